@@ -1,12 +1,24 @@
 # app.py
 import streamlit as st
-from langchain_openai import ChatOpenAI
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 from langchain_core.runnables.history import RunnableWithMessageHistory
-from langchain_community.chat_message_histories import StreamlitChatMessageHistory
 from langchain_core.output_parsers import StrOutputParser
+from langchain_core.messages import AIMessage, HumanMessage
 from dotenv import load_dotenv
 import os
+import sys
+import time
+import uuid
+
+# Make the shared helpers in Projects/common importable
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from common.chat_history import get_history_store
+from common.history_trim import HistoryTrimmer, llm_summarizer
+from common.instrumentation import instrument
+from common.llm_pool import get_chat_model
+from common.semantic_cache import get_semantic_cache
+from common.streaming import render_stream
+from common.tokens import count_tokens
 
 # Load environment variables
 load_dotenv()
@@ -37,6 +49,20 @@ with st.sidebar:
     
     temperature = st.slider("Temperature", 0.0, 1.0, 0.2, 0.1)
     
+    summarize_history = st.checkbox(
+        "Summarize older turns",
+        value=False,
+        help="Turns dropped to stay within the history token budget are summarized (one extra, short LLM call when the budget is exceeded)"
+    )
+    use_semantic_cache = st.checkbox(
+        "⚡ Reuse answers to similar questions",
+        value=os.getenv("SEMANTIC_CACHE", "0") == "1",
+        help="Near-duplicate questions (asked by anyone, with the same model and temperature) are answered from a local cache instead of the model"
+    )
+    clear_clicked = st.button("🗑️ Clear conversation")
+    history_stats = st.empty()
+    cache_stats = st.empty()
+
     st.markdown("---")
     st.caption("🔒 No code is executed by default — only generated & explained.")
 
@@ -44,8 +70,8 @@ if not api_key:
     st.warning("🔑 Please enter your OpenAI API key in the sidebar.")
     st.stop()
 
-# Initialize LLM
-llm = ChatOpenAI(
+# Initialize LLM (shared across reruns and sessions with the same settings)
+llm = get_chat_model(
     model=model_choice,
     temperature=temperature,
     api_key=api_key,
@@ -77,11 +103,6 @@ CODE_ASSISTANT_PROMPT = """You are an expert programming assistant named **CodeM
 
 ❌ Bad:  
 > "Run this shell command: `rm -rf /`"
-
-Current conversation:
-{history}
-User: {input}
-CodeMaster:
 """
 
 # Build prompt
@@ -91,16 +112,31 @@ prompt = ChatPromptTemplate.from_messages([
     ("human", "{input}")
 ])
 
-# Chain
-chain = prompt | llm | StrOutputParser()
-
-# Message history (auto-syncs with Streamlit session)
-history = StreamlitChatMessageHistory(key="chat_history")
+# History trimmer, one per browser session: keeps the history sent to the model
+# within the model's token budget, counting each message's tokens only once
+trimmer_key = f"history_trimmer_{model_choice}"
+if trimmer_key not in st.session_state:
+    st.session_state[trimmer_key] = HistoryTrimmer(model=model_choice)
+trimmer = st.session_state[trimmer_key]
+trimmer.summarize = llm_summarizer(get_chat_model(model=model_choice, temperature=0.0, api_key=api_key)) if summarize_history else None
+
+# Chain (LLM latency and token usage are recorded as "code_assistant_chain")
+chain = instrument(trimmer.as_runnable() | prompt | llm | StrOutputParser(), "code_assistant_chain")
+
+# Message history, persisted per session. The session ID lives in the URL,
+# so a reload or a server restart resumes the same conversation.
+if "session" not in st.query_params:
+    st.query_params["session"] = uuid.uuid4().hex
+session_id = st.query_params["session"]
+history_store = get_history_store()
+history = history_store.get_history(session_id)
+if clear_clicked:
+    history.clear()
 
 # Chain with memory
 chain_with_history = RunnableWithMessageHistory(
     chain,
-    lambda _: history,
+    history_store.get_history,
     input_messages_key="input",
     history_messages_key="history",
 )
@@ -110,7 +146,8 @@ st.title("💡 Code Assistant")
 st.markdown("Ask for help with writing, debugging, or understanding code!")
 
 # Display chat history
-for msg in history.messages:
+past_messages = history.messages
+for msg in past_messages:
     role = "user" if msg.type == "human" else "assistant"
     avatar = "🧑" if role == "user" else "🤖"
     with st.chat_message(role, avatar=avatar):
@@ -122,19 +159,57 @@ if user_input := st.chat_input("E.g., 'Write a Python function to calculate Fibo
     with st.chat_message("user", avatar="🧑"):
         st.markdown(user_input)
 
+    # Answers depend on the conversation so far, so the previous question is part of the cache key
+    semantic_cache = get_semantic_cache() if use_semantic_cache else None
+    cache_context = next((m.content for m in reversed(past_messages) if m.type == "human"), "")
+    cache_namespace = f"{model_choice}|{temperature:.1f}"
+    cached = semantic_cache.lookup(user_input, cache_context, cache_namespace) if semantic_cache else None
+
     # Get response
     with st.chat_message("assistant", avatar="🤖"):
-        with st.spinner("Generating code..."):
-            response_container = st.empty()
-            full_response = ""
-            
-            # Stream response tokens
-            for token in chain_with_history.stream(
-                {"input": user_input},
-                config={"configurable": {"session_id": "code_session"}}
-            ):
-                full_response += token
-                response_container.markdown(full_response + "▌")  # cursor effect
-            response_container.markdown(full_response)
-
-    # Done. History is auto-saved.
\ No newline at end of file
+        if cached:
+            # Replay the cached answer as a stream and record the turn as usual
+            render_stream(semantic_cache.replay(cached.answer), st.container())
+            history.add_messages([HumanMessage(user_input), AIMessage(cached.answer)])
+            st.caption(f"⚡ Answered from cache (similarity {cached.similarity:.2f})")
+        else:
+            with st.spinner("Generating code..."):
+                # Stream response tokens, re-rendering at most once per frame; closed
+                # code blocks are rendered once and later frames only update the tail
+                start = time.perf_counter()
+                full_response = render_stream(
+                    chain_with_history.stream(
+                        {"input": user_input},
+                        config={"configurable": {"session_id": session_id}}
+                    ),
+                    st.container()
+                )
+
+            if semantic_cache:
+                semantic_cache.put(
+                    user_input,
+                    full_response,
+                    cache_context,
+                    cache_namespace,
+                    tokens=count_tokens(CODE_ASSISTANT_PROMPT + user_input + full_response, model_choice),
+                    seconds=time.perf_counter() - start
+                )
+
+    # Done. History is auto-saved.
+
+# Prompt tokens saved by trimming the history
+trim_stats = trimmer.get_stats()
+if trim_stats["turns"]:
+    history_stats.caption(
+        f"✂️ History: {trim_stats['tokens_before']:,} → {trim_stats['tokens_after']:,} prompt tokens "
+        f"({trim_stats['reduction']:.0%} saved, budget {trim_stats['max_tokens']:,}/turn)"
+    )
+
+# Semantic cache hit rate and savings (shared by all sessions)
+if use_semantic_cache:
+    stats = get_semantic_cache().get_stats()
+    cache_stats.caption(
+        f"⚡ Cache: {stats['hits']}/{stats['lookups']} hits ({stats['hit_rate']:.0%}), "
+        f"~{stats['saved_tokens']:,} tokens saved, {stats['avg_hit_ms']:.1f} ms per hit "
+        f"vs {stats['avg_miss_seconds']:.1f} s per generated answer"
+    )
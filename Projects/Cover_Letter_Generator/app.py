@@ -1,16 +1,23 @@
 # cover_letter_gen.py
 import streamlit as st
-from langchain_openai import ChatOpenAI
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import StrOutputParser
 from langchain_core.runnables import RunnablePassthrough, RunnableParallel
 from langchain_tavily import TavilySearch
 from dotenv import load_dotenv
 import os
+import sys
 
 # Load env
 load_dotenv()
 
+# Make the shared helpers in Projects/common importable
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from common.instrumentation import instrument
+from common.llm_cache import cached_streaming, enable_llm_cache
+from common.llm_pool import get_chat_model
+from common.streaming import render_stream
+
 # Page config
 st.set_page_config(
     page_title="📄 Cover Letter Generator + 🌐 Company Research",
@@ -39,6 +46,16 @@ with st.sidebar:
     
     # Define research_enabled HERE, inside the sidebar
     research_enabled = st.toggle("🌐 Enable Company Research", value=bool(tavily_key))
+
+    # Identical requests at creativity 0 are always answered from the cache
+    llm_cache = enable_llm_cache()
+    reuse_letters = st.checkbox(
+        "♻️ Reuse letters for identical requests",
+        value=False,
+        disabled=llm_cache is None or temperature == 0,
+        help="Return the earlier letter for a repeated request instead of writing a new one, even at creativity above 0"
+    )
+    cache_stats = st.empty()
     
     st.markdown("---")
     st.caption("🔒 All data stays local. Research only if enabled.")
@@ -54,7 +71,12 @@ if research_enabled and not tavily_key:
     st.stop()
 
 # ====== TOOLS & CHAINS ======
-llm = ChatOpenAI(model=model, temperature=temperature, api_key=api_key)
+llm = get_chat_model(
+    model=model,
+    temperature=temperature,
+    api_key=api_key,
+    cache=llm_cache.with_sampling() if llm_cache and reuse_letters else None
+)
 
 if research_enabled:
     tavily = TavilySearch(
@@ -198,24 +220,29 @@ if generate or generate_free:
                     research=lambda x: get_research(x.get("company", "")),
                 )
                 | prompt.partial(tone=tone)
-                | llm
+                | cached_streaming(llm)
                 | StrOutputParser()
             )
         else:
             chain = (
                 {"input": RunnablePassthrough(), "research": lambda _: "Disabled"}
                 | prompt.partial(tone=tone)
-                | llm
+                | cached_streaming(llm)
                 | StrOutputParser()
             )
 
+        # Queue time includes the company research step
+        chain = instrument(chain, "cover_letter_chain")
+
         try:
-            response = ""
             placeholder = st.empty()
             placeholder.info("📝 Writing…")
-            for chunk in chain.stream(input_data):
-                response += chunk
-                placeholder.markdown(f"📝 **Drafting...**\n\n```\n{response}▌\n```")
+            response = render_stream(
+                chain.stream(input_data),
+                placeholder.container(),
+                template="📝 **Drafting...**\n\n```\n{text}\n```",
+                split_code_blocks=False
+            )
             placeholder.empty()
             
             st.session_state.cover_letter = response.strip()
@@ -306,4 +333,11 @@ if "cover_letter" in st.session_state:
         """
         st.components.v1.html(copy_button_html, height=60)
 
+if llm_cache:
+    stats = llm_cache.get_stats()
+    cache_stats.caption(
+        f"♻️ Cache: {stats['hits']}/{stats['hits'] + stats['misses']} hits ({stats['hit_ratio']:.0%}), "
+        f"{stats['bypassed']} sampled requests not cached"
+    )
+
 st.caption("✅ Powered by LangChain + Tavily + OpenAI • 🔒 Private & secure")
\ No newline at end of file
@@ -6,16 +6,36 @@ Handles interview question generation, answer evaluation, and conversation manag
 from langchain_openai import ChatOpenAI
 from langchain_community.chat_message_histories import ChatMessageHistory
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
-from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
-from typing import Dict, List, Optional
+from langchain_core.messages import HumanMessage, AIMessage, SystemMessage, messages_from_dict, messages_to_dict
+from langchain_core.language_models import BaseChatModel
+from langchain_core.runnables import RunnableParallel
+from typing import AsyncIterator, Dict, Iterator, List, Optional, Tuple
+import asyncio
 import os
+import sys
 from datetime import datetime
+from history import HistoryStrategy
+from prefetch import PrefetchPolicy, QuestionPrefetcher
+from question_cache import QuestionCache
+
+# Make the shared helpers in Projects/common importable
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from common.instrumentation import instrument
 
 
 class InterviewBot:
     """Main class for managing mock interview sessions."""
     
-    def __init__(self, api_key: str, model_name: str = "gpt-4o-mini", temperature: float = 0.7):
+    def __init__(
+        self,
+        api_key: str,
+        model_name: str = "gpt-4o-mini",
+        temperature: float = 0.7,
+        history_strategy: Optional[HistoryStrategy] = None,
+        prefetch_policy: Optional[PrefetchPolicy] = None,
+        question_cache: Optional[QuestionCache] = None,
+        llm: Optional[BaseChatModel] = None
+    ):
         """
         Initialize the InterviewBot with LangChain components.
         
@@ -23,8 +43,19 @@ class InterviewBot:
             api_key: OpenAI API key
             model_name: Name of the model to use (default: gpt-4o-mini)
             temperature: Temperature for response generation (default: 0.7)
+            history_strategy: Strategy bounding the history sent with each
+                question (default: full history)
+            prefetch_policy: How far ahead to speculatively generate questions
+                (default: no prefetching)
+            question_cache: Persistent cache for opening questions (default: none)
+            llm: Pre-built chat model, e.g. a shared pooled client (default: a new
+                ChatOpenAI built from api_key, model_name and temperature)
         """
-        self.llm = ChatOpenAI(
+        self.model_name = model_name
+        self.temperature = temperature
+        self.question_cache = question_cache
+        
+        self.llm = llm or ChatOpenAI(
             api_key=api_key,
             model_name=model_name,
             temperature=temperature
@@ -32,6 +63,11 @@ class InterviewBot:
         
         self.chat_history = ChatMessageHistory()
         
+        self.history_strategy = history_strategy or HistoryStrategy()
+        self.history_strategy.bind_llm(self.llm)
+        
+        self.prefetcher = QuestionPrefetcher(self._generate_speculative_question, prefetch_policy)
+        
         self.current_role = None
         self.question_count = 0
         self.start_time = None
@@ -76,119 +112,407 @@ Candidate's Answer: {answer}
 Please evaluate this answer and provide feedback.""")
         ])
         
-        self.question_chain = self.question_prompt | self.llm
-        self.evaluation_chain = self.evaluation_prompt | self.llm
+        # Each chain records its LLM latency and token usage under its own name
+        self.question_chain = instrument(self.question_prompt | self.llm, "question_chain")
+        self.evaluation_chain = instrument(self.evaluation_prompt | self.llm, "evaluation_chain")
+        
+        # Feedback and the next question only depend on the candidate's answer,
+        # so both chains run side by side on the same input payload
+        self.turn_chain = RunnableParallel(
+            feedback=self.evaluation_chain,
+            next_question=self.question_chain
+        )
     
-    def start_interview(self, role: str) -> str:
+    @staticmethod
+    def _split_role(role: str) -> Tuple[str, str]:
         """
-        Start a new interview session for a specific role.
+        Split a role string into its name and optional description.
+        
+        Args:
+            role: The job role, optionally formatted as "name - description"
+            
+        Returns:
+            Tuple of (role_name, role_description)
+        """
+        if " - " in role:
+            role_name, role_description = role.split(" - ", 1)
+            return role_name, role_description
+        return role, ""
+    
+    def _begin_interview(self, role: str) -> Tuple[str, str]:
+        """
+        Reset the session state for a new interview.
         
         Args:
             role: The job role/position for the interview (may include description)
             
         Returns:
-            Welcome message with the first question
+            Tuple of (role_name, role_description)
         """
         self.current_role = role
         self.question_count = 0
         self.start_time = datetime.now()
         self.chat_history.clear()
+        self.history_strategy.reset()
+        self.prefetcher.cancel()
         
         # Extract role name and description if provided
-        if " - " in role:
-            role_name, role_description = role.split(" - ", 1)
-        else:
-            role_name = role
-            role_description = ""
-        
-        # Generate first question
-        first_question = self.generate_question(role_name, role_description)
+        return self._split_role(role)
+    
+    def _welcome_message(self, role_name: str, first_question: str) -> str:
+        """Build the welcome message and prepare upcoming questions."""
+        # Prepare upcoming questions while the candidate answers
+        self._schedule_prefetch()
         
-        welcome_message = f"""Welcome to your mock interview for the **{role_name}** position! 
+        return f"""Welcome to your mock interview for the **{role_name}** position! 
 
 I'll be asking you a series of questions to help you practice. Take your time to think through your answers, and I'll provide feedback after each response.
 
 Let's begin with your first question:
 
 {first_question}"""
+    
+    def start_interview(self, role: str) -> str:
+        """
+        Start a new interview session for a specific role.
+        
+        Args:
+            role: The job role/position for the interview (may include description)
+            
+        Returns:
+            Welcome message with the first question
+        """
+        role_name, role_description = self._begin_interview(role)
         
-        return welcome_message
+        # Generate first question
+        first_question = self.generate_question(role_name, role_description)
+        
+        return self._welcome_message(role_name, first_question)
     
-    def generate_question(self, role_name: str = None, role_description: str = "") -> str:
+    async def astart_interview(self, role: str) -> str:
         """
-        Generate the next interview question based on conversation history.
+        Start a new interview session without blocking the event loop.
+        
+        Args:
+            role: The job role/position for the interview (may include description)
+            
+        Returns:
+            Welcome message with the first question
+        """
+        role_name, role_description = self._begin_interview(role)
+        first_question = await self.agenerate_question(role_name, role_description)
+        return self._welcome_message(role_name, first_question)
+    
+    def _prepare_question(
+        self,
+        role_name: str = None,
+        role_description: str = ""
+    ) -> Tuple[Dict[str, any], Optional[str], Optional[str]]:
+        """
+        Advance the question count and build the question chain input.
         
         Args:
             role_name: The role name (optional, uses current_role if not provided)
             role_description: The role description for custom roles
             
         Returns:
-            The generated interview question
+            Tuple of (question chain input, cached question or None, cache key or None)
         """
         self.question_count += 1
         
         # Use current role if not provided
         if role_name is None:
-            if " - " in self.current_role:
-                role_name, role_description = self.current_role.split(" - ", 1)
-            else:
-                role_name = self.current_role
-                role_description = ""
+            role_name, role_description = self._split_role(self.current_role)
         
-        # Get chat history
-        chat_history = self.chat_history.messages
+        # Get chat history, bounded by the configured strategy
+        chat_history = self.history_strategy.select(self.chat_history.messages)
         
-        # Generate question
-        response = self.question_chain.invoke({
+        # Openers don't depend on the conversation, so they can be served from the cache.
+        # Check the real conversation: a strategy's window can be empty later on too.
+        question = None
+        cache_key = None
+        if self.question_cache is not None and not self.chat_history.messages:
+            cache_key = self.question_cache.make_key(
+                role_name, role_description, self.question_count, self.model_name, self.temperature
+            )
+            question = self.question_cache.get(cache_key)
+        
+        inputs = {
             "role": role_name,
             "role_description": role_description,
             "question_number": self.question_count,
             "chat_history": chat_history
-        })
+        }
         
-        question = response.content
+        return inputs, question, cache_key
+    
+    def _save_question(self, question: str, cache_key: Optional[str], generated: bool):
+        """Save an asked question to chat history and, if newly generated, to the cache."""
+        if generated and cache_key is not None:
+            self.question_cache.add(cache_key, question)
         
-        # Save question to chat history
         self.chat_history.add_ai_message(question)
+    
+    def generate_question(self, role_name: str = None, role_description: str = "") -> str:
+        """
+        Generate the next interview question based on conversation history.
+        
+        Args:
+            role_name: The role name (optional, uses current_role if not provided)
+            role_description: The role description for custom roles
+            
+        Returns:
+            The generated interview question
+        """
+        inputs, question, cache_key = self._prepare_question(role_name, role_description)
+        
+        generated = question is None
+        if generated:
+            question = self.question_chain.invoke(inputs).content
+        
+        self._save_question(question, cache_key, generated)
         
         return question
     
-    def evaluate_answer(self, question: str, answer: str) -> Dict[str, str]:
+    async def agenerate_question(self, role_name: str = None, role_description: str = "") -> str:
         """
-        Evaluate the user's answer and provide feedback.
+        Generate the next interview question without blocking the event loop.
+        
+        Args:
+            role_name: The role name (optional, uses current_role if not provided)
+            role_description: The role description for custom roles
+            
+        Returns:
+            The generated interview question
+        """
+        # History strategies and the question cache may block (summaries, SQLite)
+        inputs, question, cache_key = await asyncio.to_thread(self._prepare_question, role_name, role_description)
+        
+        generated = question is None
+        if generated:
+            question = (await self.question_chain.ainvoke(inputs)).content
+        
+        await asyncio.to_thread(self._save_question, question, cache_key, generated)
+        
+        return question
+    
+    def _generate_speculative_question(
+        self,
+        role_name: str,
+        role_description: str,
+        question_number: int,
+        asked_questions: List[str]
+    ) -> str:
+        """
+        Generate a question that does not depend on the candidate's answers.
+        
+        Args:
+            role_name: The role name
+            role_description: The role description for custom roles
+            question_number: The number of the question to generate
+            asked_questions: Questions already asked or prefetched, to avoid repeats
+            
+        Returns:
+            The generated interview question
+        """
+        response = self.question_chain.invoke({
+            "role": role_name,
+            "role_description": role_description,
+            "question_number": question_number,
+            "chat_history": [AIMessage(content=q) for q in asked_questions]
+        })
+        return response.content
+    
+    def _schedule_prefetch(self):
+        """Queue speculative questions after the current one."""
+        role_name, role_description = self._split_role(self.current_role)
+        asked_questions = [m.content for m in self.chat_history.messages if isinstance(m, AIMessage)]
+        
+        self.prefetcher.schedule(role_name, role_description, asked_questions, self.question_count + 1)
+    
+    def _prepare_turn(self, question: str, answer: str) -> Tuple[Dict[str, any], Optional[str]]:
+        """
+        Record the user's answer and build the shared input for the turn chain.
         
         Args:
             question: The interview question that was asked
             answer: The user's answer to evaluate
             
         Returns:
-            Dictionary containing feedback and the next question
+            Tuple of (input dictionary accepted by both the evaluation and question
+            chains, prefetched next question or None)
         """
         # Save user's answer to chat history
         self.chat_history.add_user_message(answer)
+        self.question_count += 1
         
-        # Generate evaluation
-        evaluation_response = self.evaluation_chain.invoke({
+        role_name, role_description = self._split_role(self.current_role)
+        prefetched_question = self.prefetcher.take(self.question_count)
+        
+        inputs = {
             "question": question,
-            "answer": answer
-        })
+            "answer": answer,
+            "role": role_name,
+            "role_description": role_description,
+            "question_number": self.question_count,
+            "chat_history": []
+        }
         
-        feedback = evaluation_response.content
+        # The history is only needed when the next question has to be generated
+        if prefetched_question is None:
+            inputs["chat_history"] = self.history_strategy.select(self.chat_history.messages)
         
-        # Generate next question with role information
-        if " - " in self.current_role:
-            role_name, role_description = self.current_role.split(" - ", 1)
-        else:
-            role_name = self.current_role
-            role_description = ""
+        return inputs, prefetched_question
+    
+    def _finish_turn(self, result: Dict[str, any]) -> Dict[str, str]:
+        """
+        Save the next question to chat history and unwrap the chain outputs.
+        
+        Args:
+            result: Output of the turn chain with 'feedback' and 'next_question' messages
+            
+        Returns:
+            Dictionary containing feedback and the next question
+        """
+        feedback = result["feedback"].content
+        next_question = result["next_question"].content
         
-        next_question = self.generate_question(role_name, role_description)
+        self.chat_history.add_ai_message(next_question)
+        self._schedule_prefetch()
         
         return {
             "feedback": feedback,
             "next_question": next_question
         }
     
+    async def aevaluate_answer(self, question: str, answer: str) -> Dict[str, str]:
+        """
+        Evaluate the user's answer and generate the next question concurrently.
+        
+        Args:
+            question: The interview question that was asked
+            answer: The user's answer to evaluate
+            
+        Returns:
+            Dictionary containing feedback and the next question
+        """
+        # Waiting on an in-flight prefetch must not block the event loop
+        inputs, prefetched_question = await asyncio.to_thread(self._prepare_turn, question, answer)
+        
+        if prefetched_question is None:
+            result = await self.turn_chain.ainvoke(inputs)
+        else:
+            result = {
+                "feedback": await self.evaluation_chain.ainvoke(inputs),
+                "next_question": AIMessage(content=prefetched_question)
+            }
+        
+        return self._finish_turn(result)
+    
+    def evaluate_answer(self, question: str, answer: str) -> Dict[str, str]:
+        """
+        Evaluate the user's answer and provide feedback.
+        
+        Synchronous counterpart of aevaluate_answer: the evaluation and
+        next-question chains still run concurrently on RunnableParallel's
+        thread pool, so a turn costs one LLM round trip instead of two.
+        
+        Args:
+            question: The interview question that was asked
+            answer: The user's answer to evaluate
+            
+        Returns:
+            Dictionary containing feedback and the next question
+        """
+        inputs, prefetched_question = self._prepare_turn(question, answer)
+        
+        if prefetched_question is None:
+            result = self.turn_chain.invoke(inputs)
+        else:
+            result = {
+                "feedback": self.evaluation_chain.invoke(inputs),
+                "next_question": AIMessage(content=prefetched_question)
+            }
+        
+        return self._finish_turn(result)
+    
+    def stream_evaluation(self, question: str, answer: str) -> Iterator[Tuple[str, str]]:
+        """
+        Stream the feedback for the user's answer, then the next question.
+        
+        Args:
+            question: The interview question that was asked
+            answer: The user's answer to evaluate
+            
+        Yields:
+            Tuples of (section, token) where section is 'feedback' or 'next_question'
+        """
+        inputs, prefetched_question = self._prepare_turn(question, answer)
+        
+        for chunk in self.evaluation_chain.stream(inputs):
+            yield "feedback", chunk.content
+        
+        if prefetched_question is not None:
+            question_parts = [prefetched_question]
+            yield "next_question", prefetched_question
+        else:
+            question_parts = []
+            for chunk in self.question_chain.stream(inputs):
+                question_parts.append(chunk.content)
+                yield "next_question", chunk.content
+        
+        # Save the fully streamed question to chat history
+        self.chat_history.add_ai_message("".join(question_parts))
+        self._schedule_prefetch()
+    
+    async def astream_evaluation(self, question: str, answer: str) -> AsyncIterator[Tuple[str, str]]:
+        """
+        Stream the feedback for the user's answer, then the next question, asynchronously.
+        
+        The next question is generated while the feedback streams, so its first
+        token is usually ready as soon as the feedback finishes.
+        
+        Args:
+            question: The interview question that was asked
+            answer: The user's answer to evaluate
+            
+        Yields:
+            Tuples of (section, token) where section is 'feedback' or 'next_question'
+        """
+        inputs, prefetched_question = await asyncio.to_thread(self._prepare_turn, question, answer)
+        
+        question_tokens: asyncio.Queue = asyncio.Queue()
+        
+        async def produce_question():
+            try:
+                if prefetched_question is not None:
+                    await question_tokens.put(prefetched_question)
+                else:
+                    async for chunk in self.question_chain.astream(inputs):
+                        await question_tokens.put(chunk.content)
+            finally:
+                await question_tokens.put(None)
+        
+        producer = asyncio.create_task(produce_question())
+        
+        try:
+            async for chunk in self.evaluation_chain.astream(inputs):
+                yield "feedback", chunk.content
+            
+            question_parts = []
+            while (token := await question_tokens.get()) is not None:
+                question_parts.append(token)
+                yield "next_question", token
+            
+            # Surface generation errors instead of saving a truncated question
+            await producer
+        finally:
+            producer.cancel()
+        
+        # Save the fully streamed question to chat history
+        self.chat_history.add_ai_message("".join(question_parts))
+        self._schedule_prefetch()
+    
     def get_conversation_history(self) -> List[Dict[str, str]]:
         """
         Retrieve the conversation history.
@@ -210,10 +534,42 @@ Let's begin with your first question:
     def reset_session(self):
         """Clear conversation memory and reset session state."""
         self.chat_history.clear()
+        self.history_strategy.reset()
+        self.prefetcher.cancel()
         self.current_role = None
         self.question_count = 0
         self.start_time = None
     
+    def export_state(self) -> Dict[str, any]:
+        """
+        Export the session state as plain, JSON-serializable data.
+        
+        Returns:
+            Dictionary containing the role, question count, start time, messages
+            and the history strategy state (e.g. a running summary)
+        """
+        return {
+            "role": self.current_role,
+            "question_count": self.question_count,
+            "start_time": self.start_time.isoformat() if self.start_time else None,
+            "messages": messages_to_dict(self.chat_history.messages),
+            "history": self.history_strategy.export_state()
+        }
+    
+    def load_state(self, state: Dict[str, any]):
+        """
+        Replace the session state with one produced by export_state.
+        
+        Args:
+            state: Dictionary returned by export_state
+        """
+        self.reset_session()
+        self.current_role = state["role"]
+        self.question_count = state["question_count"]
+        self.start_time = datetime.fromisoformat(state["start_time"]) if state["start_time"] else None
+        self.chat_history.add_messages(messages_from_dict(state["messages"]))
+        self.history_strategy.load_state(state.get("history") or {})
+    
     def get_session_stats(self) -> Dict[str, any]:
         """
         Get statistics about the current interview session.
@@ -228,5 +584,7 @@ Let's begin with your first question:
         return {
             "role": self.current_role,
             "questions_asked": self.question_count,
-            "elapsed_minutes": elapsed_time
+            "elapsed_minutes": elapsed_time,
+            "history_tokens_saved": self.history_strategy.tokens_saved,
+            "prefetch_hit_rate": self.prefetcher.hit_rate
         }
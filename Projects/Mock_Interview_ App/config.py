@@ -18,6 +18,30 @@ class Config:
     OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
     MODEL_NAME = os.getenv("MODEL_NAME", "gpt-4o-mini")
     TEMPERATURE = float(os.getenv("TEMPERATURE", "0.7"))
+    # Point at any OpenAI-compatible server, e.g. the local stub used for load tests
+    OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL", "")
+    
+    # Chat history sent with each question: full, last_n, token_window or summary
+    HISTORY_STRATEGY = os.getenv("HISTORY_STRATEGY", "token_window")
+    HISTORY_MAX_TOKENS = int(os.getenv("HISTORY_MAX_TOKENS", "1500"))
+    HISTORY_KEEP_LAST = int(os.getenv("HISTORY_KEEP_LAST", "6"))
+    
+    # Speculative question prefetching (depth 0 disables it)
+    PREFETCH_DEPTH = int(os.getenv("PREFETCH_DEPTH", "1"))
+    PREFETCH_INDEPENDENT_QUESTIONS = int(os.getenv("PREFETCH_INDEPENDENT_QUESTIONS", "3"))
+    
+    # Persistent cache of opening questions (warm with: python question_cache.py warm)
+    QUESTION_CACHE_ENABLED = os.getenv("QUESTION_CACHE_ENABLED", "true").lower() == "true"
+    QUESTION_CACHE_PATH = os.getenv("QUESTION_CACHE_PATH", "question_cache.db")
+    QUESTION_CACHE_POOL_SIZE = int(os.getenv("QUESTION_CACHE_POOL_SIZE", "5"))
+    QUESTION_CACHE_TTL_HOURS = float(os.getenv("QUESTION_CACHE_TTL_HOURS", "168"))
+    QUESTION_CACHE_MAX_ENTRIES = int(os.getenv("QUESTION_CACHE_MAX_ENTRIES", "5000"))
+    
+    # Session storage: live bots, compact in-memory records, then disk
+    SESSION_MAX_ACTIVE = int(os.getenv("SESSION_MAX_ACTIVE", "50"))
+    SESSION_MAX_MEMORY_MB = int(os.getenv("SESSION_MAX_MEMORY_MB", "64"))
+    SESSION_IDLE_SECONDS = float(os.getenv("SESSION_IDLE_SECONDS", "900"))
+    SESSION_SPILL_DIR = os.getenv("SESSION_SPILL_DIR", "sessions")
     
     # Available interview roles
     INTERVIEW_ROLES = [
@@ -3,16 +3,39 @@ Frontend module for Mock Interview Chatbot using Streamlit.
 Provides the user interface for conducting mock interviews.
 """
 
+import os
+import sys
 import streamlit as st
-from backend import InterviewBot
 from config import Config
+from session_manager import (
+    SessionManager,
+    SessionNotFoundError,
+    create_question_cache,
+    create_session_manager
+)
 from datetime import datetime
 
+# Make the shared helpers in Projects/common importable
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from common.instrumentation import get_metrics
+
+
+@st.cache_resource
+def get_question_cache():
+    """Open the shared question cache once per server process."""
+    return create_question_cache()
+
+
+@st.cache_resource
+def get_session_manager() -> SessionManager:
+    """Create the session manager shared by all browser sessions."""
+    return create_session_manager(get_question_cache())
+
 
 def init_session_state():
     """Initialize Streamlit session state variables."""
-    if "interview_bot" not in st.session_state:
-        st.session_state.interview_bot = None
+    if "session_id" not in st.session_state:
+        st.session_state.session_id = None
     
     if "interview_started" not in st.session_state:
         st.session_state.interview_started = False
@@ -182,8 +205,14 @@ def display_sidebar():
                     start_interview(selected_role)
         else:
             # Display session stats
-            if st.session_state.interview_bot:
-                stats = st.session_state.interview_bot.get_session_stats()
+            stats = None
+            if st.session_state.session_id:
+                try:
+                    stats = get_session_manager().get_session_stats(st.session_state.session_id)
+                except SessionNotFoundError:
+                    st.warning("This interview session has expired.")
+            
+            if stats:
                 
                 st.subheader("📊 Session Stats")
                 
@@ -213,6 +242,16 @@ def display_sidebar():
                             <p style="font-size: 24px; margin: 0; font-weight: bold;">{stats['elapsed_minutes']} min</p>
                         </div>
                     """, unsafe_allow_html=True)
+                
+                if stats['history_tokens_saved']:
+                    st.markdown(f"""
+                        <div class="stat-card">
+                            <h4>Context Tokens Saved</h4>
+                            <p style="font-size: 24px; margin: 0; font-weight: bold;">{stats['history_tokens_saved']}</p>
+                        </div>
+                    """, unsafe_allow_html=True)
+                
+                display_llm_metrics()
             
             st.divider()
             
@@ -239,6 +278,25 @@ def display_sidebar():
             """)
 
 
+def display_llm_metrics():
+    """Show per-chain LLM latency and token usage for this server process."""
+    chain_stats = get_metrics().get_stats()
+    if not chain_stats:
+        return
+    
+    with st.expander("⏱️ LLM Metrics"):
+        for chain, stats in chain_stats.items():
+            latency = stats.get("latency_seconds", {})
+            ttft = stats.get("ttft_seconds", {})
+            tokens = stats.get("completion_tokens", {})
+            st.markdown(
+                f"**{chain}** · {stats['calls']} calls\n\n"
+                f"Latency p50/p95: {latency.get('p50', 0):.2f}s / {latency.get('p95', 0):.2f}s  \n"
+                f"First token p50: {ttft.get('p50', 0):.2f}s  \n"
+                f"Completion tokens: {int(tokens.get('sum', 0))}"
+            )
+
+
 def start_interview(role: str):
     """
     Start a new interview session.
@@ -252,15 +310,9 @@ def start_interview(role: str):
         st.error(error_msg)
         return
     
-    # Initialize the interview bot
-    st.session_state.interview_bot = InterviewBot(
-        api_key=Config.OPENAI_API_KEY,
-        model_name=Config.MODEL_NAME,
-        temperature=Config.TEMPERATURE
-    )
-    
-    # Start the interview
-    welcome_message = st.session_state.interview_bot.start_interview(role)
+    # Create the session and start the interview
+    session_id, welcome_message = get_session_manager().create_session(role)
+    st.session_state.session_id = session_id
     
     # Update session state
     st.session_state.interview_started = True
@@ -280,15 +332,15 @@ def start_interview(role: str):
 
 def reset_interview():
     """Reset the interview session."""
-    if st.session_state.interview_bot:
-        st.session_state.interview_bot.reset_session()
+    if st.session_state.session_id:
+        get_session_manager().end_session(st.session_state.session_id)
     
     st.session_state.interview_started = False
     st.session_state.current_question = ""
     st.session_state.messages = []
     st.session_state.selected_role = None
     st.session_state.awaiting_answer = False
-    st.session_state.interview_bot = None
+    st.session_state.session_id = None
     
     st.rerun()
 
@@ -313,32 +365,43 @@ def handle_user_input():
         with st.chat_message("user"):
             st.markdown(prompt)
         
-        # Get evaluation and next question
+        # Stream evaluation and next question as tokens arrive
         with st.chat_message("assistant"):
-            with st.spinner("Evaluating your answer..."):
-                result = st.session_state.interview_bot.evaluate_answer(
-                    st.session_state.current_question,
+            containers = {
+                "feedback": st.empty(),
+                "next_question": st.empty()
+            }
+            headers = {
+                "feedback": "### 📝 Feedback\n\n",
+                "next_question": "---\n\n### ❓ Next Question\n\n"
+            }
+            sections = {"feedback": "", "next_question": ""}
+            
+            containers["feedback"].markdown(headers["feedback"] + "▌")
+            
+            try:
+                for section, token in get_session_manager().stream_answer(
+                    st.session_state.session_id,
                     prompt
-                )
-                
-                feedback = result["feedback"]
-                next_question = result["next_question"]
-                
-                # Display feedback
-                st.markdown("### 📝 Feedback")
-                st.markdown(feedback)
-                
-                st.divider()
-                
-                # Display next question
-                st.markdown("### ❓ Next Question")
-                st.markdown(next_question)
-                
-                # Combine for message history
-                full_response = f"### 📝 Feedback\n\n{feedback}\n\n---\n\n### ❓ Next Question\n\n{next_question}"
-                
-                st.session_state.messages.append({"role": "assistant", "content": full_response})
-                st.session_state.current_question = next_question
+                ):
+                    sections[section] += token
+                    containers[section].markdown(headers[section] + sections[section] + "▌")  # cursor effect
+            except SessionNotFoundError:
+                containers["feedback"].error("This interview session has expired. Please reset and start a new interview.")
+                st.session_state.awaiting_answer = False
+                return
+            
+            for section, container in containers.items():
+                container.markdown(headers[section] + sections[section])
+            
+            feedback = sections["feedback"]
+            next_question = sections["next_question"]
+            
+            # Combine for message history
+            full_response = f"### 📝 Feedback\n\n{feedback}\n\n---\n\n### ❓ Next Question\n\n{next_question}"
+            
+            st.session_state.messages.append({"role": "assistant", "content": full_response})
+            st.session_state.current_question = next_question
 
 
 def main():
@@ -0,0 +1,327 @@
+"""
+Chat history strategies for Mock Interview Chatbot.
+Bounds how much of the conversation is sent back to the model on every question.
+"""
+
+from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage
+from langchain_core.runnables import Runnable
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+
+def estimate_tokens(message: BaseMessage) -> int:
+    """
+    Cheaply estimate the number of tokens in a message.
+
+    Uses the common ~4 characters per token heuristic plus a small per-message
+    overhead, which is close enough for budgeting without loading a tokenizer.
+
+    Args:
+        message: The message to measure
+
+    Returns:
+        Estimated token count
+    """
+    return len(str(message.content)) // 4 + 4
+
+
+class HistoryStrategy:
+    """Base strategy that sends the full chat history and tracks token usage."""
+
+    name = "full"
+
+    def __init__(self, token_counter: Callable[[BaseMessage], int] = estimate_tokens):
+        """
+        Initialize the strategy.
+
+        Args:
+            token_counter: Function returning the token count of a single message
+        """
+        self.token_counter = token_counter
+        self.tokens_available = 0
+        self.tokens_sent = 0
+
+    def select(self, messages: Sequence[BaseMessage]) -> List[BaseMessage]:
+        """
+        Pick the messages to send to the model and update the token counters.
+
+        Args:
+            messages: The full chat history
+
+        Returns:
+            The messages to place in the prompt
+        """
+        selected = self._select(list(messages))
+
+        self.tokens_available += self.count_tokens(messages)
+        self.tokens_sent += self.count_tokens(selected)
+
+        return selected
+
+    def _select(self, messages: List[BaseMessage]) -> List[BaseMessage]:
+        """Return the subset of messages to send. Subclasses override this."""
+        return messages
+
+    def count_tokens(self, messages: Sequence[BaseMessage]) -> int:
+        """Return the total token count of a list of messages."""
+        return sum(self.token_counter(message) for message in messages)
+
+    @property
+    def tokens_saved(self) -> int:
+        """Prompt tokens that were not sent compared to the full history."""
+        return max(self.tokens_available - self.tokens_sent, 0)
+
+    def bind_llm(self, llm):
+        """Give the strategy access to the bot's chat model. No-op by default."""
+
+    def reset(self):
+        """Clear counters and any per-session state."""
+        self.tokens_available = 0
+        self.tokens_sent = 0
+
+    def export_state(self) -> Dict[str, Any]:
+        """
+        Export the per-session state as plain, JSON-serializable data.
+
+        Returns:
+            Dictionary containing the token counters
+        """
+        return {
+            "tokens_available": self.tokens_available,
+            "tokens_sent": self.tokens_sent
+        }
+
+    def load_state(self, state: Dict[str, Any]):
+        """
+        Restore per-session state produced by export_state.
+
+        Args:
+            state: Dictionary returned by export_state (missing keys keep their reset values)
+        """
+        self.tokens_available = state.get("tokens_available", 0)
+        self.tokens_sent = state.get("tokens_sent", 0)
+
+    def get_stats(self) -> Dict[str, any]:
+        """
+        Get token statistics for this strategy.
+
+        Returns:
+            Dictionary containing the strategy name and token counters
+        """
+        return {
+            "strategy": self.name,
+            "tokens_sent": self.tokens_sent,
+            "tokens_saved": self.tokens_saved
+        }
+
+
+class KeepLastN(HistoryStrategy):
+    """Send only the most recent N messages."""
+
+    name = "last_n"
+
+    def __init__(self, keep_last: int = 6, **kwargs):
+        """
+        Initialize the strategy.
+
+        Args:
+            keep_last: Number of most recent messages to keep
+        """
+        super().__init__(**kwargs)
+        self.keep_last = keep_last
+
+    def _select(self, messages: List[BaseMessage]) -> List[BaseMessage]:
+        if self.keep_last <= 0:
+            return []
+        return messages[-self.keep_last:]
+
+
+class TokenBudgetWindow(HistoryStrategy):
+    """Send the most recent messages that fit within a token budget."""
+
+    name = "token_window"
+
+    def __init__(self, max_tokens: int = 1500, **kwargs):
+        """
+        Initialize the strategy.
+
+        Args:
+            max_tokens: Maximum number of history tokens to send
+        """
+        super().__init__(**kwargs)
+        self.max_tokens = max_tokens
+
+    def _select(self, messages: List[BaseMessage]) -> List[BaseMessage]:
+        selected = []
+        used = 0
+
+        for message in reversed(messages):
+            tokens = self.token_counter(message)
+            # Always keep the latest message so follow-ups stay grounded
+            if selected and used + tokens > self.max_tokens:
+                break
+            selected.append(message)
+            used += tokens
+
+        selected.reverse()
+        return selected
+
+
+class RollingSummary(HistoryStrategy):
+    """Keep the latest turns verbatim and compact older ones into a running summary."""
+
+    name = "summary"
+
+    def __init__(self, summarizer: Optional[Runnable] = None, keep_last: int = 4, **kwargs):
+        """
+        Initialize the strategy.
+
+        Args:
+            summarizer: Chain taking 'summary' and 'transcript' and returning a message
+                (built from the bot's chat model when omitted)
+            keep_last: Number of most recent messages to keep verbatim
+        """
+        super().__init__(**kwargs)
+        self.summarizer = summarizer
+        self.keep_last = keep_last
+        self.summary = ""
+        self.summarized_count = 0
+        self.summarizer_calls = 0
+
+    def _select(self, messages: List[BaseMessage]) -> List[BaseMessage]:
+        split = max(len(messages) - self.keep_last, 0)
+        older, recent = messages[:split], messages[split:]
+
+        # History was cleared or replaced, so the summary no longer applies
+        if len(older) < self.summarized_count:
+            self.summary = ""
+            self.summarized_count = 0
+
+        # Only fold in turns that have not been summarized yet
+        if len(older) > self.summarized_count:
+            new_turns = older[self.summarized_count:]
+            response = self.summarizer.invoke({
+                "summary": self.summary or "(none yet)",
+                "transcript": format_transcript(new_turns)
+            })
+            self.summary = getattr(response, "content", response)
+            self.summarized_count = len(older)
+            self.summarizer_calls += 1
+
+        if not self.summary:
+            return recent
+
+        return [SystemMessage(content=f"Summary of earlier interview turns:\n{self.summary}")] + recent
+
+    def bind_llm(self, llm):
+        """Build the default summarizer chain unless one was provided."""
+        if self.summarizer is None:
+            self.summarizer = build_summarizer_chain(llm)
+
+    def reset(self):
+        """Clear counters and the running summary."""
+        super().reset()
+        self.summary = ""
+        self.summarized_count = 0
+        self.summarizer_calls = 0
+
+    def export_state(self) -> Dict[str, Any]:
+        """Export the token counters and the running summary."""
+        state = super().export_state()
+        state.update({
+            "summary": self.summary,
+            "summarized_count": self.summarized_count,
+            "summarizer_calls": self.summarizer_calls
+        })
+        return state
+
+    def load_state(self, state: Dict[str, Any]):
+        """Restore the token counters and the running summary."""
+        super().load_state(state)
+        self.summary = state.get("summary", "")
+        self.summarized_count = state.get("summarized_count", 0)
+        self.summarizer_calls = state.get("summarizer_calls", 0)
+
+    def get_stats(self) -> Dict[str, any]:
+        """
+        Get token statistics for this strategy.
+
+        Returns:
+            Dictionary containing token counters and the number of summarizer calls
+        """
+        stats = super().get_stats()
+        stats["summarizer_calls"] = self.summarizer_calls
+        return stats
+
+
+def format_transcript(messages: Sequence[BaseMessage]) -> str:
+    """
+    Render messages as a plain interviewer/candidate transcript.
+
+    Args:
+        messages: The messages to render
+
+    Returns:
+        One line per message prefixed with the speaker
+    """
+    lines = []
+    for message in messages:
+        speaker = "Candidate" if isinstance(message, HumanMessage) else "Interviewer"
+        lines.append(f"{speaker}: {message.content}")
+    return "\n".join(lines)
+
+
+def build_summarizer_chain(llm) -> Runnable:
+    """
+    Build the chain used by RollingSummary to compact older turns.
+
+    Args:
+        llm: Chat model used for summarization (a small, cheap model is enough)
+
+    Returns:
+        Runnable mapping 'summary' and 'transcript' to an updated summary message
+    """
+    prompt = ChatPromptTemplate.from_messages([
+        ("system", """You maintain a running summary of a mock interview.
+Merge the new transcript lines into the existing summary. Keep which topics were
+already asked and the key points of the candidate's answers. Be brief: at most
+8 bullet points."""),
+        ("human", """Existing summary:
+{summary}
+
+New transcript lines:
+{transcript}
+
+Updated summary:""")
+    ])
+    return prompt | llm
+
+
+def create_history_strategy(
+    name: str,
+    max_tokens: int = 1500,
+    keep_last: int = 6,
+    summarizer: Optional[Runnable] = None
+) -> HistoryStrategy:
+    """
+    Create a history strategy by name.
+
+    Args:
+        name: One of 'full', 'last_n', 'token_window' or 'summary'
+        max_tokens: Token budget for 'token_window'
+        keep_last: Number of recent messages kept by 'last_n' and 'summary'
+        summarizer: Optional summarizer chain for 'summary'
+
+    Returns:
+        The configured history strategy
+    """
+    if name == "full":
+        return HistoryStrategy()
+    if name == "last_n":
+        return KeepLastN(keep_last=keep_last)
+    if name == "token_window":
+        return TokenBudgetWindow(max_tokens=max_tokens)
+    if name == "summary":
+        return RollingSummary(summarizer=summarizer, keep_last=keep_last)
+
+    raise ValueError(f"Unknown history strategy: {name}")
@@ -0,0 +1,208 @@
+"""
+Speculative question prefetching for Mock Interview Chatbot.
+Generates upcoming questions in the background while the candidate is answering.
+"""
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+import threading
+
+
+class PrefetchPolicy:
+    """Per-session policy controlling how far ahead questions are prefetched."""
+
+    def __init__(self, depth: int = 0, independent_questions: int = 3):
+        """
+        Initialize the policy.
+
+        Args:
+            depth: How many upcoming questions to generate ahead (0 disables prefetching)
+            independent_questions: Highest question number that may be served from
+                a prefetched question; later questions follow up on the answers
+        """
+        self.depth = depth
+        self.independent_questions = independent_questions
+
+    @property
+    def enabled(self) -> bool:
+        """Whether prefetching is turned on."""
+        return self.depth > 0
+
+    def numbers_to_prefetch(self, next_number: int) -> List[int]:
+        """
+        Get the question numbers to generate ahead of time.
+
+        Args:
+            next_number: The number of the question that will be asked next
+
+        Returns:
+            Question numbers within the lookahead depth that do not depend on answers
+        """
+        last = min(next_number + self.depth - 1, self.independent_questions)
+        return list(range(next_number, last + 1))
+
+
+class QuestionPrefetcher:
+    """Runs speculative question generation on a background thread and tracks hit rate."""
+
+    def __init__(
+        self,
+        generate: Callable[[str, str, int, List[str]], str],
+        policy: Optional[PrefetchPolicy] = None
+    ):
+        """
+        Initialize the prefetcher.
+
+        Args:
+            generate: Function taking (role_name, role_description, question_number,
+                previous_questions) and returning a question
+            policy: Prefetch policy (default: prefetching disabled)
+        """
+        self.generate = generate
+        self.policy = policy or PrefetchPolicy()
+
+        self._executor = None
+        self._futures: Dict[int, Future] = {}
+        self._lock = threading.Lock()
+
+        self.scheduled = 0
+        self.hits = 0
+        self.misses = 0
+        self.wasted = 0
+
+    def schedule(
+        self,
+        role_name: str,
+        role_description: str,
+        asked_questions: List[str],
+        next_number: int
+    ):
+        """
+        Queue speculative questions after the ones already asked.
+
+        Questions are generated one after another on a single worker, each one
+        seeing the previously asked and prefetched questions so they don't repeat.
+
+        Args:
+            role_name: The role name
+            role_description: The role description for custom roles
+            asked_questions: Questions asked so far in this session
+            next_number: The number of the question that will be asked next
+        """
+        if not self.policy.enabled:
+            return
+
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="question-prefetch")
+
+            previous = None
+            for number in self.policy.numbers_to_prefetch(next_number):
+                if number in self._futures:
+                    previous = self._futures[number]
+                    continue
+
+                future = self._executor.submit(
+                    self._generate_after,
+                    previous,
+                    role_name,
+                    role_description,
+                    number,
+                    list(asked_questions)
+                )
+                self._futures[number] = future
+                self.scheduled += 1
+                previous = future
+
+    def _generate_after(
+        self,
+        previous: Optional[Future],
+        role_name: str,
+        role_description: str,
+        question_number: int,
+        asked_questions: List[str]
+    ) -> str:
+        """Generate a question once the previous speculative question is known."""
+        if previous is not None:
+            try:
+                asked_questions.append(previous.result())
+            except Exception:
+                pass
+        return self.generate(role_name, role_description, question_number, asked_questions)
+
+    def take(self, question_number: int) -> Optional[str]:
+        """
+        Claim the prefetched question for a question number.
+
+        Waits for an in-flight generation to finish, since that is never slower
+        than starting a new one.
+
+        Args:
+            question_number: The number of the question about to be asked
+
+        Returns:
+            The prefetched question, or None if there is none to reuse
+        """
+        if not self.policy.enabled or question_number > self.policy.independent_questions:
+            return None
+
+        with self._lock:
+            future = self._futures.pop(question_number, None)
+            # Prefetches for earlier numbers can no longer be used
+            for number in [n for n in self._futures if n < question_number]:
+                self._discard(self._futures.pop(number))
+
+        question = None
+        if future is not None:
+            try:
+                question = future.result()
+            except Exception:
+                question = None
+
+        if question:
+            self.hits += 1
+        else:
+            self.misses += 1
+
+        return question or None
+
+    def cancel(self):
+        """Drop all outstanding prefetches, e.g. when the session is reset."""
+        with self._lock:
+            for future in self._futures.values():
+                self._discard(future)
+            self._futures.clear()
+
+    def _discard(self, future: Future):
+        """Cancel a pending prefetch or count a finished one as wasted."""
+        if not future.cancel():
+            self.wasted += 1
+
+    def shutdown(self):
+        """Cancel outstanding prefetches and stop the worker thread."""
+        self.cancel()
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of prefetch-eligible questions served from a prefetch."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def get_stats(self) -> Dict[str, any]:
+        """
+        Get prefetch statistics.
+
+        Returns:
+            Dictionary containing scheduled, hit, miss and wasted counts and the hit rate
+        """
+        return {
+            "scheduled": self.scheduled,
+            "hits": self.hits,
+            "misses": self.misses,
+            "wasted": self.wasted,
+            "hit_rate": round(self.hit_rate, 3)
+        }
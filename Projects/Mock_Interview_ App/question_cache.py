@@ -0,0 +1,266 @@
+"""
+Persistent question cache for Mock Interview Chatbot.
+Stores pools of generated opening questions in SQLite so new sessions start instantly.
+
+Warm the cache for all predefined roles with:
+    python question_cache.py warm
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+import argparse
+import hashlib
+import random
+import sqlite3
+import threading
+import time
+
+
+class QuestionCache:
+    """Disk-backed pool of questions keyed by role, question number and model settings."""
+
+    def __init__(
+        self,
+        path: str = "question_cache.db",
+        pool_size: int = 5,
+        ttl_seconds: float = 7 * 24 * 3600,
+        max_entries: int = 5000
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            path: SQLite database file (":memory:" for a throwaway cache)
+            pool_size: Number of question variants collected per key before serving them
+            ttl_seconds: Age after which a cached question expires
+            max_entries: Maximum number of stored questions; least recently used are evicted
+        """
+        self.path = path
+        self.pool_size = pool_size
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS questions (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                cache_key TEXT NOT NULL,
+                question TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_used REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_questions_key ON questions (cache_key)")
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(
+        role_name: str,
+        role_description: str,
+        question_number: int,
+        model_name: str,
+        temperature: float
+    ) -> str:
+        """
+        Build the cache key for a question.
+
+        Args:
+            role_name: The role name
+            role_description: The role description for custom roles
+            question_number: The question number
+            model_name: Name of the model that generates the question
+            temperature: Sampling temperature, bucketed to one decimal
+
+        Returns:
+            The cache key
+        """
+        description_hash = hashlib.sha256(role_description.strip().encode("utf-8")).hexdigest()[:16]
+        return "|".join([
+            role_name.strip().lower(),
+            description_hash,
+            str(question_number),
+            model_name,
+            f"{round(temperature, 1):.1f}"
+        ])
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Get a random question from the pool for a key.
+
+        Questions are only served once the pool is full, so sessions stay varied.
+
+        Args:
+            key: Cache key from make_key
+
+        Returns:
+            A cached question, or None on a miss
+        """
+        now = time.time()
+
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, question FROM questions WHERE cache_key = ? AND created_at >= ?",
+                (key, now - self.ttl_seconds)
+            ).fetchall()
+
+            if len(rows) < self.pool_size:
+                self.misses += 1
+                return None
+
+            row_id, question = random.choice(rows)
+            self._conn.execute("UPDATE questions SET last_used = ? WHERE id = ?", (now, row_id))
+            self._conn.commit()
+            self.hits += 1
+
+        return question
+
+    def pool_count(self, key: str) -> int:
+        """Return the number of live questions stored for a key."""
+        with self._lock:
+            (count,) = self._conn.execute(
+                "SELECT COUNT(*) FROM questions WHERE cache_key = ? AND created_at >= ?",
+                (key, time.time() - self.ttl_seconds)
+            ).fetchone()
+        return count
+
+    def add(self, key: str, question: str):
+        """
+        Add a generated question to the pool for a key.
+
+        Args:
+            key: Cache key from make_key
+            question: The generated question
+        """
+        now = time.time()
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO questions (cache_key, question, created_at, last_used) VALUES (?, ?, ?, ?)",
+                (key, question, now, now)
+            )
+            self._evict(now)
+            self._conn.commit()
+
+    def _evict(self, now: float):
+        """Drop expired questions, then least recently used ones above max_entries."""
+        self._conn.execute("DELETE FROM questions WHERE created_at < ?", (now - self.ttl_seconds,))
+        self._conn.execute("""
+            DELETE FROM questions WHERE id IN (
+                SELECT id FROM questions ORDER BY last_used DESC LIMIT -1 OFFSET ?
+            )
+        """, (self.max_entries,))
+
+    def clear(self):
+        """Remove all cached questions."""
+        with self._lock:
+            self._conn.execute("DELETE FROM questions")
+            self._conn.commit()
+
+    def get_stats(self) -> Dict[str, any]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dictionary containing entry and key counts, hits, misses and hit rate
+        """
+        with self._lock:
+            entries, keys = self._conn.execute(
+                "SELECT COUNT(*), COUNT(DISTINCT cache_key) FROM questions"
+            ).fetchone()
+
+        total = self.hits + self.misses
+        return {
+            "entries": entries,
+            "keys": keys,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0
+        }
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+
+def warm_up(bot, cache: QuestionCache, roles: List[str], max_workers: int = 4) -> int:
+    """
+    Fill the opening-question pool for each role.
+
+    Args:
+        bot: InterviewBot whose question chain and model settings are used
+        cache: The question cache to fill
+        roles: Roles to warm, optionally formatted as "name - description"
+        max_workers: Number of concurrent LLM calls
+
+    Returns:
+        Number of questions generated
+    """
+    jobs = []
+    for role in roles:
+        role_name, role_description = bot._split_role(role)
+        key = cache.make_key(role_name, role_description, 1, bot.model_name, bot.temperature)
+        missing = cache.pool_size - cache.pool_count(key)
+        jobs.extend([(key, role_name, role_description)] * max(missing, 0))
+
+    def generate(job):
+        key, role_name, role_description = job
+        response = bot.question_chain.invoke({
+            "role": role_name,
+            "role_description": role_description,
+            "question_number": 1,
+            "chat_history": []
+        })
+        cache.add(key, response.content)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        list(executor.map(generate, jobs))
+
+    return len(jobs)
+
+
+def main():
+    """Command line interface for warming and inspecting the question cache."""
+    from backend import InterviewBot
+    from config import Config
+
+    parser = argparse.ArgumentParser(description="Manage the Mock Interview question cache.")
+    parser.add_argument("command", choices=["warm", "stats", "clear"])
+    parser.add_argument("--roles", nargs="*", help="Roles to warm (default: all predefined roles)")
+    parser.add_argument("--workers", type=int, default=4, help="Concurrent LLM calls while warming")
+    args = parser.parse_args()
+
+    cache = QuestionCache(
+        path=Config.QUESTION_CACHE_PATH,
+        pool_size=Config.QUESTION_CACHE_POOL_SIZE,
+        ttl_seconds=Config.QUESTION_CACHE_TTL_HOURS * 3600,
+        max_entries=Config.QUESTION_CACHE_MAX_ENTRIES
+    )
+
+    if args.command == "warm":
+        is_valid, error_msg = Config.validate_config()
+        if not is_valid:
+            parser.error(error_msg)
+
+        bot = InterviewBot(
+            api_key=Config.OPENAI_API_KEY,
+            model_name=Config.MODEL_NAME,
+            temperature=Config.TEMPERATURE
+        )
+        generated = warm_up(bot, cache, args.roles or Config.get_roles(), max_workers=args.workers)
+        print(f"Generated {generated} questions.")
+    elif args.command == "clear":
+        cache.clear()
+        print("Question cache cleared.")
+
+    print(cache.get_stats())
+    cache.close()
+
+
+if __name__ == "__main__":
+    main()
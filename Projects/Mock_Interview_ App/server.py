@@ -0,0 +1,204 @@
+"""
+Headless HTTP API for Mock Interview Chatbot.
+Serves the interview engine over ASGI so it can be driven and load-tested without Streamlit.
+
+Run with:
+    python server.py --port 8000
+
+Endpoints:
+    POST   /sessions                  {"role": ...} -> {"session_id", "message", "question"}
+    POST   /sessions/{id}/answer      {"answer": ...} -> {"feedback", "next_question"}
+    POST   /sessions/{id}/stream      {"answer": ...} -> Server-Sent Events
+    DELETE /sessions/{id}             Reset (end) the session
+    GET    /sessions/{id}/stats       Session statistics
+    GET    /stats                     Session manager statistics
+    GET    /metrics                   Per-chain LLM metrics (Prometheus text, or ?format=jsonl)
+    GET    /health                    Liveness check
+"""
+
+from typing import AsyncIterator, Optional, Tuple
+import argparse
+import asyncio
+import json
+import os
+import sys
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from starlette.routing import Route
+
+from session_manager import (
+    SessionManager,
+    SessionNotFoundError,
+    create_question_cache,
+    create_session_manager
+)
+
+# Make the shared helpers in Projects/common importable
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from common.instrumentation import get_metrics
+
+
+async def read_field(request: Request, field: str) -> Tuple[Optional[str], Optional[JSONResponse]]:
+    """
+    Read a required, non-empty string field from a JSON request body.
+
+    Args:
+        request: The incoming request
+        field: Name of the field to read
+
+    Returns:
+        Tuple of (value, None) or (None, error response)
+    """
+    try:
+        body = await request.json()
+    except ValueError:
+        return None, JSONResponse({"error": "Request body must be JSON."}, status_code=400)
+
+    value = body.get(field) if isinstance(body, dict) else None
+    if not isinstance(value, str) or not value.strip():
+        return None, JSONResponse({"error": f"'{field}' is required."}, status_code=400)
+
+    return value.strip(), None
+
+
+def session_not_found(session_id: str) -> JSONResponse:
+    """Build the response for an unknown session."""
+    return JSONResponse({"error": f"Session {session_id} not found."}, status_code=404)
+
+
+def format_event(event: str, data: dict) -> str:
+    """Format a Server-Sent Event."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def create_app(manager: Optional[SessionManager] = None) -> Starlette:
+    """
+    Build the ASGI application.
+
+    Args:
+        manager: Session manager to serve (default: one built from Config)
+
+    Returns:
+        The Starlette application
+    """
+    if manager is None:
+        manager = create_session_manager(create_question_cache())
+
+    async def start(request: Request) -> JSONResponse:
+        role, error = await read_field(request, "role")
+        if error:
+            return error
+
+        session_id, welcome_message = await manager.acreate_session(role)
+        return JSONResponse({
+            "session_id": session_id,
+            "message": welcome_message,
+            "question": manager.get_current_question(session_id)
+        }, status_code=201)
+
+    async def answer(request: Request) -> JSONResponse:
+        session_id = request.path_params["session_id"]
+        text, error = await read_field(request, "answer")
+        if error:
+            return error
+
+        try:
+            result = await manager.aanswer(session_id, text)
+        except SessionNotFoundError:
+            return session_not_found(session_id)
+
+        return JSONResponse(result)
+
+    async def stream(request: Request):
+        session_id = request.path_params["session_id"]
+        text, error = await read_field(request, "answer")
+        if error:
+            return error
+
+        tokens = manager.astream_answer(session_id, text)
+
+        # Resolve the session before committing to a 200 streaming response
+        try:
+            first = await tokens.__anext__()
+        except SessionNotFoundError:
+            return session_not_found(session_id)
+        except StopAsyncIteration:
+            first = None
+
+        async def events() -> AsyncIterator[str]:
+            try:
+                if first is not None:
+                    yield format_event(first[0], {"token": first[1]})
+                async for section, token in tokens:
+                    yield format_event(section, {"token": token})
+                yield format_event("done", {"next_question": manager.get_current_question(session_id)})
+            except Exception as e:
+                yield format_event("error", {"error": str(e)})
+            finally:
+                await tokens.aclose()
+
+        return StreamingResponse(
+            events(),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+        )
+
+    async def reset(request: Request) -> JSONResponse:
+        session_id = request.path_params["session_id"]
+        await asyncio.to_thread(manager.end_session, session_id)
+        return JSONResponse({"session_id": session_id, "status": "ended"})
+
+    async def session_stats(request: Request) -> JSONResponse:
+        session_id = request.path_params["session_id"]
+        try:
+            stats = await asyncio.to_thread(manager.get_session_stats, session_id)
+        except SessionNotFoundError:
+            return session_not_found(session_id)
+        return JSONResponse(stats)
+
+    async def stats(request: Request) -> JSONResponse:
+        return JSONResponse(await asyncio.to_thread(manager.get_stats))
+
+    async def metrics(request: Request) -> PlainTextResponse:
+        if request.query_params.get("format") == "jsonl":
+            return PlainTextResponse(get_metrics().to_jsonl(), media_type="application/x-ndjson")
+        return PlainTextResponse(get_metrics().to_prometheus(), media_type="text/plain; version=0.0.4")
+
+    async def health(request: Request) -> JSONResponse:
+        return JSONResponse({"status": "ok"})
+
+    app = Starlette(routes=[
+        Route("/sessions", start, methods=["POST"]),
+        Route("/sessions/{session_id}/answer", answer, methods=["POST"]),
+        Route("/sessions/{session_id}/stream", stream, methods=["POST"]),
+        Route("/sessions/{session_id}", reset, methods=["DELETE"]),
+        Route("/sessions/{session_id}/stats", session_stats, methods=["GET"]),
+        Route("/stats", stats, methods=["GET"]),
+        Route("/metrics", metrics, methods=["GET"]),
+        Route("/health", health, methods=["GET"])
+    ])
+    app.state.manager = manager
+    return app
+
+
+def main():
+    """Run the API with uvicorn."""
+    import uvicorn
+    from config import Config
+
+    parser = argparse.ArgumentParser(description="Serve the Mock Interview engine over HTTP.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    args = parser.parse_args()
+
+    is_valid, error_msg = Config.validate_config()
+    if not is_valid:
+        parser.error(error_msg)
+
+    uvicorn.run(create_app(), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,709 @@
+"""
+Session manager for Mock Interview Chatbot.
+Hosts many interview sessions in one process with bounded memory.
+
+Sessions live in one of three tiers:
+- active: attached to an InterviewBot (recently used, prefetching works)
+- compact: an InterviewSession record holding a compressed history
+- disk: the compact record written to spill_dir
+"""
+
+from collections import OrderedDict
+from contextlib import asynccontextmanager, contextmanager
+from datetime import datetime
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional, Tuple
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+import uuid
+import zlib
+
+from backend import InterviewBot
+from config import Config
+from history import create_history_strategy
+from prefetch import PrefetchPolicy
+from question_cache import QuestionCache
+
+# Make the shared helpers in Projects/common importable
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from common.llm_pool import get_chat_model
+
+
+class SessionNotFoundError(KeyError):
+    """Raised when a session id is unknown or has been deleted."""
+
+
+def compress_history(state: Dict[str, Any]) -> bytes:
+    """
+    Compress the messages and history strategy state of an InterviewBot state.
+
+    Args:
+        state: Dictionary returned by InterviewBot.export_state
+
+    Returns:
+        zlib-compressed JSON document
+    """
+    history = {"messages": state["messages"], "history": state.get("history", {})}
+    return zlib.compress(json.dumps(history).encode("utf-8"))
+
+
+class InterviewSession:
+    """Compact record of one interview session."""
+
+    __slots__ = (
+        "session_id",
+        "role",
+        "question_count",
+        "start_time",
+        "current_question",
+        "history_blob",
+        "last_access",
+        "bot"
+    )
+
+    def __init__(self, session_id: str):
+        """
+        Initialize an empty session record.
+
+        Args:
+            session_id: Unique session identifier
+        """
+        self.session_id = session_id
+        self.role = None
+        self.question_count = 0
+        self.start_time = None
+        self.current_question = ""
+        self.history_blob = b""
+        self.last_access = time.time()
+        self.bot = None
+
+    def store_state(self, state: Dict[str, any]):
+        """
+        Store an InterviewBot state, compressing the message history and
+        the history strategy state.
+
+        Args:
+            state: Dictionary returned by InterviewBot.export_state
+        """
+        self.role = state["role"]
+        self.question_count = state["question_count"]
+        self.start_time = state["start_time"]
+        self.history_blob = compress_history(state)
+
+    def load_state(self) -> Dict[str, any]:
+        """
+        Rebuild the InterviewBot state stored in this record.
+
+        Returns:
+            Dictionary accepted by InterviewBot.load_state
+        """
+        history = json.loads(zlib.decompress(self.history_blob)) if self.history_blob else {}
+        return {
+            "role": self.role,
+            "question_count": self.question_count,
+            "start_time": self.start_time,
+            "messages": history.get("messages", []),
+            "history": history.get("history", {})
+        }
+
+    def size_bytes(self) -> int:
+        """Approximate memory held by this record (excluding an attached bot)."""
+        size = sys.getsizeof(self) + sys.getsizeof(self.history_blob)
+        for value in (self.session_id, self.role, self.start_time, self.current_question):
+            if value is not None:
+                size += sys.getsizeof(value)
+        return size
+
+    def to_bytes(self) -> bytes:
+        """Serialize the record for spilling to disk."""
+        header = json.dumps({
+            "session_id": self.session_id,
+            "role": self.role,
+            "question_count": self.question_count,
+            "start_time": self.start_time,
+            "current_question": self.current_question,
+            "last_access": self.last_access
+        }).encode("utf-8")
+        return header + b"\n" + self.history_blob
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "InterviewSession":
+        """Rebuild a record serialized by to_bytes."""
+        header, history_blob = data.split(b"\n", 1)
+        fields = json.loads(header)
+
+        record = cls(fields["session_id"])
+        record.role = fields["role"]
+        record.question_count = fields["question_count"]
+        record.start_time = fields["start_time"]
+        record.current_question = fields["current_question"]
+        record.last_access = fields["last_access"]
+        record.history_blob = history_blob
+        return record
+
+
+class SessionManager:
+    """Stores interview sessions in memory and on disk with LRU eviction."""
+
+    def __init__(
+        self,
+        bot_factory: Callable[[], InterviewBot],
+        max_active_sessions: int = 50,
+        max_memory_bytes: int = 64 * 1024 * 1024,
+        idle_seconds: float = 900,
+        spill_dir: Optional[str] = "sessions"
+    ):
+        """
+        Initialize the session manager.
+
+        Args:
+            bot_factory: Function returning a fresh InterviewBot
+            max_active_sessions: Sessions kept attached to a live InterviewBot
+            max_memory_bytes: Memory budget for compact records before spilling to disk
+            idle_seconds: Inactivity after which a session is moved to disk
+            spill_dir: Directory for spilled sessions (None drops evicted sessions instead)
+        """
+        self.bot_factory = bot_factory
+        self.max_active_sessions = max_active_sessions
+        self.max_memory_bytes = max_memory_bytes
+        self.idle_seconds = idle_seconds
+        self.spill_dir = spill_dir
+
+        if spill_dir:
+            os.makedirs(spill_dir, exist_ok=True)
+
+        self._lock = threading.RLock()
+        self._sessions: "OrderedDict[str, InterviewSession]" = OrderedDict()
+        self._session_locks: Dict[str, threading.Lock] = {}
+        self._last_sweep = time.time()
+        self._idle_bots: List[InterviewBot] = []
+        self._active = 0
+        self._compact_bytes = 0
+
+        self.dehydrations = 0
+        self.spills = 0
+        self.disk_loads = 0
+        self.dropped = 0
+
+    # ------------------------------------------------------------------
+    # Session lifecycle
+    # ------------------------------------------------------------------
+
+    def _new_session(self) -> InterviewSession:
+        """Register an empty session record."""
+        record = InterviewSession(uuid.uuid4().hex)
+
+        with self._lock:
+            self._sessions[record.session_id] = record
+            self._session_locks[record.session_id] = threading.Lock()
+            self._compact_bytes += record.size_bytes()
+
+        return record
+
+    def create_session(self, role: str) -> Tuple[str, str]:
+        """
+        Create a session and start the interview.
+
+        Args:
+            role: The job role/position for the interview (may include description)
+
+        Returns:
+            Tuple of (session_id, welcome message with the first question)
+        """
+        record = self._new_session()
+
+        with self.checkout(record.session_id) as bot:
+            welcome_message = bot.start_interview(role)
+            record.current_question = self._extract_question(welcome_message)
+
+        return record.session_id, welcome_message
+
+    async def acreate_session(self, role: str) -> Tuple[str, str]:
+        """
+        Create a session and start the interview without blocking the event loop.
+
+        Args:
+            role: The job role/position for the interview (may include description)
+
+        Returns:
+            Tuple of (session_id, welcome message with the first question)
+        """
+        record = self._new_session()
+
+        async with self.acheckout(record.session_id) as bot:
+            welcome_message = await bot.astart_interview(role)
+            record.current_question = self._extract_question(welcome_message)
+
+        return record.session_id, welcome_message
+
+    @staticmethod
+    def _extract_question(welcome_message: str) -> str:
+        """Extract the first question from a welcome message."""
+        lines = welcome_message.split("\n")
+        for i, line in enumerate(lines):
+            if "Let's begin" in line and i + 1 < len(lines):
+                return "\n".join(lines[i + 1:]).strip()
+        return welcome_message
+
+    def answer(self, session_id: str, answer: str) -> Dict[str, str]:
+        """
+        Evaluate an answer to the session's current question.
+
+        Args:
+            session_id: The session identifier
+            answer: The user's answer
+
+        Returns:
+            Dictionary containing feedback and the next question
+        """
+        with self.checkout(session_id) as bot:
+            record = self._sessions[session_id]
+            result = bot.evaluate_answer(record.current_question, answer)
+            record.current_question = result["next_question"]
+        return result
+
+    def stream_answer(self, session_id: str, answer: str) -> Iterator[Tuple[str, str]]:
+        """
+        Stream feedback and the next question for the session's current question.
+
+        Args:
+            session_id: The session identifier
+            answer: The user's answer
+
+        Yields:
+            Tuples of (section, token) where section is 'feedback' or 'next_question'
+        """
+        with self.checkout(session_id) as bot:
+            record = self._sessions[session_id]
+            question_parts = []
+            for section, token in bot.stream_evaluation(record.current_question, answer):
+                if section == "next_question":
+                    question_parts.append(token)
+                yield section, token
+            record.current_question = "".join(question_parts)
+
+    async def aanswer(self, session_id: str, answer: str) -> Dict[str, str]:
+        """
+        Evaluate an answer without blocking the event loop.
+
+        Args:
+            session_id: The session identifier
+            answer: The user's answer
+
+        Returns:
+            Dictionary containing feedback and the next question
+        """
+        async with self.acheckout(session_id) as bot:
+            record = self._sessions[session_id]
+            result = await bot.aevaluate_answer(record.current_question, answer)
+            record.current_question = result["next_question"]
+        return result
+
+    async def astream_answer(self, session_id: str, answer: str) -> AsyncIterator[Tuple[str, str]]:
+        """
+        Stream feedback and the next question without blocking the event loop.
+
+        Args:
+            session_id: The session identifier
+            answer: The user's answer
+
+        Yields:
+            Tuples of (section, token) where section is 'feedback' or 'next_question'
+        """
+        async with self.acheckout(session_id) as bot:
+            record = self._sessions[session_id]
+            question_parts = []
+            async for section, token in bot.astream_evaluation(record.current_question, answer):
+                if section == "next_question":
+                    question_parts.append(token)
+                yield section, token
+            record.current_question = "".join(question_parts)
+
+    def get_current_question(self, session_id: str) -> str:
+        """Return the question the session is waiting on."""
+        return self._get_record(session_id).current_question
+
+    def end_session(self, session_id: str):
+        """
+        Delete a session from memory and disk.
+
+        Waits for a request still holding the session, so its bot is not
+        handed to another session mid-request.
+
+        Args:
+            session_id: The session identifier
+        """
+        try:
+            record, session_lock = self._lock_record(session_id)
+        except SessionNotFoundError:
+            return
+
+        try:
+            with self._lock:
+                del self._sessions[session_id]
+                self._session_locks.pop(session_id, None)
+
+                if record.bot is not None:
+                    self._release_bot(record)
+                else:
+                    self._compact_bytes -= record.size_bytes()
+
+            path = self._spill_path(session_id)
+            if path and os.path.exists(path):
+                os.remove(path)
+        finally:
+            session_lock.release()
+
+    # ------------------------------------------------------------------
+    # Bot checkout
+    # ------------------------------------------------------------------
+
+    @contextmanager
+    def checkout(self, session_id: str) -> Iterator[InterviewBot]:
+        """
+        Attach the session to an InterviewBot for the duration of a request.
+
+        Args:
+            session_id: The session identifier
+
+        Yields:
+            An InterviewBot holding the session's state
+        """
+        record, session_lock = self._lock_record(session_id)
+
+        try:
+            yield self._enter(session_id, record)
+        finally:
+            self._leave(record, session_lock)
+
+        self._after_request()
+
+    @asynccontextmanager
+    async def acheckout(self, session_id: str) -> AsyncIterator[InterviewBot]:
+        """
+        Async counterpart of checkout that never blocks the event loop.
+
+        Waiting for a busy session, loading it from disk and spilling other
+        sessions run on worker threads.
+
+        Args:
+            session_id: The session identifier
+
+        Yields:
+            An InterviewBot holding the session's state
+        """
+        record, session_lock = await asyncio.to_thread(self._lock_record, session_id)
+
+        try:
+            yield await asyncio.to_thread(self._enter, session_id, record)
+        finally:
+            self._leave(record, session_lock)
+
+        await asyncio.to_thread(self._after_request)
+
+    def _enter(self, session_id: str, record: InterviewSession) -> InterviewBot:
+        """Attach a locked session to a bot and mark it most recently used."""
+        with self._lock:
+            if record.bot is None:
+                self._attach_bot(record)
+            record.last_access = time.time()
+            self._sessions.move_to_end(session_id)
+            return record.bot
+
+    def _leave(self, record: InterviewSession, session_lock: threading.Lock):
+        """Release a session after a request."""
+        record.last_access = time.time()
+        session_lock.release()
+
+    def _after_request(self):
+        """Apply memory limits and periodically spill idle sessions."""
+        with self._lock:
+            self._enforce_limits()
+
+        if time.time() - self._last_sweep > min(self.idle_seconds, 60):
+            self.spill_idle()
+
+    def _lock_record(self, session_id: str) -> Tuple[InterviewSession, threading.Lock]:
+        """Acquire a session's lock, retrying if the record was spilled meanwhile."""
+        while True:
+            record = self._get_record(session_id)
+            session_lock = self._session_locks.get(session_id)
+            if session_lock is None:
+                raise SessionNotFoundError(session_id)
+
+            session_lock.acquire()
+            with self._lock:
+                if self._sessions.get(session_id) is record:
+                    return record, session_lock
+            session_lock.release()
+
+    def _get_record(self, session_id: str) -> InterviewSession:
+        """Find a session record, loading it from disk if it was spilled."""
+        with self._lock:
+            record = self._sessions.get(session_id)
+            if record is not None:
+                return record
+
+            path = self._spill_path(session_id)
+            if not path or not os.path.exists(path):
+                raise SessionNotFoundError(session_id)
+
+            with open(path, "rb") as f:
+                record = InterviewSession.from_bytes(f.read())
+            os.remove(path)
+
+            self._sessions[session_id] = record
+            self._session_locks.setdefault(session_id, threading.Lock())
+            self._compact_bytes += record.size_bytes()
+            self.disk_loads += 1
+            return record
+
+    def _attach_bot(self, record: InterviewSession):
+        """Rehydrate a compact record into an InterviewBot."""
+        bot = self._idle_bots.pop() if self._idle_bots else self.bot_factory()
+        self._compact_bytes -= record.size_bytes()
+
+        if record.role is not None:
+            bot.load_state(record.load_state())
+
+        record.bot = bot
+        record.history_blob = b""
+        self._active += 1
+
+    def _release_bot(self, record: InterviewSession):
+        """Compact an active session and return its bot to the idle pool."""
+        bot = record.bot
+        if bot.current_role is not None:
+            record.store_state(bot.export_state())
+
+        bot.reset_session()
+        record.bot = None
+        self._active -= 1
+        self._compact_bytes += record.size_bytes()
+
+        if len(self._idle_bots) < self.max_active_sessions:
+            self._idle_bots.append(bot)
+
+    # ------------------------------------------------------------------
+    # Eviction
+    # ------------------------------------------------------------------
+
+    def _spill_path(self, session_id: str) -> Optional[str]:
+        """Return the file used to spill a session, if spilling is enabled."""
+        if not self.spill_dir:
+            return None
+        return os.path.join(self.spill_dir, f"{session_id}.session")
+
+    def _is_busy(self, session_id: str) -> bool:
+        """Check whether a request currently holds the session."""
+        session_lock = self._session_locks.get(session_id)
+        if session_lock is None or not session_lock.acquire(blocking=False):
+            return True
+        session_lock.release()
+        return False
+
+    def _spill(self, session_id: str):
+        """Move a compact record out of memory, to disk if enabled."""
+        record = self._sessions.pop(session_id)
+        self._compact_bytes -= record.size_bytes()
+
+        path = self._spill_path(session_id)
+        if path:
+            with open(path, "wb") as f:
+                f.write(record.to_bytes())
+            self.spills += 1
+        else:
+            self._session_locks.pop(session_id, None)
+            self.dropped += 1
+
+    def _enforce_limits(self):
+        """Dehydrate and spill least recently used sessions until within limits."""
+        # Oldest first: OrderedDict keeps sessions in least recently used order
+        for session_id, record in list(self._sessions.items()):
+            if self._active <= self.max_active_sessions:
+                break
+            if record.bot is not None and not self._is_busy(session_id):
+                self._release_bot(record)
+                self.dehydrations += 1
+
+        for session_id, record in list(self._sessions.items()):
+            if self._compact_bytes <= self.max_memory_bytes:
+                break
+            if record.bot is None and not self._is_busy(session_id):
+                self._spill(session_id)
+
+    def spill_idle(self, now: Optional[float] = None) -> int:
+        """
+        Move sessions that have been idle longer than idle_seconds out of memory.
+
+        Args:
+            now: Current timestamp (default: time.time())
+
+        Returns:
+            Number of sessions moved out of memory
+        """
+        now = now or time.time()
+        moved = 0
+        self._last_sweep = now
+
+        with self._lock:
+            for session_id, record in list(self._sessions.items()):
+                if now - record.last_access < self.idle_seconds or self._is_busy(session_id):
+                    continue
+                if record.bot is not None:
+                    self._release_bot(record)
+                    self.dehydrations += 1
+                self._spill(session_id)
+                moved += 1
+
+        return moved
+
+    # ------------------------------------------------------------------
+    # Statistics
+    # ------------------------------------------------------------------
+
+    def memory_usage(self, session_id: str) -> int:
+        """
+        Estimate the memory held by a session.
+
+        Active sessions are measured by the size of their compacted state.
+
+        Args:
+            session_id: The session identifier
+
+        Returns:
+            Approximate size in bytes (0 for sessions spilled to disk)
+        """
+        with self._lock:
+            record = self._sessions.get(session_id)
+            if record is None:
+                return 0
+            if record.bot is None:
+                return record.size_bytes()
+
+            return record.size_bytes() + sys.getsizeof(compress_history(record.bot.export_state()))
+
+    def get_session_stats(self, session_id: str) -> Dict[str, any]:
+        """
+        Get statistics about one session.
+
+        Args:
+            session_id: The session identifier
+
+        Returns:
+            Dictionary containing InterviewBot session statistics and memory usage
+        """
+        record = self._get_record(session_id)
+
+        with self._lock:
+            if record.bot is not None:
+                stats = record.bot.get_session_stats()
+            else:
+                # Compact sessions are summarized without rehydrating a bot
+                elapsed_time = None
+                if record.start_time:
+                    elapsed_time = int(time.time() - datetime.fromisoformat(record.start_time).timestamp()) // 60
+                stats = {
+                    "role": record.role,
+                    "questions_asked": record.question_count,
+                    "elapsed_minutes": elapsed_time,
+                    "history_tokens_saved": 0,
+                    "prefetch_hit_rate": 0.0
+                }
+
+        stats["memory_bytes"] = self.memory_usage(session_id)
+        return stats
+
+    def get_stats(self) -> Dict[str, any]:
+        """
+        Get statistics about all sessions.
+
+        Returns:
+            Dictionary containing session counts per tier, memory use and eviction counters
+        """
+        with self._lock:
+            in_memory = len(self._sessions)
+            on_disk = 0
+            if self.spill_dir and os.path.isdir(self.spill_dir):
+                on_disk = sum(1 for name in os.listdir(self.spill_dir) if name.endswith(".session"))
+
+            return {
+                "active_sessions": self._active,
+                "compact_sessions": in_memory - self._active,
+                "disk_sessions": on_disk,
+                "compact_memory_bytes": self._compact_bytes,
+                "avg_compact_bytes": self._compact_bytes // max(in_memory - self._active, 1),
+                "idle_bots": len(self._idle_bots),
+                "dehydrations": self.dehydrations,
+                "spills": self.spills,
+                "disk_loads": self.disk_loads,
+                "dropped": self.dropped
+            }
+
+
+def create_question_cache() -> Optional[QuestionCache]:
+    """Open the question cache configured in Config, if enabled."""
+    if not Config.QUESTION_CACHE_ENABLED:
+        return None
+
+    return QuestionCache(
+        path=Config.QUESTION_CACHE_PATH,
+        pool_size=Config.QUESTION_CACHE_POOL_SIZE,
+        ttl_seconds=Config.QUESTION_CACHE_TTL_HOURS * 3600,
+        max_entries=Config.QUESTION_CACHE_MAX_ENTRIES
+    )
+
+
+def create_interview_bot(question_cache: Optional[QuestionCache] = None) -> InterviewBot:
+    """
+    Build an InterviewBot with the configured strategies and shared resources.
+
+    Args:
+        question_cache: Question cache shared by all bots (default: none)
+
+    Returns:
+        A new InterviewBot using the pooled chat model
+    """
+    return InterviewBot(
+        api_key=Config.OPENAI_API_KEY,
+        model_name=Config.MODEL_NAME,
+        temperature=Config.TEMPERATURE,
+        history_strategy=create_history_strategy(
+            Config.HISTORY_STRATEGY,
+            max_tokens=Config.HISTORY_MAX_TOKENS,
+            keep_last=Config.HISTORY_KEEP_LAST
+        ),
+        prefetch_policy=PrefetchPolicy(
+            depth=Config.PREFETCH_DEPTH,
+            independent_questions=Config.PREFETCH_INDEPENDENT_QUESTIONS
+        ),
+        question_cache=question_cache,
+        llm=get_chat_model(
+            model=Config.MODEL_NAME,
+            temperature=Config.TEMPERATURE,
+            api_key=Config.OPENAI_API_KEY,
+            base_url=Config.OPENAI_BASE_URL or None
+        )
+    )
+
+
+def create_session_manager(question_cache: Optional[QuestionCache] = None) -> SessionManager:
+    """
+    Build a SessionManager from the SESSION_* settings in Config.
+
+    Args:
+        question_cache: Question cache shared by all bots (default: none)
+
+    Returns:
+        A SessionManager creating bots with create_interview_bot
+    """
+    return SessionManager(
+        bot_factory=lambda: create_interview_bot(question_cache),
+        max_active_sessions=Config.SESSION_MAX_ACTIVE,
+        max_memory_bytes=Config.SESSION_MAX_MEMORY_MB * 1024 * 1024,
+        idle_seconds=Config.SESSION_IDLE_SECONDS,
+        spill_dir=Config.SESSION_SPILL_DIR or None
+    )
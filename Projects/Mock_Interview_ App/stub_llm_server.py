@@ -0,0 +1,114 @@
+"""
+Stub OpenAI-compatible chat completions server for load-testing the interview API.
+Answers every request with canned text after a configurable latency, without calling OpenAI.
+
+Run with:
+    python stub_llm_server.py --port 9000 --latency 0.5 --tokens-per-second 50
+
+Then point the app at it with OPENAI_BASE_URL=http://127.0.0.1:9000/v1.
+"""
+
+from typing import AsyncIterator
+import argparse
+import asyncio
+import json
+import time
+import uuid
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, StreamingResponse
+from starlette.routing import Route
+
+
+DEFAULT_REPLY = (
+    "Thanks, that is a solid answer. Can you walk me through a recent project "
+    "where you had to make a difficult technical trade-off?"
+)
+
+
+def create_app(latency: float = 0.5, tokens_per_second: float = 50, reply: str = DEFAULT_REPLY) -> Starlette:
+    """
+    Build the stub server.
+
+    Args:
+        latency: Seconds before the first token is sent
+        tokens_per_second: Streaming rate after the first token (0 sends everything at once)
+        reply: Text returned for every completion
+
+    Returns:
+        The Starlette application
+    """
+    tokens = [word + " " for word in reply.split()]
+    tokens[-1] = tokens[-1].rstrip()
+    usage = {"prompt_tokens": 0, "completion_tokens": len(tokens), "total_tokens": len(tokens)}
+
+    def completion(body: dict, **fields) -> dict:
+        return {
+            "id": f"chatcmpl-{uuid.uuid4().hex}",
+            "created": int(time.time()),
+            "model": body.get("model", "stub"),
+            **fields
+        }
+
+    async def chat_completions(request: Request):
+        body = await request.json()
+        await asyncio.sleep(latency)
+
+        if not body.get("stream"):
+            return JSONResponse(completion(
+                body,
+                object="chat.completion",
+                choices=[{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": reply},
+                    "finish_reason": "stop"
+                }],
+                usage=usage
+            ))
+
+        async def events() -> AsyncIterator[str]:
+            for i, token in enumerate(tokens):
+                if i and tokens_per_second:
+                    await asyncio.sleep(1 / tokens_per_second)
+                chunk = completion(
+                    body,
+                    object="chat.completion.chunk",
+                    choices=[{"index": 0, "delta": {"content": token}, "finish_reason": None}]
+                )
+                yield f"data: {json.dumps(chunk)}\n\n"
+
+            chunk = completion(
+                body,
+                object="chat.completion.chunk",
+                choices=[{"index": 0, "delta": {}, "finish_reason": "stop"}]
+            )
+            yield f"data: {json.dumps(chunk)}\n\n"
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    return Starlette(routes=[Route("/v1/chat/completions", chat_completions, methods=["POST"])])
+
+
+def main():
+    """Run the stub server with uvicorn."""
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Serve canned chat completions for load tests.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9000)
+    parser.add_argument("--latency", type=float, default=0.5, help="Seconds before the first token")
+    parser.add_argument("--tokens-per-second", type=float, default=50, help="Streaming rate (0 for no delay)")
+    args = parser.parse_args()
+
+    uvicorn.run(
+        create_app(latency=args.latency, tokens_per_second=args.tokens_per_second),
+        host=args.host,
+        port=args.port,
+        log_level="warning"
+    )
+
+
+if __name__ == "__main__":
+    main()
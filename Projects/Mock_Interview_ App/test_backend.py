@@ -3,9 +3,36 @@ Basic tests for the Mock Interview Chatbot backend.
 Note: These tests use mocked LLM responses to avoid API calls.
 """
 
+import asyncio
+import time
+
 import pytest
 from unittest.mock import Mock, patch, MagicMock
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.runnables import RunnableLambda
 from backend import InterviewBot
+from history import KeepLastN, RollingSummary
+
+
+STUB_LATENCY = 0.3
+
+
+def make_slow_llm(latency: float = STUB_LATENCY):
+    """Build a stub chat model that sleeps like a real LLM round trip."""
+    def respond(prompt_value):
+        time.sleep(latency)
+        if "evaluate this answer" in prompt_value.to_string():
+            return AIMessage(content="Good answer.")
+        return AIMessage(content="Describe a project you are proud of.")
+    
+    async def arespond(prompt_value):
+        await asyncio.sleep(latency)
+        if "evaluate this answer" in prompt_value.to_string():
+            return AIMessage(content="Good answer.")
+        return AIMessage(content="Describe a project you are proud of.")
+    
+    return RunnableLambda(respond, afunc=arespond)
 
 
 class TestInterviewBot:
@@ -68,6 +95,93 @@ class TestInterviewBot:
         assert stats["questions_asked"] == 3
         assert "elapsed_minutes" in stats
 
+    
+    @patch('backend.ChatOpenAI')
+    def test_evaluate_answer_runs_chains_concurrently(self, mock_chat_openai):
+        """Test that feedback and the next question overlap instead of running back to back."""
+        mock_chat_openai.return_value = make_slow_llm()
+        
+        bot = InterviewBot(api_key="test_key")
+        bot.current_role = "Software Engineer"
+        bot.question_count = 1
+        
+        start = time.perf_counter()
+        result = bot.evaluate_answer("What is Python?", "A programming language.")
+        elapsed = time.perf_counter() - start
+        
+        assert result == {
+            "feedback": "Good answer.",
+            "next_question": "Describe a project you are proud of."
+        }
+        assert elapsed < 2 * STUB_LATENCY
+        assert bot.question_count == 2
+        assert bot.get_conversation_history()[-1]["content"] == result["next_question"]
+    
+    @patch('backend.ChatOpenAI')
+    def test_aevaluate_answer_runs_chains_concurrently(self, mock_chat_openai):
+        """Test the async evaluation path returns the same result shape concurrently."""
+        mock_chat_openai.return_value = make_slow_llm()
+        
+        bot = InterviewBot(api_key="test_key")
+        bot.current_role = "Data Scientist - Build forecasting models"
+        
+        start = time.perf_counter()
+        result = asyncio.run(bot.aevaluate_answer("What is overfitting?", "Memorizing noise."))
+        elapsed = time.perf_counter() - start
+        
+        assert set(result) == {"feedback", "next_question"}
+        assert result["feedback"] == "Good answer."
+        assert elapsed < 2 * STUB_LATENCY
+        assert [m["role"] for m in bot.get_conversation_history()] == ["user", "assistant"]
+
+    
+    @patch('backend.ChatOpenAI')
+    def test_stream_evaluation_yields_feedback_then_question(self, mock_chat_openai):
+        """Test that streaming yields feedback tokens before next-question tokens."""
+        mock_chat_openai.return_value = FakeListChatModel(responses=["Solid answer.", "What is a closure?"])
+        
+        bot = InterviewBot(api_key="test_key")
+        bot.current_role = "Software Engineer"
+        bot.question_count = 1
+        
+        chunks = list(bot.stream_evaluation("What is Python?", "A programming language."))
+        sections = [section for section, _ in chunks]
+        
+        assert sections == sorted(sections, key=["feedback", "next_question"].index)
+        assert "".join(t for s, t in chunks if s == "feedback") == "Solid answer."
+        assert "".join(t for s, t in chunks if s == "next_question") == "What is a closure?"
+        assert bot.question_count == 2
+        assert bot.get_conversation_history()[-1]["content"] == "What is a closure?"
+
+    
+    @patch('backend.ChatOpenAI')
+    def test_history_strategy_bounds_question_context(self, mock_chat_openai):
+        """Test that generate_question only sends the history chosen by the strategy."""
+        seen_histories = []
+        
+        def respond(prompt_value):
+            seen_histories.append(prompt_value.to_messages())
+            return AIMessage(content="Next question?")
+        
+        mock_chat_openai.return_value = RunnableLambda(respond)
+        
+        bot = InterviewBot(api_key="test_key", history_strategy=KeepLastN(keep_last=2))
+        bot.start_interview("Software Engineer")
+        for i in range(3):
+            bot.chat_history.add_user_message(f"Answer {i}")
+            bot.generate_question()
+        
+        # System prompt + 2 history messages + human instruction
+        assert len(seen_histories[-1]) == 4
+        assert bot.get_session_stats()["history_tokens_saved"] > 0
+    
+    @patch('backend.ChatOpenAI')
+    def test_summary_strategy_uses_bot_llm(self, mock_chat_openai):
+        """Test that a rolling summary without a summarizer is bound to the bot's LLM."""
+        bot = InterviewBot(api_key="test_key", history_strategy=RollingSummary())
+        
+        assert bot.history_strategy.summarizer is not None
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -0,0 +1,106 @@
+"""
+Tests for the chat history strategies.
+Note: The summarizer is a stub runnable, so no API calls are made.
+"""
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+from langchain_core.runnables import RunnableLambda
+from history import (
+    HistoryStrategy,
+    KeepLastN,
+    RollingSummary,
+    TokenBudgetWindow,
+    create_history_strategy,
+)
+
+
+def make_history(turns: int):
+    """Build an alternating question/answer history."""
+    messages = []
+    for i in range(turns):
+        messages.append(AIMessage(content=f"Question {i} " + "x" * 40))
+        messages.append(HumanMessage(content=f"Answer {i} " + "y" * 40))
+    return messages
+
+
+class TestHistoryStrategies:
+    """Test cases for history strategies."""
+
+    def test_full_history_saves_nothing(self):
+        """Test that the default strategy passes every message through."""
+        strategy = HistoryStrategy()
+        messages = make_history(3)
+
+        assert strategy.select(messages) == messages
+        assert strategy.tokens_saved == 0
+
+    def test_keep_last_n(self):
+        """Test that only the most recent messages are kept."""
+        strategy = KeepLastN(keep_last=2)
+        messages = make_history(5)
+
+        assert strategy.select(messages) == messages[-2:]
+        assert strategy.tokens_saved == strategy.count_tokens(messages[:-2])
+
+    def test_token_budget_window(self):
+        """Test that the window stays within budget but keeps the latest message."""
+        messages = make_history(10)
+        strategy = TokenBudgetWindow(max_tokens=50)
+
+        selected = strategy.select(messages)
+
+        assert selected == messages[-len(selected):]
+        assert strategy.count_tokens(selected) <= 50
+        assert strategy.tokens_saved > 0
+
+        tiny = TokenBudgetWindow(max_tokens=1)
+        assert tiny.select(messages) == messages[-1:]
+
+    def test_rolling_summary_only_summarizes_new_turns(self):
+        """Test that older turns are compacted incrementally."""
+        transcripts = []
+
+        def summarize(inputs):
+            transcripts.append(inputs["transcript"])
+            return AIMessage(content=f"summary #{len(transcripts)}")
+
+        strategy = RollingSummary(summarizer=RunnableLambda(summarize), keep_last=2)
+        messages = make_history(4)
+
+        selected = strategy.select(messages)
+        assert isinstance(selected[0], SystemMessage)
+        assert "summary #1" in selected[0].content
+        assert selected[1:] == messages[-2:]
+
+        # Same history again: nothing new to summarize
+        strategy.select(messages)
+        assert len(transcripts) == 1
+
+        messages = messages + make_history(1)
+        strategy.select(messages)
+        assert len(transcripts) == 2
+        assert "Question 0" not in transcripts[1]
+        assert strategy.get_stats()["summarizer_calls"] == 2
+
+    def test_reset_clears_counters(self):
+        """Test that reset clears token counters."""
+        strategy = KeepLastN(keep_last=1)
+        strategy.select(make_history(3))
+        strategy.reset()
+
+        assert strategy.tokens_saved == 0
+        assert strategy.tokens_sent == 0
+
+    def test_create_history_strategy(self):
+        """Test building strategies by name."""
+        assert isinstance(create_history_strategy("last_n", keep_last=3), KeepLastN)
+        assert create_history_strategy("token_window", max_tokens=10).max_tokens == 10
+        assert create_history_strategy("summary").summarizer is None
+
+        with pytest.raises(ValueError):
+            create_history_strategy("unknown")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,124 @@
+"""
+Tests for speculative question prefetching.
+Note: Question generation is stubbed, so no API calls are made.
+"""
+
+import threading
+
+import pytest
+from unittest.mock import patch
+from langchain_core.messages import AIMessage
+from langchain_core.runnables import RunnableLambda
+from backend import InterviewBot
+from prefetch import PrefetchPolicy, QuestionPrefetcher
+
+
+def make_generator(calls):
+    """Build a stub generator that records its calls."""
+    def generate(role_name, role_description, question_number, asked_questions):
+        calls.append((question_number, list(asked_questions)))
+        return f"{role_name} question {question_number}"
+    return generate
+
+
+class TestPrefetchPolicy:
+    """Test cases for PrefetchPolicy."""
+
+    def test_numbers_to_prefetch(self):
+        """Test that prefetching stops at the last answer-independent question."""
+        policy = PrefetchPolicy(depth=3, independent_questions=4)
+
+        assert policy.numbers_to_prefetch(2) == [2, 3, 4]
+        assert policy.numbers_to_prefetch(4) == [4]
+        assert policy.numbers_to_prefetch(5) == []
+
+    def test_disabled_by_default(self):
+        """Test that the default policy does not prefetch."""
+        assert not PrefetchPolicy().enabled
+
+
+class TestQuestionPrefetcher:
+    """Test cases for QuestionPrefetcher."""
+
+    def test_prefetched_questions_see_earlier_ones(self):
+        """Test that each speculative question knows the questions before it."""
+        calls = []
+        prefetcher = QuestionPrefetcher(make_generator(calls), PrefetchPolicy(depth=2))
+
+        prefetcher.schedule("Data Scientist", "", ["Opener?"], next_number=2)
+
+        assert prefetcher.take(2) == "Data Scientist question 2"
+        assert prefetcher.take(3) == "Data Scientist question 3"
+        assert calls[1] == (3, ["Opener?", "Data Scientist question 2"])
+        assert prefetcher.get_stats()["hit_rate"] == 1.0
+
+    def test_miss_when_nothing_prefetched(self):
+        """Test that eligible questions without a prefetch count as misses."""
+        prefetcher = QuestionPrefetcher(make_generator([]), PrefetchPolicy(depth=1, independent_questions=3))
+
+        assert prefetcher.take(2) is None
+        assert prefetcher.take(7) is None
+        assert prefetcher.misses == 1
+
+    def test_failed_prefetch_is_a_miss(self):
+        """Test that generation errors fall back instead of propagating."""
+        def generate(*args):
+            raise RuntimeError("LLM unavailable")
+
+        prefetcher = QuestionPrefetcher(generate, PrefetchPolicy(depth=1))
+        prefetcher.schedule("QA Engineer", "", [], next_number=2)
+
+        assert prefetcher.take(2) is None
+        assert prefetcher.misses == 1
+
+    def test_cancel_counts_finished_prefetches_as_wasted(self):
+        """Test that discarded prefetches are tracked."""
+        prefetcher = QuestionPrefetcher(make_generator([]), PrefetchPolicy(depth=2))
+        prefetcher.schedule("PM", "", [], next_number=2)
+        prefetcher.take(2)
+
+        # Let the remaining prefetch finish before cancelling it
+        prefetcher._futures[3].result()
+        prefetcher.cancel()
+
+        assert prefetcher.wasted == 1
+        prefetcher.shutdown()
+
+
+class TestInterviewBotPrefetch:
+    """Test cases for prefetching inside InterviewBot."""
+
+    @patch('backend.ChatOpenAI')
+    def test_prefetched_question_skips_question_chain(self, mock_chat_openai):
+        """Test that a prefetch hit only calls the evaluation chain on the critical path."""
+        question_calls = []
+        lock = threading.Lock()
+
+        def respond(prompt_value):
+            text = prompt_value.to_string()
+            if "evaluate this answer" in text:
+                return AIMessage(content="Nice.")
+            with lock:
+                question_calls.append(threading.current_thread().name)
+                return AIMessage(content=f"Question {len(question_calls)}")
+
+        mock_chat_openai.return_value = RunnableLambda(respond)
+
+        bot = InterviewBot(api_key="test_key", prefetch_policy=PrefetchPolicy(depth=1, independent_questions=2))
+        bot.start_interview("Software Engineer")
+        result = bot.evaluate_answer("Question 1", "My answer")
+
+        assert result["next_question"] == "Question 2"
+        assert question_calls[1].startswith("question-prefetch")
+        assert bot.get_session_stats()["prefetch_hit_rate"] == 1.0
+
+        # Question 3 depends on the answers, so it is generated with history
+        bot.evaluate_answer("Question 2", "Another answer")
+        assert bot.prefetcher.hits == 1
+        assert bot.prefetcher.misses == 0
+        assert bot.question_count == 3
+        bot.prefetcher.shutdown()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
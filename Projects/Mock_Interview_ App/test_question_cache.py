@@ -0,0 +1,137 @@
+"""
+Tests for the persistent question cache.
+Note: These tests use an in-memory SQLite database and mocked LLM responses.
+"""
+
+import time
+
+import pytest
+from unittest.mock import patch
+from langchain_core.messages import AIMessage
+from langchain_core.runnables import RunnableLambda
+from backend import InterviewBot
+from history import KeepLastN
+from question_cache import QuestionCache, warm_up
+
+
+def make_counting_llm(calls):
+    """Build a stub chat model that numbers its questions."""
+    def respond(prompt_value):
+        calls.append(prompt_value)
+        return AIMessage(content=f"Opening question {len(calls)}")
+    return RunnableLambda(respond)
+
+
+class TestQuestionCache:
+    """Test cases for QuestionCache."""
+
+    def test_key_buckets_temperature_and_hashes_description(self):
+        """Test that close temperatures share a key and descriptions change it."""
+        key = QuestionCache.make_key("Data Scientist", "", 1, "gpt-4o-mini", 0.71)
+
+        assert key == QuestionCache.make_key("data scientist", "", 1, "gpt-4o-mini", 0.69)
+        assert key != QuestionCache.make_key("Data Scientist", "NLP focus", 1, "gpt-4o-mini", 0.7)
+        assert key != QuestionCache.make_key("Data Scientist", "", 2, "gpt-4o-mini", 0.7)
+
+    def test_serves_only_full_pools(self):
+        """Test that questions are served once the variant pool is full."""
+        cache = QuestionCache(":memory:", pool_size=2)
+        key = cache.make_key("PM", "", 1, "gpt-4o-mini", 0.7)
+
+        cache.add(key, "Q1")
+        assert cache.get(key) is None
+
+        cache.add(key, "Q2")
+        assert cache.get(key) in {"Q1", "Q2"}
+        assert cache.get_stats()["hits"] == 1
+
+    def test_ttl_expiry(self):
+        """Test that expired questions are not served."""
+        cache = QuestionCache(":memory:", pool_size=1, ttl_seconds=0.01)
+        key = cache.make_key("PM", "", 1, "gpt-4o-mini", 0.7)
+        cache.add(key, "Q1")
+
+        time.sleep(0.02)
+
+        assert cache.get(key) is None
+
+    def test_lru_eviction(self):
+        """Test that least recently used questions are evicted above max_entries."""
+        cache = QuestionCache(":memory:", pool_size=1, max_entries=2)
+        key_a = cache.make_key("A", "", 1, "m", 0.7)
+        key_b = cache.make_key("B", "", 1, "m", 0.7)
+        key_c = cache.make_key("C", "", 1, "m", 0.7)
+
+        cache.add(key_a, "QA")
+        cache.add(key_b, "QB")
+        cache.get(key_a)
+        cache.add(key_c, "QC")
+
+        assert cache.get(key_b) is None
+        assert cache.get(key_a) == "QA"
+        assert cache.get_stats()["entries"] == 2
+
+
+class TestInterviewBotQuestionCache:
+    """Test cases for the question cache inside InterviewBot."""
+
+    @patch('backend.ChatOpenAI')
+    def test_opening_question_served_from_warm_cache(self, mock_chat_openai):
+        """Test that a warmed cache removes the LLM call from interview start."""
+        calls = []
+        mock_chat_openai.return_value = make_counting_llm(calls)
+
+        cache = QuestionCache(":memory:", pool_size=2)
+        bot = InterviewBot(api_key="test_key", question_cache=cache)
+
+        assert warm_up(bot, cache, ["Software Engineer"], max_workers=2) == 2
+        assert len(calls) == 2
+
+        welcome = bot.start_interview("Software Engineer")
+
+        assert len(calls) == 2
+        assert "Opening question" in welcome
+        assert cache.get_stats()["hits"] == 1
+
+    @patch('backend.ChatOpenAI')
+    def test_cold_cache_collects_generated_openers(self, mock_chat_openai):
+        """Test that openers generated on a miss are added to the pool."""
+        calls = []
+        mock_chat_openai.return_value = make_counting_llm(calls)
+
+        cache = QuestionCache(":memory:", pool_size=3)
+        bot = InterviewBot(api_key="test_key", question_cache=cache)
+        bot.start_interview("Gen AI Engineer")
+
+        key = cache.make_key("Gen AI Engineer", "", 1, "gpt-4o-mini", 0.7)
+        assert cache.pool_count(key) == 1
+
+        # Follow-up questions depend on history and are never cached
+        bot.chat_history.add_user_message("An answer")
+        bot.generate_question()
+        assert cache.get_stats()["entries"] == 1
+
+    @patch('backend.ChatOpenAI')
+    def test_empty_history_window_is_not_an_opener(self, mock_chat_openai):
+        """Test that follow-ups bypass the cache even when the strategy sends no history."""
+        calls = []
+        mock_chat_openai.return_value = make_counting_llm(calls)
+
+        cache = QuestionCache(":memory:", pool_size=1)
+        bot = InterviewBot(api_key="test_key", question_cache=cache, history_strategy=KeepLastN(keep_last=0))
+        warm_up(bot, cache, ["Gen AI Engineer"])
+        bot.start_interview("Gen AI Engineer")
+        assert len(calls) == 1
+
+        for i in range(3):
+            bot.chat_history.add_user_message(f"Answer {i}")
+            question = bot.generate_question()
+
+        assert len(calls) == 4
+        assert question == "Opening question 4"
+        assert cache.get_stats()["hits"] == 1
+        assert cache.get_stats()["entries"] == 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,127 @@
+"""
+Tests for the headless interview API.
+Note: These tests run against the local stub LLM server, so no API calls are made.
+"""
+
+import asyncio
+import json
+import time
+
+import httpx
+import pytest
+from langchain_openai import ChatOpenAI
+from starlette.testclient import TestClient
+from backend import InterviewBot
+from server import create_app
+from session_manager import SessionManager
+from stub_llm_server import DEFAULT_REPLY, create_app as create_stub_app
+
+
+STUB_LATENCY = 0.3
+
+
+def make_stub_llm(latency: float = STUB_LATENCY) -> ChatOpenAI:
+    """Build a ChatOpenAI whose async calls go to the stub server in-process."""
+    stub_app = create_stub_app(latency=latency, tokens_per_second=0)
+    return ChatOpenAI(
+        api_key="test_key",
+        base_url="http://stub/v1",
+        http_async_client=httpx.AsyncClient(transport=httpx.ASGITransport(app=stub_app)),
+        max_retries=0
+    )
+
+
+@pytest.fixture
+def manager(tmp_path):
+    """Session manager whose bots call the stub LLM server."""
+    llm = make_stub_llm()
+    return SessionManager(
+        bot_factory=lambda: InterviewBot(api_key="test_key", llm=llm),
+        spill_dir=str(tmp_path / "sessions")
+    )
+
+
+def parse_events(body: str):
+    """Parse a Server-Sent Events body into (event, data) tuples."""
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.split("\n"))
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+class TestServer:
+    """Test cases for the HTTP endpoints."""
+
+    def test_interview_round_trip(self, manager):
+        """Test starting a session, answering, reading stats and metrics, and resetting."""
+        client = TestClient(create_app(manager))
+
+        response = client.post("/sessions", json={"role": "Software Engineer"})
+        assert response.status_code == 201
+        session = response.json()
+        assert session["question"] == DEFAULT_REPLY
+
+        response = client.post(f"/sessions/{session['session_id']}/answer", json={"answer": "I use TDD."})
+        assert response.json() == {"feedback": DEFAULT_REPLY, "next_question": DEFAULT_REPLY}
+
+        stats = client.get(f"/sessions/{session['session_id']}/stats").json()
+        assert stats["questions_asked"] == 2
+
+        metrics = client.get("/metrics").text
+        assert 'llm_calls_total{chain="evaluation_chain"}' in metrics
+        assert 'llm_latency_seconds_count{chain="question_chain"}' in metrics
+
+        assert client.delete(f"/sessions/{session['session_id']}").status_code == 200
+        assert client.get(f"/sessions/{session['session_id']}/stats").status_code == 404
+
+    def test_stream_sends_server_sent_events(self, manager):
+        """Test that streamed turns send feedback, then the question, then done."""
+        client = TestClient(create_app(manager))
+        session_id = client.post("/sessions", json={"role": "Data Scientist"}).json()["session_id"]
+
+        response = client.post(f"/sessions/{session_id}/stream", json={"answer": "Cross-validation."})
+
+        assert response.headers["content-type"].startswith("text/event-stream")
+        events = parse_events(response.text)
+        sections = [event for event, _ in events]
+        assert sections[0] == "feedback"
+        assert sections[-1] == "done"
+        assert sections.index("next_question") > max(i for i, s in enumerate(sections) if s == "feedback")
+        assert "".join(d["token"] for e, d in events if e == "feedback") == DEFAULT_REPLY
+        assert events[-1][1]["next_question"] == DEFAULT_REPLY
+
+    def test_errors(self, manager):
+        """Test validation and unknown sessions."""
+        client = TestClient(create_app(manager))
+
+        assert client.post("/sessions", json={}).status_code == 400
+        assert client.post("/sessions", content=b"not json").status_code == 400
+        assert client.post("/sessions/missing/answer", json={"answer": "Hi"}).status_code == 404
+        assert client.post("/sessions/missing/stream", json={"answer": "Hi"}).status_code == 404
+
+
+class TestAsyncSessions:
+    """Test cases for non-blocking session handling."""
+
+    def test_concurrent_sessions_share_the_event_loop(self, manager):
+        """Test that many sessions answered at once take about one LLM round trip each."""
+        async def run():
+            session_ids = [
+                session_id for session_id, _ in await asyncio.gather(
+                    *(manager.acreate_session("Software Engineer") for _ in range(10))
+                )
+            ]
+
+            start = time.perf_counter()
+            results = await asyncio.gather(*(manager.aanswer(s, "My answer") for s in session_ids))
+            return results, time.perf_counter() - start
+
+        results, elapsed = asyncio.run(run())
+
+        assert all(result["feedback"] == DEFAULT_REPLY for result in results)
+        assert elapsed < 3 * STUB_LATENCY
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,191 @@
+"""
+Tests for the multi-session SessionManager.
+Note: These tests use a stub LLM to avoid API calls.
+"""
+
+import threading
+
+import pytest
+from unittest.mock import patch
+from langchain_core.messages import AIMessage
+from langchain_core.runnables import RunnableLambda
+from backend import InterviewBot
+from history import RollingSummary
+from session_manager import InterviewSession, SessionManager, SessionNotFoundError
+
+
+def make_llm():
+    """Build a stub chat model for evaluations and questions."""
+    def respond(prompt_value):
+        if "evaluate this answer" in prompt_value.to_string():
+            return AIMessage(content="Good.")
+        return AIMessage(content="Tell me about a hard bug you fixed.")
+    return RunnableLambda(respond)
+
+
+@pytest.fixture
+def manager(tmp_path):
+    """Session manager with tiny limits so eviction is easy to trigger."""
+    with patch('backend.ChatOpenAI', return_value=make_llm()):
+        yield SessionManager(
+            bot_factory=lambda: InterviewBot(api_key="test_key"),
+            max_active_sessions=1,
+            max_memory_bytes=10 ** 9,
+            spill_dir=str(tmp_path / "sessions")
+        )
+
+
+class TestInterviewSession:
+    """Test cases for the compact session record."""
+
+    def test_record_uses_slots(self):
+        """Test that records have no per-instance __dict__."""
+        assert not hasattr(InterviewSession("abc"), "__dict__")
+
+    def test_state_round_trip(self):
+        """Test that a bot state survives compaction and disk serialization."""
+        record = InterviewSession("abc")
+        record.store_state({
+            "role": "Data Scientist",
+            "question_count": 2,
+            "start_time": "2025-01-01T10:00:00",
+            "messages": [{"type": "ai", "data": {"content": "Q1"}}]
+        })
+        record.current_question = "Q1"
+
+        restored = InterviewSession.from_bytes(record.to_bytes())
+
+        assert restored.current_question == "Q1"
+        assert restored.load_state() == record.load_state()
+
+
+class TestSessionManager:
+    """Test cases for SessionManager."""
+
+    def test_sessions_are_isolated(self, manager):
+        """Test that answers in one session don't leak into another."""
+        first, _ = manager.create_session("Software Engineer")
+        second, _ = manager.create_session("Product Manager")
+
+        result = manager.answer(first, "I used a debugger.")
+
+        assert result["feedback"] == "Good."
+        assert manager.get_session_stats(first)["questions_asked"] == 2
+        assert manager.get_session_stats(second)["questions_asked"] == 1
+        assert manager.get_session_stats(second)["role"] == "Product Manager"
+
+    def test_lru_sessions_are_compacted_and_restored(self, manager):
+        """Test that sessions beyond max_active_sessions keep their history when compacted."""
+        first, _ = manager.create_session("Software Engineer")
+        manager.answer(first, "My answer")
+        manager.create_session("Data Scientist")
+
+        stats = manager.get_stats()
+        assert stats["active_sessions"] == 1
+        assert stats["compact_sessions"] == 1
+        assert manager.memory_usage(first) > 0
+
+        with manager.checkout(first) as bot:
+            history = bot.get_conversation_history()
+        assert [m["role"] for m in history] == ["assistant", "user", "assistant"]
+
+    def test_idle_sessions_spill_to_disk(self, manager):
+        """Test that idle sessions leave memory and are loaded back on demand."""
+        session_id, _ = manager.create_session("DevOps Engineer")
+
+        assert manager.spill_idle(now=10 ** 12) == 1
+        assert manager.get_stats()["disk_sessions"] == 1
+        assert manager.memory_usage(session_id) == 0
+
+        result = manager.answer(session_id, "I automate deployments.")
+
+        assert result["next_question"]
+        assert manager.get_stats()["disk_loads"] == 1
+        assert manager.get_session_stats(session_id)["questions_asked"] == 2
+
+    def test_memory_cap_spills_least_recently_used(self, manager):
+        """Test that compact records above the memory budget are spilled."""
+        manager.max_memory_bytes = 0
+        first, _ = manager.create_session("Software Engineer")
+        manager.create_session("Data Scientist")
+
+        stats = manager.get_stats()
+        assert stats["spills"] == 1
+        assert stats["compact_sessions"] == 0
+        assert manager.get_current_question(first)
+
+    def test_stream_answer_updates_current_question(self, manager):
+        """Test that streaming a turn records the streamed question."""
+        session_id, _ = manager.create_session("QA Engineer")
+
+        chunks = list(manager.stream_answer(session_id, "I write tests."))
+
+        assert ("feedback", "Good.") in chunks
+        assert manager.get_current_question(session_id) == "Tell me about a hard bug you fixed."
+
+    def test_end_session(self, manager):
+        """Test that ended sessions are gone."""
+        session_id, _ = manager.create_session("Business Analyst")
+        manager.end_session(session_id)
+
+        with pytest.raises(SessionNotFoundError):
+            manager.answer(session_id, "Anything")
+
+    def test_end_session_waits_for_the_running_request(self, manager):
+        """Test that a session is not ended while a request still holds its bot."""
+        session_id, _ = manager.create_session("Business Analyst")
+        ended = threading.Event()
+
+        def end():
+            manager.end_session(session_id)
+            ended.set()
+
+        with manager.checkout(session_id) as bot:
+            thread = threading.Thread(target=end)
+            thread.start()
+            assert not ended.wait(0.2)
+            assert bot.current_role == "Business Analyst"
+
+        thread.join(timeout=5)
+        assert ended.is_set()
+        assert manager.get_stats()["active_sessions"] == 0
+
+    def test_rolling_summary_survives_compaction_and_spilling(self, tmp_path):
+        """Test that a rehydrated session keeps its running summary instead of rebuilding it."""
+        summaries = []
+
+        def summarize(inputs):
+            summaries.append(inputs["transcript"])
+            return AIMessage(content=f"summary {len(summaries)}")
+
+        with patch('backend.ChatOpenAI', return_value=make_llm()):
+            manager = SessionManager(
+                bot_factory=lambda: InterviewBot(
+                    api_key="test_key",
+                    history_strategy=RollingSummary(summarizer=RunnableLambda(summarize), keep_last=2)
+                ),
+                max_active_sessions=1,
+                spill_dir=str(tmp_path / "sessions")
+            )
+            session_id, _ = manager.create_session("Software Engineer")
+            manager.answer(session_id, "First answer")
+            manager.answer(session_id, "Second answer")
+            calls = len(summaries)
+
+            manager.create_session("Data Scientist")
+            manager.spill_idle(now=10 ** 12)
+
+            with manager.checkout(session_id) as bot:
+                assert bot.history_strategy.summary == f"summary {calls}"
+                assert bot.history_strategy.summarizer_calls == calls
+                assert bot.get_session_stats()["history_tokens_saved"] > 0
+
+            manager.answer(session_id, "Third answer")
+
+        # Only the turns added since the last summary are summarized again
+        assert "First answer" not in summaries[-1]
+        assert len(summaries) == calls + 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -1,11 +1,18 @@
 import streamlit as st
-from langchain_openai import ChatOpenAI
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 from langchain_core.runnables.history import RunnableWithMessageHistory
-from langchain_community.chat_message_histories import StreamlitChatMessageHistory
 from langchain_core.output_parsers import StrOutputParser
 from dotenv import load_dotenv
 import os
+import sys
+import uuid
+
+# Make the shared helpers in Projects/common importable
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from common.chat_history import get_history_store
+from common.history_trim import HistoryTrimmer
+from common.instrumentation import instrument
+from common.llm_pool import get_chat_model
 
 # Load environment variables
 load_dotenv()
@@ -38,19 +45,31 @@ prompt = ChatPromptTemplate.from_messages([
     ("human", "{input}")  # ← user input
 ])
 
-# ✅ Initialize LLM (modern ChatOpenAI, not legacy OpenAI)
-llm = ChatOpenAI(model="gpt-4o-mini", temperature=0.7)
+# ✅ Initialize LLM (shared ChatOpenAI, reused across reruns)
+llm = get_chat_model(model="gpt-4o-mini", temperature=0.7, api_key=api_key)
+
+# ✅ Keep the history sent to the model within a token budget (one trimmer per browser session)
+if "history_trimmer" not in st.session_state:
+    st.session_state["history_trimmer"] = HistoryTrimmer(model="gpt-4o-mini")
+trimmer = st.session_state["history_trimmer"]
 
 # ✅ Build chain
-chain = prompt | llm | StrOutputParser()
+chain = instrument(trimmer.as_runnable() | prompt | llm | StrOutputParser(), "simple_gen_chain")
 
-# ✅ Use StreamlitChatMessageHistory (auto-syncs with st.session_state)
-history = StreamlitChatMessageHistory(key="chat_history")
+# ✅ Persistent history per session (the session ID is kept in the URL)
+if "session" not in st.query_params:
+    st.query_params["session"] = uuid.uuid4().hex
+session_id = st.query_params["session"]
+history_store = get_history_store()
+history = history_store.get_history(session_id)
+
+if st.sidebar.button("🗑️ Clear conversation"):
+    history.clear()
 
 # ✅ Wrap chain with message history
 chain_with_history = RunnableWithMessageHistory(
     chain,
-    lambda session_id: history,  # Always return the same history
+    history_store.get_history,  # One history per session ID
     input_messages_key="input",
     history_messages_key="history",
 )
@@ -76,6 +95,14 @@ if prompt_input := st.chat_input("Ask me anything..."):
         with st.spinner("Thinking..."):
             response = chain_with_history.invoke(
                 {"input": prompt_input},
-                config={"configurable": {"session_id": "any"}}  # required for RunnableWithMessageHistory
+                config={"configurable": {"session_id": session_id}}
             )
-        st.write(response)
\ No newline at end of file
+        st.write(response)
+
+# ✂️ Prompt tokens saved by trimming the history
+trim_stats = trimmer.get_stats()
+if trim_stats["turns"]:
+    st.sidebar.caption(
+        f"✂️ History: {trim_stats['tokens_before']:,} → {trim_stats['tokens_after']:,} prompt tokens "
+        f"({trim_stats['reduction']:.0%} saved)"
+    )
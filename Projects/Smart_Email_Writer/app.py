@@ -1,18 +1,25 @@
 # email_writer.py
 import streamlit as st
-from langchain_openai import ChatOpenAI
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import StrOutputParser
 from langchain_core.runnables import RunnablePassthrough
 from dotenv import load_dotenv
 import os
 import io
+import sys
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 
 # Load environment variables from .env (optional)
 load_dotenv()
 
+# Make the shared helpers in Projects/common importable
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from common.instrumentation import instrument
+from common.llm_cache import cached_streaming, enable_llm_cache
+from common.llm_pool import get_chat_model
+from common.streaming import render_stream
+
 # Page configuration
 st.set_page_config(
     page_title="✉️ Smart Email Writer",
@@ -60,9 +67,19 @@ with st.sidebar:
         step=0.1,
         help="Lower → more formal & predictable | Higher → more creative"
     )
+
+    # Identical requests at creativity 0 are always answered from the cache
+    llm_cache = enable_llm_cache()
+    reuse_drafts = st.checkbox(
+        "♻️ Reuse drafts for identical requests",
+        value=False,
+        disabled=llm_cache is None or temperature == 0,
+        help="Return the earlier draft for a repeated request instead of writing a new one, even at creativity above 0"
+    )
+    cache_stats = st.empty()
     
     st.markdown("---")
-    st.caption("🔒 Your data stays private — no emails are stored or sent to external servers.")
+    st.caption("🔒 Your data stays private — requests go only to OpenAI, and drafts are cached only on this server.")
 
 # Safety check
 if not api_key:
@@ -127,19 +144,21 @@ Now generate an email for this request:
 # Build LangChain prompt & chain
 prompt = ChatPromptTemplate.from_template(EMAIL_PROMPT)
 
-llm = ChatOpenAI(
+llm = get_chat_model(
     model=model,
     temperature=temperature,
     api_key=api_key,
     streaming=True,
-    max_retries=2
+    max_retries=2,
+    cache=llm_cache.with_sampling() if llm_cache and reuse_drafts else None
 )
 
-chain = (
+chain = instrument(
     {"input": RunnablePassthrough()}
     | prompt
-    | llm
-    | StrOutputParser()
+    | cached_streaming(llm)
+    | StrOutputParser(),
+    "email_chain"
 )
 
 # ====== MAIN UI ======
@@ -222,15 +241,17 @@ if generate_form or generate_free:
 
         # Generate
         try:
-            full_response = ""
             placeholder = st.empty()
             placeholder.info("📝 Drafting...")
-            
-            for chunk in chain.stream(input_text):
-                full_response += chunk
-                # Show live drafting with cursor
-                placeholder.markdown(f"📝 **Drafting...**\n\n```\n{full_response}▌\n```")
-            
+
+            # Show live drafting with cursor, throttled to one update per frame
+            full_response = render_stream(
+                chain.stream(input_text),
+                placeholder.container(),
+                template="📝 **Drafting...**\n\n```\n{text}\n```",
+                split_code_blocks=False
+            )
+
             placeholder.empty()
             st.session_state.email_draft = full_response.strip()
             st.session_state.generation_input = input_text
@@ -370,6 +391,13 @@ if "email_draft" in st.session_state:
 
         st.components.v1.html(copy_button_html, height=60)
 
+if llm_cache:
+    stats = llm_cache.get_stats()
+    cache_stats.caption(
+        f"♻️ Cache: {stats['hits']}/{stats['hits'] + stats['misses']} hits ({stats['hit_ratio']:.0%}), "
+        f"{stats['bypassed']} sampled requests not cached"
+    )
+
 # Footer
 st.markdown("---")
 st.caption(
@@ -1,12 +1,86 @@
 import streamlit as st
+import asyncio
 import os
+import sys
 from dotenv import load_dotenv
-from youtube_transcript_api import YouTubeTranscriptApi
-from openai import OpenAI
-import re
+
+from budget import count_tokens
+from cache import SummaryCache
+from llm_client import LLMClient
+from pipeline import summarize_video
+from qa_index import TranscriptIndex, answer_question
+from summarizer import chunk_segments, extract_video_id, format_chapters, format_timestamp
+from transcripts import TranscriptFetcher
+
+# Make the shared helpers in Projects/common importable
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from common.llm_cache import enable_llm_cache
+from common.streaming import StreamRenderer
 
 load_dotenv()
 
+# Sections summarized at once
+MAX_CONCURRENCY = 8
+
+# Transcript characters per chapter in chapter mode
+CHAPTER_CHARS = 4000
+
+MODEL = "gpt-4o-mini"
+# Caption languages, most preferred first
+TRANSCRIPT_LANGUAGES = os.getenv("TRANSCRIPT_LANGUAGES", "en").split(",")
+
+# Transcript passages sent with a follow-up question
+QA_TOP_K = 5
+
+PLAN_LABELS = {
+    "single_shot": "Single-shot",
+    "map_reduce": "Map-reduce",
+    "extractive": "Extractive pre-filter"
+}
+
+
+@st.cache_resource
+def get_summary_cache():
+    """Open the transcript and summary cache once per server process."""
+    return SummaryCache(
+        path=os.getenv("SUMMARY_CACHE_PATH", "summary_cache.db"),
+        max_bytes=int(os.getenv("SUMMARY_CACHE_MAX_MB", "256")) * 1024 * 1024
+    )
+
+
+@st.cache_resource
+def get_llm_client(api_key):
+    """Share one rate-limited OpenAI client per API key across all sessions."""
+    return LLMClient(
+        api_key=api_key,
+        model=MODEL,
+        temperature=0.3,
+        requests_per_minute=float(os.getenv("OPENAI_RPM", "500")),
+        tokens_per_minute=float(os.getenv("OPENAI_TPM", "200000")),
+        # Summaries are sampled, so they are only reused with LLM_CACHE_SAMPLED=1
+        cache=enable_llm_cache()
+    )
+
+
+@st.cache_resource
+def get_transcript_fetcher():
+    """Share one transcript fetcher (and its worker threads) across all sessions."""
+    return TranscriptFetcher(
+        languages=TRANSCRIPT_LANGUAGES,
+        list_timeout=float(os.getenv("TRANSCRIPT_LIST_TIMEOUT", "10")),
+        fetch_timeout=float(os.getenv("TRANSCRIPT_FETCH_TIMEOUT", "20")),
+        cache=get_summary_cache()
+    )
+
+
+@st.cache_resource(max_entries=32)
+def get_transcript_index(video_id, transcript_hash, _segments):
+    """Index a transcript for follow-up questions once, across reruns and sessions."""
+    return TranscriptIndex(_segments)
+
+
+cache = get_summary_cache()
+
 # Set page configuration
 st.set_page_config(page_title="YouTube Video Summarizer", page_icon="📺", layout="wide")
 
@@ -49,25 +123,55 @@ with st.sidebar:
     api_key = st.text_input("Enter OpenAI API Key", value=os.getenv("OPENAI_API_KEY", ""), type="password")
     st.markdown("[Get your API Key here](https://platform.openai.com/account/api-keys)")
     st.markdown("---")
+    
+    # Budget targets for the summary plan
+    st.subheader("📐 Budget")
+    max_seconds = st.number_input("Latency target (seconds)", min_value=0, value=0, step=5, help="0 for no target")
+    max_cost = st.number_input("Cost target per video ($)", min_value=0.0, value=0.0, step=0.01, help="0 for no target")
+    keep_ratio = st.slider(
+        "Transcript kept after compression",
+        min_value=0.2,
+        max_value=1.0,
+        value=float(os.getenv("TRANSCRIPT_KEEP_RATIO", "1.0")),
+        step=0.1,
+        help="Filler and repeated captions are always removed; below 1.0 only the most central sentences are kept."
+    )
+    st.markdown("---")
+    
+    # Cache statistics
+    cache_stats = cache.get_stats()
+    st.subheader("⚡ Cache")
+    col1, col2 = st.columns(2)
+    with col1:
+        st.metric("Transcript hits", f"{cache_stats['transcripts']['hit_rate']:.0%}")
+    with col2:
+        st.metric("Summary hits", f"{cache_stats['summaries']['hit_rate']:.0%}")
+    st.caption(
+        f"{cache_stats['transcripts']['entries']} transcripts, "
+        f"{cache_stats['summaries']['entries']} summaries, "
+        f"{cache_stats['size_bytes'] / (1024 * 1024):.1f} MB"
+    )
+    if api_key:
+        llm_stats = get_llm_client(api_key).get_stats()
+        st.caption(
+            f"LLM: {llm_stats['calls']} calls, {llm_stats['cached']} cached, {llm_stats['coalesced']} coalesced, "
+            f"{llm_stats['retries']} retries, {llm_stats['throttled_seconds']}s throttled"
+        )
+    st.markdown("---")
     st.markdown("Built with 🦜️🔗 LangChain & Streamlit")
 
 # Main input area
 video_url = st.text_input("Enter YouTube Video URL", placeholder="https://www.youtube.com/watch?v=...")
+summary_style = st.radio(
+    "Summary style",
+    ["Overview", "Chapters"],
+    horizontal=True,
+    help="Overview streams one summary of the whole video; Chapters summarizes it section by section, in order, as each is ready."
+)
+
+summarize_clicked = st.button("Summarize Video")
 
-def extract_video_id(url):
-    """Extract video ID from YouTube URL"""
-    patterns = [
-        r'(?:v=|\/)([0-9A-Za-z_-]{11}).*',
-        r'(?:embed\/)([0-9A-Za-z_-]{11})',
-        r'(?:watch\?v=)([0-9A-Za-z_-]{11})'
-    ]
-    for pattern in patterns:
-        match = re.search(pattern, url)
-        if match:
-            return match.group(1)
-    return None
-
-if st.button("Summarize Video"):
+if summarize_clicked:
     if not api_key:
         st.error("❌ Please provide an OpenAI API Key in the sidebar.")
     elif not video_url:
@@ -83,54 +187,105 @@ if st.button("Summarize Video"):
                 else:
                     st.info(f"📹 Video ID: {video_id}")
                     
-                    # Get transcript using youtube_transcript_api directly
+                    # Run the pipeline, rendering each step as it happens
                     try:
-                        api = YouTubeTranscriptApi()
-                        transcript_list = api.fetch(video_id)
+                        ui = {}
                         
-                        # Combine all transcript text
-                        transcript_text = " ".join([item.text for item in transcript_list])
+                        def show_transcript(transcript):
+                            transcript_text = " ".join(segment["text"] for segment in transcript.segments)
+                            st.success(f"✅ Transcript loaded! ({len(transcript_text)} characters)")
+                            if transcript.is_generated or transcript.language not in (None, TRANSCRIPT_LANGUAGES[0]):
+                                kind = "auto-generated" if transcript.is_generated else "manual"
+                                st.caption(f"🌐 Using {kind} '{transcript.language}' captions")
+                            
+                            # Show preview
+                            with st.expander("Preview transcript"):
+                                st.text(transcript_text[:300] + "...")
+                            
+                            st.markdown("### 📝 Video Summary")
                         
-                        st.success(f"✅ Transcript loaded! ({len(transcript_text)} characters)")
+                        def show_compression(segments, stats):
+                            st.caption(
+                                f"🗜️ Pre-compression: {stats['tokens_before']:,} → {stats['tokens_after']:,} tokens "
+                                f"({stats['token_savings']:.0%} saved)"
+                            )
+                            if chapter_mode:
+                                # Chapters appear in order while later sections are still being summarized
+                                st.info(f"📑 Summarizing {len(chunk_segments(segments, CHAPTER_CHARS))} chapters...")
+                                ui["progress"] = st.progress(0.0)
                         
-                        # Show preview
-                        with st.expander("Preview transcript"):
-                            st.text(transcript_text[:300] + "...")
+                        def show_chapter(chapter):
+                            ui["progress"].progress((chapter["index"] + 1) / chapter["total"])
+                            st.markdown(format_chapters([chapter]))
                         
-                        # Truncate if too long
-                        max_chars = 10000
-                        if len(transcript_text) > max_chars:
-                            transcript_text = transcript_text[:max_chars]
-                            st.warning(f"⚠️ Transcript truncated to {max_chars} characters")
+                        def show_plan(plan, segments):
+                            st.caption(
+                                f"📐 {PLAN_LABELS[plan.mode]}: {plan.reason} "
+                                f"(est. {plan.prompt_tokens + plan.completion_tokens:,} tokens, "
+                                f"${plan.cost:.4f}, ~{plan.seconds:.0f}s)"
+                            )
+                            # Long transcripts are summarized section by section, in parallel
+                            chunk_count = len(chunk_segments(segments, plan.chunk_chars))
+                            if chunk_count > 1:
+                                st.info(f"🤖 Summarizing {chunk_count} sections in parallel...")
+                                ui["progress"] = st.progress(0.0)
+                                ui["sections"] = st.expander("Section summaries", expanded=False)
+                            else:
+                                st.info("🤖 Generating summary...")
+                            
+                            # The final summary is rendered as it streams in, at most once per frame
+                            ui["summary"] = StreamRenderer(st.container())
+                            ui["done_sections"] = 0
                         
-                        # Generate summary using OpenAI
-                        st.info("🤖 Generating summary...")
+                        def show_section(section):
+                            ui["done_sections"] += 1
+                            ui["progress"].progress(ui["done_sections"] / section["total"])
+                            with ui["sections"]:
+                                st.markdown(format_chapters([section]))
                         
-                        client = OpenAI(api_key=api_key)
+                        def show_token(delta):
+                            ui["summary"].write(delta)
                         
-                        response = client.chat.completions.create(
-                            model="gpt-4o-mini",
-                            messages=[
-                                {"role": "system", "content": "You are a helpful assistant that creates concise, informative summaries of YouTube video transcripts."},
-                                {"role": "user", "content": f"""Please provide a comprehensive summary of this YouTube video transcript in bullet points:
-
-{transcript_text}
-
-Include:
-- Main topic/theme
-- Key points discussed
-- Important conclusions or takeaways"""}
-                            ],
-                            temperature=0.3,
-                            max_tokens=800
-                        )
+                        chapter_mode = summary_style == "Chapters"
+                        result = asyncio.run(summarize_video(
+                            video_id,
+                            get_transcript_fetcher(),
+                            get_llm_client(api_key),
+                            cache=cache,
+                            model=MODEL,
+                            chapters=chapter_mode,
+                            keep_ratio=keep_ratio,
+                            max_cost=max_cost or None,
+                            max_seconds=max_seconds or None,
+                            max_concurrency=MAX_CONCURRENCY,
+                            chapter_chars=CHAPTER_CHARS,
+                            on_transcript=show_transcript,
+                            on_compressed=show_compression,
+                            on_plan=show_plan,
+                            on_chunk=show_section,
+                            on_chapter=show_chapter,
+                            on_token=show_token
+                        ))
+                        summary = result.summary
                         
-                        summary = response.choices[0].message.content
+                        if result.summary_cached:
+                            st.info("⚡ Loaded summary from cache")
+                            st.markdown(summary)
+                        elif result.plan:
+                            ui["summary"].finish()
+                            with st.expander("Token budget: estimated vs actual"):
+                                st.table(result.usage.compare(result.plan, MODEL))
                         
                         if summary:
                             st.success("✅ Summary Generated Successfully!")
-                            st.markdown("### 📝 Video Summary")
-                            st.markdown(summary)
+                            
+                            # Keep the transcript for follow-up questions after this run
+                            st.session_state["qa_video"] = {
+                                "video_id": video_id,
+                                "transcript_hash": SummaryCache.transcript_hash(result.transcript.segments),
+                                "segments": result.transcript.segments,
+                                "summary": summary
+                            }
                             
                             # Add download button
                             st.download_button(
@@ -152,4 +307,39 @@ Include:
             with st.expander("Show detailed error"):
                 st.code(traceback.format_exc())
 
-
+# Follow-up questions, answered from the most relevant transcript passages
+qa_video = st.session_state.get("qa_video")
+if qa_video:
+    st.markdown("---")
+    st.markdown("### 💬 Ask About This Video")
+    if not summarize_clicked:
+        with st.expander("📝 Video Summary"):
+            st.markdown(qa_video["summary"])
+    
+    question = st.text_input("Question", placeholder="What does the speaker say about...?")
+    if st.button("Ask") and question:
+        if not api_key:
+            st.error("❌ Please provide an OpenAI API Key in the sidebar.")
+        else:
+            try:
+                with st.spinner("Searching the transcript..."):
+                    index = get_transcript_index(qa_video["video_id"], qa_video["transcript_hash"], qa_video["segments"])
+                    answer = asyncio.run(answer_question(index, question, get_llm_client(api_key).complete, k=QA_TOP_K))
+                
+                st.markdown(answer["answer"] or "No relevant part of the transcript was found.")
+                with st.expander("Sources"):
+                    for passage in answer["sources"]:
+                        link = f"https://www.youtube.com/watch?v={qa_video['video_id']}&t={int(passage['start'])}s"
+                        st.markdown(
+                            f"**[{format_timestamp(passage['start'])} – {format_timestamp(passage['end'])}]({link})** "
+                            f"(similarity {passage['score']:.2f})\n\n{passage['text']}"
+                        )
+                
+                transcript_text = " ".join(segment["text"] for segment in qa_video["segments"])
+                st.caption(
+                    f"🔎 Answered from {len(answer['sources'])} of {len(index)} passages: "
+                    f"~{count_tokens(answer['prompt'], MODEL):,} prompt tokens instead of "
+                    f"{count_tokens(transcript_text, MODEL):,} for the whole transcript"
+                )
+            except Exception as e:
+                st.error(f"❌ Could not answer the question: {str(e)}")
@@ -0,0 +1,374 @@
+"""
+Batch summarization of many YouTube videos.
+
+Each video goes through pipeline.summarize_video, like in the app, so
+batch jobs get the same pre-compression, budget plan and summary cache.
+Transcripts are fetched ahead on a bounded thread pool while earlier videos
+are already being summarized; every LLM call goes through one LLMClient,
+which keeps the job under its request and token quotas. Results are
+appended to a JSONL or CSV file as each video finishes, and re-running the
+same job skips videos that already succeeded.
+
+Example:
+    python batch.py --playlist PLxxxx --output summaries.jsonl
+    python batch.py --file urls.txt --output summaries.csv --rpm 300
+"""
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+import argparse
+import asyncio
+import csv
+import json
+import os
+import re
+import sys
+import time
+
+from dotenv import load_dotenv
+
+from cache import SummaryCache
+from pipeline import DEFAULT_MODEL, summarize_video
+from providers import LLMProvider, TranscriptProvider
+from summarizer import extract_video_id
+from transcripts import TranscriptResult
+from llm_client import LLMClient
+
+FIELDS = ["video_id", "status", "summary", "error", "mode", "calls", "transcript_chars", "seconds"]
+
+
+def parse_video_id(value: str) -> Optional[str]:
+    """Accept a bare 11-character video ID or any supported YouTube URL."""
+    value = value.strip()
+    if re.fullmatch(r"[0-9A-Za-z_-]{11}", value):
+        return value
+    return extract_video_id(value)
+
+
+def read_url_file(path: str) -> List[str]:
+    """Read one URL or video ID per line, skipping blank lines and # comments."""
+    with open(path, encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip() and not line.lstrip().startswith("#")]
+
+
+def playlist_video_urls(playlist: str) -> List[str]:
+    """
+    List the video URLs in a playlist.
+
+    Args:
+        playlist: Playlist URL or ID
+
+    Returns:
+        Video URLs in playlist order
+    """
+    from pytube import Playlist
+
+    if not playlist.startswith("http"):
+        playlist = f"https://www.youtube.com/playlist?list={playlist}"
+    return list(Playlist(playlist).video_urls)
+
+
+def collect_video_ids(inputs: Iterable[str]) -> List[str]:
+    """
+    Turn URLs and IDs into unique video IDs, keeping their order.
+
+    Args:
+        inputs: URLs or video IDs
+
+    Returns:
+        Video IDs; unrecognized inputs are reported on stderr and skipped
+    """
+    video_ids = []
+    seen = set()
+    for value in inputs:
+        video_id = parse_video_id(value)
+        if not video_id:
+            print(f"Skipping unrecognized input: {value}", file=sys.stderr)
+        elif video_id not in seen:
+            seen.add(video_id)
+            video_ids.append(video_id)
+    return video_ids
+
+
+def load_finished(path: str) -> Set[str]:
+    """
+    Read the video IDs that already have a successful result.
+
+    Args:
+        path: JSONL or CSV results file (may not exist yet)
+
+    Returns:
+        Set of finished video IDs
+    """
+    if not os.path.exists(path):
+        return set()
+
+    with open(path, encoding="utf-8", newline="") as f:
+        if path.endswith(".csv"):
+            rows = list(csv.DictReader(f))
+        else:
+            rows = []
+            for line in f:
+                try:
+                    rows.append(json.loads(line))
+                except ValueError:
+                    # A crash can leave a half-written last line
+                    continue
+
+    return {row["video_id"] for row in rows if row.get("status") == "ok"}
+
+
+class ResultWriter:
+    """Appends one result per video to a JSONL or CSV file, flushing each row."""
+
+    def __init__(self, path: str):
+        """
+        Open the results file for appending.
+
+        Args:
+            path: Output file; a .csv extension selects CSV, anything else JSONL
+        """
+        self.path = path
+        self.is_csv = path.endswith(".csv")
+        is_new = not os.path.exists(path) or os.path.getsize(path) == 0
+
+        self._file = open(path, "a", encoding="utf-8", newline="")
+        if self.is_csv:
+            self._writer = csv.DictWriter(self._file, fieldnames=FIELDS)
+            if is_new:
+                self._writer.writeheader()
+
+    def write(self, result: Dict[str, Any]):
+        """Append a result and flush it to disk."""
+        if self.is_csv:
+            self._writer.writerow({field: result.get(field) for field in FIELDS})
+        else:
+            self._file.write(json.dumps(result, ensure_ascii=False) + "\n")
+        self._file.flush()
+
+    def close(self):
+        """Close the results file."""
+        self._file.close()
+
+
+class PrefetchingTranscripts:
+    """Transcript provider that fetches videos ahead on a bounded thread pool."""
+
+    def __init__(self, transcripts: TranscriptProvider, workers: int, cache: Optional[SummaryCache] = None):
+        """
+        Initialize the provider.
+
+        Args:
+            transcripts: Provider doing the actual fetching, e.g. TranscriptFetcher
+            workers: Fetch threads
+            cache: Cache checked before prefetching, so cached transcripts aren't fetched
+        """
+        self.transcripts = transcripts
+        self.language_key = getattr(transcripts, "language_key", "en")
+        self.cache = cache
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="transcript")
+        self._fetched: Dict[str, TranscriptResult] = {}
+
+    def _load(self, video_id: str):
+        # Cached transcripts are read by summarize_video itself
+        if self.cache is not None and self.cache.get_transcript(video_id, self.language_key) is not None:
+            return
+        self._fetched[video_id] = self.transcripts.fetch(video_id)
+
+    def prefetch(self, video_id: str) -> Future:
+        """Start fetching a video's transcript, returning the future of the fetch."""
+        return self._executor.submit(self._load, video_id)
+
+    def fetch(self, video_id: str) -> TranscriptResult:
+        """Return the prefetched transcript, fetching it now if it wasn't prefetched."""
+        result = self._fetched.pop(video_id, None)
+        return result or self.transcripts.fetch(video_id)
+
+    def close(self):
+        """Stop the fetch threads without waiting for running fetches."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+def youtube_transcripts(languages: str = "en", cache: Optional[SummaryCache] = None) -> TranscriptProvider:
+    """
+    Build a transcript provider that downloads transcripts with youtube-transcript-api.
+
+    Args:
+        languages: Comma-separated language codes, most preferred first
+        cache: Cache remembering videos without captions
+
+    Returns:
+        A transcripts.TranscriptFetcher
+    """
+    from transcripts import TranscriptFetcher
+
+    return TranscriptFetcher(languages=languages.split(","), cache=cache)
+
+
+async def run_batch(
+    video_ids: List[str],
+    llm: LLMProvider,
+    output: str,
+    transcripts: TranscriptProvider,
+    fetch_workers: int = 4,
+    max_videos: int = 4,
+    max_concurrency: int = 8,
+    cache: Optional[SummaryCache] = None,
+    model: str = DEFAULT_MODEL,
+    keep_ratio: float = 1.0,
+    max_cost: Optional[float] = None,
+    max_seconds: Optional[float] = None,
+    on_result: Optional[Callable[[Dict[str, Any]], None]] = None
+) -> Dict[str, int]:
+    """
+    Summarize many videos, appending each result to output as it finishes.
+
+    Args:
+        video_ids: Videos to summarize
+        llm: LLM provider, typically LLMClient
+        output: JSONL or CSV results file; finished videos in it are skipped
+        transcripts: Transcript provider, e.g. TranscriptFetcher, run on the thread pool
+        fetch_workers: Transcript fetch threads
+        max_videos: Videos summarized at the same time
+        max_concurrency: LLM calls in flight per video
+        cache: Optional transcript and summary cache, shared with the app
+        model: Model name, for the budget plan and cache keys
+        keep_ratio: Share of each transcript kept by pre-compression
+        max_cost: Cost target per video in USD
+        max_seconds: Latency target per video in seconds
+        on_result: Called with each result as it is written
+
+    Returns:
+        Counts of "ok", "error" and "skipped" videos
+    """
+    finished = load_finished(output)
+    pending = [video_id for video_id in video_ids if video_id not in finished]
+    counts = {"ok": 0, "error": 0, "skipped": len(video_ids) - len(pending)}
+
+    prefetching = PrefetchingTranscripts(transcripts, fetch_workers, cache)
+    video_slots = asyncio.Semaphore(max_videos)
+    writer = ResultWriter(output)
+
+    async def process(video_id: str):
+        start = time.perf_counter()
+        result = {"video_id": video_id}
+        try:
+            # Transcripts are fetched ahead; only max_videos are summarized at once
+            await asyncio.wrap_future(prefetching.prefetch(video_id))
+            async with video_slots:
+                summary = await summarize_video(
+                    video_id,
+                    prefetching,
+                    llm,
+                    cache=cache,
+                    model=model,
+                    keep_ratio=keep_ratio,
+                    max_cost=max_cost,
+                    max_seconds=max_seconds,
+                    max_concurrency=max_concurrency
+                )
+            if not summary.summary:
+                raise ValueError("Received empty summary")
+
+            result.update(
+                status="ok",
+                summary=summary.summary,
+                mode="cached" if summary.summary_cached else summary.plan.mode,
+                calls=summary.usage.calls,
+                transcript_chars=sum(len(segment["text"]) + 1 for segment in summary.transcript.segments)
+            )
+        except Exception as e:
+            result.update(status="error", error=f"{type(e).__name__}: {e}")
+
+        result["seconds"] = round(time.perf_counter() - start, 2)
+        counts[result["status"]] += 1
+        writer.write(result)
+        if on_result:
+            on_result(result)
+
+    try:
+        await asyncio.gather(*(process(video_id) for video_id in pending))
+    finally:
+        writer.close()
+        prefetching.close()
+
+    return counts
+
+
+def main():
+    """Parse arguments and run a batch job."""
+    load_dotenv()
+
+    parser = argparse.ArgumentParser(description="Summarize many YouTube videos to a JSONL or CSV file.")
+    parser.add_argument("urls", nargs="*", help="Video URLs or IDs")
+    parser.add_argument("--file", help="File with one URL or video ID per line")
+    parser.add_argument("--playlist", help="Playlist URL or ID")
+    parser.add_argument("--output", default="summaries.jsonl", help="Results file (.jsonl or .csv)")
+    parser.add_argument("--model", default=DEFAULT_MODEL)
+    parser.add_argument("--language", default="en", help="Transcript language codes, comma-separated, most preferred first")
+    parser.add_argument("--keep-ratio", type=float, default=float(os.getenv("TRANSCRIPT_KEEP_RATIO", "1.0")),
+                        help="Share of each transcript kept by pre-compression")
+    parser.add_argument("--max-cost", type=float, help="Cost target per video in USD")
+    parser.add_argument("--max-seconds", type=float, help="Latency target per video in seconds")
+    parser.add_argument("--rpm", type=float, default=500, help="Maximum LLM requests per minute")
+    parser.add_argument("--tpm", type=float, default=200_000, help="Maximum LLM tokens per minute")
+    parser.add_argument("--fetch-workers", type=int, default=4, help="Transcript fetch threads")
+    parser.add_argument("--videos", type=int, default=4, help="Videos summarized at the same time")
+    parser.add_argument("--concurrency", type=int, default=8, help="LLM calls in flight per video")
+    parser.add_argument("--cache", default=os.getenv("SUMMARY_CACHE_PATH", "summary_cache.db"),
+                        help="Transcript and summary cache file")
+    parser.add_argument("--no-cache", action="store_true", help="Disable the cache")
+    args = parser.parse_args()
+
+    inputs = list(args.urls)
+    if args.file:
+        inputs.extend(read_url_file(args.file))
+    if args.playlist:
+        inputs.extend(playlist_video_urls(args.playlist))
+
+    video_ids = collect_video_ids(inputs)
+    if not video_ids:
+        parser.error("No videos given; pass URLs, --file or --playlist.")
+    if not os.getenv("OPENAI_API_KEY"):
+        parser.error("OPENAI_API_KEY is not set.")
+
+    cache = None if args.no_cache else SummaryCache(path=args.cache)
+    llm = LLMClient(model=args.model, requests_per_minute=args.rpm, tokens_per_minute=args.tpm)
+
+    def report(result: Dict[str, Any]):
+        detail = f"{result['mode']}, {result['calls']} calls" if result["status"] == "ok" else result["error"]
+        print(f"[{result['status']}] {result['video_id']} ({result['seconds']}s) {detail}", flush=True)
+
+    start = time.perf_counter()
+    counts = asyncio.run(run_batch(
+        video_ids,
+        llm,
+        args.output,
+        transcripts=youtube_transcripts(args.language, cache),
+        fetch_workers=args.fetch_workers,
+        max_videos=args.videos,
+        max_concurrency=args.concurrency,
+        cache=cache,
+        model=args.model,
+        keep_ratio=args.keep_ratio,
+        max_cost=args.max_cost,
+        max_seconds=args.max_seconds,
+        on_result=report
+    ))
+
+    print(
+        f"Done in {time.perf_counter() - start:.1f}s: {counts['ok']} ok, "
+        f"{counts['error']} failed, {counts['skipped']} already finished -> {args.output}"
+    )
+    stats = llm.get_stats()
+    print(
+        f"LLM: {stats['calls']} calls, {stats['coalesced']} coalesced, {stats['retries']} retries "
+        f"({stats['rate_limited']} rate limited), {stats['throttled_seconds']}s throttled"
+    )
+    llm.close()
+    if cache:
+        cache.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,268 @@
+"""
+Token budgeting for YouTube summaries.
+
+Counts transcript tokens with the model's tokenizer (common/tokens.py,
+with a character-based fallback when tiktoken or its encoding files are
+unavailable) and plans how to summarize:
+
+- single_shot: the whole transcript in one call
+- map_reduce: sections summarized in parallel, then combined
+- extractive: the most informative segments only (see compress.py), in one call
+
+The plan fits the model's context window and, when given, a cost and
+latency target. Estimated tokens can be compared with the tokens
+actually used, as reported by the API.
+"""
+
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Optional
+import math
+import os
+import sys
+import threading
+
+from summarizer import MAP_PROMPT, REDUCE_PROMPT, SUMMARY_PROMPT, SYSTEM_PROMPT, Completer
+
+# Make the shared helpers in Projects/common importable
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from common.tokens import CHARS_PER_TOKEN, count_tokens
+
+# Context window per model, in tokens
+MODEL_CONTEXT_TOKENS = {
+    "gpt-4o-mini": 128_000,
+    "gpt-4o": 128_000,
+    "gpt-4-turbo": 128_000,
+    "gpt-3.5-turbo": 16_385
+}
+DEFAULT_CONTEXT_TOKENS = 16_385
+
+# Approximate list prices in USD per million (input, output) tokens
+MODEL_PRICES = {
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4o": (2.50, 10.00),
+    "gpt-4-turbo": (10.00, 30.00),
+    "gpt-3.5-turbo": (0.50, 1.50)
+}
+DEFAULT_PRICES = (2.50, 10.00)
+
+# Rough latency model for one call
+REQUEST_OVERHEAD_SECONDS = 0.5
+PREFILL_TOKENS_PER_SECOND = 4000
+OUTPUT_TOKENS_PER_SECOND = 60
+
+# Typical completion lengths per stage (the max_tokens limits are upper bounds)
+EXPECTED_SECTION_TOKENS = 150
+EXPECTED_SUMMARY_TOKENS = 400
+
+# Map-reduce section size, and the share of the context window kept free
+MAP_CHUNK_TOKENS = 2000
+CONTEXT_SAFETY_MARGIN = 0.1
+
+def count_message_tokens(messages: List[Dict[str, str]], model: str = "gpt-4o-mini") -> int:
+    """Count prompt tokens for chat messages, including per-message framing."""
+    return sum(count_tokens(message["content"], model) + 4 for message in messages) + 3
+
+
+@dataclass
+class BudgetPlan:
+    """How a transcript will be summarized, and what it is expected to cost."""
+
+    mode: str
+    reason: str
+    transcript_tokens: int
+    chunk_chars: int
+    keep_ratio: float
+    calls: int
+    prompt_tokens: int
+    completion_tokens: int
+    cost: float
+    seconds: float
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the plan to a dictionary."""
+        return asdict(self)
+
+
+def estimate_cost(model: str, prompt_tokens: int, completion_tokens: int) -> float:
+    """Estimate the USD cost of a number of prompt and completion tokens."""
+    input_price, output_price = MODEL_PRICES.get(model, DEFAULT_PRICES)
+    return (prompt_tokens * input_price + completion_tokens * output_price) / 1_000_000
+
+
+def estimate_seconds(prompt_tokens: int, completion_tokens: int) -> float:
+    """Estimate the duration of one call."""
+    return (
+        REQUEST_OVERHEAD_SECONDS
+        + prompt_tokens / PREFILL_TOKENS_PER_SECOND
+        + completion_tokens / OUTPUT_TOKENS_PER_SECOND
+    )
+
+
+def _template_tokens(template: str, model: str) -> int:
+    """Tokens a prompt template adds around the transcript text."""
+    prompt = template.format(text="", start="0:00", end="0:00")
+    messages = [{"role": "system", "content": SYSTEM_PROMPT}, {"role": "user", "content": prompt}]
+    return count_message_tokens(messages, model)
+
+
+def plan_summary(
+    segments: List[Dict[str, Any]],
+    model: str = "gpt-4o-mini",
+    max_cost: Optional[float] = None,
+    max_seconds: Optional[float] = None,
+    max_concurrency: int = 8,
+    fan_in: int = 8,
+    max_tokens: int = 800
+) -> BudgetPlan:
+    """
+    Choose how to summarize a transcript within the model's context and the targets.
+
+    Modes are tried from most to least faithful: single-shot if the
+    transcript fits the context window, then map-reduce, then extractive
+    pre-filtering with the largest share of the transcript that meets the
+    targets.
+
+    Args:
+        segments: Segments from to_segments
+        model: Model name
+        max_cost: Cost target in USD (None for no target)
+        max_seconds: Latency target in seconds (None for no target)
+        max_concurrency: Parallel map calls
+        fan_in: Section summaries combined per reduce call
+        max_tokens: Completion limit of the final summary
+
+    Returns:
+        The plan
+    """
+    text = " ".join(segment["text"] for segment in segments)
+    tokens = count_tokens(text, model)
+    chars_per_token = len(text) / tokens if tokens else CHARS_PER_TOKEN
+    context = MODEL_CONTEXT_TOKENS.get(model, DEFAULT_CONTEXT_TOKENS)
+    usable = int(context * (1 - CONTEXT_SAFETY_MARGIN)) - _template_tokens(SUMMARY_PROMPT, model) - max_tokens
+
+    def meets_targets(plan: BudgetPlan) -> bool:
+        return (max_cost is None or plan.cost <= max_cost) and (max_seconds is None or plan.seconds <= max_seconds)
+
+    def single_shot(kept_tokens: int, mode: str, keep_ratio: float) -> BudgetPlan:
+        prompt_tokens = kept_tokens + _template_tokens(SUMMARY_PROMPT, model)
+        return BudgetPlan(
+            mode=mode,
+            reason="",
+            transcript_tokens=tokens,
+            chunk_chars=len(text) + 1,
+            keep_ratio=keep_ratio,
+            calls=1,
+            prompt_tokens=prompt_tokens,
+            completion_tokens=EXPECTED_SUMMARY_TOKENS,
+            cost=estimate_cost(model, prompt_tokens, EXPECTED_SUMMARY_TOKENS),
+            seconds=estimate_seconds(prompt_tokens, EXPECTED_SUMMARY_TOKENS)
+        )
+
+    def map_reduce() -> BudgetPlan:
+        sections = max(1, math.ceil(tokens / MAP_CHUNK_TOKENS))
+        map_overhead = _template_tokens(MAP_PROMPT, model)
+        reduce_overhead = _template_tokens(REDUCE_PROMPT, model)
+        section_seconds = estimate_seconds(MAP_CHUNK_TOKENS + map_overhead, EXPECTED_SECTION_TOKENS)
+
+        calls = sections
+        prompt_tokens = tokens + sections * map_overhead
+        completion_tokens = sections * EXPECTED_SECTION_TOKENS
+        seconds = math.ceil(sections / max_concurrency) * section_seconds
+
+        # Combine rounds, mirroring summarize_segments
+        remaining = sections
+        while remaining > fan_in:
+            groups = math.ceil(remaining / fan_in)
+            calls += groups
+            prompt_tokens += remaining * EXPECTED_SECTION_TOKENS + groups * reduce_overhead
+            completion_tokens += groups * EXPECTED_SECTION_TOKENS
+            seconds += math.ceil(groups / max_concurrency) * estimate_seconds(
+                fan_in * EXPECTED_SECTION_TOKENS + reduce_overhead, EXPECTED_SECTION_TOKENS
+            )
+            remaining = groups
+
+        final_prompt = remaining * EXPECTED_SECTION_TOKENS + reduce_overhead
+        return BudgetPlan(
+            mode="map_reduce",
+            reason="",
+            transcript_tokens=tokens,
+            chunk_chars=int(MAP_CHUNK_TOKENS * chars_per_token),
+            keep_ratio=1.0,
+            calls=calls + 1,
+            prompt_tokens=prompt_tokens + final_prompt,
+            completion_tokens=completion_tokens + EXPECTED_SUMMARY_TOKENS,
+            cost=estimate_cost(model, prompt_tokens + final_prompt, completion_tokens + EXPECTED_SUMMARY_TOKENS),
+            seconds=seconds + estimate_seconds(final_prompt, EXPECTED_SUMMARY_TOKENS)
+        )
+
+    if tokens <= usable:
+        plan = single_shot(tokens, "single_shot", 1.0)
+        if meets_targets(plan):
+            plan.reason = f"{tokens:,} tokens fit in the {context:,}-token context"
+            return plan
+
+    plan = map_reduce()
+    if meets_targets(plan):
+        plan.reason = (
+            f"{tokens:,} tokens exceed the context window" if tokens > usable
+            else "single-shot would miss the cost or latency target"
+        )
+        return plan
+
+    # Keep the largest share of the transcript that fits and meets the targets
+    keep_ratio = min(1.0, usable / tokens) if tokens else 1.0
+    plan = single_shot(int(tokens * keep_ratio), "extractive", keep_ratio)
+    while keep_ratio > 0.1 and not meets_targets(plan):
+        keep_ratio = max(0.1, keep_ratio - 0.05)
+        plan = single_shot(int(tokens * keep_ratio), "extractive", keep_ratio)
+
+    if meets_targets(plan):
+        plan.reason = f"keeping the most informative {keep_ratio:.0%} of the transcript to meet the targets"
+    else:
+        plan.reason = f"the targets can't be met; keeping the most informative {keep_ratio:.0%} of the transcript"
+    return plan
+
+
+class TokenUsage:
+    """Accumulates the tokens actually used by a summarization job."""
+
+    def __init__(self):
+        self.calls = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self._lock = threading.Lock()
+
+    def add(self, prompt_tokens: int, completion_tokens: int):
+        """Record one call's reported usage (safe to call from any thread)."""
+        with self._lock:
+            self.calls += 1
+            self.prompt_tokens += prompt_tokens
+            self.completion_tokens += completion_tokens
+
+    def wrap(self, complete: Completer) -> Completer:
+        """Wrap LLMClient.complete (or .stream) so its usage is recorded here."""
+        def metered(messages: List[Dict[str, str]], max_tokens: int, stage: str):
+            return complete(messages, max_tokens, stage, on_usage=self.add)
+        return metered
+
+    def compare(self, plan: BudgetPlan, model: str = "gpt-4o-mini") -> Dict[str, Dict[str, float]]:
+        """
+        Compare a plan's estimates with the usage recorded so far.
+
+        Args:
+            plan: The plan that was followed
+            model: Model name, for the actual cost
+
+        Returns:
+            Mapping of calls, prompt_tokens, completion_tokens and cost to
+            {"estimated", "actual"}
+        """
+        return {
+            "calls": {"estimated": plan.calls, "actual": self.calls},
+            "prompt_tokens": {"estimated": plan.prompt_tokens, "actual": self.prompt_tokens},
+            "completion_tokens": {"estimated": plan.completion_tokens, "actual": self.completion_tokens},
+            "cost": {
+                "estimated": round(plan.cost, 6),
+                "actual": round(estimate_cost(model, self.prompt_tokens, self.completion_tokens), 6)
+            }
+        }
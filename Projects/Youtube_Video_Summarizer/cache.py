@@ -0,0 +1,280 @@
+"""
+Persistent transcript and summary cache for the YouTube summarizer.
+
+Two levels share one compressed SQLite store:
+- transcripts keyed by video ID and language
+- summaries keyed by video ID, transcript hash, model and prompt version
+
+Entries are zlib-compressed; once the store grows past max_bytes the
+least recently used entries of either level are evicted.
+
+Videos known to have no usable captions are also remembered, for a
+limited time, so they aren't looked up again on every request.
+"""
+
+from typing import Any, Dict, List, Optional
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+import zlib
+
+
+class SummaryCache:
+    """Disk-backed, size-bounded cache of transcripts and summaries."""
+
+    LEVELS = ("transcripts", "summaries")
+
+    def __init__(self, path: str = "summary_cache.db", max_bytes: int = 256 * 1024 * 1024):
+        """
+        Initialize the cache.
+
+        Args:
+            path: SQLite database file (":memory:" for a throwaway cache)
+            max_bytes: Maximum compressed size of all entries; least recently used are evicted
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+
+        self.hits = {level: 0 for level in self.LEVELS}
+        self.misses = {level: 0 for level in self.LEVELS}
+        self.evictions = 0
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        for level in self.LEVELS:
+            self._conn.execute(f"""
+                CREATE TABLE IF NOT EXISTS {level} (
+                    cache_key TEXT PRIMARY KEY,
+                    video_id TEXT NOT NULL,
+                    data BLOB NOT NULL,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_used REAL NOT NULL
+                )
+            """)
+            self._conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{level}_last_used ON {level} (last_used)")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS missing_transcripts (
+                cache_key TEXT PRIMARY KEY,
+                video_id TEXT NOT NULL,
+                reason TEXT NOT NULL,
+                expires_at REAL NOT NULL
+            )
+        """)
+        self._conn.commit()
+
+    # ------------------------------------------------------------------
+    # Keys
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def transcript_key(video_id: str, language: str = "en") -> str:
+        """Build the cache key for a transcript."""
+        return f"{video_id}|{language}"
+
+    @staticmethod
+    def transcript_hash(segments: List[Dict[str, Any]]) -> str:
+        """Hash a transcript's text so summaries are invalidated when captions change."""
+        text = "\n".join(segment["text"] for segment in segments)
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+    @staticmethod
+    def summary_key(video_id: str, transcript_hash: str, model: str, prompt_version: str) -> str:
+        """Build the cache key for a summary."""
+        return "|".join([video_id, transcript_hash, model, prompt_version])
+
+    # ------------------------------------------------------------------
+    # Storage
+    # ------------------------------------------------------------------
+
+    def _get(self, level: str, key: str) -> Optional[Any]:
+        """Load and decompress an entry, updating its last use."""
+        with self._lock:
+            row = self._conn.execute(f"SELECT data FROM {level} WHERE cache_key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses[level] += 1
+                return None
+
+            self._conn.execute(f"UPDATE {level} SET last_used = ? WHERE cache_key = ?", (time.time(), key))
+            self._conn.commit()
+            self.hits[level] += 1
+
+        return json.loads(zlib.decompress(row[0]))
+
+    def _put(self, level: str, key: str, video_id: str, value: Any):
+        """Compress and store an entry, then evict down to max_bytes."""
+        data = zlib.compress(json.dumps(value).encode("utf-8"), 6)
+        now = time.time()
+
+        with self._lock:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO {level} (cache_key, video_id, data, size, created_at, last_used) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, video_id, data, len(data), now, now)
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _total_bytes(self) -> int:
+        """Sum the compressed size of all entries."""
+        return sum(
+            self._conn.execute(f"SELECT COALESCE(SUM(size), 0) FROM {level}").fetchone()[0]
+            for level in self.LEVELS
+        )
+
+    def _evict(self):
+        """Drop least recently used entries across both levels until within max_bytes."""
+        excess = self._total_bytes() - self.max_bytes
+        if excess <= 0:
+            return
+
+        rows = self._conn.execute("""
+            SELECT 'transcripts', cache_key, size, last_used FROM transcripts
+            UNION ALL
+            SELECT 'summaries', cache_key, size, last_used FROM summaries
+            ORDER BY last_used
+        """).fetchall()
+
+        for level, key, size, _ in rows:
+            if excess <= 0:
+                break
+            self._conn.execute(f"DELETE FROM {level} WHERE cache_key = ?", (key,))
+            excess -= size
+            self.evictions += 1
+
+    def get_transcript(self, video_id: str, language: str = "en") -> Optional[List[Dict[str, Any]]]:
+        """
+        Get cached transcript segments.
+
+        Args:
+            video_id: YouTube video ID
+            language: Transcript language code
+
+        Returns:
+            Segments as produced by summarizer.to_segments, or None on a miss
+        """
+        return self._get("transcripts", self.transcript_key(video_id, language))
+
+    def put_transcript(self, video_id: str, segments: List[Dict[str, Any]], language: str = "en"):
+        """
+        Store transcript segments.
+
+        Args:
+            video_id: YouTube video ID
+            segments: Segments as produced by summarizer.to_segments
+            language: Transcript language code
+        """
+        self._put("transcripts", self.transcript_key(video_id, language), video_id, segments)
+
+    def get_summary(self, video_id: str, transcript_hash: str, model: str, prompt_version: str) -> Optional[str]:
+        """
+        Get a cached summary.
+
+        Args:
+            video_id: YouTube video ID
+            transcript_hash: Hash from transcript_hash
+            model: Model that produced the summary
+            prompt_version: Version of the summarization prompts
+
+        Returns:
+            The summary, or None on a miss
+        """
+        return self._get("summaries", self.summary_key(video_id, transcript_hash, model, prompt_version))
+
+    def put_summary(self, video_id: str, transcript_hash: str, model: str, prompt_version: str, summary: str):
+        """
+        Store a summary.
+
+        Args:
+            video_id: YouTube video ID
+            transcript_hash: Hash from transcript_hash
+            model: Model that produced the summary
+            prompt_version: Version of the summarization prompts
+            summary: The summary text
+        """
+        key = self.summary_key(video_id, transcript_hash, model, prompt_version)
+        self._put("summaries", key, video_id, summary)
+
+    def get_missing(self, video_id: str, language: str = "en") -> Optional[str]:
+        """
+        Check whether a video is known to have no usable transcript.
+
+        Args:
+            video_id: YouTube video ID
+            language: Transcript language code (or comma-separated preference list)
+
+        Returns:
+            Why no transcript could be fetched, or None if unknown or expired
+        """
+        key = self.transcript_key(video_id, language)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT reason FROM missing_transcripts WHERE cache_key = ? AND expires_at > ?",
+                (key, time.time())
+            ).fetchone()
+        return row[0] if row else None
+
+    def put_missing(self, video_id: str, reason: str, language: str = "en", ttl: float = 6 * 3600):
+        """
+        Remember that a video has no usable transcript.
+
+        Args:
+            video_id: YouTube video ID
+            reason: Why no transcript could be fetched
+            language: Transcript language code (or comma-separated preference list)
+            ttl: Seconds before the video is looked up again
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO missing_transcripts (cache_key, video_id, reason, expires_at) "
+                "VALUES (?, ?, ?, ?)",
+                (self.transcript_key(video_id, language), video_id, reason, now + ttl)
+            )
+            self._conn.execute("DELETE FROM missing_transcripts WHERE expires_at <= ?", (now,))
+            self._conn.commit()
+
+    def clear(self):
+        """Remove all cached entries."""
+        with self._lock:
+            for level in self.LEVELS:
+                self._conn.execute(f"DELETE FROM {level}")
+            self._conn.execute("DELETE FROM missing_transcripts")
+            self._conn.commit()
+
+    def get_stats(self) -> Dict[str, any]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dictionary containing per-level entries, hits, misses and hit rates,
+            the compressed store size, the number of evictions and the number
+            of videos remembered as having no transcript
+        """
+        stats = {}
+        with self._lock:
+            for level in self.LEVELS:
+                (entries,) = self._conn.execute(f"SELECT COUNT(*) FROM {level}").fetchone()
+                total = self.hits[level] + self.misses[level]
+                stats[level] = {
+                    "entries": entries,
+                    "hits": self.hits[level],
+                    "misses": self.misses[level],
+                    "hit_rate": round(self.hits[level] / total, 3) if total else 0.0
+                }
+            stats["size_bytes"] = self._total_bytes()
+            (stats["missing"],) = self._conn.execute(
+                "SELECT COUNT(*) FROM missing_transcripts WHERE expires_at > ?", (time.time(),)
+            ).fetchone()
+
+        stats["max_bytes"] = self.max_bytes
+        stats["evictions"] = self.evictions
+        return stats
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
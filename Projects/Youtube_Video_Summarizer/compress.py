@@ -0,0 +1,281 @@
+"""
+Local, CPU-only pre-compression of transcripts before summarization.
+
+Three stages, all keeping segment timestamps:
+
+1. Cleanup: caption artifacts ([Music], >>), filler words and stutters are removed
+2. Deduplication: repeated caption lines (common in auto-generated captions) are dropped
+3. Extraction: segments are grouped into sentence-sized units, scored with
+   TF-IDF TextRank (NumPy) and the most central units are kept, in order,
+   up to a share of the transcript
+
+The result is a shorter segment list that can be passed straight to the
+summarizer, cutting prompt tokens, cost and latency.
+"""
+
+from typing import Any, Dict, List, Optional
+import math
+import re
+
+import numpy as np
+
+# Sound tags captioners put in brackets or parentheses; other bracketed text is speech, e.g. f(x)
+CAPTION_TAGS = (
+    "music", "music playing", "upbeat music", "applause", "laughter", "laughs", "laughing",
+    "cheering", "cheers", "inaudible", "silence", "crosstalk", "foreign", "noise", "no audio"
+)
+
+# Caption artifacts: [Music], (applause), speaker-change markers and music notes
+_TAG = "|".join(tag.replace(" ", r"\s+") for tag in CAPTION_TAGS)
+_ARTIFACTS = re.compile(rf"[\[(]\s*(?:{_TAG})\s*[\])]|>>+|♪+|&gt;&gt;", re.IGNORECASE)
+
+# Filler words, removed wherever they occur
+_FILLERS = re.compile(r"\b(?:um+|uh+|uhm+|erm+|er|hmm+|mm+|ah+)\b[,.]?\s*", re.IGNORECASE)
+
+# Filler phrases, removed only when set off by commas or the segment's ends
+# ("so, you know, it works") and not inside a sentence ("do you know what I mean?")
+_PHRASE_FILLERS = re.compile(r"(^|,)\s*(?:you know|i mean)\s*(,|[.!?]?\s*$)", re.IGNORECASE)
+
+
+def _drop_phrase_filler(match: re.Match) -> str:
+    """Keep one comma between the surrounding clauses, or the final punctuation."""
+    return match.group(1) if match.group(2) == "," else match.group(2).strip()
+
+# The same word repeated back to back ("the the")
+_STUTTER = re.compile(r"\b(\w+)(?:\s+\1\b)+", re.IGNORECASE)
+
+_WORD = re.compile(r"[a-z0-9']+")
+
+STOPWORDS = frozenset("""
+a about after all also an and any are as at be because been but by can could did do does doing dont
+for from get got had has have he her here him his how i if im in into is it its just know like me
+more my no not now of off on one only or our out really right say see she so some than that thats the
+their them then there these they thing things this to too up us very was way we well were what when
+where which who will with would yeah yes you your youre okay oh going gonna want
+""".split())
+
+
+def clean_text(text: str) -> str:
+    """
+    Remove caption artifacts, filler words and stutters from one caption line.
+
+    Args:
+        text: Caption text
+
+    Returns:
+        Cleaned text with whitespace collapsed
+    """
+    text = _ARTIFACTS.sub(" ", text)
+    text = _PHRASE_FILLERS.sub(_drop_phrase_filler, text.strip())
+    text = _FILLERS.sub("", text)
+    text = _STUTTER.sub(r"\1", text)
+    return " ".join(text.split())
+
+
+def _normalize(text: str) -> str:
+    """Lowercase words only, for duplicate detection."""
+    return " ".join(_WORD.findall(text.lower()))
+
+
+def dedupe_segments(segments: List[Dict[str, Any]], window: int = 20) -> List[Dict[str, Any]]:
+    """
+    Drop segments that repeat a recent caption line.
+
+    Rolling auto-captions often repeat a line, or a line contained in the
+    previous one; both are dropped. Repeats further apart than the window
+    are kept, since speakers legitimately come back to a point.
+
+    Args:
+        segments: Segments from to_segments
+        window: How many previous segments a repeat is looked for in
+
+    Returns:
+        The segments without repeats
+    """
+    kept: List[Dict[str, Any]] = []
+    recent: List[str] = []
+    for segment in segments:
+        normalized = _normalize(segment["text"])
+        if not normalized:
+            continue
+        if normalized in recent or (recent and f" {normalized} " in f" {recent[-1]} "):
+            continue
+        kept.append(segment)
+        recent.append(normalized)
+        if len(recent) > window:
+            recent.pop(0)
+    return kept
+
+
+def make_units(segments: List[Dict[str, Any]], unit_chars: int = 200) -> List[Dict[str, Any]]:
+    """
+    Group segments into sentence-sized units.
+
+    A unit ends at sentence punctuation once it has some length, or when it
+    reaches unit_chars; captions often have no punctuation at all.
+
+    Args:
+        segments: Segments from to_segments
+        unit_chars: Target unit length in characters
+
+    Returns:
+        Units in segment format ({"text", "start", "duration"})
+    """
+    units = []
+    current: List[Dict[str, Any]] = []
+    length = 0
+
+    def flush():
+        last = current[-1]
+        units.append({
+            "text": " ".join(segment["text"] for segment in current),
+            "start": current[0]["start"],
+            "duration": last["start"] + last["duration"] - current[0]["start"]
+        })
+
+    for segment in segments:
+        current.append(segment)
+        length += len(segment["text"]) + 1
+        ends_sentence = segment["text"].rstrip().endswith((".", "?", "!")) and length >= unit_chars / 2
+        if ends_sentence or length >= unit_chars:
+            flush()
+            current, length = [], 0
+
+    if current:
+        flush()
+    return units
+
+
+def tfidf_matrix(texts: List[str]) -> np.ndarray:
+    """
+    Build L2-normalized TF-IDF vectors for texts, ignoring stopwords.
+
+    Args:
+        texts: Documents
+
+    Returns:
+        Array of shape (len(texts), vocabulary size)
+    """
+    tokenized = [
+        [word for word in _WORD.findall(text.lower()) if word not in STOPWORDS and len(word) > 2]
+        for text in texts
+    ]
+    vocabulary: Dict[str, int] = {}
+    for words in tokenized:
+        for word in words:
+            vocabulary.setdefault(word, len(vocabulary))
+
+    counts = np.zeros((len(texts), max(1, len(vocabulary))), dtype=np.float32)
+    for row, words in enumerate(tokenized):
+        for word in words:
+            counts[row, vocabulary[word]] += 1
+
+    document_frequency = np.count_nonzero(counts, axis=0)
+    idf = np.log((1 + len(texts)) / (1 + document_frequency)) + 1
+    matrix = counts * idf
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.where(norms == 0, 1, norms)
+
+
+def textrank_scores(matrix: np.ndarray, damping: float = 0.85, iterations: int = 50) -> np.ndarray:
+    """
+    Score units by centrality in their cosine-similarity graph (TextRank).
+
+    Args:
+        matrix: L2-normalized TF-IDF vectors, one row per unit
+        damping: PageRank damping factor
+        iterations: Maximum power iterations
+
+    Returns:
+        One score per unit, summing to 1
+    """
+    count = matrix.shape[0]
+    if count == 0:
+        return np.zeros(0)
+
+    similarity = matrix @ matrix.T
+    np.fill_diagonal(similarity, 0)
+    row_sums = similarity.sum(axis=1, keepdims=True)
+    # Units sharing no terms with any other link to every unit evenly
+    transition = np.where(row_sums > 0, similarity / np.where(row_sums == 0, 1, row_sums), 1 / count)
+
+    scores = np.full(count, 1 / count)
+    for _ in range(iterations):
+        updated = (1 - damping) / count + damping * transition.T @ scores
+        if np.abs(updated - scores).sum() < 1e-6:
+            scores = updated
+            break
+        scores = updated
+    return scores / scores.sum()
+
+
+def compress_segments(
+    segments: List[Dict[str, Any]],
+    ratio: float = 1.0,
+    unit_chars: int = 200,
+    dedupe_window: int = 20
+) -> List[Dict[str, Any]]:
+    """
+    Clean, deduplicate and (below ratio 1.0) extract a transcript.
+
+    Args:
+        segments: Segments from to_segments
+        ratio: Share of the cleaned transcript's characters to keep
+        unit_chars: Size of the units scored and kept
+        dedupe_window: Segments looked back on for repeated lines
+
+    Returns:
+        Compressed segments in transcript order, with their timestamps
+    """
+    cleaned = []
+    for segment in segments:
+        text = clean_text(segment["text"])
+        if text:
+            cleaned.append({**segment, "text": text})
+    cleaned = dedupe_segments(cleaned, dedupe_window)
+
+    if ratio >= 1.0 or len(cleaned) < 2:
+        return cleaned
+
+    units = make_units(cleaned, unit_chars)
+    scores = textrank_scores(tfidf_matrix([unit["text"] for unit in units]))
+
+    budget = ratio * sum(len(unit["text"]) + 1 for unit in units)
+    kept, used = set(), 0
+    for index in np.argsort(-scores, kind="stable"):
+        size = len(units[index]["text"]) + 1
+        if used + size > budget:
+            continue
+        kept.add(int(index))
+        used += size
+
+    return [unit for i, unit in enumerate(units) if i in kept]
+
+
+def compression_stats(
+    original: List[Dict[str, Any]],
+    compressed: List[Dict[str, Any]],
+    count_tokens: Optional[Any] = None
+) -> Dict[str, Any]:
+    """
+    Measure how much a transcript was shrunk.
+
+    Args:
+        original: Segments before compression
+        compressed: Segments after compression
+        count_tokens: Token counter taking text (default: four characters per token)
+
+    Returns:
+        Dictionary containing characters and tokens before and after, and the token savings
+    """
+    count_tokens = count_tokens or (lambda text: math.ceil(len(text) / 4))
+    before_text = " ".join(segment["text"] for segment in original)
+    after_text = " ".join(segment["text"] for segment in compressed)
+    before, after = count_tokens(before_text), count_tokens(after_text)
+    return {
+        "chars_before": len(before_text),
+        "chars_after": len(after_text),
+        "tokens_before": before,
+        "tokens_after": after,
+        "token_savings": round(1 - after / before, 3) if before else 0.0
+    }
@@ -0,0 +1,41 @@
+"""
+Shared pytest fixtures for the YouTube summarizer tests.
+Note: The replay fixtures in fixtures/ were written by `pipeline.py --record`;
+tests using them make no network calls.
+"""
+
+import os
+
+import pytest
+from providers import (
+    COMPLETION_FIXTURES,
+    TRANSCRIPT_FIXTURES,
+    VIDEO_INFO_FIXTURES,
+    ReplayLLM,
+    ReplayTranscriptProvider,
+    ReplayVideoInfo
+)
+
+FIXTURE_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+
+# Videos in the recorded fixtures
+VIDEO_ID = "demoVideo01"
+NO_CAPTIONS_VIDEO_ID = "noCaptions1"
+
+
+@pytest.fixture
+def replay_transcripts():
+    """Transcript provider serving the recorded transcripts."""
+    return ReplayTranscriptProvider(os.path.join(FIXTURE_DIR, TRANSCRIPT_FIXTURES))
+
+
+@pytest.fixture
+def replay_llm():
+    """LLM provider serving the recorded completions."""
+    return ReplayLLM(os.path.join(FIXTURE_DIR, COMPLETION_FIXTURES))
+
+
+@pytest.fixture
+def replay_video_info():
+    """pytube.YouTube stand-in serving the recorded video details."""
+    return ReplayVideoInfo(os.path.join(FIXTURE_DIR, VIDEO_INFO_FIXTURES))
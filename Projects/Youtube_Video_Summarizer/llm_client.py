@@ -0,0 +1,410 @@
+"""
+Shared, rate-limited OpenAI client for the YouTube summarizer.
+
+One LLMClient owns an AsyncOpenAI client on a dedicated event loop thread,
+so Streamlit sessions (each running its own short-lived loop) and batch jobs
+share one connection pool and one quota. Every call passes through token
+buckets for requests and tokens per minute, is retried with jittered
+exponential backoff on rate limits and transient errors, and identical
+prompts already in flight are coalesced into one request. Completions can
+also be streamed token by token. With an LLMCache (common/llm_cache.py),
+prompts answered before are returned without a request.
+"""
+
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+import asyncio
+import hashlib
+import json
+import os
+import random
+import sys
+import threading
+import time
+
+import openai
+
+# Make the shared helpers in Projects/common importable
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from common.instrumentation import get_metrics
+from common.llm_pool import get_async_openai_client
+
+from budget import count_message_tokens
+
+# HTTP statuses worth retrying: timeouts, conflicts, rate limits and server errors
+RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket refilled continuously at a per-minute rate.
+
+    Callers reserve tokens up front and then sleep until their reservation
+    is covered, so waiting callers are served in order and the bucket works
+    from any thread or event loop.
+    """
+
+    def __init__(self, per_minute: float, burst_seconds: float = 10.0):
+        """
+        Initialize the bucket, starting full.
+
+        Args:
+            per_minute: Refill rate in tokens per minute
+            burst_seconds: Seconds' worth of tokens that may be spent at once
+        """
+        self.rate = per_minute / 60.0
+        self.capacity = max(1.0, self.rate * burst_seconds)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        """Add the tokens earned since the last update."""
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self, amount: float) -> float:
+        """
+        Take tokens, going into debt if needed.
+
+        Args:
+            amount: Tokens to take (clamped to the capacity)
+
+        Returns:
+            Seconds to wait before the reservation is covered
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens -= min(amount, self.capacity)
+            return max(0.0, -self._tokens / self.rate)
+
+    def refund(self, amount: float):
+        """Return unused tokens, e.g. when a request used fewer than estimated."""
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens = min(self.capacity, self._tokens + amount)
+
+    async def acquire(self, amount: float = 1.0) -> float:
+        """
+        Wait until amount tokens are available.
+
+        Args:
+            amount: Tokens to take
+
+        Returns:
+            Seconds spent waiting
+        """
+        wait = self.reserve(amount)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+
+def is_retryable(error: Exception) -> bool:
+    """Whether an OpenAI error is worth retrying."""
+    if isinstance(error, openai.APIConnectionError):
+        return True
+    return isinstance(error, openai.APIStatusError) and error.status_code in RETRYABLE_STATUS
+
+
+def retry_after(error: Exception) -> Optional[float]:
+    """Read the Retry-After header of an API error, in seconds."""
+    response = getattr(error, "response", None)
+    value = response.headers.get("retry-after") if response is not None else None
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+class LLMClient:
+    """Rate-limited, retrying, coalescing chat completion client."""
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        model: str = "gpt-4o-mini",
+        temperature: float = 0.3,
+        requests_per_minute: float = 500,
+        tokens_per_minute: float = 200_000,
+        max_retries: int = 5,
+        base_delay: float = 0.5,
+        max_delay: float = 30.0,
+        client: Optional[Any] = None,
+        cache: Optional[Any] = None,
+        **client_kwargs
+    ):
+        """
+        Initialize the client.
+
+        Args:
+            api_key: OpenAI API key (falls back to OPENAI_API_KEY)
+            model: Model name
+            temperature: Sampling temperature
+            requests_per_minute: Request quota to stay under
+            tokens_per_minute: Token quota (prompt plus completion) to stay under
+            max_retries: Retries after the first attempt
+            base_delay: Backoff ceiling for the first retry, doubled per attempt
+            max_delay: Largest backoff ceiling
+            client: AsyncOpenAI-compatible client (default: one from the shared pool)
+            cache: LLMCache for completed prompts; calls above temperature 0 are
+                only cached if it allows sampled calls
+            **client_kwargs: Extra AsyncOpenAI options such as base_url
+        """
+        self.model = model
+        self.temperature = temperature
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.cache = cache
+
+        self._api_key = api_key
+        self._client = client
+        self._client_kwargs = client_kwargs
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock = threading.Lock()
+
+        # Statistics
+        self.calls = 0
+        self.cached = 0
+        self.coalesced = 0
+        self.retries = 0
+        self.rate_limited = 0
+        self.errors = 0
+        self.throttled_seconds = 0.0
+
+    @property
+    def client(self):
+        """The AsyncOpenAI client; the SDK's own retries are disabled in favor of ours."""
+        if self._client is None:
+            self._client = get_async_openai_client(api_key=self._api_key, max_retries=0, **self._client_kwargs)
+        return self._client
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        """Start the client's event loop thread on first use."""
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="llm-client", daemon=True).start()
+                self._loop = loop
+            return self._loop
+
+    async def complete(
+        self,
+        messages: List[Dict[str, str]],
+        max_tokens: int,
+        stage: str = "summary",
+        on_usage: Optional[Callable[[int, int], None]] = None
+    ) -> str:
+        """
+        Get a chat completion; usable as a summarizer Completer from any event loop.
+
+        Args:
+            messages: Chat messages
+            max_tokens: Completion limit
+            stage: Stage name, recorded in the metrics as youtube_<stage>
+            on_usage: Called with (prompt_tokens, completion_tokens) after the
+                request; coalesced callers share the first caller's request
+
+        Returns:
+            The completion text
+        """
+        loop = self._ensure_loop()
+        coro = self._coalesced(messages, max_tokens, stage, on_usage)
+        if asyncio.get_running_loop() is loop:
+            return await coro
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, loop))
+
+    async def stream(
+        self,
+        messages: List[Dict[str, str]],
+        max_tokens: int,
+        stage: str = "summary",
+        on_usage: Optional[Callable[[int, int], None]] = None
+    ) -> AsyncIterator[str]:
+        """
+        Stream a chat completion; usable as a summarizer Streamer from any event loop.
+
+        Streams are throttled and retried like complete(), but a stream that
+        fails after producing text raises instead of retrying, and identical
+        streams are not coalesced.
+
+        Args:
+            messages: Chat messages
+            max_tokens: Completion limit
+            stage: Stage name, recorded in the metrics as youtube_<stage>
+            on_usage: Called with (prompt_tokens, completion_tokens) after the request
+
+        Yields:
+            Text deltas as they arrive
+        """
+        loop = self._ensure_loop()
+        caller = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+
+        def emit(delta: str):
+            caller.call_soon_threadsafe(queue.put_nowait, delta)
+
+        async def produce():
+            try:
+                await self._request(messages, max_tokens, stage, on_token=emit, on_usage=on_usage)
+            finally:
+                caller.call_soon_threadsafe(queue.put_nowait, None)
+
+        future = asyncio.run_coroutine_threadsafe(produce(), loop)
+        try:
+            while (delta := await queue.get()) is not None:
+                yield delta
+            # Surface any error from the request
+            await asyncio.wrap_future(future)
+        finally:
+            future.cancel()
+
+    async def _coalesced(
+        self,
+        messages: List[Dict[str, str]],
+        max_tokens: int,
+        stage: str,
+        on_usage: Optional[Callable[[int, int], None]]
+    ) -> str:
+        """Share one request between identical prompts in flight (runs on the client loop)."""
+        key = hashlib.sha256(
+            json.dumps([self.model, self.temperature, max_tokens, messages], sort_keys=True).encode("utf-8")
+        ).hexdigest()
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            task = asyncio.get_running_loop().create_task(self._request(messages, max_tokens, stage, on_usage=on_usage))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+
+        # Shielded so one caller giving up doesn't cancel the request for the others
+        return await asyncio.shield(task)
+
+    def _backoff(self, attempt: int, error: Exception) -> float:
+        """Full-jitter exponential backoff, never shorter than the server's Retry-After."""
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+        server_delay = retry_after(error)
+        if server_delay is not None:
+            delay = max(delay, min(server_delay, self.max_delay))
+        return delay
+
+    async def _send(self, messages: List[Dict[str, str]], max_tokens: int, on_token: Optional[Callable[[str], None]]):
+        """Make one API call, streaming deltas to on_token if given; returns (text, usage, ttft)."""
+        kwargs = {"model": self.model, "messages": messages, "temperature": self.temperature, "max_tokens": max_tokens}
+        if on_token is None:
+            response = await self.client.chat.completions.create(**kwargs)
+            return response.choices[0].message.content or "", response.usage, None
+
+        start = time.perf_counter()
+        parts, usage, ttft = [], None, None
+        response = await self.client.chat.completions.create(
+            stream=True, stream_options={"include_usage": True}, **kwargs
+        )
+        async for chunk in response:
+            if chunk.usage:
+                usage = chunk.usage
+            delta = chunk.choices[0].delta.content if chunk.choices else None
+            if delta:
+                if ttft is None:
+                    ttft = time.perf_counter() - start
+                parts.append(delta)
+                on_token(delta)
+        return "".join(parts), usage, ttft
+
+    async def _request(
+        self,
+        messages: List[Dict[str, str]],
+        max_tokens: int,
+        stage: str,
+        on_token: Optional[Callable[[str], None]] = None,
+        on_usage: Optional[Callable[[int, int], None]] = None
+    ) -> str:
+        """Send one completion request, throttled and retried."""
+        if self.cache is not None:
+            prompt = json.dumps(messages, ensure_ascii=False)
+            settings = f"max_tokens={max_tokens}"
+            text = self.cache.lookup_text(prompt, self.model, self.temperature, settings)
+            if text is not None:
+                self.cached += 1
+                if on_token:
+                    on_token(text)
+                return text
+
+        estimate = count_message_tokens(messages, self.model) + max_tokens
+        start = time.perf_counter()
+        queued = 0.0
+        streamed = []
+
+        def emit(delta: str):
+            streamed.append(delta)
+            on_token(delta)
+
+        for attempt in range(self.max_retries + 1):
+            queued += await self.requests.acquire(1)
+            queued += await self.tokens.acquire(estimate)
+            try:
+                text, usage, ttft = await self._send(messages, max_tokens, emit if on_token else None)
+            except Exception as e:
+                if isinstance(e, openai.APIStatusError) and e.status_code == 429:
+                    self.rate_limited += 1
+                # A stream that already produced text can't be retried transparently
+                if attempt == self.max_retries or streamed or not is_retryable(e):
+                    self.errors += 1
+                    get_metrics().record(f"youtube_{stage}", time.perf_counter() - start, retries=attempt, error=True)
+                    raise
+                self.retries += 1
+                delay = self._backoff(attempt, e)
+                queued += delay
+                await asyncio.sleep(delay)
+                continue
+
+            self.calls += 1
+            self.throttled_seconds += queued
+            if self.cache is not None and text:
+                self.cache.update_text(prompt, self.model, self.temperature, text, settings)
+            if usage:
+                self.tokens.refund(max(0, estimate - usage.prompt_tokens - usage.completion_tokens))
+                if on_usage:
+                    on_usage(usage.prompt_tokens, usage.completion_tokens)
+
+            get_metrics().record(
+                f"youtube_{stage}",
+                time.perf_counter() - start,
+                ttft=queued + ttft if ttft is not None else None,
+                queue=queued,
+                prompt_tokens=usage.prompt_tokens if usage else None,
+                completion_tokens=usage.completion_tokens if usage else None,
+                retries=attempt
+            )
+            return text
+
+    def get_stats(self) -> Dict[str, any]:
+        """
+        Get client statistics.
+
+        Returns:
+            Dictionary containing completed calls, cache hits, coalesced calls, retries,
+            rate-limit responses, failures and total seconds spent throttled
+        """
+        return {
+            "calls": self.calls,
+            "cached": self.cached,
+            "coalesced": self.coalesced,
+            "retries": self.retries,
+            "rate_limited": self.rate_limited,
+            "errors": self.errors,
+            "in_flight": len(self._inflight),
+            "throttled_seconds": round(self.throttled_seconds, 2)
+        }
+
+    def close(self):
+        """Stop the client's event loop thread."""
+        with self._lock:
+            if self._loop is not None:
+                self._loop.call_soon_threadsafe(self._loop.stop)
+                self._loop = None
@@ -0,0 +1,301 @@
+"""
+The YouTube summarization pipeline as a library function.
+
+summarize_video runs the same steps as the Streamlit app, without
+Streamlit: transcript (cache, then provider), pre-compression, budget plan,
+summary (overview or chapters), summary cache. Backends are providers (see
+providers.py), so the pipeline runs against YouTube and OpenAI, or offline
+against recorded fixtures for tests and benchmarks.
+
+Example:
+    python pipeline.py https://www.youtube.com/watch?v=VIDEO --record fixtures/
+    python pipeline.py VIDEO --replay fixtures/
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+import argparse
+import asyncio
+import json
+import os
+import time
+
+from dotenv import load_dotenv
+
+from budget import BudgetPlan, TokenUsage, count_tokens, plan_summary
+from cache import SummaryCache
+from compress import compress_segments, compression_stats
+from providers import (
+    COMPLETION_FIXTURES,
+    TRANSCRIPT_FIXTURES,
+    LLMProvider,
+    RecordingLLM,
+    RecordingTranscriptProvider,
+    ReplayLLM,
+    ReplayTranscriptProvider,
+    TranscriptProvider
+)
+from summarizer import PROMPT_VERSION, extract_video_id, format_chapters, summarize_chapters, summarize_segments
+from transcripts import TranscriptResult
+
+DEFAULT_MODEL = "gpt-4o-mini"
+
+# Transcript characters per chapter in chapter mode
+CHAPTER_CHARS = 4000
+
+
+@dataclass
+class VideoSummary:
+    """The result of summarizing one video."""
+
+    video_id: str
+    summary: str
+    style: str
+    transcript: TranscriptResult
+    summary_cached: bool
+    usage: TokenUsage
+    compression: Optional[Dict[str, Any]] = None
+    plan: Optional[BudgetPlan] = None
+    chapters: List[Dict[str, Any]] = field(default_factory=list)
+    seconds: Dict[str, float] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the result to a JSON-serializable dictionary, without the transcript text."""
+        return {
+            "video_id": self.video_id,
+            "summary": self.summary,
+            "style": self.style,
+            "language": self.transcript.language,
+            "is_generated": self.transcript.is_generated,
+            "transcript_cached": self.transcript.cached,
+            "summary_cached": self.summary_cached,
+            "compression": self.compression,
+            "plan": self.plan.to_dict() if self.plan else None,
+            "usage": {
+                "calls": self.usage.calls,
+                "prompt_tokens": self.usage.prompt_tokens,
+                "completion_tokens": self.usage.completion_tokens
+            },
+            "seconds": self.seconds
+        }
+
+
+def summary_version(chapters: bool = False, keep_ratio: float = 1.0, plan: Optional[BudgetPlan] = None) -> str:
+    """
+    Build the summary cache version.
+
+    Chapter lists, compressed inputs and summaries degraded to an extractive
+    plan by a cost or latency target are cached separately, so a request
+    without targets never gets a degraded summary.
+
+    Args:
+        chapters: Chapter mode
+        keep_ratio: Share of the transcript kept by pre-compression
+        plan: The overview plan, once known
+
+    Returns:
+        The version string for SummaryCache
+    """
+    version = PROMPT_VERSION
+    if chapters:
+        version += "-chapters"
+    if keep_ratio < 1.0:
+        version += f"-keep{keep_ratio:.1f}"
+    if plan is not None and plan.mode == "extractive":
+        version += f"-extractive{plan.keep_ratio:.2f}"
+    return version
+
+
+async def summarize_video(
+    video_id: str,
+    transcripts: TranscriptProvider,
+    llm: LLMProvider,
+    cache: Optional[SummaryCache] = None,
+    model: str = DEFAULT_MODEL,
+    chapters: bool = False,
+    keep_ratio: float = 1.0,
+    max_cost: Optional[float] = None,
+    max_seconds: Optional[float] = None,
+    max_concurrency: int = 8,
+    chapter_chars: int = CHAPTER_CHARS,
+    on_transcript: Optional[Callable[[TranscriptResult], None]] = None,
+    on_compressed: Optional[Callable[[List[Dict[str, Any]], Dict[str, Any]], None]] = None,
+    on_plan: Optional[Callable[[BudgetPlan, List[Dict[str, Any]]], None]] = None,
+    on_chunk: Optional[Callable[[Dict[str, Any]], None]] = None,
+    on_chapter: Optional[Callable[[Dict[str, Any]], None]] = None,
+    on_token: Optional[Callable[[str], None]] = None
+) -> VideoSummary:
+    """
+    Summarize one video end to end.
+
+    Callbacks run on the calling event loop's thread, so they may update a UI.
+
+    Args:
+        video_id: YouTube video ID
+        transcripts: Transcript provider, e.g. TranscriptFetcher (fetched on a worker thread)
+        llm: LLM provider, e.g. LLMClient
+        cache: Transcript and summary cache
+        model: Model name, for token counts, prices and cache keys
+        chapters: Summarize section by section instead of one overview
+        keep_ratio: Share of the transcript kept by pre-compression
+        max_cost: Cost target in USD for the overview plan
+        max_seconds: Latency target in seconds for the overview plan
+        max_concurrency: Maximum LLM calls in flight
+        chapter_chars: Maximum characters per chapter
+        on_transcript: Called with the transcript once loaded
+        on_compressed: Called with the compressed segments and compression_stats
+        on_plan: Called with the overview plan and the segments it will summarize
+        on_chunk: Called as each overview section summary finishes
+        on_chapter: Called with each chapter, in transcript order
+        on_token: Called with each delta of the streamed overview (streams only when given)
+
+    Returns:
+        The summary, with the plan, token usage and timings
+    """
+    start = time.perf_counter()
+
+    language_key = getattr(transcripts, "language_key", "en")
+    segments = cache.get_transcript(video_id, language_key) if cache else None
+    if segments is not None:
+        transcript = TranscriptResult(segments=segments, language=None, is_generated=None, seconds=0.0, cached=True)
+    else:
+        transcript = await asyncio.to_thread(transcripts.fetch, video_id)
+        if cache:
+            cache.put_transcript(video_id, transcript.segments, language_key)
+    if on_transcript:
+        on_transcript(transcript)
+
+    seconds = {"transcript": round(time.perf_counter() - start, 3)}
+    style = "chapters" if chapters else "overview"
+    usage = TokenUsage()
+
+    # A full summary is served whatever the targets; it costs nothing now
+    version = summary_version(chapters, keep_ratio)
+    transcript_hash = SummaryCache.transcript_hash(transcript.segments)
+    summary = cache.get_summary(video_id, transcript_hash, model, version) if cache else None
+    if summary is not None:
+        seconds["total"] = round(time.perf_counter() - start, 3)
+        return VideoSummary(video_id, summary, style, transcript, summary_cached=True, usage=usage, seconds=seconds)
+
+    # Strip filler and repeated captions, then keep the most central sentences
+    segments = compress_segments(transcript.segments, ratio=keep_ratio)
+    compression = compression_stats(transcript.segments, segments, lambda text: count_tokens(text, model))
+    if on_compressed:
+        on_compressed(segments, compression)
+
+    plan = None
+    chapter_list: List[Dict[str, Any]] = []
+    summary_start = time.perf_counter()
+    if chapters:
+        chapter_list = await summarize_chapters(
+            segments,
+            usage.wrap(llm.complete),
+            max_chunk_chars=chapter_chars,
+            max_concurrency=max_concurrency,
+            on_chapter=on_chapter
+        )
+        summary = format_chapters(chapter_list)
+    else:
+        # Pick single-shot, map-reduce or extractive from the token count and targets
+        plan = plan_summary(segments, model, max_cost=max_cost, max_seconds=max_seconds, max_concurrency=max_concurrency)
+        if plan.mode == "extractive":
+            segments = compress_segments(segments, ratio=plan.keep_ratio)
+            version = summary_version(chapters, keep_ratio, plan)
+            summary = cache.get_summary(video_id, transcript_hash, model, version) if cache else None
+        if on_plan:
+            on_plan(plan, segments)
+
+        if summary is not None:
+            seconds["total"] = round(time.perf_counter() - start, 3)
+            return VideoSummary(
+                video_id, summary, style, transcript, summary_cached=True, usage=usage,
+                compression=compression, plan=plan, seconds=seconds
+            )
+
+        summary = await summarize_segments(
+            segments,
+            usage.wrap(llm.complete),
+            max_chunk_chars=plan.chunk_chars,
+            max_concurrency=max_concurrency,
+            on_chunk=on_chunk,
+            stream=usage.wrap(llm.stream) if on_token else None,
+            on_token=on_token
+        )
+
+    if summary and cache:
+        cache.put_summary(video_id, transcript_hash, model, version, summary)
+
+    seconds["summary"] = round(time.perf_counter() - summary_start, 3)
+    seconds["total"] = round(time.perf_counter() - start, 3)
+    return VideoSummary(
+        video_id,
+        summary,
+        style,
+        transcript,
+        summary_cached=False,
+        usage=usage,
+        compression=compression,
+        plan=plan,
+        chapters=chapter_list,
+        seconds=seconds
+    )
+
+
+def main():
+    """Parse arguments and summarize videos live, while recording, or from fixtures."""
+    load_dotenv()
+
+    parser = argparse.ArgumentParser(description="Summarize YouTube videos without the Streamlit app.")
+    parser.add_argument("videos", nargs="+", help="Video URLs or IDs")
+    backend = parser.add_mutually_exclusive_group()
+    backend.add_argument("--record", metavar="DIR", help="Call YouTube and OpenAI and save fixtures to DIR")
+    backend.add_argument("--replay", metavar="DIR", help="Use the fixtures in DIR instead of the network")
+    parser.add_argument("--model", default=DEFAULT_MODEL)
+    parser.add_argument("--language", default="en", help="Transcript language codes, comma-separated, most preferred first")
+    parser.add_argument("--chapters", action="store_true", help="Summarize chapter by chapter")
+    parser.add_argument("--keep-ratio", type=float, default=1.0, help="Share of the transcript kept by pre-compression")
+    parser.add_argument("--max-cost", type=float, help="Cost target per video in USD")
+    parser.add_argument("--max-seconds", type=float, help="Latency target per video in seconds")
+    parser.add_argument("--cache", help="Transcript and summary cache file (no cache by default)")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON lines")
+    args = parser.parse_args()
+
+    if args.replay:
+        transcripts = ReplayTranscriptProvider(os.path.join(args.replay, TRANSCRIPT_FIXTURES))
+        llm = ReplayLLM(os.path.join(args.replay, COMPLETION_FIXTURES), model=args.model)
+    else:
+        from llm_client import LLMClient
+        from transcripts import TranscriptFetcher
+
+        if not os.getenv("OPENAI_API_KEY"):
+            parser.error("OPENAI_API_KEY is not set.")
+        transcripts = TranscriptFetcher(languages=args.language.split(","))
+        llm = LLMClient(model=args.model)
+        if args.record:
+            os.makedirs(args.record, exist_ok=True)
+            transcripts = RecordingTranscriptProvider(transcripts, os.path.join(args.record, TRANSCRIPT_FIXTURES))
+            llm = RecordingLLM(llm, os.path.join(args.record, COMPLETION_FIXTURES))
+
+    cache = SummaryCache(path=args.cache) if args.cache else None
+
+    for video in args.videos:
+        video_id = extract_video_id(video) or video
+        result = asyncio.run(summarize_video(
+            video_id,
+            transcripts,
+            llm,
+            cache=cache,
+            model=args.model,
+            chapters=args.chapters,
+            keep_ratio=args.keep_ratio,
+            max_cost=args.max_cost,
+            max_seconds=args.max_seconds
+        ))
+        if args.json:
+            print(json.dumps(result.to_dict()), flush=True)
+        else:
+            print(f"# {video_id} ({result.seconds['total']}s, {result.usage.calls} calls)\n\n{result.summary}\n", flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,439 @@
+"""
+Transcript and LLM providers for the YouTube summarizer, with record/replay.
+
+The pipeline only needs two backends:
+- a TranscriptProvider with fetch(video_id) -> TranscriptResult
+  (transcripts.TranscriptFetcher talks to YouTube)
+- an LLMProvider with async complete() and stream() methods taking
+  on_usage (llm_client.LLMClient talks to OpenAI)
+
+The recording providers wrap a live backend and save what it returns to
+fixture files; the replay providers serve those fixtures without any
+network access, optionally with simulated latency. Together they let the
+pipeline run in CI and in deterministic, offline benchmarks.
+
+Code that calls the YouTube libraries directly (TranscriptFetcher, or
+LangChain's YoutubeLoader) can be replayed too: ReplayTranscriptApi stands
+in for YouTubeTranscriptApi and ReplayVideoInfo for pytube.YouTube.
+
+Fixture files:
+- transcripts: JSON object of video ID -> {"language", "is_generated", "segments"}
+  or {"error"} for videos without captions
+- completions: JSONL, one {"key", "stage", "reply", "prompt_tokens", "completion_tokens"} per line
+- video info: JSON object of video ID -> {"title", "author", "description",
+  "views", "length", "thumbnail_url", "publish_date"} (as read from pytube)
+"""
+
+from datetime import datetime
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, List, Optional, Protocol
+import asyncio
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+
+from youtube_transcript_api import FetchedTranscript, FetchedTranscriptSnippet, TranscriptList, TranscriptsDisabled
+
+from budget import count_message_tokens, count_tokens
+from transcripts import TranscriptResult, TranscriptUnavailable
+
+UsageCallback = Callable[[int, int], None]
+
+# File names inside a fixture directory
+TRANSCRIPT_FIXTURES = "transcripts.json"
+COMPLETION_FIXTURES = "completions.jsonl"
+VIDEO_INFO_FIXTURES = "video_info.json"
+
+
+class TranscriptProvider(Protocol):
+    """Anything that fetches a video's transcript."""
+
+    def fetch(self, video_id: str) -> TranscriptResult:
+        """Fetch a transcript, raising TranscriptUnavailable if there is none."""
+        ...
+
+
+class LLMProvider(Protocol):
+    """Anything that completes and streams chat prompts like LLMClient."""
+
+    async def complete(
+        self,
+        messages: List[Dict[str, str]],
+        max_tokens: int,
+        stage: str = "summary",
+        on_usage: Optional[UsageCallback] = None
+    ) -> str:
+        """Get a completion."""
+        ...
+
+    def stream(
+        self,
+        messages: List[Dict[str, str]],
+        max_tokens: int,
+        stage: str = "summary",
+        on_usage: Optional[UsageCallback] = None
+    ) -> AsyncIterator[str]:
+        """Stream a completion as text deltas."""
+        ...
+
+
+def prompt_key(messages: List[Dict[str, str]], max_tokens: int) -> str:
+    """Identify a prompt for recording and replay."""
+    payload = json.dumps({"messages": messages, "max_tokens": max_tokens}, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:24]
+
+
+def split_deltas(text: str) -> List[str]:
+    """Split text into word-sized stream deltas, keeping the whitespace before each word."""
+    return re.findall(r"\s*\S+", text) or [text]
+
+
+# ----------------------------------------------------------------------
+# Transcripts
+# ----------------------------------------------------------------------
+
+class RecordingTranscriptProvider:
+    """Wraps a live transcript provider and saves every result to a fixture file."""
+
+    def __init__(self, provider: TranscriptProvider, path: str):
+        """
+        Initialize the recorder.
+
+        Args:
+            provider: Live provider, e.g. TranscriptFetcher
+            path: Transcript fixture file (created or extended)
+        """
+        self.provider = provider
+        self.path = path
+        self.language_key = getattr(provider, "language_key", "en")
+        self._lock = threading.Lock()
+        self._fixtures = _load_json(path)
+
+    def _save(self, video_id: str, entry: Dict[str, Any]):
+        with self._lock:
+            self._fixtures[video_id] = entry
+            _write_json(self.path, self._fixtures)
+
+    def fetch(self, video_id: str) -> TranscriptResult:
+        """Fetch from the live provider and record the transcript or the missing-captions reason."""
+        try:
+            result = self.provider.fetch(video_id)
+        except TranscriptUnavailable as e:
+            self._save(video_id, {"error": e.reason})
+            raise
+
+        self._save(video_id, {
+            "language": result.language,
+            "is_generated": result.is_generated,
+            "segments": result.segments
+        })
+        return result
+
+
+class ReplayTranscriptProvider:
+    """Serves recorded transcripts without network access."""
+
+    def __init__(self, path: Optional[str] = None, fixtures: Optional[Dict[str, Any]] = None, latency: float = 0.0):
+        """
+        Initialize the replay provider.
+
+        Args:
+            path: Transcript fixture file
+            fixtures: Fixtures given directly, in the file's format (merged over the file)
+            latency: Simulated seconds per fetch
+        """
+        self.fixtures = {**(_load_json(path) if path else {}), **(fixtures or {})}
+        self.latency = latency
+        self.language_key = "en"
+        self.fetched = 0
+
+    def fetch(self, video_id: str) -> TranscriptResult:
+        """Return a recorded transcript, raising TranscriptUnavailable for unknown or caption-less videos."""
+        time.sleep(self.latency)
+        self.fetched += 1
+
+        entry = self.fixtures.get(video_id)
+        if entry is None:
+            raise TranscriptUnavailable(video_id, "not in the recorded fixtures")
+        if "error" in entry:
+            raise TranscriptUnavailable(video_id, entry["error"])
+
+        return TranscriptResult(
+            segments=entry["segments"],
+            language=entry.get("language", "en"),
+            is_generated=entry.get("is_generated", False),
+            seconds=self.latency
+        )
+
+
+class ReplayTranscript:
+    """One recorded transcript, shaped like youtube_transcript_api.Transcript."""
+
+    def __init__(self, provider: ReplayTranscriptProvider, video_id: str, entry: Dict[str, Any]):
+        self.provider = provider
+        self.video_id = video_id
+        self.language_code = entry.get("language", "en")
+        self.language = self.language_code
+        self.is_generated = entry.get("is_generated", False)
+        self.is_translatable = False
+        self.translation_languages = []
+
+    def fetch(self, preserve_formatting: bool = False) -> FetchedTranscript:
+        """Return the recorded snippets through the replay provider."""
+        result = self.provider.fetch(self.video_id)
+        return FetchedTranscript(
+            snippets=[
+                FetchedTranscriptSnippet(text=segment["text"], start=segment["start"], duration=segment["duration"])
+                for segment in result.segments
+            ],
+            video_id=self.video_id,
+            language=self.language,
+            language_code=self.language_code,
+            is_generated=self.is_generated
+        )
+
+    def __str__(self) -> str:
+        return f'{self.language_code} ("{self.language}")'
+
+
+class ReplayTranscriptApi:
+    """
+    Serves a ReplayTranscriptProvider's fixtures through the YouTubeTranscriptApi interface.
+
+    Use it as TranscriptFetcher's api, or patch it over YouTubeTranscriptApi
+    for code that creates its own client, like LangChain's YoutubeLoader.
+    """
+
+    def __init__(self, provider: ReplayTranscriptProvider):
+        """
+        Initialize the replay API.
+
+        Args:
+            provider: Replay provider holding the recorded transcripts
+        """
+        self.provider = provider
+
+    def list(self, video_id: str) -> TranscriptList:
+        """List the recorded transcript, raising TranscriptsDisabled for unknown or caption-less videos."""
+        entry = self.provider.fixtures.get(video_id)
+        if entry is None or "error" in entry:
+            raise TranscriptsDisabled(video_id)
+
+        transcript = ReplayTranscript(self.provider, video_id, entry)
+        transcripts = {transcript.language_code: transcript}
+        return TranscriptList(
+            video_id,
+            manually_created_transcripts={} if transcript.is_generated else transcripts,
+            generated_transcripts=transcripts if transcript.is_generated else {},
+            translation_languages=[]
+        )
+
+    def fetch(self, video_id: str, languages: Iterable[str] = ("en",), preserve_formatting: bool = False) -> FetchedTranscript:
+        """Fetch the recorded transcript in the first matching language."""
+        return self.list(video_id).find_transcript(languages).fetch(preserve_formatting)
+
+
+class RecordedVideo:
+    """Recorded video details, with the pytube.YouTube attributes LangChain reads."""
+
+    def __init__(self, video_id: str, entry: Dict[str, Any]):
+        self.video_id = video_id
+        self.title = entry.get("title")
+        self.author = entry.get("author")
+        self.description = entry.get("description")
+        self.views = entry.get("views")
+        self.length = entry.get("length")
+        self.thumbnail_url = entry.get("thumbnail_url")
+        self.publish_date = datetime.fromisoformat(entry["publish_date"]) if entry.get("publish_date") else None
+
+
+class ReplayVideoInfo:
+    """Serves recorded video details in place of pytube.YouTube."""
+
+    def __init__(self, path: Optional[str] = None, fixtures: Optional[Dict[str, Any]] = None):
+        """
+        Initialize the replay provider.
+
+        Args:
+            path: Video info fixture file
+            fixtures: Fixtures given directly, in the file's format (merged over the file)
+        """
+        self.fixtures = {**(_load_json(path) if path else {}), **(fixtures or {})}
+
+    def __call__(self, url: str) -> RecordedVideo:
+        """Look up a video by URL, like pytube.YouTube(url); raises LookupError if it wasn't recorded."""
+        video_id = re.search(r"v=([0-9A-Za-z_-]{11})", url)
+        entry = self.fixtures.get(video_id.group(1)) if video_id else None
+        if entry is None:
+            raise LookupError(f"No recorded video info for {url}")
+        return RecordedVideo(video_id.group(1), entry)
+
+
+# ----------------------------------------------------------------------
+# LLM
+# ----------------------------------------------------------------------
+
+class RecordingLLM:
+    """Wraps a live LLMProvider and appends every completion to a fixture file."""
+
+    def __init__(self, llm: LLMProvider, path: str):
+        """
+        Initialize the recorder.
+
+        Args:
+            llm: Live provider, e.g. LLMClient
+            path: Completion fixture file (JSONL, appended to)
+        """
+        self.llm = llm
+        self.path = path
+        self._lock = threading.Lock()
+
+    def _record(self, messages: List[Dict[str, str]], max_tokens: int, stage: str, reply: str, usage: List[int]):
+        entry = {
+            "key": prompt_key(messages, max_tokens),
+            "stage": stage,
+            "reply": reply,
+            "prompt_tokens": usage[0] if usage else None,
+            "completion_tokens": usage[1] if usage else None
+        }
+        with self._lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry) + "\n")
+
+    async def complete(
+        self,
+        messages: List[Dict[str, str]],
+        max_tokens: int,
+        stage: str = "summary",
+        on_usage: Optional[UsageCallback] = None
+    ) -> str:
+        """Get a completion from the live provider and record it."""
+        usage: List[int] = []
+
+        def record_usage(prompt_tokens: int, completion_tokens: int):
+            usage[:] = [prompt_tokens, completion_tokens]
+            if on_usage:
+                on_usage(prompt_tokens, completion_tokens)
+
+        reply = await self.llm.complete(messages, max_tokens, stage, on_usage=record_usage)
+        self._record(messages, max_tokens, stage, reply, usage)
+        return reply
+
+    async def stream(
+        self,
+        messages: List[Dict[str, str]],
+        max_tokens: int,
+        stage: str = "summary",
+        on_usage: Optional[UsageCallback] = None
+    ) -> AsyncIterator[str]:
+        """Stream a completion from the live provider and record it once finished."""
+        usage: List[int] = []
+
+        def record_usage(prompt_tokens: int, completion_tokens: int):
+            usage[:] = [prompt_tokens, completion_tokens]
+            if on_usage:
+                on_usage(prompt_tokens, completion_tokens)
+
+        parts = []
+        async for delta in self.llm.stream(messages, max_tokens, stage, on_usage=record_usage):
+            parts.append(delta)
+            yield delta
+        self._record(messages, max_tokens, stage, "".join(parts), usage)
+
+
+class ReplayLLM:
+    """Serves recorded completions, with simulated latency and streaming rate."""
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        default: Optional[str] = None,
+        latency: float = 0.0,
+        tokens_per_second: float = 0.0,
+        model: str = "gpt-4o-mini"
+    ):
+        """
+        Initialize the replay provider.
+
+        Args:
+            path: Completion fixture file (JSONL)
+            default: Reply for prompts that weren't recorded (None raises LookupError)
+            latency: Simulated seconds before the first token
+            tokens_per_second: Simulated streaming rate (0 for no delay)
+            model: Model whose tokenizer estimates usage missing from the fixtures
+        """
+        self.default = default
+        self.latency = latency
+        self.tokens_per_second = tokens_per_second
+        self.model = model
+        self.calls: List[str] = []
+        self._replies: Dict[str, Dict[str, Any]] = {}
+
+        if path and os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self._replies[entry["key"]] = entry
+
+    def _lookup(self, messages: List[Dict[str, str]], max_tokens: int, stage: str) -> Dict[str, Any]:
+        """Find the recorded completion for a prompt."""
+        self.calls.append(stage)
+        entry = self._replies.get(prompt_key(messages, max_tokens))
+        if entry is None:
+            if self.default is None:
+                raise LookupError(f"No recorded {stage} completion for this prompt")
+            entry = {"reply": self.default}
+
+        prompt_tokens = entry.get("prompt_tokens") or count_message_tokens(messages, self.model)
+        completion_tokens = entry.get("completion_tokens") or count_tokens(entry["reply"], self.model)
+        return {"reply": entry["reply"], "usage": (prompt_tokens, completion_tokens)}
+
+    async def complete(
+        self,
+        messages: List[Dict[str, str]],
+        max_tokens: int,
+        stage: str = "summary",
+        on_usage: Optional[UsageCallback] = None
+    ) -> str:
+        """Return the recorded completion after the simulated generation time."""
+        entry = self._lookup(messages, max_tokens, stage)
+        deltas = split_deltas(entry["reply"])
+        await asyncio.sleep(self.latency + (len(deltas) / self.tokens_per_second if self.tokens_per_second else 0))
+        if on_usage:
+            on_usage(*entry["usage"])
+        return entry["reply"]
+
+    async def stream(
+        self,
+        messages: List[Dict[str, str]],
+        max_tokens: int,
+        stage: str = "summary",
+        on_usage: Optional[UsageCallback] = None
+    ) -> AsyncIterator[str]:
+        """Stream the recorded completion at the simulated rate."""
+        entry = self._lookup(messages, max_tokens, stage)
+        await asyncio.sleep(self.latency)
+        for delta in split_deltas(entry["reply"]):
+            if self.tokens_per_second:
+                await asyncio.sleep(1 / self.tokens_per_second)
+            yield delta
+        if on_usage:
+            on_usage(*entry["usage"])
+
+
+def _load_json(path: Optional[str]) -> Dict[str, Any]:
+    """Load a JSON object from a file, or an empty one if it doesn't exist."""
+    if not path or not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _write_json(path: str, value: Dict[str, Any]):
+    """Write a JSON object atomically."""
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump(value, f)
+    os.replace(temp_path, path)
@@ -0,0 +1,129 @@
+"""
+Question answering over a video's timestamped transcript.
+
+The transcript is split into short passages on segment boundaries, each
+embedded locally (see common/embeddings.py) and stored in an in-memory
+vector index (common/vector_index.py). A follow-up question retrieves the
+top-k passages and sends only those, with their timestamps, in a short
+prompt, instead of the whole transcript.
+"""
+
+from typing import Any, Callable, Dict, List, Optional
+import os
+import sys
+
+from summarizer import Completer, chunk_segments, format_timestamp
+
+# Make the shared helpers in Projects/common importable
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from common.embeddings import get_embedder
+from common.vector_index import build_index
+
+QA_SYSTEM_PROMPT = "You answer questions about a YouTube video from excerpts of its transcript."
+
+QA_PROMPT = """Answer the question using only these excerpts from the video's transcript.
+Cite the timestamps you rely on, like [12:34]. If the excerpts don't contain the answer, say so.
+
+{context}
+
+Question: {question}"""
+
+
+class TranscriptIndex:
+    """Vector index over a transcript's timestamped passages."""
+
+    def __init__(
+        self,
+        segments: List[Dict[str, Any]],
+        embedder: Optional[Any] = None,
+        passage_chars: int = 500,
+        ivf_threshold: int = 4096
+    ):
+        """
+        Split, embed and index a transcript.
+
+        Args:
+            segments: Segments from to_segments
+            embedder: Object with embed(texts) (default: get_embedder())
+            passage_chars: Maximum characters per passage
+            ivf_threshold: Passages at which the flat index is replaced by IVF
+        """
+        self.embedder = embedder or get_embedder()
+        self.passages = [
+            {"text": chunk["text"], "start": chunk["start"], "end": chunk["end"]}
+            for chunk in chunk_segments(segments, passage_chars)
+        ]
+        self.index = None
+        if self.passages:
+            self.index = build_index(self.embedder.embed([p["text"] for p in self.passages]), ivf_threshold)
+
+    def __len__(self) -> int:
+        return len(self.passages)
+
+    def search(self, question: str, k: int = 5) -> List[Dict[str, Any]]:
+        """
+        Find the passages most relevant to a question.
+
+        Args:
+            question: The question
+            k: Number of passages
+
+        Returns:
+            Passages ({"text", "start", "end", "score"}), best first
+        """
+        if self.index is None:
+            return []
+
+        scores, ids = self.index.search(self.embedder.embed([question]), k)
+        return [
+            {**self.passages[i], "score": round(float(score), 4)}
+            for score, i in zip(scores[0], ids[0])
+            if i >= 0
+        ]
+
+
+def build_qa_prompt(question: str, passages: List[Dict[str, Any]]) -> str:
+    """Build the answer prompt from retrieved passages, in transcript order."""
+    context = "\n\n".join(
+        f"[{format_timestamp(p['start'])} - {format_timestamp(p['end'])}]\n{p['text']}"
+        for p in sorted(passages, key=lambda p: p["start"])
+    )
+    return QA_PROMPT.format(context=context, question=question)
+
+
+async def answer_question(
+    index: TranscriptIndex,
+    question: str,
+    complete: Completer,
+    k: int = 5,
+    max_tokens: int = 400,
+    on_sources: Optional[Callable[[List[Dict[str, Any]]], None]] = None
+) -> Dict[str, Any]:
+    """
+    Answer a question from the top-k transcript passages.
+
+    Args:
+        index: Index of the video's transcript
+        question: The question
+        complete: Async completion function, e.g. LLMClient.complete
+        k: Passages sent to the model
+        max_tokens: Completion limit for the answer
+        on_sources: Called with the retrieved passages before the model is called
+
+    Returns:
+        Dictionary containing the answer, the passages used as sources and the prompt sent
+    """
+    passages = index.search(question, k)
+    if on_sources:
+        on_sources(passages)
+    if not passages:
+        return {"answer": "", "sources": [], "prompt": ""}
+
+    prompt = build_qa_prompt(question, passages)
+    messages = [
+        {"role": "system", "content": QA_SYSTEM_PROMPT},
+        {"role": "user", "content": prompt}
+    ]
+    answer = await complete(messages, max_tokens, "qa")
+    return {"answer": answer, "sources": passages, "prompt": prompt}
@@ -0,0 +1,331 @@
+"""
+Map-reduce summarization for long YouTube transcripts.
+
+The transcript is split into chunks on segment boundaries (preferring
+pauses in speech), every chunk is summarized concurrently, and the chunk
+summaries are combined hierarchically into one summary. Long videos get
+full coverage in roughly the wall-clock time of two LLM calls.
+"""
+
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, List, Optional
+import asyncio
+import re
+
+
+# Bump when the prompts change so cached summaries are not reused
+PROMPT_VERSION = "1"
+
+SYSTEM_PROMPT = "You are a helpful assistant that creates concise, informative summaries of YouTube video transcripts."
+
+SUMMARY_PROMPT = """Please provide a comprehensive summary of this YouTube video transcript in bullet points:
+
+{text}
+
+Include:
+- Main topic/theme
+- Key points discussed
+- Important conclusions or takeaways"""
+
+MAP_PROMPT = """Summarize this section ({start} - {end}) of a YouTube video transcript in 3-6 concise bullet points.
+Keep names, numbers and conclusions; skip filler.
+
+{text}"""
+
+REDUCE_PROMPT = """These are summaries of consecutive sections of one YouTube video, with their timestamps.
+Combine them into a single comprehensive summary in bullet points.
+
+{text}
+
+Include:
+- Main topic/theme
+- Key points discussed
+- Important conclusions or takeaways"""
+
+COMBINE_PROMPT = """These are summaries of consecutive sections of one YouTube video, with their timestamps.
+Merge them into one shorter list of bullet points covering {start} - {end}, keeping the most important points.
+
+{text}"""
+
+# An async function taking chat messages, a max_tokens limit and a stage name
+Completer = Callable[[List[Dict[str, str]], int, str], Awaitable[str]]
+
+# Like a Completer, but yields the completion as text deltas
+Streamer = Callable[[List[Dict[str, str]], int, str], AsyncIterator[str]]
+
+
+def extract_video_id(url: str) -> Optional[str]:
+    """Extract video ID from YouTube URL"""
+    patterns = [
+        r'(?:v=|\/)([0-9A-Za-z_-]{11}).*',
+        r'(?:embed\/)([0-9A-Za-z_-]{11})',
+        r'(?:watch\?v=)([0-9A-Za-z_-]{11})'
+    ]
+    for pattern in patterns:
+        match = re.search(pattern, url)
+        if match:
+            return match.group(1)
+    return None
+
+
+def to_segments(transcript: Iterable[Any]) -> List[Dict[str, Any]]:
+    """
+    Convert fetched transcript snippets into plain segment dictionaries.
+
+    Args:
+        transcript: Snippets with text, start and duration (objects or dicts)
+
+    Returns:
+        List of {"text", "start", "duration"} dictionaries
+    """
+    segments = []
+    for snippet in transcript:
+        if isinstance(snippet, dict):
+            text, start, duration = snippet["text"], snippet.get("start", 0.0), snippet.get("duration", 0.0)
+        else:
+            text, start, duration = snippet.text, snippet.start, snippet.duration
+        text = " ".join(text.split())
+        if text:
+            segments.append({"text": text, "start": float(start), "duration": float(duration)})
+    return segments
+
+
+def format_timestamp(seconds: float) -> str:
+    """Format seconds as m:ss or h:mm:ss."""
+    seconds = int(seconds)
+    hours, rest = divmod(seconds, 3600)
+    minutes, secs = divmod(rest, 60)
+    if hours:
+        return f"{hours}:{minutes:02d}:{secs:02d}"
+    return f"{minutes}:{secs:02d}"
+
+
+def _make_chunk(segments: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Build a chunk from consecutive segments."""
+    last = segments[-1]
+    return {
+        "start": segments[0]["start"],
+        "end": last["start"] + last["duration"],
+        "text": " ".join(segment["text"] for segment in segments)
+    }
+
+
+def chunk_segments(segments: List[Dict[str, Any]], max_chars: int = 8000) -> List[Dict[str, Any]]:
+    """
+    Split transcript segments into chunks of at most max_chars characters.
+
+    Chunks never split a segment. Once a chunk is full, it is cut at the
+    longest pause in its last quarter so sections end at natural breaks.
+
+    Args:
+        segments: Segments from to_segments
+        max_chars: Maximum characters per chunk
+
+    Returns:
+        List of {"start", "end", "text"} chunks in transcript order
+    """
+    chunks = []
+    current: List[Dict[str, Any]] = []
+    length = 0
+
+    for segment in segments:
+        if current and length + len(segment["text"]) + 1 > max_chars:
+            # Find the longest pause in the last quarter of the chunk
+            best, best_gap = len(current), -1.0
+            position = 0
+            for i in range(1, len(current)):
+                position += len(current[i - 1]["text"]) + 1
+                if position < 0.75 * length:
+                    continue
+                gap = current[i]["start"] - (current[i - 1]["start"] + current[i - 1]["duration"])
+                if gap > best_gap:
+                    best, best_gap = i, gap
+
+            chunks.append(_make_chunk(current[:best]))
+            current = current[best:]
+            length = sum(len(s["text"]) + 1 for s in current)
+
+        current.append(segment)
+        length += len(segment["text"]) + 1
+
+    if current:
+        chunks.append(_make_chunk(current))
+
+    return chunks
+
+
+def _messages(prompt: str) -> List[Dict[str, str]]:
+    """Build the chat messages for a prompt."""
+    return [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": prompt}
+    ]
+
+
+def _map_prompt(chunk: Dict[str, Any]) -> str:
+    """Build the prompt summarizing one section."""
+    return MAP_PROMPT.format(
+        start=format_timestamp(chunk["start"]),
+        end=format_timestamp(chunk["end"]),
+        text=chunk["text"]
+    )
+
+
+async def _final(
+    prompt: str,
+    max_tokens: int,
+    stage: str,
+    complete: Completer,
+    stream: Optional[Streamer],
+    on_token: Optional[Callable[[str], None]]
+) -> str:
+    """Run the call producing the final summary, streaming it when possible."""
+    if stream is None or on_token is None:
+        return await complete(_messages(prompt), max_tokens, stage)
+
+    parts = []
+    async for delta in stream(_messages(prompt), max_tokens, stage):
+        parts.append(delta)
+        on_token(delta)
+    return "".join(parts)
+
+
+def _labelled(summaries: List[Dict[str, Any]]) -> str:
+    """Join section summaries, each headed by its time range."""
+    return "\n\n".join(
+        f"[{format_timestamp(s['start'])} - {format_timestamp(s['end'])}]\n{s['summary']}"
+        for s in summaries
+    )
+
+
+async def summarize_segments(
+    segments: List[Dict[str, Any]],
+    complete: Completer,
+    max_chunk_chars: int = 8000,
+    max_concurrency: int = 8,
+    fan_in: int = 8,
+    max_tokens: int = 800,
+    on_chunk: Optional[Callable[[Dict[str, Any]], None]] = None,
+    stream: Optional[Streamer] = None,
+    on_token: Optional[Callable[[str], None]] = None
+) -> str:
+    """
+    Summarize a transcript, using map-reduce when it doesn't fit in one chunk.
+
+    With stream and on_token, the final summary (the single-shot or reduce
+    call) is streamed, so it can be shown while it is being written.
+
+    Args:
+        segments: Segments from to_segments
+        complete: Async completion function, e.g. LLMClient.complete
+        max_chunk_chars: Maximum characters sent per map call
+        max_concurrency: Maximum LLM calls in flight
+        fan_in: Maximum section summaries combined per reduce call
+        max_tokens: Completion limit for the final summary
+        on_chunk: Called with {"index", "total", "start", "end", "summary"} as
+            each section summary finishes (in completion order)
+        stream: Async streaming function, e.g. LLMClient.stream
+        on_token: Called with each text delta of the final summary
+
+    Returns:
+        The final summary
+    """
+    chunks = chunk_segments(segments, max_chunk_chars)
+    if not chunks:
+        return ""
+
+    if len(chunks) == 1:
+        prompt = SUMMARY_PROMPT.format(text=chunks[0]["text"])
+        return await _final(prompt, max_tokens, "summary", complete, stream, on_token)
+
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def limited(prompt: str, limit: int, stage: str) -> str:
+        async with semaphore:
+            return await complete(_messages(prompt), limit, stage)
+
+    async def summarize_chunk(index: int, chunk: Dict[str, Any]) -> Dict[str, Any]:
+        summary = await limited(_map_prompt(chunk), 300, "map")
+        result = {"index": index, "total": len(chunks), "start": chunk["start"], "end": chunk["end"], "summary": summary}
+        if on_chunk:
+            on_chunk(result)
+        return result
+
+    summaries = list(await asyncio.gather(*(summarize_chunk(i, c) for i, c in enumerate(chunks))))
+
+    # Combine in groups until one reduce call can see every section summary
+    while len(summaries) > fan_in:
+        groups = [summaries[i:i + fan_in] for i in range(0, len(summaries), fan_in)]
+
+        async def combine(group: List[Dict[str, Any]]) -> Dict[str, Any]:
+            start, end = group[0]["start"], group[-1]["end"]
+            summary = await limited(
+                COMBINE_PROMPT.format(
+                    start=format_timestamp(start),
+                    end=format_timestamp(end),
+                    text=_labelled(group)
+                ),
+                400,
+                "combine"
+            )
+            return {"start": start, "end": end, "summary": summary}
+
+        summaries = list(await asyncio.gather(*(combine(group) for group in groups)))
+
+    # Every other call has finished, so the final one needs no semaphore
+    prompt = REDUCE_PROMPT.format(text=_labelled(summaries))
+    return await _final(prompt, max_tokens, "reduce", complete, stream, on_token)
+
+
+async def summarize_chapters(
+    segments: List[Dict[str, Any]],
+    complete: Completer,
+    max_chunk_chars: int = 4000,
+    max_concurrency: int = 8,
+    on_chapter: Optional[Callable[[Dict[str, Any]], None]] = None
+) -> List[Dict[str, Any]]:
+    """
+    Summarize a transcript section by section, emitting chapters in order.
+
+    Sections are summarized concurrently, earliest first. Each chapter is
+    emitted as soon as it and every chapter before it are done, so the
+    start of a long video can be read while later sections are processed.
+
+    Args:
+        segments: Segments from to_segments
+        complete: Async completion function, e.g. LLMClient.complete
+        max_chunk_chars: Maximum characters per chapter
+        max_concurrency: Maximum LLM calls in flight
+        on_chapter: Called with {"index", "total", "start", "end", "summary"}
+            for each chapter, in transcript order
+
+    Returns:
+        The chapters in transcript order
+    """
+    chunks = chunk_segments(segments, max_chunk_chars)
+    semaphore = asyncio.Semaphore(max_concurrency)
+    chapters: List[Optional[Dict[str, Any]]] = [None] * len(chunks)
+    emitted = 0
+
+    async def summarize_chunk(index: int, chunk: Dict[str, Any]):
+        nonlocal emitted
+        # The semaphore wakes waiters in order, so earlier chapters start first
+        async with semaphore:
+            summary = await complete(_messages(_map_prompt(chunk)), 300, "chapter")
+        chapters[index] = {"index": index, "total": len(chunks), "start": chunk["start"], "end": chunk["end"], "summary": summary}
+
+        while emitted < len(chapters) and chapters[emitted] is not None:
+            if on_chapter:
+                on_chapter(chapters[emitted])
+            emitted += 1
+
+    await asyncio.gather(*(summarize_chunk(i, c) for i, c in enumerate(chunks)))
+    return chapters
+
+
+def format_chapters(chapters: List[Dict[str, Any]]) -> str:
+    """Format chapters as Markdown, each headed by its time range."""
+    return "\n\n".join(
+        f"**{format_timestamp(c['start'])} – {format_timestamp(c['end'])}**\n\n{c['summary']}"
+        for c in chapters
+    )
+
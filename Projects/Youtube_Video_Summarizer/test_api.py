@@ -1,26 +1,43 @@
-import os
-from dotenv import load_dotenv
-from openai import OpenAI
-
-load_dotenv()
-
-api_key = os.getenv("OPENAI_API_KEY")
-
-if not api_key:
-    print("ERROR: OPENAI_API_KEY not found in environment")
-    print("Please create a .env file with your API key")
-else:
-    print(f"API Key found: {api_key[:10]}...")
-    
-    try:
-        client = OpenAI(api_key=api_key)
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "user", "content": "Say hello"}
-            ]
-        )
-        print("SUCCESS! API is working")
-        print(f"Response: {response.choices[0].message.content}")
-    except Exception as e:
-        print(f"ERROR: {e}")
+"""
+Tests for the LLM provider interface used by the summarizer.
+Note: Completions are replayed from fixtures/completions.jsonl, so no API calls are made.
+"""
+
+import asyncio
+
+import pytest
+
+HELLO = [{"role": "user", "content": "Say hello"}]
+
+
+class TestLLMProvider:
+    """Test cases for completing a prompt through an LLM provider."""
+
+    def test_completes_a_prompt(self, replay_llm):
+        """Test that a recorded prompt returns its reply and reports token usage."""
+        usage = []
+
+        reply = asyncio.run(replay_llm.complete(HELLO, 50, stage="hello", on_usage=lambda *tokens: usage.append(tokens)))
+
+        assert reply == "Hello! How can I help you today?"
+        assert usage == [(10, 8)]
+        assert replay_llm.calls == ["hello"]
+
+    def test_streams_the_same_reply(self, replay_llm):
+        """Test that streaming a recorded prompt yields the reply in deltas."""
+        async def collect():
+            return [delta async for delta in replay_llm.stream(HELLO, 50, stage="hello")]
+
+        deltas = asyncio.run(collect())
+
+        assert len(deltas) > 1
+        assert "".join(deltas) == "Hello! How can I help you today?"
+
+    def test_unrecorded_prompt_fails(self, replay_llm):
+        """Test that prompts missing from the fixtures fail instead of calling the API."""
+        with pytest.raises(LookupError, match="No recorded"):
+            asyncio.run(replay_llm.complete([{"role": "user", "content": "Say goodbye"}], 50))
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
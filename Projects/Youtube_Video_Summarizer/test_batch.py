@@ -0,0 +1,128 @@
+"""
+Tests for batch summarization.
+Note: Transcripts and the LLM are stubs, so no network calls are made.
+"""
+
+import asyncio
+import csv
+import json
+import time
+
+from batch import collect_video_ids, load_finished, run_batch
+from cache import SummaryCache
+from pipeline import summarize_video
+from providers import ReplayLLM
+from transcripts import TranscriptResult, TranscriptUnavailable
+
+
+class StubTranscripts:
+    """Transcript provider that records the videos it fetches."""
+
+    language_key = "en"
+
+    def __init__(self, fail=()):
+        self.fail = set(fail)
+        self.fetched = []
+
+    def fetch(self, video_id):
+        self.fetched.append(video_id)
+        if video_id in self.fail:
+            raise TranscriptUnavailable(video_id, "Transcripts are disabled")
+        segments = [{"text": f"{video_id} segment {i}.", "start": i * 4.0, "duration": 4.0} for i in range(5)]
+        return TranscriptResult(segments=segments, language="en", is_generated=False, seconds=0.0)
+
+
+def make_llm(latency=0.0):
+    """Build an LLM provider answering every prompt with one bullet point."""
+    return ReplayLLM(default="- point", latency=latency)
+
+
+class TestInputs:
+    """Test cases for turning inputs into video IDs."""
+
+    def test_collects_unique_ids_from_urls_and_ids(self):
+        """Test URL parsing, bare IDs, de-duplication and skipping bad input."""
+        inputs = [
+            "https://www.youtube.com/watch?v=dQw4w9WgXcQ",
+            "https://youtu.be/dQw4w9WgXcQ",
+            "9bZkp7q19f0",
+            "not a video"
+        ]
+        assert collect_video_ids(inputs) == ["dQw4w9WgXcQ", "9bZkp7q19f0"]
+
+
+class TestRunBatch:
+    """Test cases for run_batch."""
+
+    def test_writes_jsonl_results_and_resumes(self, tmp_path):
+        """Test that a re-run skips finished videos and retries failures."""
+        output = str(tmp_path / "out.jsonl")
+        video_ids = ["aaaaaaaaaaa", "bbbbbbbbbbb", "ccccccccccc"]
+
+        counts = asyncio.run(run_batch(
+            video_ids, make_llm(), output, transcripts=StubTranscripts(fail={"bbbbbbbbbbb"})
+        ))
+        assert counts == {"ok": 2, "error": 1, "skipped": 0}
+
+        rows = [json.loads(line) for line in open(output)]
+        assert {row["video_id"]: row["status"] for row in rows} == {
+            "aaaaaaaaaaa": "ok", "bbbbbbbbbbb": "error", "ccccccccccc": "ok"
+        }
+        assert "Transcripts are disabled" in next(row["error"] for row in rows if row["status"] == "error")
+
+        transcripts = StubTranscripts()
+        counts = asyncio.run(run_batch(video_ids, make_llm(), output, transcripts=transcripts))
+        assert counts == {"ok": 1, "error": 0, "skipped": 2}
+        assert transcripts.fetched == ["bbbbbbbbbbb"]
+        assert load_finished(output) == set(video_ids)
+
+    def test_writes_csv(self, tmp_path):
+        """Test CSV output with a single header across runs."""
+        output = str(tmp_path / "out.csv")
+        asyncio.run(run_batch(["aaaaaaaaaaa"], make_llm(), output, transcripts=StubTranscripts()))
+        asyncio.run(run_batch(["bbbbbbbbbbb"], make_llm(), output, transcripts=StubTranscripts()))
+
+        rows = list(csv.DictReader(open(output, newline="")))
+        assert [row["video_id"] for row in rows] == ["aaaaaaaaaaa", "bbbbbbbbbbb"]
+        assert all(row["summary"] == "- point" for row in rows)
+        assert all(row["mode"] == "single_shot" and row["calls"] == "1" for row in rows)
+
+    def test_resume_ignores_truncated_line(self, tmp_path):
+        """Test that a half-written last line from a crash is ignored."""
+        output = tmp_path / "out.jsonl"
+        output.write_text(json.dumps({"video_id": "aaaaaaaaaaa", "status": "ok"}) + "\n{\"video_id\": \"bbb")
+        assert load_finished(str(output)) == {"aaaaaaaaaaa"}
+
+    def test_videos_are_summarized_concurrently(self, tmp_path):
+        """Test that slow LLM calls for different videos overlap."""
+        video_ids = [f"video{i:06d}" for i in range(8)]
+        start = time.perf_counter()
+        asyncio.run(run_batch(
+            video_ids, make_llm(latency=0.2), str(tmp_path / "out.jsonl"),
+            transcripts=StubTranscripts(), max_videos=8
+        ))
+        assert time.perf_counter() - start < 0.2 * 4
+
+    def test_uses_cache(self, tmp_path):
+        """Test that cached summaries skip the fetch and the LLM."""
+        cache = SummaryCache(path=str(tmp_path / "cache.db"))
+        transcripts, llm = StubTranscripts(), make_llm()
+        asyncio.run(run_batch(["aaaaaaaaaaa"], llm, str(tmp_path / "one.jsonl"), transcripts=transcripts, cache=cache))
+        asyncio.run(run_batch(["aaaaaaaaaaa"], llm, str(tmp_path / "two.jsonl"), transcripts=transcripts, cache=cache))
+
+        assert transcripts.fetched == ["aaaaaaaaaaa"]
+        assert len(llm.calls) == 1
+        assert json.loads(open(tmp_path / "two.jsonl").readline())["mode"] == "cached"
+        cache.close()
+
+    def test_shares_summaries_with_the_pipeline(self, tmp_path):
+        """Test that a video summarized by the app's pipeline is served to a batch job from the cache."""
+        cache = SummaryCache(path=str(tmp_path / "cache.db"))
+        transcripts, llm = StubTranscripts(), make_llm()
+        asyncio.run(summarize_video("aaaaaaaaaaa", transcripts, llm, cache=cache))
+
+        asyncio.run(run_batch(["aaaaaaaaaaa"], llm, str(tmp_path / "out.jsonl"), transcripts=transcripts, cache=cache))
+
+        assert transcripts.fetched == ["aaaaaaaaaaa"]
+        assert len(llm.calls) == 1
+        cache.close()
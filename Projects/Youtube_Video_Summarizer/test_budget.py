@@ -0,0 +1,108 @@
+"""
+Tests for token budgeting.
+Note: Token counts fall back to the character estimate when tiktoken's encodings can't be loaded.
+"""
+
+import asyncio
+
+import pytest
+from budget import TokenUsage, count_tokens, plan_summary
+from summarizer import chunk_segments
+from common import tokens
+
+
+def make_segments(total_chars, segment_chars=200):
+    """Build segments adding up to roughly total_chars characters."""
+    words = "the speaker explains transformer attention and training data for language models "
+    text = (words * (segment_chars // len(words) + 1))[:segment_chars]
+    return [{"text": text, "start": i * 5.0, "duration": 5.0} for i in range(total_chars // segment_chars)]
+
+
+class TestCounting:
+    """Test cases for token counting."""
+
+    def test_counts_tokens(self):
+        """Test that counts are positive and roughly proportional to length."""
+        short = count_tokens("hello world")
+        long = count_tokens("hello world " * 100)
+
+        assert 0 < short < 10
+        assert 50 * short < long
+
+    def test_falls_back_without_tokenizer(self, monkeypatch):
+        """Test the four-characters-per-token estimate."""
+        monkeypatch.setattr(tokens, "get_tokenizer", lambda model: None)
+        assert count_tokens("x" * 400) == 100
+
+
+class TestPlanning:
+    """Test cases for plan_summary."""
+
+    def test_short_transcript_is_single_shot(self):
+        """Test that a transcript fitting the context is summarized in one call."""
+        segments = make_segments(20_000)
+        plan = plan_summary(segments, "gpt-4o-mini")
+
+        assert plan.mode == "single_shot"
+        assert plan.calls == 1
+        assert len(chunk_segments(segments, plan.chunk_chars)) == 1
+
+    def test_transcript_over_context_uses_map_reduce(self):
+        """Test that exceeding the context window switches to map-reduce."""
+        plan = plan_summary(make_segments(200_000), "gpt-3.5-turbo")
+
+        assert plan.mode == "map_reduce"
+        assert plan.calls > 1
+        assert plan.chunk_chars < 200_000
+        assert "context" in plan.reason
+
+    def test_latency_target_prefers_parallel_map_reduce(self):
+        """Test that a latency target can rule out one long single-shot call."""
+        segments = make_segments(300_000)
+        relaxed = plan_summary(segments, "gpt-4o-mini", max_concurrency=64)
+        assert relaxed.mode == "single_shot"
+
+        plan = plan_summary(segments, "gpt-4o-mini", max_seconds=relaxed.seconds * 0.75, max_concurrency=64)
+        assert plan.mode == "map_reduce"
+        assert plan.seconds <= relaxed.seconds * 0.75
+
+    def test_cost_target_uses_extractive(self):
+        """Test that a tight cost target keeps only part of the transcript."""
+        segments = make_segments(300_000)
+        full = plan_summary(segments, "gpt-4o-mini")
+
+        plan = plan_summary(segments, "gpt-4o-mini", max_cost=full.cost / 3)
+        assert plan.mode == "extractive"
+        assert plan.keep_ratio < 0.4
+        assert plan.cost <= full.cost / 3
+
+    def test_unreachable_target_keeps_minimum(self):
+        """Test that impossible targets still produce a plan."""
+        plan = plan_summary(make_segments(100_000), "gpt-4o-mini", max_cost=0.0)
+
+        assert plan.mode == "extractive"
+        assert plan.keep_ratio == pytest.approx(0.1)
+        assert "can't be met" in plan.reason
+
+
+class TestTokenUsage:
+    """Test cases for TokenUsage."""
+
+    def test_records_usage_and_compares(self):
+        """Test that wrapped calls report their usage for comparison with the plan."""
+        async def complete(messages, max_tokens, stage, on_usage=None):
+            on_usage(100, 20)
+            return "- point"
+
+        usage = TokenUsage()
+        metered = usage.wrap(complete)
+        asyncio.run(metered([], 50, "map"))
+        asyncio.run(metered([], 50, "reduce"))
+
+        plan = plan_summary(make_segments(1_000))
+        report = usage.compare(plan)
+
+        assert report["calls"] == {"estimated": 1, "actual": 2}
+        assert report["prompt_tokens"]["actual"] == 200
+        assert report["completion_tokens"]["actual"] == 40
+        assert report["cost"]["actual"] > 0
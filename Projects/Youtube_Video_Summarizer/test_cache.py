@@ -0,0 +1,112 @@
+"""
+Tests for the transcript and summary cache.
+"""
+
+import pytest
+from cache import SummaryCache
+
+
+def make_segments(text="hello world", count=3):
+    """Build a few transcript segments."""
+    return [{"text": f"{text} {i}", "start": i * 4.0, "duration": 4.0} for i in range(count)]
+
+
+@pytest.fixture
+def cache(tmp_path):
+    """Create a cache in a temporary directory."""
+    cache = SummaryCache(path=str(tmp_path / "cache.db"))
+    yield cache
+    cache.close()
+
+
+class TestSummaryCache:
+    """Test cases for SummaryCache."""
+
+    def test_transcript_round_trip(self, cache):
+        """Test that stored segments are returned unchanged."""
+        segments = make_segments()
+        cache.put_transcript("abc", segments, "en")
+
+        assert cache.get_transcript("abc", "en") == segments
+        assert cache.get_transcript("abc", "de") is None
+
+    def test_summary_key_includes_model_and_prompt_version(self, cache):
+        """Test that a summary is only reused for the same model and prompts."""
+        transcript_hash = SummaryCache.transcript_hash(make_segments())
+        cache.put_summary("abc", transcript_hash, "gpt-4o-mini", "1", "- point")
+
+        assert cache.get_summary("abc", transcript_hash, "gpt-4o-mini", "1") == "- point"
+        assert cache.get_summary("abc", transcript_hash, "gpt-4o", "1") is None
+        assert cache.get_summary("abc", transcript_hash, "gpt-4o-mini", "2") is None
+
+    def test_transcript_hash_changes_with_text(self):
+        """Test that edited captions invalidate cached summaries."""
+        assert SummaryCache.transcript_hash(make_segments("a")) != SummaryCache.transcript_hash(make_segments("b"))
+        assert SummaryCache.transcript_hash(make_segments()) == SummaryCache.transcript_hash(make_segments())
+
+    def test_persists_across_instances(self, tmp_path):
+        """Test that entries survive reopening the database."""
+        path = str(tmp_path / "cache.db")
+        first = SummaryCache(path=path)
+        first.put_summary("abc", "hash", "model", "1", "- point")
+        first.close()
+
+        second = SummaryCache(path=path)
+        assert second.get_summary("abc", "hash", "model", "1") == "- point"
+        second.close()
+
+    def test_stats_track_hits_and_misses_per_level(self, cache):
+        """Test hit and miss counting for each level."""
+        cache.put_transcript("abc", make_segments())
+        cache.get_transcript("abc")
+        cache.get_transcript("missing")
+        cache.get_summary("abc", "hash", "model", "1")
+
+        stats = cache.get_stats()
+        assert stats["transcripts"] == {"entries": 1, "hits": 1, "misses": 1, "hit_rate": 0.5}
+        assert stats["summaries"]["misses"] == 1
+        assert stats["summaries"]["hit_rate"] == 0.0
+        assert stats["size_bytes"] > 0
+
+    def test_evicts_least_recently_used_when_full(self, tmp_path):
+        """Test that the store is trimmed to max_bytes, oldest use first."""
+        # Random-looking text compresses poorly, so each entry is large
+        import random
+        rng = random.Random(0)
+        text = "".join(rng.choice("abcdefghijklmnopqrstuvwxyz ") for _ in range(4000))
+
+        cache = SummaryCache(path=str(tmp_path / "cache.db"), max_bytes=7000)
+        cache.put_summary("a", "h", "m", "1", text + "a")
+        cache.put_summary("b", "h", "m", "1", text + "b")
+
+        # Touch "a" so "b" becomes the least recently used
+        assert cache.get_summary("a", "h", "m", "1") is not None
+        cache.put_transcript("c", [{"text": text, "start": 0.0, "duration": 1.0}])
+
+        assert cache.get_summary("b", "h", "m", "1") is None
+        assert cache.get_summary("a", "h", "m", "1") is not None
+        assert cache.get_transcript("c") is not None
+
+        stats = cache.get_stats()
+        assert stats["evictions"] == 1
+        assert stats["size_bytes"] <= 7000
+        cache.close()
+
+    def test_clear(self, cache):
+        """Test that clear removes every entry."""
+        cache.put_transcript("abc", make_segments())
+        cache.put_summary("abc", "hash", "model", "1", "- point")
+        cache.clear()
+
+        assert cache.get_transcript("abc") is None
+        assert cache.get_summary("abc", "hash", "model", "1") is None
+
+    def test_missing_transcripts_expire(self, cache):
+        """Test that videos without captions are remembered until their TTL passes."""
+        cache.put_missing("abc", "TranscriptsDisabled", "en", ttl=60)
+        cache.put_missing("old", "TranscriptsDisabled", "en", ttl=0)
+
+        assert cache.get_missing("abc", "en") == "TranscriptsDisabled"
+        assert cache.get_missing("abc", "de") is None
+        assert cache.get_missing("old", "en") is None
+        assert cache.get_stats()["missing"] == 1
@@ -1,45 +1,70 @@
-from youtube_transcript_api import YouTubeTranscriptApi
-from openai import OpenAI
-import os
-from dotenv import load_dotenv
-
-load_dotenv()
-
-video_id = "dQw4w9WgXcQ"
-api_key = os.getenv("OPENAI_API_KEY")
-
-print("Step 1: Fetching transcript...")
-try:
-    api = YouTubeTranscriptApi()
-    transcript_list = api.fetch(video_id)
-    transcript_text = " ".join([item.text for item in transcript_list])
-    print(f"✅ Success! Got {len(transcript_text)} characters")
-    print(f"Preview: {transcript_text[:200]}...")
-except Exception as e:
-    print(f"❌ Error: {e}")
-    exit(1)
-
-print("\nStep 2: Generating summary with OpenAI...")
-try:
-    client = OpenAI(api_key=api_key)
-    
-    # Truncate
-    transcript_text = transcript_text[:8000]
-    
-    response = client.chat.completions.create(
-        model="gpt-4o-mini",
-        messages=[
-            {"role": "system", "content": "You are a helpful assistant that creates concise summaries."},
-            {"role": "user", "content": f"Summarize this in 3-5 bullet points:\n\n{transcript_text}"}
-        ],
-        temperature=0.3,
-        max_tokens=500
-    )
-    
-    summary = response.choices[0].message.content
-    print(f"✅ Success!\n\nSummary:\n{summary}")
-    
-except Exception as e:
-    print(f"❌ Error: {e}")
-    import traceback
-    traceback.print_exc()
+"""
+Tests for summarizing a video end to end: transcript, then summary.
+Note: Transcripts and completions are replayed from fixtures/, so no network calls are made.
+"""
+
+import asyncio
+
+import pytest
+from cache import SummaryCache
+from conftest import NO_CAPTIONS_VIDEO_ID, VIDEO_ID
+from pipeline import summarize_video
+from providers import ReplayTranscriptApi
+from transcripts import TranscriptFetcher, TranscriptUnavailable
+
+
+class TestRecordedVideo:
+    """Test cases for summarize_video on the recorded video."""
+
+    def test_summarizes_the_video(self, replay_transcripts, replay_llm):
+        """Test that the transcript is fetched and summarized in one call."""
+        result = asyncio.run(summarize_video(VIDEO_ID, replay_transcripts, replay_llm))
+
+        assert result.summary.startswith("- Caching stores answers")
+        assert result.summary.count("\n- ") == 4
+        assert result.plan.mode == "single_shot"
+        assert result.usage.calls == 1
+        assert result.compression["tokens_after"] < result.compression["tokens_before"]
+        assert replay_transcripts.fetched == 1
+
+    def test_streams_the_summary(self, replay_transcripts, replay_llm):
+        """Test that the streamed deltas add up to the summary."""
+        deltas = []
+
+        result = asyncio.run(summarize_video(VIDEO_ID, replay_transcripts, replay_llm, on_token=deltas.append))
+
+        assert len(deltas) > 1
+        assert "".join(deltas) == result.summary
+
+    def test_live_fetcher_on_replayed_api(self, replay_transcripts, replay_llm):
+        """Test the app's TranscriptFetcher in the pipeline, with YouTube replaced by fixtures."""
+        fetcher = TranscriptFetcher(api=ReplayTranscriptApi(replay_transcripts))
+
+        result = asyncio.run(summarize_video(VIDEO_ID, fetcher, replay_llm))
+
+        assert result.transcript.language == "en"
+        assert result.summary.startswith("- Caching stores answers")
+        fetcher.close()
+
+    def test_second_run_is_cached(self, replay_transcripts, replay_llm, tmp_path):
+        """Test that a repeated video is served from the cache without fetching or calling the LLM."""
+        cache = SummaryCache(path=str(tmp_path / "cache.db"))
+
+        first = asyncio.run(summarize_video(VIDEO_ID, replay_transcripts, replay_llm, cache=cache))
+        second = asyncio.run(summarize_video(VIDEO_ID, replay_transcripts, replay_llm, cache=cache))
+
+        assert second.summary_cached
+        assert second.summary == first.summary
+        assert replay_transcripts.fetched == 1
+        assert len(replay_llm.calls) == 1
+        cache.close()
+
+    def test_video_without_captions(self, replay_transcripts, replay_llm):
+        """Test that a caption-less video fails before any LLM call."""
+        with pytest.raises(TranscriptUnavailable):
+            asyncio.run(summarize_video(NO_CAPTIONS_VIDEO_ID, replay_transcripts, replay_llm))
+        assert replay_llm.calls == []
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
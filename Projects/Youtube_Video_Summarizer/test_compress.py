@@ -0,0 +1,122 @@
+"""
+Tests for transcript pre-compression.
+"""
+
+import pytest
+from compress import (
+    clean_text,
+    compress_segments,
+    compression_stats,
+    dedupe_segments,
+    make_units,
+    textrank_scores,
+    tfidf_matrix
+)
+
+
+def make_segments(total_chars, segment_chars=200):
+    """Build segments adding up to roughly total_chars characters."""
+    words = "the speaker explains transformer attention and training data for language models "
+    text = (words * (segment_chars // len(words) + 1))[:segment_chars]
+    return [{"text": text, "start": i * 5.0, "duration": 5.0} for i in range(total_chars // segment_chars)]
+
+
+def segment(text, start):
+    """Build one five-second segment."""
+    return {"text": text, "start": start, "duration": 5.0}
+
+
+class TestCleanup:
+    """Test cases for cleanup and deduplication."""
+
+    def test_removes_artifacts_fillers_and_stutters(self):
+        """Test that caption noise is stripped and the content kept."""
+        assert clean_text("[Music] >> um so the the model, uh, learns") == "so the model, learns"
+        assert clean_text("[Applause]") == ""
+
+    def test_keeps_speech_that_looks_like_noise(self):
+        """Test that parentheses and filler phrases inside a sentence are kept."""
+        assert clean_text("Do you know what I mean by that?") == "Do you know what I mean by that?"
+        assert clean_text("f(x) returns (roughly) twice x") == "f(x) returns (roughly) twice x"
+        assert clean_text("the list a[i] (laughter) grows") == "the list a[i] grows"
+
+    def test_removes_delimited_filler_phrases(self):
+        """Test that filler phrases set off by commas or segment ends are removed."""
+        assert clean_text("You know, the model learns") == "the model learns"
+        assert clean_text("the model, you know, learns") == "the model, learns"
+        assert clean_text("it works, I mean.") == "it works."
+        assert clean_text("(Applause) [Music Playing] thanks") == "thanks"
+
+    def test_dedupes_repeated_lines(self):
+        """Test that rolling-caption repeats are dropped and distant repeats kept."""
+        segments = [
+            segment("attention is all you need", 0.0),
+            segment("all you need", 5.0),
+            segment("Attention is all you need!", 10.0),
+            segment("next we look at training", 15.0)
+        ]
+        kept = dedupe_segments(segments)
+        assert [s["start"] for s in kept] == [0.0, 15.0]
+
+        spaced = [segment("recap", 0.0), segment("one", 5.0), segment("two", 10.0), segment("recap", 15.0)]
+        assert len(dedupe_segments(spaced, window=2)) == 4
+
+    def test_cleanup_only_at_full_ratio(self):
+        """Test that ratio 1.0 keeps every segment that has content."""
+        segments = [segment("um [Music]", 0.0), segment("the the model learns", 5.0)]
+        assert compress_segments(segments) == [segment("the model learns", 5.0)]
+
+
+class TestExtraction:
+    """Test cases for TextRank extraction."""
+
+    def test_groups_units(self):
+        """Test that units end at sentences or the size limit and span their segments."""
+        segments = [segment("first part", 0.0), segment("ends here.", 5.0), segment("x" * 50, 10.0)]
+        units = make_units(segments, unit_chars=30)
+
+        assert units[0] == {"text": "first part ends here.", "start": 0.0, "duration": 10.0}
+        assert units[1]["start"] == 10.0
+
+    def test_central_unit_scores_highest(self):
+        """Test that the unit sharing most terms with the others ranks first."""
+        matrix = tfidf_matrix([
+            "transformers attention tokens",
+            "attention tokens layers",
+            "transformers attention layers tokens",
+            "cooking pasta recipe"
+        ])
+        scores = textrank_scores(matrix)
+
+        assert scores.argmax() == 2
+        assert scores.argmin() == 3
+        assert scores.sum() == pytest.approx(1.0)
+
+    def test_keeps_topical_segments_in_order(self):
+        """Test that on-topic segments beat small talk and order is preserved."""
+        segments = [
+            segment("attention layers let transformers weigh tokens.", 0.0),
+            segment("so okay well anyway.", 5.0),
+            segment("transformers use attention over every token.", 10.0),
+            segment("thanks for watching.", 15.0)
+        ]
+        kept = compress_segments(segments, ratio=0.7, unit_chars=20)
+
+        assert [s["start"] for s in kept] == [0.0, 10.0]
+
+    def test_respects_ratio(self):
+        """Test that the kept text stays within the ratio."""
+        segments = make_segments(10_000)
+        kept = compress_segments(segments, ratio=0.3, dedupe_window=0)
+
+        assert sum(len(s["text"]) + 1 for s in kept) <= 0.3 * sum(len(s["text"]) + 1 for s in segments)
+
+    def test_reports_savings(self):
+        """Test the before and after counts."""
+        original = [segment("x" * 400, 0.0)]
+        compressed = [segment("x" * 100, 0.0)]
+        stats = compression_stats(original, compressed)
+
+        assert stats["tokens_before"] == 100
+        assert stats["tokens_after"] == 25
+        assert stats["token_savings"] == 0.75
@@ -1,52 +1,56 @@
 """
-Test the YouTube summarizer functionality
+Tests for loading a video with LangChain's YoutubeLoader, then summarizing it.
+Note: youtube-transcript-api and pytube are replaced by replay providers, so no network calls are made.
 """
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+from conftest import VIDEO_ID
 from langchain_community.document_loaders import YoutubeLoader
-from openai import OpenAI
-import os
-from dotenv import load_dotenv
-
-load_dotenv()
-
-# Test URL - a short video
-video_url = "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
-
-print("Testing YouTube Transcript Loader...")
-try:
-    loader = YoutubeLoader.from_youtube_url(video_url, add_video_info=True)
-    docs = loader.load()
-    
-    if docs:
-        print(f"✅ Successfully loaded transcript")
-        print(f"Title: {docs[0].metadata.get('title', 'N/A')}")
-        print(f"Author: {docs[0].metadata.get('author', 'N/A')}")
-        print(f"Transcript length: {len(docs[0].page_content)} characters")
-        print(f"\nFirst 200 characters:\n{docs[0].page_content[:200]}")
-        
-        # Test OpenAI
-        print("\n\nTesting OpenAI API...")
-        api_key = os.getenv("OPENAI_API_KEY")
-        if api_key:
-            client = OpenAI(api_key=api_key)
-            
-            transcript = docs[0].page_content[:5000]  # First 5000 chars
-            
-            response = client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[
-                    {"role": "user", "content": f"Summarize in 3 bullet points: {transcript}"}
-                ],
-                max_tokens=200
-            )
-            
-            print("✅ OpenAI API working!")
-            print(f"\nSummary:\n{response.choices[0].message.content}")
-        else:
-            print("❌ No API key found")
-    else:
-        print("❌ No transcript found")
-        
-except Exception as e:
-    print(f"❌ Error: {e}")
-    import traceback
-    traceback.print_exc()
+from providers import ReplayTranscriptApi
+
+VIDEO_URL = f"https://www.youtube.com/watch?v={VIDEO_ID}"
+
+
+@pytest.fixture
+def replay_youtube(replay_transcripts, replay_video_info):
+    """Serve YoutubeLoader's transcript and video info requests from the recorded fixtures."""
+    with patch("youtube_transcript_api.YouTubeTranscriptApi", return_value=ReplayTranscriptApi(replay_transcripts)), \
+            patch("pytube.YouTube", replay_video_info):
+        yield
+
+
+class TestYoutubeLoader:
+    """Test cases for YoutubeLoader on recorded fixtures."""
+
+    def test_loads_transcript_with_video_info(self, replay_youtube, replay_transcripts):
+        """Test that add_video_info adds the recorded title and author to the document."""
+        docs = YoutubeLoader.from_youtube_url(VIDEO_URL, add_video_info=True).load()
+
+        assert len(docs) == 1
+        assert docs[0].metadata["title"] == "Caching in Web Applications, Explained"
+        assert docs[0].metadata["author"] == "Example Channel"
+        assert docs[0].metadata["publish_date"] == "2024-03-05 00:00:00"
+        segments = replay_transcripts.fixtures[VIDEO_ID]["segments"]
+        assert docs[0].page_content == " ".join(segment["text"] for segment in segments)
+
+    def test_loads_transcript_without_video_info(self, replay_youtube):
+        """Test that the document only names its source without add_video_info."""
+        docs = YoutubeLoader.from_youtube_url(VIDEO_URL).load()
+
+        assert docs[0].metadata == {"source": VIDEO_ID}
+
+    def test_summarizes_the_loaded_document(self, replay_youtube, replay_llm):
+        """Test that the loaded transcript gets the recorded three-bullet summary."""
+        docs = YoutubeLoader.from_youtube_url(VIDEO_URL, add_video_info=True).load()
+        messages = [{"role": "user", "content": f"Summarize in 3 bullet points: {docs[0].page_content}"}]
+
+        summary = asyncio.run(replay_llm.complete(messages, 200))
+
+        assert summary.count("- ") == 3
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
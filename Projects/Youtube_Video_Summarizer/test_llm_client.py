@@ -0,0 +1,262 @@
+"""
+Tests for the rate-limited LLM client.
+Note: The OpenAI client is a stub, so no API calls are made.
+"""
+
+import asyncio
+import time
+import types
+
+import httpx
+import openai
+import pytest
+from common.llm_cache import LLMCache
+from llm_client import LLMClient, TokenBucket, is_retryable
+
+
+def make_error(status, headers=None):
+    """Build an OpenAI API error with the given HTTP status."""
+    request = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+    response = httpx.Response(status, request=request, headers=headers or {})
+    error_class = openai.RateLimitError if status == 429 else openai.InternalServerError
+    return error_class("error", response=response, body=None)
+
+
+class StubClient:
+    """AsyncOpenAI stand-in that fails a few times, then answers after a delay."""
+
+    def __init__(self, failures=(), latency=0.0):
+        self.failures = list(failures)
+        self.latency = latency
+        self.calls = []
+        self.chat = types.SimpleNamespace(completions=types.SimpleNamespace(create=self.create))
+
+    async def create(self, **kwargs):
+        self.calls.append(kwargs)
+        await asyncio.sleep(self.latency)
+        if self.failures:
+            raise self.failures.pop(0)
+        reply = f"reply to {kwargs['messages'][-1]['content']}"
+        usage = types.SimpleNamespace(prompt_tokens=10, completion_tokens=5)
+        if kwargs.get("stream"):
+            return self.chunks(reply.split(" "), usage)
+        message = types.SimpleNamespace(content=reply)
+        return types.SimpleNamespace(choices=[types.SimpleNamespace(message=message)], usage=usage)
+
+    async def chunks(self, words, usage):
+        for i, word in enumerate(words):
+            delta = types.SimpleNamespace(content=word if i == 0 else " " + word)
+            yield types.SimpleNamespace(choices=[types.SimpleNamespace(delta=delta)], usage=None)
+        # With include_usage, the last chunk has usage and no choices
+        yield types.SimpleNamespace(choices=[], usage=usage)
+
+
+def messages(text):
+    """Build a one-message prompt."""
+    return [{"role": "user", "content": text}]
+
+
+@pytest.fixture
+def make_client():
+    """Create LLM clients with fast backoff and stop their loops afterwards."""
+    clients = []
+
+    def make(stub, **kwargs):
+        kwargs.setdefault("base_delay", 0.01)
+        client = LLMClient(client=stub, **kwargs)
+        clients.append(client)
+        return client
+
+    yield make
+    for client in clients:
+        client.close()
+
+
+class TestTokenBucket:
+    """Test cases for TokenBucket."""
+
+    def test_burst_then_waits(self):
+        """Test that the burst is free and further reservations wait for the refill."""
+        bucket = TokenBucket(per_minute=600, burst_seconds=1.0)  # 10 per second, burst of 10
+
+        assert all(bucket.reserve(1) == 0 for _ in range(10))
+        assert bucket.reserve(1) == pytest.approx(0.1, abs=0.02)
+        assert bucket.reserve(1) == pytest.approx(0.2, abs=0.02)
+
+    def test_refund(self):
+        """Test that refunded tokens can be reused immediately."""
+        bucket = TokenBucket(per_minute=60, burst_seconds=1.0)
+        bucket.reserve(1)
+        bucket.refund(1)
+        assert bucket.reserve(1) == 0
+
+
+class TestLLMClient:
+    """Test cases for LLMClient."""
+
+    def test_completes_from_caller_loop(self, make_client):
+        """Test a plain completion awaited from another event loop."""
+        stub = StubClient()
+        client = make_client(stub, model="test-model")
+
+        reply = asyncio.run(client.complete(messages("hi"), 50, "summary"))
+
+        assert reply == "reply to hi"
+        assert stub.calls[0]["model"] == "test-model"
+        assert stub.calls[0]["max_tokens"] == 50
+        assert client.get_stats()["calls"] == 1
+
+    def test_retries_rate_limits_and_server_errors(self, make_client):
+        """Test that 429s and 5xx responses are retried with backoff."""
+        stub = StubClient(failures=[make_error(429), make_error(500)])
+        client = make_client(stub)
+
+        assert asyncio.run(client.complete(messages("hi"), 50)) == "reply to hi"
+
+        stats = client.get_stats()
+        assert len(stub.calls) == 3
+        assert stats["retries"] == 2
+        assert stats["rate_limited"] == 1
+
+    def test_gives_up_after_max_retries(self, make_client):
+        """Test that the last error is raised once retries are exhausted."""
+        stub = StubClient(failures=[make_error(429)] * 3)
+        client = make_client(stub, max_retries=2)
+
+        with pytest.raises(openai.RateLimitError):
+            asyncio.run(client.complete(messages("hi"), 50))
+        assert len(stub.calls) == 3
+        assert client.get_stats()["errors"] == 1
+
+    def test_does_not_retry_client_errors(self):
+        """Test that only transient errors are retryable."""
+        request = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+        bad_request = openai.BadRequestError("bad", response=httpx.Response(400, request=request), body=None)
+
+        assert not is_retryable(bad_request)
+        assert is_retryable(make_error(429))
+        assert is_retryable(openai.APIConnectionError(request=request))
+
+    def test_honors_retry_after(self, make_client):
+        """Test that backoff waits at least the server's Retry-After."""
+        stub = StubClient(failures=[make_error(429, headers={"retry-after": "0.3"})])
+        client = make_client(stub)
+
+        start = time.perf_counter()
+        asyncio.run(client.complete(messages("hi"), 50))
+        assert time.perf_counter() - start >= 0.3
+
+    def test_coalesces_identical_prompts(self, make_client):
+        """Test that identical in-flight prompts share one request."""
+        stub = StubClient(latency=0.1)
+        client = make_client(stub)
+
+        async def run():
+            return await asyncio.gather(
+                client.complete(messages("same"), 50),
+                client.complete(messages("same"), 50),
+                client.complete(messages("other"), 50)
+            )
+
+        replies = asyncio.run(run())
+
+        assert replies == ["reply to same", "reply to same", "reply to other"]
+        assert len(stub.calls) == 2
+        assert client.get_stats()["coalesced"] == 1
+
+    def test_requests_per_minute_limit(self, make_client):
+        """Test that calls beyond the burst are spaced out."""
+        stub = StubClient()
+        # 600 per minute with a 10 second burst allows 100 calls at once
+        client = make_client(stub, requests_per_minute=600)
+
+        async def run(count):
+            await asyncio.gather(*(client.complete(messages(str(i)), 5) for i in range(count)))
+
+        start = time.perf_counter()
+        asyncio.run(run(103))
+        assert time.perf_counter() - start >= 0.25
+        assert client.get_stats()["throttled_seconds"] > 0
+
+    def test_shared_across_event_loops(self, make_client):
+        """Test that one client serves callers on separate, short-lived loops."""
+        stub = StubClient()
+        client = make_client(stub)
+
+        assert asyncio.run(client.complete(messages("one"), 5)) == "reply to one"
+        assert asyncio.run(client.complete(messages("two"), 5)) == "reply to two"
+
+    def test_streams_deltas(self, make_client):
+        """Test that a streamed completion yields its deltas in order."""
+        stub = StubClient()
+        client = make_client(stub)
+
+        async def run():
+            return [delta async for delta in client.stream(messages("hi"), 50, "reduce")]
+
+        assert asyncio.run(run()) == ["reply", " to", " hi"]
+        assert stub.calls[0]["stream"] is True
+        assert client.get_stats()["calls"] == 1
+
+    def test_stream_retries_before_first_token(self, make_client):
+        """Test that a stream failing before any output is retried."""
+        stub = StubClient(failures=[make_error(429)])
+        client = make_client(stub)
+
+        async def run():
+            return "".join([delta async for delta in client.stream(messages("hi"), 50)])
+
+        assert asyncio.run(run()) == "reply to hi"
+        assert client.get_stats()["retries"] == 1
+
+    def test_stream_raises_errors(self, make_client):
+        """Test that a failed stream raises in the consumer."""
+        stub = StubClient(failures=[make_error(429)] * 2)
+        client = make_client(stub, max_retries=1)
+
+        async def run():
+            return [delta async for delta in client.stream(messages("hi"), 50)]
+
+        with pytest.raises(openai.RateLimitError):
+            asyncio.run(run())
+
+    def test_reports_usage(self, make_client):
+        """Test that on_usage receives the usage reported by the API."""
+        stub = StubClient()
+        client = make_client(stub)
+        usage = []
+
+        async def run():
+            await client.complete(messages("hi"), 50, on_usage=lambda *counts: usage.append(counts))
+            async for _ in client.stream(messages("hi"), 50, on_usage=lambda *counts: usage.append(counts)):
+                pass
+
+        asyncio.run(run())
+        assert usage == [(10, 5), (10, 5)]
+
+    def test_cached_prompts_skip_the_request(self, make_client):
+        """Test that a cached prompt is answered, and streamed, without calling the API."""
+        stub = StubClient()
+        client = make_client(stub, temperature=0.0, cache=LLMCache(":memory:"))
+
+        async def run():
+            first = await client.complete(messages("hi"), 50)
+            streamed = [delta async for delta in client.stream(messages("hi"), 50)]
+            return first, streamed
+
+        assert asyncio.run(run()) == ("reply to hi", ["reply to hi"])
+        assert len(stub.calls) == 1
+        assert client.get_stats()["cached"] == 1
+
+    def test_sampled_prompts_bypass_the_cache(self, make_client):
+        """Test that prompts above temperature 0 are not cached by default."""
+        stub = StubClient()
+        client = make_client(stub, temperature=0.3, cache=LLMCache(":memory:"))
+
+        async def run():
+            await client.complete(messages("hi"), 50)
+            await client.complete(messages("hi"), 50)
+
+        asyncio.run(run())
+        assert len(stub.calls) == 2
+        assert client.cache.get_stats()["bypassed"] == 2
@@ -0,0 +1,204 @@
+"""
+Tests for the record/replay providers and the library pipeline.
+Note: Everything runs offline against stub and replay providers.
+"""
+
+import asyncio
+import time
+
+import pytest
+from cache import SummaryCache
+from pipeline import summarize_video
+from providers import (
+    RecordingLLM,
+    RecordingTranscriptProvider,
+    ReplayLLM,
+    ReplayTranscriptProvider,
+    prompt_key
+)
+from transcripts import TranscriptResult, TranscriptUnavailable
+
+
+def make_segments(count=40, words="attention layers let transformers weigh every token in context"):
+    """Build a transcript of count segments."""
+    return [{"text": f"{words} part {i}.", "start": i * 4.0, "duration": 4.0} for i in range(count)]
+
+
+class StubTranscripts:
+    """Live transcript provider stand-in."""
+
+    language_key = "en"
+
+    def __init__(self, missing=()):
+        self.missing = set(missing)
+        self.fetched = 0
+
+    def fetch(self, video_id):
+        self.fetched += 1
+        if video_id in self.missing:
+            raise TranscriptUnavailable(video_id, "TranscriptsDisabled")
+        return TranscriptResult(segments=make_segments(), language="en", is_generated=True, seconds=0.0)
+
+
+class StubLLM:
+    """Live LLM provider stand-in answering with the stage name."""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def complete(self, messages, max_tokens, stage="summary", on_usage=None):
+        self.calls += 1
+        if on_usage:
+            on_usage(100, 10)
+        return f"- {stage} point"
+
+    async def stream(self, messages, max_tokens, stage="summary", on_usage=None):
+        self.calls += 1
+        for delta in ["- streamed", " point"]:
+            yield delta
+        if on_usage:
+            on_usage(100, 10)
+
+
+def messages(text):
+    """Build a one-message prompt."""
+    return [{"role": "user", "content": text}]
+
+
+class TestRecordReplay:
+    """Test cases for recording and replaying providers."""
+
+    def test_transcripts_round_trip(self, tmp_path):
+        """Test that recorded transcripts and missing captions replay offline."""
+        path = str(tmp_path / "transcripts.json")
+        recorder = RecordingTranscriptProvider(StubTranscripts(missing={"nocaps"}), path)
+        recorded = recorder.fetch("video")
+        with pytest.raises(TranscriptUnavailable):
+            recorder.fetch("nocaps")
+
+        replay = ReplayTranscriptProvider(path)
+        assert replay.fetch("video").segments == recorded.segments
+        assert replay.fetch("video").is_generated
+        with pytest.raises(TranscriptUnavailable, match="TranscriptsDisabled"):
+            replay.fetch("nocaps")
+        with pytest.raises(TranscriptUnavailable, match="not in the recorded fixtures"):
+            replay.fetch("unknown")
+
+    def test_completions_round_trip(self, tmp_path):
+        """Test that recorded completions, streams and usage replay by prompt."""
+        path = str(tmp_path / "completions.jsonl")
+        recorder = RecordingLLM(StubLLM(), path)
+
+        async def record():
+            await recorder.complete(messages("one"), 50, "map")
+            return [delta async for delta in recorder.stream(messages("two"), 50, "reduce")]
+
+        assert asyncio.run(record()) == ["- streamed", " point"]
+
+        replay = ReplayLLM(path)
+        usage = []
+
+        async def run():
+            first = await replay.complete(messages("one"), 50, "map", on_usage=lambda *u: usage.append(u))
+            second = "".join([d async for d in replay.stream(messages("two"), 50, "reduce")])
+            return first, second
+
+        assert asyncio.run(run()) == ("- map point", "- streamed point")
+        assert usage == [(100, 10)]
+        with pytest.raises(LookupError):
+            asyncio.run(replay.complete(messages("three"), 50))
+
+    def test_replay_default_and_latency(self):
+        """Test the default reply, estimated usage and simulated generation time."""
+        replay = ReplayLLM(default="one two three four", latency=0.05, tokens_per_second=40)
+        usage = []
+
+        start = time.perf_counter()
+        reply = asyncio.run(replay.complete(messages("anything"), 50, on_usage=lambda *u: usage.append(u)))
+
+        assert reply == "one two three four"
+        assert time.perf_counter() - start >= 0.15
+        assert usage[0][0] > 0 and usage[0][1] > 0
+
+    def test_prompt_key_depends_on_limit(self):
+        """Test that the same prompt with another max_tokens is a different recording."""
+        assert prompt_key(messages("x"), 50) != prompt_key(messages("x"), 60)
+
+
+class TestPipeline:
+    """Test cases for summarize_video."""
+
+    def test_overview_streams_and_caches(self):
+        """Test an overview run, then a cached re-run without transcript or LLM calls."""
+        transcripts = ReplayTranscriptProvider(fixtures={"video": {"segments": make_segments()}})
+        llm = ReplayLLM(default="- point")
+        cache = SummaryCache(path=":memory:")
+        tokens, plans = [], []
+
+        result = asyncio.run(summarize_video(
+            "video", transcripts, llm, cache=cache,
+            on_plan=lambda plan, segments: plans.append(plan.mode),
+            on_token=tokens.append
+        ))
+
+        assert result.summary == "- point"
+        assert "".join(tokens) == "- point"
+        assert plans == ["single_shot"]
+        assert result.usage.calls == 1
+        assert result.compression["tokens_before"] >= result.compression["tokens_after"]
+
+        again = asyncio.run(summarize_video("video", transcripts, llm, cache=cache))
+        assert again.summary_cached and again.transcript.cached
+        assert transcripts.fetched == 1
+        assert len(llm.calls) == 1
+
+    def test_chapters_in_order(self):
+        """Test chapter mode and that the keep ratio changes the cache version."""
+        transcripts = ReplayTranscriptProvider(fixtures={"video": {"segments": make_segments(200)}})
+        llm = ReplayLLM(default="- point")
+        cache = SummaryCache(path=":memory:")
+        chapters = []
+
+        result = asyncio.run(summarize_video(
+            "video", transcripts, llm, cache=cache, chapters=True, chapter_chars=2000,
+            on_chapter=lambda chapter: chapters.append(chapter["index"])
+        ))
+
+        assert result.style == "chapters"
+        assert chapters == list(range(len(result.chapters)))
+        assert len(chapters) > 1
+
+        compressed = asyncio.run(summarize_video("video", transcripts, llm, cache=cache, chapters=True, keep_ratio=0.5))
+        assert not compressed.summary_cached
+
+    def test_budget_limited_summaries_are_cached_separately(self):
+        """Test that an extractive summary forced by a cost target is not served to requests without one."""
+        transcripts = ReplayTranscriptProvider(fixtures={"video": {"segments": make_segments(400)}})
+        llm = ReplayLLM(default="- point")
+        cache = SummaryCache(path=":memory:")
+
+        cheap = asyncio.run(summarize_video("video", transcripts, llm, cache=cache, max_cost=0.00001))
+        assert cheap.plan.mode == "extractive"
+
+        again = asyncio.run(summarize_video("video", transcripts, llm, cache=cache, max_cost=0.00001))
+        assert again.summary_cached and again.plan.mode == "extractive"
+
+        full = asyncio.run(summarize_video("video", transcripts, llm, cache=cache))
+        assert not full.summary_cached
+        assert full.plan.mode != "extractive"
+
+        # A cached full summary serves budgeted requests too
+        assert asyncio.run(summarize_video("video", transcripts, llm, cache=cache, max_cost=0.00001)).summary_cached
+
+    def test_map_reduce_concurrency(self):
+        """Test that long transcripts are summarized with parallel map calls."""
+        words = "the speaker explains gradient descent, loss curves and batch sizes for training models"
+        transcripts = ReplayTranscriptProvider(fixtures={"video": {"segments": make_segments(3000, words)}})
+        llm = ReplayLLM(default="- point", latency=0.05)
+
+        start = time.perf_counter()
+        result = asyncio.run(summarize_video("video", transcripts, llm, model="gpt-3.5-turbo", max_concurrency=64))
+
+        assert result.plan.mode == "map_reduce"
+        assert llm.calls.count("map") > 8
+        assert time.perf_counter() - start < 0.05 * len(llm.calls) / 2
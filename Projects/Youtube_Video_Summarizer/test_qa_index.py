@@ -0,0 +1,67 @@
+"""
+Tests for question answering over the transcript.
+Note: The hashing embedder and a stub LLM are used, so nothing is downloaded or sent.
+"""
+
+import asyncio
+import re
+
+from common.embeddings import HashingEmbedder
+from qa_index import TranscriptIndex, answer_question
+
+
+def make_segments():
+    """Build a transcript with one topic per minute."""
+    topics = [
+        "we start with how attention layers weigh every token",
+        "next the training data is filtered and deduplicated",
+        "then we compare the learning rate schedules for training",
+        "finally the model is deployed behind an inference server"
+    ]
+    return [
+        {"text": f"{topic} part {i}.", "start": minute * 60.0 + i * 10, "duration": 10.0}
+        for minute, topic in enumerate(topics)
+        for i in range(6)
+    ]
+
+
+class TestTranscriptIndex:
+    """Test cases for TranscriptIndex and answer_question."""
+
+    def test_search_returns_timestamped_passages(self):
+        """Test that the passage about the question's topic ranks first."""
+        index = TranscriptIndex(make_segments(), embedder=HashingEmbedder(), passage_chars=200)
+        results = index.search("How is the model deployed to a server?", k=2)
+
+        assert len(index) > 4
+        assert len(results) == 2
+        assert results[0]["start"] >= 180
+        assert "deployed" in results[0]["text"]
+        assert results[0]["score"] >= results[1]["score"]
+
+    def test_answer_sends_only_top_passages(self):
+        """Test that the prompt holds k passages in transcript order, not the whole transcript."""
+        index = TranscriptIndex(make_segments(), embedder=HashingEmbedder(), passage_chars=200)
+        prompts = []
+
+        async def complete(messages, max_tokens, stage):
+            prompts.append((messages[-1]["content"], stage))
+            return "At [3:00] the model is deployed."
+
+        result = asyncio.run(answer_question(index, "Where is the model deployed?", complete, k=2))
+        prompt, stage = prompts[0]
+
+        assert result["answer"] == "At [3:00] the model is deployed."
+        assert stage == "qa"
+        assert len(result["sources"]) == 2
+        assert len(re.findall(r"^\[\d+:\d+ - \d+:\d+\]$", prompt, re.MULTILINE)) == 2
+        assert "Where is the model deployed?" in prompt
+        assert len(prompt) < sum(len(s["text"]) for s in make_segments())
+
+    def test_empty_transcript(self):
+        """Test that an empty transcript answers without calling the model."""
+        async def complete(messages, max_tokens, stage):
+            raise AssertionError("the model should not be called")
+
+        index = TranscriptIndex([], embedder=HashingEmbedder())
+        assert asyncio.run(answer_question(index, "anything?", complete)) == {"answer": "", "sources": [], "prompt": ""}
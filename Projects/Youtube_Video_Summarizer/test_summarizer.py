@@ -0,0 +1,175 @@
+"""
+Tests for map-reduce transcript summarization.
+Note: The LLM is a stub completer, so no API calls are made.
+"""
+
+import asyncio
+import time
+
+import pytest
+from summarizer import (
+    chunk_segments,
+    format_chapters,
+    format_timestamp,
+    summarize_chapters,
+    summarize_segments,
+    to_segments
+)
+
+
+def make_segments(count, words_per_segment=20, pause_every=None):
+    """Build evenly spaced segments, with a longer pause every few segments."""
+    segments = []
+    start = 0.0
+    for i in range(count):
+        segments.append({"text": " ".join(f"w{i}" for _ in range(words_per_segment)), "start": start, "duration": 4.0})
+        start += 4.0 + (3.0 if pause_every and (i + 1) % pause_every == 0 else 0.1)
+    return segments
+
+
+def make_completer(calls, latency=0.0):
+    """Build a stub completer that records each stage it is called for."""
+    async def complete(messages, max_tokens, stage):
+        calls.append(stage)
+        await asyncio.sleep(latency)
+        return f"{stage} summary"
+    return complete
+
+
+class TestChunking:
+    """Test cases for transcript chunking."""
+
+    def test_chunks_cover_every_segment_in_order(self):
+        """Test that no transcript text is dropped or reordered."""
+        segments = make_segments(200)
+        chunks = chunk_segments(segments, max_chars=2000)
+
+        assert len(chunks) > 1
+        assert all(len(chunk["text"]) <= 2000 for chunk in chunks)
+        assert " ".join(chunk["text"] for chunk in chunks) == " ".join(s["text"] for s in segments)
+        assert all(a["end"] <= b["start"] for a, b in zip(chunks, chunks[1:]))
+
+    def test_chunks_end_at_pauses(self):
+        """Test that chunks are cut at the longest pause near the end."""
+        chunks = chunk_segments(make_segments(100, pause_every=5), max_chars=2000)
+
+        # Segments are 3 chars per word (+ spaces); every 5th segment is followed by a pause
+        for chunk in chunks[:-1]:
+            last_segment = int(chunk["text"].split()[-1][1:])
+            assert (last_segment + 1) % 5 == 0
+
+    def test_to_segments_and_timestamps(self):
+        """Test snippet conversion and timestamp formatting."""
+        assert to_segments([{"text": " hi \n there ", "start": 1, "duration": 2}, {"text": " "}]) == [
+            {"text": "hi there", "start": 1.0, "duration": 2.0}
+        ]
+        assert format_timestamp(75) == "1:15"
+        assert format_timestamp(3725) == "1:02:05"
+
+
+class TestSummarize:
+    """Test cases for map-reduce summarization."""
+
+    def test_short_transcript_uses_one_call(self):
+        """Test that transcripts fitting in one chunk skip map-reduce."""
+        calls = []
+        summary = asyncio.run(summarize_segments(make_segments(5), make_completer(calls)))
+
+        assert summary == "summary summary"
+        assert calls == ["summary"]
+
+    def test_long_transcript_is_reduced_hierarchically(self):
+        """Test that many sections are combined in groups before the final reduce."""
+        calls, sections = [], []
+        summary = asyncio.run(summarize_segments(
+            make_segments(300),
+            make_completer(calls),
+            max_chunk_chars=1000,
+            fan_in=4,
+            on_chunk=sections.append
+        ))
+
+        map_calls = calls.count("map")
+        assert summary == "reduce summary"
+        assert map_calls == len(sections) > 4
+
+        # Each level combines groups of 4 until at most 4 summaries remain
+        expected_combines, remaining = 0, map_calls
+        while remaining > 4:
+            remaining = -(-remaining // 4)
+            expected_combines += remaining
+        assert calls.count("combine") == expected_combines
+        assert calls[-1] == "reduce"
+
+    def test_sections_are_summarized_concurrently(self):
+        """Test that map calls overlap, bounded by max_concurrency."""
+        start = time.perf_counter()
+        asyncio.run(summarize_segments(
+            make_segments(80),
+            make_completer([], latency=0.2),
+            max_chunk_chars=1000,
+            max_concurrency=16
+        ))
+
+        # 10+ sections, one map round and one reduce round
+        assert time.perf_counter() - start < 0.8
+
+    def test_final_summary_is_streamed(self):
+        """Test that only the final call streams, delivering every delta."""
+        calls, streamed, deltas = [], [], []
+
+        async def stream(messages, max_tokens, stage):
+            streamed.append(stage)
+            for delta in ["- one", "\n- two"]:
+                yield delta
+
+        summary = asyncio.run(summarize_segments(
+            make_segments(100),
+            make_completer(calls),
+            max_chunk_chars=1000,
+            stream=stream,
+            on_token=deltas.append
+        ))
+
+        assert summary == "- one\n- two"
+        assert deltas == ["- one", "\n- two"]
+        assert streamed == ["reduce"]
+        assert "reduce" not in calls
+
+
+class TestChapters:
+    """Test cases for chapter mode."""
+
+    def test_chapters_are_emitted_in_order_as_they_finish(self):
+        """Test that a slow early chapter holds back later ones, which then follow at once."""
+        emitted = []
+
+        async def complete(messages, max_tokens, stage):
+            # The first section is slowest
+            await asyncio.sleep(0.2 if "0:00 -" in messages[-1]["content"] else 0.01)
+            return f"{stage} summary"
+
+        chapters = asyncio.run(summarize_chapters(
+            make_segments(60),
+            complete,
+            max_chunk_chars=1000,
+            on_chapter=lambda chapter: emitted.append((chapter["index"], time.perf_counter()))
+        ))
+
+        assert [index for index, _ in emitted] == list(range(len(chapters)))
+        assert len(chapters) > 2
+        assert all(chapter["summary"] == "chapter summary" for chapter in chapters)
+        # Everything after the slow first chapter was ready and is emitted right behind it
+        assert emitted[-1][1] - emitted[0][1] < 0.05
+
+    def test_format_chapters(self):
+        """Test Markdown chapter formatting with time ranges."""
+        chapters = [
+            {"start": 0.0, "end": 65.0, "summary": "- intro"},
+            {"start": 65.0, "end": 130.0, "summary": "- details"}
+        ]
+        assert format_chapters(chapters) == "**0:00 – 1:05**\n\n- intro\n\n**1:05 – 2:10**\n\n- details"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,179 @@
+"""
+Tests for transcript acquisition.
+Note: YouTube is replaced by a stub API, so no network calls are made.
+"""
+
+import time
+
+import pytest
+from youtube_transcript_api import TranscriptsDisabled
+from cache import SummaryCache
+from transcripts import TranscriptFetcher, TranscriptUnavailable
+
+
+class StubTranscript:
+    """Transcript stand-in that answers after a delay, or fails."""
+
+    def __init__(self, language_code, is_generated=False, latency=0.0, error=None):
+        self.language_code = language_code
+        self.is_generated = is_generated
+        self.latency = latency
+        self.error = error
+        self.fetched = 0
+
+    def fetch(self):
+        self.fetched += 1
+        time.sleep(self.latency)
+        if self.error:
+            raise self.error
+        return [{"text": f"{self.language_code} caption {i}", "start": i * 2.0, "duration": 2.0} for i in range(3)]
+
+
+class StubApi:
+    """YouTubeTranscriptApi stand-in listing fixed transcripts and counting requests."""
+
+    def __init__(self, transcripts=(), error=None, latency=0.0):
+        self.transcripts = list(transcripts)
+        self.error = error
+        self.latency = latency
+        self.listed = 0
+
+    def list(self, video_id):
+        self.listed += 1
+        time.sleep(self.latency)
+        if self.error:
+            raise self.error
+        return self.transcripts
+
+
+@pytest.fixture
+def make_fetcher():
+    """Create fetchers and stop their threads afterwards."""
+    fetchers = []
+
+    def make(api, **kwargs):
+        fetcher = TranscriptFetcher(api=api, **kwargs)
+        fetchers.append(fetcher)
+        return fetcher
+
+    yield make
+    for fetcher in fetchers:
+        fetcher.close()
+
+
+class TestTranscriptFetcher:
+    """Test cases for TranscriptFetcher."""
+
+    def test_prefers_manual_captions_in_language_order(self, make_fetcher):
+        """Test the ranking of manual and auto-generated captions."""
+        api = StubApi([
+            StubTranscript("en", is_generated=True),
+            StubTranscript("de"),
+            StubTranscript("en-GB"),
+            StubTranscript("fr")
+        ])
+        fetcher = make_fetcher(api, languages=["en", "de"])
+
+        ranked = fetcher.rank(api.transcripts)
+        assert [(t.language_code, t.is_generated) for t in ranked] == [("en-GB", False), ("de", False), ("en", True)]
+
+        result = fetcher.fetch("video")
+        assert result.language == "en-GB"
+        assert not result.is_generated
+        assert result.segments[0]["text"] == "en-GB caption 0"
+
+    def test_falls_back_in_order(self, make_fetcher):
+        """Test that a failing first choice falls back to the next candidate."""
+        api = StubApi([
+            StubTranscript("en", error=RuntimeError("blocked")),
+            StubTranscript("en", is_generated=True)
+        ])
+        fetcher = make_fetcher(api)
+
+        result = fetcher.fetch("video")
+
+        assert result.is_generated
+        assert fetcher.get_stats()["fallbacks"] == 1
+
+    def test_fetches_fallbacks_only_when_needed(self, make_fetcher):
+        """Test that lower-ranked captions are not requested when the first choice works."""
+        api = StubApi([
+            StubTranscript("en"),
+            StubTranscript("de"),
+            StubTranscript("en", is_generated=True)
+        ])
+        fetcher = make_fetcher(api, languages=["en", "de"])
+
+        assert fetcher.fetch("video").language == "en"
+        assert [t.fetched for t in api.transcripts] == [1, 0, 0]
+
+    def test_fallbacks_share_the_fetch_timeout(self, make_fetcher):
+        """Test that candidates after a timed-out one are not tried past the deadline."""
+        api = StubApi([StubTranscript("en", latency=0.3), StubTranscript("en", is_generated=True)])
+        fetcher = make_fetcher(api, fetch_timeout=0.1)
+
+        with pytest.raises(TranscriptUnavailable, match="1 more not tried"):
+            fetcher.fetch("video")
+        assert api.transcripts[1].fetched == 0
+
+    def test_generated_fallback_can_be_disabled(self, make_fetcher):
+        """Test that only manual captions are used when allow_generated is off."""
+        api = StubApi([StubTranscript("en", is_generated=True)])
+        fetcher = make_fetcher(api, allow_generated=False)
+
+        with pytest.raises(TranscriptUnavailable, match="available: en"):
+            fetcher.fetch("video")
+
+    def test_fetch_timeout(self, make_fetcher):
+        """Test that slow candidates are abandoned after fetch_timeout."""
+        api = StubApi([StubTranscript("en", latency=0.5)])
+        fetcher = make_fetcher(api, fetch_timeout=0.1)
+
+        with pytest.raises(TranscriptUnavailable, match="timed out"):
+            fetcher.fetch("video")
+        assert fetcher.get_stats()["timeouts"] == 1
+
+    def test_list_timeout(self, make_fetcher):
+        """Test that a slow transcript list raises TimeoutError and is not remembered."""
+        api = StubApi([StubTranscript("en")], latency=0.5)
+        fetcher = make_fetcher(api, list_timeout=0.1)
+
+        with pytest.raises(TimeoutError):
+            fetcher.fetch("video")
+        assert fetcher.get_stats()["missing"] == 0
+
+    def test_remembers_videos_without_captions(self, make_fetcher):
+        """Test that caption-less videos fail from the negative cache on later requests."""
+        api = StubApi(error=TranscriptsDisabled("video"))
+        fetcher = make_fetcher(api)
+
+        with pytest.raises(TranscriptUnavailable) as first:
+            fetcher.fetch("video")
+        with pytest.raises(TranscriptUnavailable) as second:
+            fetcher.fetch("video")
+
+        assert not first.value.cached
+        assert second.value.cached
+        assert second.value.reason == "TranscriptsDisabled"
+        assert api.listed == 1
+
+    def test_negative_cache_expires_and_persists(self, make_fetcher, tmp_path):
+        """Test the persistent negative cache and its time to live."""
+        path = str(tmp_path / "cache.db")
+        api = StubApi([StubTranscript("fr")])
+
+        with pytest.raises(TranscriptUnavailable):
+            make_fetcher(api, cache=SummaryCache(path=path)).fetch("video")
+
+        cache = SummaryCache(path=path)
+        assert "no captions in en" in cache.get_missing("video", "en")
+        with pytest.raises(TranscriptUnavailable):
+            make_fetcher(api, cache=cache).fetch("video")
+        assert api.listed == 1
+
+        expiring = make_fetcher(api, missing_ttl=0)
+        with pytest.raises(TranscriptUnavailable):
+            expiring.fetch("other")
+        with pytest.raises(TranscriptUnavailable):
+            expiring.fetch("other")
+        assert api.listed == 3
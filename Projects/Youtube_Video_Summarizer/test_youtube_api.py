@@ -1,26 +1,59 @@
-from youtube_transcript_api import YouTubeTranscriptApi
-
-video_id = "dQw4w9WgXcQ"
-
-try:
-    api = YouTubeTranscriptApi()
-    result = api.fetch(video_id)
-    
-    print(f"Type: {type(result)}")
-    print(f"Length: {len(result)}")
-    print(f"\nFirst item type: {type(result[0])}")
-    print(f"First item: {result[0]}")
-    print(f"\nFirst item attributes: {dir(result[0])}")
-    
-    # Try different ways to access text
-    print(f"\nTrying .text: {result[0].text}")
-    print(f"Trying ['text']: {result[0]['text'] if hasattr(result[0], '__getitem__') else 'N/A'}")
-    
-    # Build transcript
-    transcript = " ".join([item.text for item in result[:10]])
-    print(f"\nTranscript preview: {transcript[:200]}")
-    
-except Exception as e:
-    print(f"Error: {e}")
-    import traceback
-    traceback.print_exc()
+"""
+Tests for fetching transcripts through the youtube-transcript-api interface.
+Note: ReplayTranscriptApi serves fixtures/transcripts.json, so YouTube is never called.
+"""
+
+import pytest
+from conftest import NO_CAPTIONS_VIDEO_ID, VIDEO_ID
+from providers import ReplayTranscriptApi
+from transcripts import TranscriptFetcher, TranscriptUnavailable
+from youtube_transcript_api import TranscriptsDisabled
+
+
+class TestReplayTranscriptApi:
+    """Test cases for ReplayTranscriptApi."""
+
+    def test_fetch_returns_snippets(self, replay_transcripts):
+        """Test that fetched snippets expose text, start and duration like the live API."""
+        result = ReplayTranscriptApi(replay_transcripts).fetch(VIDEO_ID)
+
+        assert len(result) == len(replay_transcripts.fixtures[VIDEO_ID]["segments"])
+        assert result[0].text == "hi everyone, welcome back to the channel"
+        assert result.to_raw_data() == replay_transcripts.fixtures[VIDEO_ID]["segments"]
+        assert " ".join(item.text for item in result[:2]).startswith("hi everyone")
+        assert result.language_code == "en"
+        assert not result.is_generated
+
+    def test_lists_recorded_languages(self, replay_transcripts):
+        """Test that listing finds the recorded transcript by language."""
+        transcripts = ReplayTranscriptApi(replay_transcripts).list(VIDEO_ID)
+
+        assert [t.language_code for t in transcripts] == ["en"]
+        assert transcripts.find_transcript(["de", "en"]).language_code == "en"
+
+    def test_video_without_captions(self, replay_transcripts):
+        """Test that caption-less videos raise the live API's error."""
+        with pytest.raises(TranscriptsDisabled):
+            ReplayTranscriptApi(replay_transcripts).fetch(NO_CAPTIONS_VIDEO_ID)
+
+
+class TestTranscriptFetcherReplay:
+    """Test cases for TranscriptFetcher on the replayed API."""
+
+    def test_fetches_and_remembers_missing_captions(self, replay_transcripts):
+        """Test the fetcher's ranking and negative cache against recorded videos."""
+        fetcher = TranscriptFetcher(api=ReplayTranscriptApi(replay_transcripts))
+
+        result = fetcher.fetch(VIDEO_ID)
+        assert result.language == "en"
+        assert result.segments == replay_transcripts.fixtures[VIDEO_ID]["segments"]
+
+        for _ in range(2):
+            with pytest.raises(TranscriptUnavailable, match="TranscriptsDisabled"):
+                fetcher.fetch(NO_CAPTIONS_VIDEO_ID)
+        assert fetcher.get_stats()["missing_cached"] == 1
+        fetcher.close()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,275 @@
+"""
+Transcript acquisition for the YouTube summarizer.
+
+Instead of asking for one language and failing, the fetcher:
+
+1. Lists the video's transcripts (one request, with its own timeout)
+2. Ranks them: manually created captions in the preferred languages first,
+   then auto-generated captions in the same order
+3. Fetches the candidates one at a time in that order and returns the
+   first one that succeeds, all within one fetch timeout; lower-ranked
+   captions are only requested when the better ones fail
+
+Videos that have no usable captions (disabled, unavailable, or none in the
+preferred languages) are remembered for a while, so repeated requests fail
+immediately instead of querying YouTube again. Timeouts and blocked
+requests are not remembered, since they are usually transient.
+
+Note: a timed-out request keeps running on its worker thread until the
+HTTP call returns; the caller just stops waiting for it.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence
+import threading
+import time
+
+from youtube_transcript_api import (
+    AgeRestricted,
+    InvalidVideoId,
+    NoTranscriptFound,
+    TranscriptsDisabled,
+    VideoUnavailable,
+    VideoUnplayable,
+    YouTubeTranscriptApi
+)
+
+from cache import SummaryCache
+from summarizer import to_segments
+
+# Errors meaning the video won't have usable captions on a retry either
+MISSING_ERRORS = (AgeRestricted, InvalidVideoId, NoTranscriptFound, TranscriptsDisabled, VideoUnavailable, VideoUnplayable)
+
+
+@dataclass
+class TranscriptResult:
+    """A fetched transcript and where it came from (unknown for cached transcripts)."""
+
+    segments: List[Dict[str, Any]]
+    language: Optional[str]
+    is_generated: Optional[bool]
+    seconds: float
+    cached: bool = False
+
+
+class TranscriptUnavailable(Exception):
+    """Raised when no transcript in the preferred languages could be fetched."""
+
+    def __init__(self, video_id: str, reason: str, cached: bool = False):
+        """
+        Initialize the error.
+
+        Args:
+            video_id: YouTube video ID
+            reason: Why no transcript could be fetched
+            cached: Whether the failure came from the negative cache
+        """
+        super().__init__(f"No transcript for {video_id}: {reason}")
+        self.video_id = video_id
+        self.reason = reason
+        self.cached = cached
+
+
+def matches_language(language_code: str, language: str) -> bool:
+    """Match a transcript's language code to a preference ("en" also matches "en-GB")."""
+    return language_code == language or language_code.startswith(f"{language}-")
+
+
+class TranscriptFetcher:
+    """Fetches the best available transcript, with concurrency, timeouts and a negative cache."""
+
+    def __init__(
+        self,
+        languages: Sequence[str] = ("en",),
+        allow_generated: bool = True,
+        list_timeout: float = 10.0,
+        fetch_timeout: float = 20.0,
+        max_workers: int = 8,
+        cache: Optional[SummaryCache] = None,
+        missing_ttl: float = 6 * 3600,
+        api: Optional[Any] = None
+    ):
+        """
+        Initialize the fetcher.
+
+        Args:
+            languages: Preferred language codes, most preferred first
+            allow_generated: Fall back to auto-generated captions
+            list_timeout: Seconds to wait for the list of transcripts
+            fetch_timeout: Seconds to wait for the transcripts themselves
+            max_workers: Threads shared by all list and fetch requests
+            cache: Cache for remembering videos without captions (in memory if None)
+            missing_ttl: Seconds a video without captions is remembered
+            api: YouTubeTranscriptApi instance (created if None)
+        """
+        self.languages = list(languages)
+        self.allow_generated = allow_generated
+        self.list_timeout = list_timeout
+        self.fetch_timeout = fetch_timeout
+        self.cache = cache
+        self.missing_ttl = missing_ttl
+        self.api = api or YouTubeTranscriptApi()
+
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="captions")
+        self._lock = threading.Lock()
+        self._missing: Dict[str, tuple] = {}
+        self._stats = {"fetched": 0, "generated": 0, "fallbacks": 0, "missing": 0, "missing_cached": 0, "timeouts": 0}
+
+    @property
+    def language_key(self) -> str:
+        """Language preferences as one cache key component."""
+        return ",".join(self.languages)
+
+    def _count(self, name: str):
+        with self._lock:
+            self._stats[name] += 1
+
+    # ------------------------------------------------------------------
+    # Negative cache
+    # ------------------------------------------------------------------
+
+    def _get_missing(self, video_id: str) -> Optional[str]:
+        """Get the remembered reason a video has no transcript, if any."""
+        if self.cache is not None:
+            return self.cache.get_missing(video_id, self.language_key)
+
+        with self._lock:
+            entry = self._missing.get(video_id)
+            if entry and entry[1] > time.time():
+                return entry[0]
+            self._missing.pop(video_id, None)
+        return None
+
+    def _put_missing(self, video_id: str, reason: str):
+        """Remember that a video has no transcript."""
+        self._count("missing")
+        if self.cache is not None:
+            self.cache.put_missing(video_id, reason, self.language_key, self.missing_ttl)
+            return
+
+        with self._lock:
+            self._missing[video_id] = (reason, time.time() + self.missing_ttl)
+
+    # ------------------------------------------------------------------
+    # Fetching
+    # ------------------------------------------------------------------
+
+    def rank(self, transcripts: List[Any]) -> List[Any]:
+        """
+        Order available transcripts by preference.
+
+        Args:
+            transcripts: Transcript objects from YouTubeTranscriptApi.list
+
+        Returns:
+            Manual transcripts in the preferred languages, then (if allowed)
+            auto-generated ones, each group in language preference order
+        """
+        kinds = [False, True] if self.allow_generated else [False]
+        ranked = []
+        for generated in kinds:
+            for language in self.languages:
+                ranked.extend(
+                    transcript for transcript in transcripts
+                    if transcript.is_generated == generated
+                    and matches_language(transcript.language_code, language)
+                    and transcript not in ranked
+                )
+        return ranked
+
+    def fetch(self, video_id: str) -> TranscriptResult:
+        """
+        Fetch the best available transcript for a video.
+
+        Args:
+            video_id: YouTube video ID
+
+        Returns:
+            The transcript, its language code and whether it is auto-generated
+
+        Raises:
+            TranscriptUnavailable: If the video has no usable captions, or all candidates failed
+            TimeoutError: If listing the transcripts took longer than list_timeout
+        """
+        start = time.perf_counter()
+
+        reason = self._get_missing(video_id)
+        if reason is not None:
+            self._count("missing_cached")
+            raise TranscriptUnavailable(video_id, reason, cached=True)
+
+        try:
+            available = self._executor.submit(lambda: list(self.api.list(video_id))).result(timeout=self.list_timeout)
+        except FutureTimeout:
+            self._count("timeouts")
+            raise TimeoutError(f"Listing transcripts for {video_id} took more than {self.list_timeout:g}s") from None
+        except MISSING_ERRORS as e:
+            reason = type(e).__name__
+            self._put_missing(video_id, reason)
+            raise TranscriptUnavailable(video_id, reason) from e
+
+        candidates = self.rank(available)
+        if not candidates:
+            codes = ", ".join(sorted({transcript.language_code for transcript in available})) or "none"
+            reason = f"no captions in {self.language_key} (available: {codes})"
+            self._put_missing(video_id, reason)
+            raise TranscriptUnavailable(video_id, reason)
+
+        # Fetch candidates in order of preference, sharing one deadline;
+        # the usual case needs a single request
+        deadline = time.monotonic() + self.fetch_timeout
+        errors = []
+        for rank, transcript in enumerate(candidates):
+            label = f"{transcript.language_code}{' (auto)' if transcript.is_generated else ''}"
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                errors.append(f"{len(candidates) - rank} more not tried")
+                break
+
+            future = self._executor.submit(transcript.fetch)
+            try:
+                segments = to_segments(future.result(timeout=remaining))
+            except FutureTimeout:
+                future.cancel()
+                self._count("timeouts")
+                errors.append(f"{label} timed out")
+                continue
+            except Exception as e:
+                errors.append(f"{label} failed ({type(e).__name__})")
+                continue
+
+            if not segments:
+                errors.append(f"{label} is empty")
+                continue
+
+            self._count("fetched")
+            if transcript.is_generated:
+                self._count("generated")
+            if rank > 0:
+                self._count("fallbacks")
+            return TranscriptResult(
+                segments=segments,
+                language=transcript.language_code,
+                is_generated=transcript.is_generated,
+                seconds=round(time.perf_counter() - start, 3)
+            )
+
+        raise TranscriptUnavailable(video_id, "; ".join(errors))
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Get fetcher statistics.
+
+        Returns:
+            Dictionary containing transcripts fetched, how many were auto-generated
+            or not the first choice, videos found without captions, negative cache
+            hits and timeouts
+        """
+        with self._lock:
+            return dict(self._stats)
+
+    def close(self):
+        """Stop the worker threads without waiting for running requests."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,7 @@
+"""
+Load-testing harness for the LangChain projects.
+
+Runs each app's chain against a deterministic fake chat model under N
+concurrent simulated users. Run from the Projects directory with:
+    python -m benchmarks.run --users 20 --requests 5
+"""
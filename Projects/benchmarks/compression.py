@@ -0,0 +1,192 @@
+"""
+Transcript pre-compression benchmark: token savings against summary quality proxies.
+
+Compresses a transcript at several keep ratios and reports, per ratio:
+- token savings and compression time
+- keyword coverage: share of the transcript's top TF-IDF terms still present
+- similarity: cosine similarity of the TF-IDF vectors of the full and compressed text
+- timeline coverage: share of equal time buckets still represented
+
+No API key is needed. Run from the Projects directory with:
+    python -m benchmarks.compression --ratios 1.0 0.6 0.3
+    python -m benchmarks.compression --transcript transcript.json
+"""
+
+from typing import Any, Dict, List
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+# Run from anywhere: make the Projects directory and the summarizer importable
+PROJECTS_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(PROJECTS_DIR)
+sys.path.append(os.path.join(PROJECTS_DIR, "Youtube_Video_Summarizer"))
+
+from compress import compress_segments, compression_stats, tfidf_matrix
+
+DEFAULT_RATIOS = [1.0, 0.8, 0.6, 0.4, 0.2]
+
+# Topics of the synthetic transcript, one per stretch of the video
+TOPICS = [
+    "transformer attention weighs every token against every other token in the sequence",
+    "training data is deduplicated and filtered before pretraining the language model",
+    "gradient descent updates the weights using the loss on each training batch",
+    "evaluation compares benchmark accuracy against human baselines on held out tasks",
+    "deployment serves the model behind an inference server with batching and caching"
+]
+FILLERS = ["um", "uh", "you know", "[Music]", ">>", "so yeah", "I mean"]
+
+
+def synthetic_transcript(segments_per_topic: int = 60, seed: int = 0) -> List[Dict[str, Any]]:
+    """
+    Build a noisy auto-caption-like transcript covering TOPICS in order.
+
+    Args:
+        segments_per_topic: Caption lines per topic
+        seed: Random seed
+
+    Returns:
+        Segments in to_segments format
+    """
+    rng = random.Random(seed)
+    segments = []
+    for topic in TOPICS:
+        words = topic.split()
+        for _ in range(segments_per_topic):
+            start = rng.randrange(len(words) - 4)
+            text = " ".join(words[start:start + rng.randint(4, 8)])
+            if rng.random() < 0.3:
+                text = f"{rng.choice(FILLERS)} {text}"
+            if rng.random() < 0.2:
+                text += "."
+            segments.append({"text": text, "start": len(segments) * 3.0, "duration": 3.0})
+            # Rolling captions repeat the previous line
+            if rng.random() < 0.15:
+                segments.append({"text": text, "start": len(segments) * 3.0, "duration": 3.0})
+    return segments
+
+
+def load_transcript(path: str) -> List[Dict[str, Any]]:
+    """Load segments saved as a JSON list of {"text", "start", "duration"}."""
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def quality_proxies(
+    original: List[Dict[str, Any]],
+    compressed: List[Dict[str, Any]],
+    top_terms: int = 30,
+    buckets: int = 10
+) -> Dict[str, float]:
+    """
+    Estimate how much of the transcript's content survives compression.
+
+    Args:
+        original: Segments before compression
+        compressed: Segments after compression
+        top_terms: Number of top TF-IDF terms checked for coverage
+        buckets: Number of equal time buckets checked for coverage
+
+    Returns:
+        Dictionary containing keyword_coverage, similarity and timeline_coverage, each between 0 and 1
+    """
+    if not compressed:
+        return {"keyword_coverage": 0.0, "similarity": 0.0, "timeline_coverage": 0.0}
+
+    original_text = " ".join(segment["text"] for segment in original)
+    compressed_text = " ".join(segment["text"] for segment in compressed)
+
+    # Score terms over the original's segments; the last two rows are the full and compressed texts
+    texts = [segment["text"] for segment in original] + [original_text, compressed_text]
+    matrix = tfidf_matrix(texts)
+    full, kept = matrix[-2], matrix[-1]
+
+    top = np.argsort(-full)[:top_terms]
+    top = top[full[top] > 0]
+    keyword_coverage = float(np.count_nonzero(kept[top]) / len(top)) if len(top) else 1.0
+
+    end = max(segment["start"] + segment["duration"] for segment in original)
+    start = min(segment["start"] for segment in original)
+    width = (end - start) / buckets or 1.0
+    covered = {min(buckets - 1, int((segment["start"] - start) / width)) for segment in compressed}
+
+    return {
+        "keyword_coverage": round(keyword_coverage, 3),
+        "similarity": round(float(full @ kept), 3),
+        "timeline_coverage": round(len(covered) / buckets, 3)
+    }
+
+
+def run_compression_benchmark(
+    segments: List[Dict[str, Any]],
+    ratios: List[float] = DEFAULT_RATIOS,
+    repeats: int = 3
+) -> List[Dict[str, Any]]:
+    """
+    Compress a transcript at each ratio and measure savings and quality.
+
+    Args:
+        segments: Transcript segments
+        ratios: Keep ratios to compare
+        repeats: Timed runs per ratio (the fastest is reported)
+
+    Returns:
+        One row per ratio with the compression stats, quality proxies and milliseconds
+    """
+    rows = []
+    for ratio in ratios:
+        timings = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            compressed = compress_segments(segments, ratio=ratio)
+            timings.append(time.perf_counter() - start)
+
+        rows.append({
+            "ratio": ratio,
+            **compression_stats(segments, compressed),
+            **quality_proxies(segments, compressed),
+            "ms": round(min(timings) * 1000, 1)
+        })
+    return rows
+
+
+def format_report(rows: List[Dict[str, Any]]) -> str:
+    """Format benchmark rows as a plain-text table."""
+    header = f"{'ratio':>6} {'tokens':>8} {'saved':>7} {'keywords':>9} {'similarity':>11} {'timeline':>9} {'ms':>8}"
+    lines = [header, "-" * len(header)]
+    for row in rows:
+        lines.append(
+            f"{row['ratio']:>6.2f} {row['tokens_after']:>8,} {row['token_savings']:>7.0%} "
+            f"{row['keyword_coverage']:>9.0%} {row['similarity']:>11.3f} "
+            f"{row['timeline_coverage']:>9.0%} {row['ms']:>8.1f}"
+        )
+    return "\n".join(lines)
+
+
+def main():
+    """Parse arguments, run the benchmark and print a report."""
+    parser = argparse.ArgumentParser(description="Compare transcript compression ratios.")
+    parser.add_argument("--transcript", help="JSON list of transcript segments (default: synthetic)")
+    parser.add_argument("--ratios", nargs="*", type=float, default=DEFAULT_RATIOS, help="Keep ratios to compare")
+    parser.add_argument("--repeats", type=int, default=3, help="Timed runs per ratio")
+    parser.add_argument("--json", help="Also write the results to this JSON file")
+    args = parser.parse_args()
+
+    segments = load_transcript(args.transcript) if args.transcript else synthetic_transcript()
+    rows = run_compression_benchmark(segments, args.ratios, args.repeats)
+
+    print(f"{len(segments)} segments, {rows[0]['tokens_before']:,} tokens before compression\n")
+    print(format_report(rows))
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(rows, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+"""
+Concurrent load generator and latency statistics for the benchmarks.
+"""
+
+from typing import AsyncIterator, Callable, Dict, List, Optional
+import asyncio
+import time
+
+
+# A simulated user is a function taking the turn number and streaming response tokens
+UserRequest = Callable[[int], AsyncIterator[str]]
+
+
+class RequestTiming:
+    """Timing of one simulated request."""
+
+    __slots__ = ("latency", "ttft", "tokens", "error")
+
+    def __init__(self, latency: float, ttft: Optional[float], tokens: int, error: Optional[str] = None):
+        """
+        Initialize the timing.
+
+        Args:
+            latency: Seconds from sending the request to the last token
+            ttft: Seconds to the first token (None if nothing was streamed)
+            tokens: Number of streamed chunks
+            error: Error message if the request failed
+        """
+        self.latency = latency
+        self.ttft = ttft
+        self.tokens = tokens
+        self.error = error
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """
+    Compute a percentile with linear interpolation between closest ranks.
+
+    Args:
+        values: Sample values
+        pct: Percentile between 0 and 100
+
+    Returns:
+        The percentile, or 0.0 for an empty sample
+    """
+    if not values:
+        return 0.0
+
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+async def time_request(request: UserRequest, turn: int) -> RequestTiming:
+    """Run one request and measure its latency, time to first token and token count."""
+    start = time.perf_counter()
+    first_token = None
+    tokens = 0
+
+    try:
+        async for token in request(turn):
+            if not token:
+                continue
+            if first_token is None:
+                first_token = time.perf_counter()
+            tokens += 1
+    except Exception as e:
+        return RequestTiming(time.perf_counter() - start, None, tokens, error=str(e))
+
+    ttft = first_token - start if first_token is not None else None
+    return RequestTiming(time.perf_counter() - start, ttft, tokens)
+
+
+async def run_load(
+    new_user: Callable[[], UserRequest],
+    users: int = 10,
+    requests_per_user: int = 5
+) -> Dict[str, any]:
+    """
+    Run concurrent simulated users, each sending requests one after another.
+
+    Args:
+        new_user: Function creating a simulated user with its own session state
+        users: Number of concurrent users
+        requests_per_user: Sequential requests sent by each user
+
+    Returns:
+        Summary statistics from summarize
+    """
+    async def simulate() -> List[RequestTiming]:
+        request = new_user()
+        return [await time_request(request, turn) for turn in range(requests_per_user)]
+
+    start = time.perf_counter()
+    per_user = await asyncio.gather(*(simulate() for _ in range(users)))
+    wall_seconds = time.perf_counter() - start
+
+    return summarize([timing for timings in per_user for timing in timings], wall_seconds)
+
+
+def summarize(timings: List[RequestTiming], wall_seconds: float) -> Dict[str, any]:
+    """
+    Summarize request timings.
+
+    Args:
+        timings: Timings of all requests
+        wall_seconds: Wall-clock duration of the whole run
+
+    Returns:
+        Dictionary containing request counts, latency and time-to-first-token
+        percentiles (in milliseconds) and token throughput
+    """
+    ok = [t for t in timings if t.error is None]
+    latencies = [t.latency * 1000 for t in ok]
+    ttfts = [t.ttft * 1000 for t in ok if t.ttft is not None]
+    tokens = sum(t.tokens for t in ok)
+
+    def stats(values: List[float]) -> Dict[str, float]:
+        return {
+            "p50": round(percentile(values, 50), 1),
+            "p95": round(percentile(values, 95), 1),
+            "p99": round(percentile(values, 99), 1),
+            "mean": round(sum(values) / len(values), 1) if values else 0.0
+        }
+
+    return {
+        "requests": len(timings),
+        "errors": len(timings) - len(ok),
+        "wall_seconds": round(wall_seconds, 3),
+        "requests_per_second": round(len(ok) / wall_seconds, 2) if wall_seconds else 0.0,
+        "latency_ms": stats(latencies),
+        "ttft_ms": stats(ttfts),
+        "tokens": tokens,
+        "tokens_per_second": round(tokens / wall_seconds, 1) if wall_seconds else 0.0
+    }
+
+
+def format_report(results: Dict[str, Dict[str, any]]) -> str:
+    """
+    Format benchmark summaries as a plain-text table.
+
+    Args:
+        results: Mapping of scenario name to summary
+
+    Returns:
+        The report
+    """
+    header = (
+        f"{'scenario':<16}{'reqs':>6}{'err':>5}{'req/s':>8}"
+        f"{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'ttft p50':>10}{'ttft p95':>10}{'tok/s':>9}"
+    )
+    lines = [header, "-" * len(header)]
+
+    for name, summary in results.items():
+        latency, ttft = summary["latency_ms"], summary["ttft_ms"]
+        lines.append(
+            f"{name:<16}{summary['requests']:>6}{summary['errors']:>5}{summary['requests_per_second']:>8}"
+            f"{latency['p50']:>9}{latency['p95']:>9}{latency['p99']:>9}"
+            f"{ttft['p50']:>10}{ttft['p95']:>10}{summary['tokens_per_second']:>9}"
+        )
+
+    return "\n".join(lines)
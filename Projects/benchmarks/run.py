@@ -0,0 +1,79 @@
+"""
+Command line entry point for the benchmarks.
+
+Example:
+    python -m benchmarks.run --users 20 --requests 5 --latency 0.4 --tokens-per-second 40
+"""
+
+from typing import Dict, List
+import argparse
+import asyncio
+import json
+import os
+import sys
+
+# Run from anywhere: make the Projects directory importable
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from benchmarks.harness import format_report, run_load
+from benchmarks.scenarios import SCENARIOS
+from common.fake_llm import FakeChatModel
+
+
+def run_benchmarks(
+    scenarios: List[str],
+    users: int = 10,
+    requests_per_user: int = 5,
+    latency: float = 0.3,
+    tokens_per_second: float = 50
+) -> Dict[str, Dict[str, any]]:
+    """
+    Run scenarios one after another against a fake chat model.
+
+    Args:
+        scenarios: Scenario names from SCENARIOS
+        users: Concurrent simulated users per scenario
+        requests_per_user: Sequential requests per user
+        latency: Fake model seconds to first token
+        tokens_per_second: Fake model streaming rate
+
+    Returns:
+        Mapping of scenario name to summary statistics
+    """
+    llm = FakeChatModel(latency=latency, tokens_per_second=tokens_per_second)
+
+    results = {}
+    for name in scenarios:
+        new_user = SCENARIOS[name](llm)
+        results[name] = asyncio.run(run_load(new_user, users=users, requests_per_user=requests_per_user))
+    return results
+
+
+def main():
+    """Parse arguments, run the benchmarks and print a report."""
+    parser = argparse.ArgumentParser(description="Benchmark the app chains with a fake LLM.")
+    parser.add_argument("--scenarios", nargs="*", choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--users", type=int, default=10, help="Concurrent simulated users")
+    parser.add_argument("--requests", type=int, default=5, help="Requests per user")
+    parser.add_argument("--latency", type=float, default=0.3, help="Fake LLM seconds to first token")
+    parser.add_argument("--tokens-per-second", type=float, default=50, help="Fake LLM streaming rate")
+    parser.add_argument("--json", help="Also write the results to this JSON file")
+    args = parser.parse_args()
+
+    results = run_benchmarks(
+        args.scenarios,
+        users=args.users,
+        requests_per_user=args.requests,
+        latency=args.latency,
+        tokens_per_second=args.tokens_per_second
+    )
+
+    print(format_report(results))
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
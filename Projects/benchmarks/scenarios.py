@@ -0,0 +1,159 @@
+"""
+Benchmark scenarios mirroring the chains built by each app.
+
+The Streamlit apps build their chains at module level next to UI code, so
+their prompts are read from the source with `ast` instead of importing them.
+"""
+
+from typing import AsyncIterator, Callable, Dict
+import ast
+import os
+import sys
+
+from langchain_core.chat_history import InMemoryChatMessageHistory
+from langchain_core.language_models import BaseChatModel
+from langchain_core.output_parsers import StrOutputParser
+from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
+from langchain_core.runnables import RunnablePassthrough
+from langchain_core.runnables.history import RunnableWithMessageHistory
+
+from benchmarks.harness import UserRequest
+
+
+PROJECTS_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+
+def load_prompt(app_dir: str, name: str) -> str:
+    """
+    Read a string constant from an app's app.py without running the app.
+
+    Args:
+        app_dir: App directory inside Projects
+        name: Name of the module-level constant
+
+    Returns:
+        The constant's value
+    """
+    path = os.path.join(PROJECTS_DIR, app_dir, "app.py")
+    with open(path, encoding="utf-8") as f:
+        tree = ast.parse(f.read(), filename=path)
+
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and any(
+            isinstance(target, ast.Name) and target.id == name for target in node.targets
+        ):
+            return ast.literal_eval(node.value)
+
+    raise ValueError(f"{name} not found in {path}")
+
+
+def interview_scenario(llm: BaseChatModel) -> Callable[[], UserRequest]:
+    """Mock Interview: start an interview, then stream feedback and the next question per answer."""
+    sys.path.append(os.path.join(PROJECTS_DIR, "Mock_Interview_ App"))
+    from backend import InterviewBot
+
+    def new_user() -> UserRequest:
+        bot = InterviewBot(api_key="benchmark", llm=llm)
+        state = {"question": ""}
+
+        async def request(turn: int) -> AsyncIterator[str]:
+            if turn == 0:
+                welcome_message = await bot.astart_interview("Software Engineer")
+                state["question"] = welcome_message
+                yield welcome_message
+                return
+
+            parts = []
+            async for section, token in bot.astream_evaluation(
+                state["question"], "I would profile first, then optimize the hot path."
+            ):
+                if section == "next_question":
+                    parts.append(token)
+                yield token
+            state["question"] = "".join(parts)
+
+        return request
+
+    return new_user
+
+
+def code_assistant_scenario(llm: BaseChatModel) -> Callable[[], UserRequest]:
+    """Code Assistant: multi-turn chat with per-user message history."""
+    prompt = ChatPromptTemplate.from_messages([
+        ("system", load_prompt("Code_Assistant", "CODE_ASSISTANT_PROMPT")),
+        MessagesPlaceholder(variable_name="history"),
+        ("human", "{input}")
+    ])
+    chain = prompt | llm | StrOutputParser()
+
+    histories: Dict[str, InMemoryChatMessageHistory] = {}
+    chain_with_history = RunnableWithMessageHistory(
+        chain,
+        lambda session_id: histories.setdefault(session_id, InMemoryChatMessageHistory()),
+        input_messages_key="input",
+        history_messages_key="history"
+    )
+
+    def new_user() -> UserRequest:
+        session_id = f"user-{len(histories)}"
+        histories[session_id] = InMemoryChatMessageHistory()
+
+        async def request(turn: int) -> AsyncIterator[str]:
+            async for token in chain_with_history.astream(
+                {"input": f"Write a Python function for task #{turn} and explain it."},
+                config={"configurable": {"session_id": session_id}}
+            ):
+                yield token
+
+        return request
+
+    return new_user
+
+
+def email_scenario(llm: BaseChatModel) -> Callable[[], UserRequest]:
+    """Smart Email Writer: one-shot email drafts."""
+    prompt = ChatPromptTemplate.from_template(load_prompt("Smart_Email_Writer", "EMAIL_PROMPT"))
+    chain = {"input": RunnablePassthrough()} | prompt | llm | StrOutputParser()
+
+    def new_user() -> UserRequest:
+        async def request(turn: int) -> AsyncIterator[str]:
+            async for token in chain.astream(
+                "Purpose: Follow-up\nTone: Friendly\nRecipient: Alex\n"
+                f"Context: Checking in on proposal #{turn} sent last week."
+            ):
+                yield token
+
+        return request
+
+    return new_user
+
+
+def cover_letter_scenario(llm: BaseChatModel) -> Callable[[], UserRequest]:
+    """Cover Letter Generator: letters without company research."""
+    prompt = ChatPromptTemplate.from_template(load_prompt("Cover_Letter_Generator", "COVER_LETTER_PROMPT"))
+    chain = (
+        {"input": RunnablePassthrough(), "research": lambda _: "Disabled"}
+        | prompt.partial(tone="Professional")
+        | llm
+        | StrOutputParser()
+    )
+
+    def new_user() -> UserRequest:
+        async def request(turn: int) -> AsyncIterator[str]:
+            async for token in chain.astream({
+                "input": "Job: Backend Engineer\nCompany: Acme\nMy Background:\n5 years of Python APIs",
+                "company": "Acme"
+            }):
+                yield token
+
+        return request
+
+    return new_user
+
+
+SCENARIOS = {
+    "interview": interview_scenario,
+    "code_assistant": code_assistant_scenario,
+    "email": email_scenario,
+    "cover_letter": cover_letter_scenario
+}
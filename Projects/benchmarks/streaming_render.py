@@ -0,0 +1,195 @@
+"""
+Streaming render benchmark, offline and deterministic.
+
+Streams a long synthetic code answer token by token into a recording
+stand-in for a Streamlit container. It compares the apps' original loop
+(`text += token; placeholder.markdown(text + "▌")`) with StreamRenderer
+at several frame intervals, reporting UI updates, characters sent to the
+browser and CPU time. Tokens arrive on a simulated clock at
+--tokens-per-second, so the run takes milliseconds. Run from the Projects
+directory with:
+    python -m benchmarks.streaming_render --tokens 4000 --tokens-per-second 60
+"""
+
+from typing import Any, Dict, List
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+# Run from anywhere: make the Projects directory importable
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from common.fake_llm import split_tokens
+from common.streaming import StreamRenderer
+
+CODE_LINES = [
+    "def {name}(items: list[int]) -> list[int]:",
+    "    \"\"\"Return the {name} of the items.\"\"\"",
+    "    result = []",
+    "    for index, value in enumerate(items):",
+    "        if value % {k} == 0:",
+    "            result.append(value * index)",
+    "    return sorted(result, reverse=True)",
+]
+
+
+class RecordingElement:
+    """Stand-in for a Streamlit element; serializes each update like a delta message."""
+
+    def __init__(self, stats: Dict[str, int]):
+        self.stats = stats
+
+    def markdown(self, body: str):
+        self.stats["updates"] += 1
+        self.stats["bytes"] += len(body.encode("utf-8"))
+
+
+class RecordingContainer:
+    """Stand-in for st.container(), counting the elements created in it."""
+
+    def __init__(self):
+        self.stats = {"updates": 0, "bytes": 0, "elements": 0}
+
+    def empty(self) -> RecordingElement:
+        self.stats["elements"] += 1
+        return RecordingElement(self.stats)
+
+
+def synthetic_answer(tokens: int, seed: int = 0) -> List[str]:
+    """Build a markdown answer alternating prose and Python code blocks, as tokens."""
+    rng = random.Random(seed)
+    words = "this function walks the list once and keeps the values we need for the result".split()
+    parts, count = [], 0
+    while count < tokens:
+        prose = " ".join(rng.choice(words) for _ in range(rng.randint(20, 60)))
+        name = rng.choice(["scale", "filter", "rank", "pick"])
+        code = "\n".join(line.format(name=name, k=rng.randint(2, 9)) for line in CODE_LINES)
+        block = f"{prose.capitalize()}.\n\n```python\n{code}\n```\n\n"
+        parts.append(block)
+        count += len(split_tokens(block))
+    return split_tokens("".join(parts))[:tokens]
+
+
+class SimulatedClock:
+    """Clock advanced by hand, one token interval at a time."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def run_naive(tokens: List[str], clock: SimulatedClock, interval: float) -> Dict[str, Any]:
+    """The apps' original loop: accumulate with += and re-render everything per token."""
+    container = RecordingContainer()
+    placeholder = container.empty()
+    start = time.process_time()
+    full_response = ""
+    for token in tokens:
+        clock.now += interval
+        full_response += token
+        placeholder.markdown(full_response + "▌")
+    placeholder.markdown(full_response)
+    return {"cpu_ms": (time.process_time() - start) * 1000, **container.stats}
+
+
+def run_renderer(tokens: List[str], clock: SimulatedClock, interval: float, **kwargs) -> Dict[str, Any]:
+    """StreamRenderer with the given options."""
+    container = RecordingContainer()
+    renderer = StreamRenderer(container, clock=clock, **kwargs)
+    start = time.process_time()
+    for token in tokens:
+        clock.now += interval
+        renderer.write(token)
+    renderer.finish()
+    return {"cpu_ms": (time.process_time() - start) * 1000, **container.stats}
+
+
+def run_render_benchmark(
+    tokens: int = 4000,
+    tokens_per_second: float = 60.0,
+    frame_intervals: List[float] = (0.05, 0.1),
+    min_chars: int = 0,
+    repeat: int = 3
+) -> List[Dict[str, Any]]:
+    """
+    Compare the original loop with StreamRenderer.
+
+    Args:
+        tokens: Answer length in tokens
+        tokens_per_second: Simulated streaming rate
+        frame_intervals: StreamRenderer frame intervals to compare
+        min_chars: StreamRenderer minimum pending characters per render (0 to disable)
+        repeat: Runs per variant; the fastest CPU time is reported
+
+    Returns:
+        One row per variant, the original loop first
+    """
+    answer = synthetic_answer(tokens)
+    interval = 1.0 / tokens_per_second
+    variants = [("original loop", lambda clock: run_naive(answer, clock, interval))]
+    for frame in frame_intervals:
+        variants.append((
+            f"renderer {frame * 1000:g} ms",
+            lambda clock, frame=frame: run_renderer(answer, clock, interval, frame_interval=frame, min_chars=min_chars)
+        ))
+
+    rows = []
+    for name, run in variants:
+        results = [run(SimulatedClock()) for _ in range(repeat)]
+        best = min(results, key=lambda r: r["cpu_ms"])
+        rows.append({
+            "variant": name,
+            "tokens": len(answer),
+            "updates": best["updates"],
+            "elements": best["elements"],
+            "mb_sent": round(best["bytes"] / 1e6, 3),
+            "cpu_ms": round(best["cpu_ms"], 2)
+        })
+    return rows
+
+
+def format_report(rows: List[Dict[str, Any]]) -> str:
+    """Format benchmark rows as a plain-text table."""
+    header = f"{'variant':<18} {'tokens':>7} {'updates':>8} {'elements':>9} {'MB sent':>8} {'CPU ms':>8}"
+    lines = [header, "-" * len(header)]
+    for row in rows:
+        lines.append(
+            f"{row['variant']:<18} {row['tokens']:>7} {row['updates']:>8} {row['elements']:>9} "
+            f"{row['mb_sent']:>8.3f} {row['cpu_ms']:>8.2f}"
+        )
+    return "\n".join(lines)
+
+
+def main():
+    """Parse arguments, run the benchmark and print a report."""
+    parser = argparse.ArgumentParser(description="Benchmark streamed markdown rendering offline.")
+    parser.add_argument("--tokens", type=int, default=4000, help="Answer length in tokens")
+    parser.add_argument("--tokens-per-second", type=float, default=60.0, help="Simulated streaming rate")
+    parser.add_argument("--frame-intervals", nargs="*", type=float, default=[0.05, 0.1], help="Renderer frame intervals in seconds")
+    parser.add_argument("--min-chars", type=int, default=0, help="Renderer minimum pending characters per render")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per variant")
+    parser.add_argument("--json", help="Also write the results to this JSON file")
+    args = parser.parse_args()
+
+    rows = run_render_benchmark(
+        tokens=args.tokens,
+        tokens_per_second=args.tokens_per_second,
+        frame_intervals=args.frame_intervals,
+        min_chars=args.min_chars,
+        repeat=args.repeat
+    )
+
+    print(format_report(rows))
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(rows, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Tests for the benchmark harness and scenarios.
+Note: Scenarios run against the fake chat model, so no API calls are made.
+"""
+
+import asyncio
+
+import pytest
+from benchmarks.compression import quality_proxies, run_compression_benchmark, synthetic_transcript
+from benchmarks.harness import percentile, run_load
+from benchmarks.run import run_benchmarks
+from benchmarks.scenarios import SCENARIOS, load_prompt
+from benchmarks.streaming_render import run_render_benchmark
+from benchmarks.youtube_pipeline import run_pipeline_benchmark
+
+
+class TestHarness:
+    """Test cases for the load generator."""
+
+    def test_percentile_interpolates(self):
+        """Test percentiles against known values."""
+        values = [float(v) for v in range(1, 101)]
+
+        assert percentile(values, 50) == pytest.approx(50.5)
+        assert percentile(values, 99) == pytest.approx(99.01)
+        assert percentile([], 95) == 0.0
+
+    def test_run_load_measures_ttft_and_errors(self):
+        """Test that time to first token and failed requests are recorded."""
+        def new_user():
+            async def request(turn):
+                if turn == 2:
+                    raise RuntimeError("boom")
+                await asyncio.sleep(0.05)
+                yield "first "
+                await asyncio.sleep(0.05)
+                yield "second"
+            return request
+
+        summary = asyncio.run(run_load(new_user, users=4, requests_per_user=3))
+
+        assert summary["requests"] == 12
+        assert summary["errors"] == 4
+        assert summary["tokens"] == 16
+        assert 40 <= summary["ttft_ms"]["p50"] < summary["latency_ms"]["p50"]
+
+
+class TestScenarios:
+    """Test cases for the app scenarios."""
+
+    def test_prompts_are_read_from_the_apps(self):
+        """Test that prompts are extracted without running the Streamlit apps."""
+        assert "{input}" in load_prompt("Smart_Email_Writer", "EMAIL_PROMPT")
+        with pytest.raises(ValueError):
+            load_prompt("Smart_Email_Writer", "MISSING_PROMPT")
+
+    def test_all_scenarios_run(self):
+        """Test every scenario end to end with a fast fake model."""
+        results = run_benchmarks(list(SCENARIOS), users=2, requests_per_user=2, latency=0, tokens_per_second=0)
+
+        for name, summary in results.items():
+            assert summary["errors"] == 0, name
+            assert summary["tokens"] > 0, name
+
+
+class TestCompression:
+    """Test cases for the transcript compression benchmark."""
+
+    def test_quality_proxies_bounds(self):
+        """Test that an uncompressed transcript scores fully and an empty one scores zero."""
+        segments = synthetic_transcript(segments_per_topic=10)
+
+        full = quality_proxies(segments, segments)
+        assert full["keyword_coverage"] == 1.0
+        assert full["similarity"] == pytest.approx(1.0, abs=0.001)
+        assert full["timeline_coverage"] == 1.0
+        assert quality_proxies(segments, [])["similarity"] == 0.0
+
+    def test_lower_ratios_save_more(self):
+        """Test that savings grow as the keep ratio falls."""
+        rows = run_compression_benchmark(synthetic_transcript(segments_per_topic=20), [1.0, 0.5, 0.2], repeats=1)
+        savings = [row["token_savings"] for row in rows]
+
+        assert savings == sorted(savings)
+        assert rows[0]["keyword_coverage"] >= rows[-1]["keyword_coverage"]
+
+
+class TestYoutubePipeline:
+    """Test cases for the offline YouTube pipeline benchmark."""
+
+    def test_warm_cache_skips_llm_calls(self):
+        """Test that the warm run is served from the cache."""
+        rows = run_pipeline_benchmark(
+            videos=2, segments_per_topic=50, concurrency=[2], latency=0, fetch_latency=0, chapters=True
+        )
+        cold, warm = rows
+
+        assert cold["calls"] > 0 and cold["cached"] == 0
+        assert warm["calls"] == 0 and warm["cached"] == 2
+
+
+class TestStreamingRender:
+    """Test cases for the streaming render benchmark."""
+
+    def test_renderer_sends_less_than_original_loop(self):
+        """Test that throttled rendering needs fewer updates and sends far fewer bytes."""
+        original, renderer = run_render_benchmark(tokens=600, tokens_per_second=60, frame_intervals=[0.1], repeat=1)
+
+        assert original["updates"] == 601
+        assert renderer["updates"] < original["updates"] / 2
+        assert renderer["mb_sent"] < original["mb_sent"] / 5
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
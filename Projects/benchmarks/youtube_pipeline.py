@@ -0,0 +1,143 @@
+"""
+YouTube summarizer pipeline benchmark, offline and deterministic.
+
+Runs summarize_video on synthetic transcripts with replay providers that
+simulate YouTube and OpenAI latency, at several concurrency limits, first
+with a cold cache and then with a warm one. Reports wall-clock time, LLM
+calls and tokens per run. Run from the Projects directory with:
+    python -m benchmarks.youtube_pipeline --videos 3 --concurrency 1 4 16
+"""
+
+from typing import Any, Dict, List
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+# Run from anywhere: make the Projects directory and the summarizer importable
+PROJECTS_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(PROJECTS_DIR)
+sys.path.append(os.path.join(PROJECTS_DIR, "Youtube_Video_Summarizer"))
+
+from benchmarks.compression import synthetic_transcript
+from cache import SummaryCache
+from pipeline import summarize_video
+from providers import ReplayLLM, ReplayTranscriptProvider
+
+# Section summary returned by the simulated model
+REPLY = "- The speaker covers the main idea of this section\n- A supporting detail with an example\n- The conclusion"
+
+
+async def summarize_all(video_ids: List[str], transcripts, llm, cache: SummaryCache, **kwargs) -> Dict[str, Any]:
+    """Summarize videos one after another and total their usage."""
+    start = time.perf_counter()
+    calls = prompt_tokens = cached = 0
+    for video_id in video_ids:
+        result = await summarize_video(video_id, transcripts, llm, cache=cache, **kwargs)
+        calls += result.usage.calls
+        prompt_tokens += result.usage.prompt_tokens
+        cached += result.summary_cached
+    return {
+        "seconds": round(time.perf_counter() - start, 3),
+        "calls": calls,
+        "prompt_tokens": prompt_tokens,
+        "cached": cached
+    }
+
+
+def run_pipeline_benchmark(
+    videos: int = 3,
+    segments_per_topic: int = 1500,
+    concurrency: List[int] = (1, 4, 16),
+    latency: float = 0.2,
+    tokens_per_second: float = 0.0,
+    fetch_latency: float = 0.3,
+    model: str = "gpt-3.5-turbo",
+    chapters: bool = False,
+    keep_ratio: float = 1.0
+) -> List[Dict[str, Any]]:
+    """
+    Benchmark the pipeline at each concurrency limit, cold and warm.
+
+    Args:
+        videos: Synthetic videos per run
+        segments_per_topic: Transcript length (see synthetic_transcript)
+        concurrency: max_concurrency values to compare
+        latency: Simulated LLM seconds to first token
+        tokens_per_second: Simulated LLM streaming rate (0 for instant)
+        fetch_latency: Simulated transcript fetch seconds
+        model: Model whose context window and prices the plan uses
+        chapters: Benchmark chapter mode instead of the overview
+        keep_ratio: Share of the transcript kept by pre-compression
+
+    Returns:
+        One row per concurrency limit and cache state
+    """
+    fixtures = {
+        f"video{i}": {"segments": synthetic_transcript(segments_per_topic, seed=i)}
+        for i in range(videos)
+    }
+    options = {"model": model, "chapters": chapters, "keep_ratio": keep_ratio}
+
+    rows = []
+    for limit in concurrency:
+        transcripts = ReplayTranscriptProvider(fixtures=fixtures, latency=fetch_latency)
+        llm = ReplayLLM(default=REPLY, latency=latency, tokens_per_second=tokens_per_second, model=model)
+        cache = SummaryCache(path=":memory:")
+        for state in ("cold", "warm"):
+            stats = asyncio.run(summarize_all(list(fixtures), transcripts, llm, cache, max_concurrency=limit, **options))
+            rows.append({"concurrency": limit, "cache": state, **stats})
+        cache.close()
+    return rows
+
+
+def format_report(rows: List[Dict[str, Any]]) -> str:
+    """Format benchmark rows as a plain-text table."""
+    header = f"{'concurrency':>11} {'cache':>6} {'seconds':>8} {'calls':>6} {'prompt tokens':>14} {'cached':>7}"
+    lines = [header, "-" * len(header)]
+    for row in rows:
+        lines.append(
+            f"{row['concurrency']:>11} {row['cache']:>6} {row['seconds']:>8.2f} {row['calls']:>6} "
+            f"{row['prompt_tokens']:>14,} {row['cached']:>7}"
+        )
+    return "\n".join(lines)
+
+
+def main():
+    """Parse arguments, run the benchmark and print a report."""
+    parser = argparse.ArgumentParser(description="Benchmark the YouTube summarizer pipeline offline.")
+    parser.add_argument("--videos", type=int, default=3, help="Synthetic videos per run")
+    parser.add_argument("--segments-per-topic", type=int, default=1500, help="Transcript length")
+    parser.add_argument("--concurrency", nargs="*", type=int, default=[1, 4, 16], help="max_concurrency values")
+    parser.add_argument("--latency", type=float, default=0.2, help="Simulated LLM seconds to first token")
+    parser.add_argument("--tokens-per-second", type=float, default=0.0, help="Simulated LLM streaming rate")
+    parser.add_argument("--fetch-latency", type=float, default=0.3, help="Simulated transcript fetch seconds")
+    parser.add_argument("--model", default="gpt-3.5-turbo", help="Model for the context window and prices")
+    parser.add_argument("--chapters", action="store_true", help="Benchmark chapter mode")
+    parser.add_argument("--keep-ratio", type=float, default=1.0, help="Share kept by pre-compression")
+    parser.add_argument("--json", help="Also write the results to this JSON file")
+    args = parser.parse_args()
+
+    rows = run_pipeline_benchmark(
+        videos=args.videos,
+        segments_per_topic=args.segments_per_topic,
+        concurrency=args.concurrency,
+        latency=args.latency,
+        tokens_per_second=args.tokens_per_second,
+        fetch_latency=args.fetch_latency,
+        model=args.model,
+        chapters=args.chapters,
+        keep_ratio=args.keep_ratio
+    )
+
+    print(format_report(rows))
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(rows, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,6 @@
+"""
+Shared helpers for the LangChain projects.
+
+Each app adds the Projects directory to sys.path and imports from here, e.g.:
+    from common.llm_pool import get_chat_model
+"""
@@ -0,0 +1,269 @@
+"""
+Persistent, session-keyed chat history for the LangChain chat apps.
+
+StreamlitChatMessageHistory lives in one browser session's memory, so a
+restart or a second worker loses it. ChatHistoryStore keeps every
+session's messages in SQLite instead:
+- the database runs in WAL mode, so readers don't block the writer
+- new messages are buffered and written in batches (every flush_interval
+  seconds or flush_size messages) by a background thread
+- an in-memory LRU front keeps the recent messages of active sessions, and
+  a session missing from it loads only its last max_messages rows
+
+get_history returns a BaseChatMessageHistory for one session, suitable as
+the factory of a RunnableWithMessageHistory.
+"""
+
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence
+import atexit
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from langchain_core.chat_history import BaseChatMessageHistory
+from langchain_core.messages import BaseMessage, message_to_dict, messages_from_dict
+
+CHAT_HISTORY_DB = os.getenv("CHAT_HISTORY_DB", "chat_history.db")
+CHAT_HISTORY_MAX_MESSAGES = int(os.getenv("CHAT_HISTORY_MAX_MESSAGES", "100"))
+
+
+class ChatHistoryStore:
+    """SQLite-backed chat messages for many sessions, with batched writes and an LRU front."""
+
+    def __init__(
+        self,
+        path: str = CHAT_HISTORY_DB,
+        max_messages: int = CHAT_HISTORY_MAX_MESSAGES,
+        max_sessions: int = 256,
+        flush_interval: float = 1.0,
+        flush_size: int = 32
+    ):
+        """
+        Initialize the store.
+
+        Args:
+            path: SQLite database file (":memory:" for a throwaway store)
+            max_messages: Most recent messages loaded and kept per session
+            max_sessions: Sessions kept in memory before the least recently used is dropped
+            flush_interval: Seconds between background writes (0 writes every message immediately)
+            flush_size: Pending messages that trigger a write without waiting
+        """
+        self.path = path
+        self.max_messages = max_messages
+        self.max_sessions = max_sessions
+        self.flush_interval = flush_interval
+        self.flush_size = flush_size
+
+        self.hits = 0
+        self.misses = 0
+        self.flushes = 0
+        self.written = 0
+
+        self._lock = threading.Lock()
+        self._sessions: "OrderedDict[str, List[Dict[str, Any]]]" = OrderedDict()
+        self._pending: List[tuple] = []
+
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS messages (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                session_id TEXT NOT NULL,
+                data TEXT NOT NULL,
+                created_at REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_messages_session ON messages (session_id, id)")
+        self._conn.commit()
+
+        self._stop = threading.Event()
+        self._flusher = None
+        if flush_interval > 0:
+            self._flusher = threading.Thread(target=self._flush_loop, name="chat-history-flush", daemon=True)
+            self._flusher.start()
+        atexit.register(self.close)
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def _flush_loop(self):
+        """Write pending messages every flush_interval seconds until closed."""
+        while not self._stop.wait(self.flush_interval):
+            self.flush()
+
+    def _flush_locked(self):
+        """Write pending messages in one transaction; the caller holds the lock."""
+        if not self._pending:
+            return
+        with self._conn:
+            self._conn.executemany(
+                "INSERT INTO messages (session_id, data, created_at) VALUES (?, ?, ?)",
+                self._pending
+            )
+        self.written += len(self._pending)
+        self.flushes += 1
+        self._pending = []
+
+    def flush(self):
+        """Write all pending messages now."""
+        with self._lock:
+            self._flush_locked()
+
+    def add_messages(self, session_id: str, messages: Sequence[BaseMessage]):
+        """
+        Append messages to a session.
+
+        Args:
+            session_id: Session to append to
+            messages: LangChain messages, oldest first
+        """
+        records = [message_to_dict(message) for message in messages]
+        now = time.time()
+
+        with self._lock:
+            recent = self._load_locked(session_id)
+            recent.extend(records)
+            del recent[:-self.max_messages]
+
+            self._pending.extend((session_id, json.dumps(record), now) for record in records)
+            if self.flush_interval <= 0 or len(self._pending) >= self.flush_size:
+                self._flush_locked()
+
+    def clear(self, session_id: str):
+        """Delete a session's messages, pending and stored."""
+        with self._lock:
+            self._pending = [row for row in self._pending if row[0] != session_id]
+            self._sessions.pop(session_id, None)
+            with self._conn:
+                self._conn.execute("DELETE FROM messages WHERE session_id = ?", (session_id,))
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def _load_locked(self, session_id: str) -> List[Dict[str, Any]]:
+        """Return a session's recent message records from memory or disk; the caller holds the lock."""
+        if session_id in self._sessions:
+            self.hits += 1
+            self._sessions.move_to_end(session_id)
+            return self._sessions[session_id]
+
+        self.misses += 1
+        # Pending rows of this session must be on disk before it is read back
+        if any(row[0] == session_id for row in self._pending):
+            self._flush_locked()
+
+        rows = self._conn.execute(
+            "SELECT data FROM messages WHERE session_id = ? ORDER BY id DESC LIMIT ?",
+            (session_id, self.max_messages)
+        ).fetchall()
+        recent = [json.loads(row[0]) for row in reversed(rows)]
+
+        self._sessions[session_id] = recent
+        while len(self._sessions) > self.max_sessions:
+            self._sessions.popitem(last=False)
+        return recent
+
+    def get_messages(self, session_id: str) -> List[BaseMessage]:
+        """
+        Load a session's most recent messages.
+
+        Args:
+            session_id: Session to load
+
+        Returns:
+            Up to max_messages LangChain messages, oldest first
+        """
+        with self._lock:
+            records = list(self._load_locked(session_id))
+        return messages_from_dict(records)
+
+    def get_history(self, session_id: str) -> "SessionChatHistory":
+        """Get a LangChain chat history view of one session."""
+        return SessionChatHistory(self, session_id)
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get store statistics.
+
+        Returns:
+            Dictionary containing memory hits and misses, hit rate, cached and stored
+            sessions, pending and written messages and write batches
+        """
+        with self._lock:
+            stored = self._conn.execute("SELECT COUNT(DISTINCT session_id) FROM messages").fetchone()[0]
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "cached_sessions": len(self._sessions),
+                "stored_sessions": stored,
+                "pending": len(self._pending),
+                "written": self.written,
+                "flushes": self.flushes
+            }
+
+    def close(self):
+        """Stop the background writer, write pending messages and close the database."""
+        if self._stop.is_set():
+            return
+        self._stop.set()
+        if self._flusher is not None:
+            self._flusher.join()
+        with self._lock:
+            self._flush_locked()
+            self._conn.close()
+        atexit.unregister(self.close)
+
+
+class SessionChatHistory(BaseChatMessageHistory):
+    """Chat history of one session in a ChatHistoryStore."""
+
+    def __init__(self, store: ChatHistoryStore, session_id: str):
+        """
+        Initialize the view.
+
+        Args:
+            store: Store holding the messages
+            session_id: Session this history reads and writes
+        """
+        self.store = store
+        self.session_id = session_id
+
+    @property
+    def messages(self) -> List[BaseMessage]:
+        """The session's most recent messages, oldest first."""
+        return self.store.get_messages(self.session_id)
+
+    def add_messages(self, messages: Sequence[BaseMessage]) -> None:
+        """Append messages to the session."""
+        self.store.add_messages(self.session_id, messages)
+
+    def clear(self) -> None:
+        """Delete the session's messages."""
+        self.store.clear(self.session_id)
+
+
+@lru_cache(maxsize=4)
+def get_history_store(path: Optional[str] = None) -> ChatHistoryStore:
+    """
+    Open a chat history store once per process.
+
+    Args:
+        path: SQLite database file (default: CHAT_HISTORY_DB)
+
+    Returns:
+        The shared ChatHistoryStore for that file
+    """
+    return ChatHistoryStore(path or CHAT_HISTORY_DB)
@@ -0,0 +1,151 @@
+"""
+Local text embeddings for retrieval, without API calls.
+
+Embedders share one method, embed(texts), returning a float32 array with
+one L2-normalized row per text, so inner products are cosine similarities:
+- SentenceTransformerEmbedder runs a local sentence-transformers model
+  (optional dependency: pip install sentence-transformers)
+- HashingEmbedder hashes words and word pairs into a fixed-size vector. It
+  captures shared vocabulary rather than meaning, but needs only NumPy,
+  is deterministic and embeds thousands of texts in milliseconds
+
+get_embedder picks the model named by EMBEDDING_MODEL and falls back to
+hashing when sentence-transformers or the model files are unavailable.
+"""
+
+from functools import lru_cache
+from typing import List, Optional
+import logging
+import os
+import re
+import zlib
+
+import numpy as np
+
+DEFAULT_EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "all-MiniLM-L6-v2")
+
+logger = logging.getLogger(__name__)
+
+_WORD = re.compile(r"[a-z0-9]+")
+_SUFFIX = re.compile(r"(?:ing|ed|es|s)$")
+
+
+def _stem(word: str) -> str:
+    """Strip common English suffixes so "models" and "modeling" share a feature."""
+    stemmed = _SUFFIX.sub("", word)
+    return stemmed if len(stemmed) >= 3 else word
+
+
+class HashingEmbedder:
+    """Feature-hashing embedder over word unigrams and bigrams."""
+
+    name = "hashing"
+
+    def __init__(self, dim: int = 1024, bigram_weight: float = 0.5):
+        """
+        Initialize the embedder.
+
+        Args:
+            dim: Vector size; larger means fewer hash collisions
+            bigram_weight: Weight of word pairs relative to single words
+        """
+        self.dim = dim
+        self.bigram_weight = bigram_weight
+
+    def _features(self, text: str) -> List[tuple]:
+        """Hashed (index, sign, weight) features of a text."""
+        words = [_stem(word) for word in _WORD.findall(text.lower()) if len(word) > 2]
+        features = [(word, 1.0) for word in words]
+        features += [(f"{a} {b}", self.bigram_weight) for a, b in zip(words, words[1:])]
+
+        hashed = []
+        for feature, weight in features:
+            # crc32 is stable across processes, unlike hash()
+            digest = zlib.crc32(feature.encode("utf-8"))
+            hashed.append((digest % self.dim, 1.0 if digest & 0x80000000 else -1.0, weight))
+        return hashed
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        """
+        Embed texts.
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            Array of shape (len(texts), dim) with L2-normalized rows (all zeros for empty texts)
+        """
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for index, sign, weight in self._features(text):
+                vectors[row, index] += sign * weight
+
+        # Sublinear term frequency, so repeated words don't dominate
+        vectors = np.sign(vectors) * np.log1p(np.abs(vectors))
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.where(norms == 0, 1, norms)
+
+
+class SentenceTransformerEmbedder:
+    """Embedder running a local sentence-transformers model."""
+
+    def __init__(self, model: str = DEFAULT_EMBEDDING_MODEL, batch_size: int = 64):
+        """
+        Load the model.
+
+        Args:
+            model: sentence-transformers model name or local path
+            batch_size: Texts embedded per forward pass
+
+        Raises:
+            ImportError: If sentence-transformers is not installed
+            OSError: If the model files can't be loaded
+        """
+        from sentence_transformers import SentenceTransformer
+
+        self.name = model
+        self.batch_size = batch_size
+        self.model = SentenceTransformer(model)
+        self.dim = self.model.get_sentence_embedding_dimension()
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        """
+        Embed texts.
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            Array of shape (len(texts), dim) with L2-normalized rows
+        """
+        if not texts:
+            return np.zeros((0, self.dim), dtype=np.float32)
+        vectors = self.model.encode(
+            texts,
+            batch_size=self.batch_size,
+            normalize_embeddings=True,
+            convert_to_numpy=True
+        )
+        return vectors.astype(np.float32)
+
+
+@lru_cache(maxsize=4)
+def get_embedder(model: Optional[str] = None):
+    """
+    Load an embedder once per process.
+
+    Args:
+        model: sentence-transformers model name, or "hashing" (default: EMBEDDING_MODEL)
+
+    Returns:
+        The embedder; a HashingEmbedder if the model can't be loaded
+    """
+    model = model or DEFAULT_EMBEDDING_MODEL
+    if model == HashingEmbedder.name:
+        return HashingEmbedder()
+
+    try:
+        return SentenceTransformerEmbedder(model)
+    except (ImportError, OSError) as e:
+        logger.warning("Embedding model %s unavailable (%s); using hashing embeddings", model, e)
+        return HashingEmbedder()
@@ -0,0 +1,115 @@
+"""
+Deterministic fake chat model for tests and benchmarks.
+
+It behaves like a streaming ChatOpenAI without any network calls: every
+request waits `latency` seconds for the first token, then streams the
+canned response at `tokens_per_second`. Sync and async calls are both
+supported, so chains can be benchmarked under real concurrency.
+"""
+
+from typing import Any, AsyncIterator, Iterator, List, Optional
+import asyncio
+import re
+import time
+
+from langchain_core.callbacks import AsyncCallbackManagerForLLMRun, CallbackManagerForLLMRun
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+
+DEFAULT_RESPONSE = (
+    "Here is a concise, well structured answer. It covers the key points, gives a short "
+    "example and ends with a clear suggestion for the next step. Each sentence is kept "
+    "simple so the reader can scan it quickly and act on it without follow-up questions."
+)
+
+
+def split_tokens(text: str) -> List[str]:
+    """Split text into word-sized tokens, keeping the trailing whitespace on each."""
+    return re.findall(r"\s*\S+\s*", text) or [text]
+
+
+class FakeChatModel(BaseChatModel):
+    """Chat model returning a fixed response with simulated latency and streaming rate."""
+
+    response: str = DEFAULT_RESPONSE
+    """Text returned for every request."""
+
+    latency: float = 0.0
+    """Seconds before the first token."""
+
+    tokens_per_second: float = 0.0
+    """Streaming rate after the first token (0 streams without delay)."""
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-chat-model"
+
+    def _chunks(self, messages: List[BaseMessage]) -> List[AIMessageChunk]:
+        """Build the response chunks, with token usage on the last one."""
+        tokens = split_tokens(self.response)
+        prompt_chars = sum(len(str(message.content)) for message in messages)
+        input_tokens = prompt_chars // 4 + 1
+
+        chunks = [AIMessageChunk(content=token) for token in tokens]
+        chunks[-1].usage_metadata = {
+            "input_tokens": input_tokens,
+            "output_tokens": len(tokens),
+            "total_tokens": input_tokens + len(tokens)
+        }
+        return chunks
+
+    def _stream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any
+    ) -> Iterator[ChatGenerationChunk]:
+        time.sleep(self.latency)
+        for i, chunk in enumerate(self._chunks(messages)):
+            if i and self.tokens_per_second:
+                time.sleep(1 / self.tokens_per_second)
+            if run_manager:
+                run_manager.on_llm_new_token(chunk.content)
+            yield ChatGenerationChunk(message=chunk)
+
+    async def _astream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        await asyncio.sleep(self.latency)
+        for i, chunk in enumerate(self._chunks(messages)):
+            if i and self.tokens_per_second:
+                await asyncio.sleep(1 / self.tokens_per_second)
+            if run_manager:
+                await run_manager.on_llm_new_token(chunk.content)
+            yield ChatGenerationChunk(message=chunk)
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any
+    ) -> ChatResult:
+        message = None
+        for chunk in self._stream(messages, stop, run_manager, **kwargs):
+            message = chunk.message if message is None else message + chunk.message
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any
+    ) -> ChatResult:
+        message = None
+        async for chunk in self._astream(messages, stop, run_manager, **kwargs):
+            message = chunk.message if message is None else message + chunk.message
+        return ChatResult(generations=[ChatGeneration(message=message)])
@@ -0,0 +1,270 @@
+"""
+Token-budgeted chat history for RunnableWithMessageHistory chains.
+
+Feeding the whole history into MessagesPlaceholder("history") makes every
+turn's prompt longer than the last. HistoryTrimmer is a runnable stage
+placed in front of the prompt that keeps only the most recent turns
+fitting a per-model token budget:
+- token counts are cached per message, so each turn only tokenizes the
+  messages it hasn't seen before
+- when the budget is exceeded the oldest turns are dropped down to a low
+  water mark, so the cut moves every few turns instead of on every turn
+  and the kept prefix of the prompt stays stable in between
+- dropped turns can optionally be folded into a running summary, sent as
+  a system message ahead of the kept turns
+
+get_stats reports the prompt tokens saved.
+"""
+
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import logging
+import os
+import threading
+
+from langchain_core.messages import BaseMessage, SystemMessage, get_buffer_string
+from langchain_core.output_parsers import StrOutputParser
+from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.runnables import RunnableConfig, RunnableLambda
+
+from common.tokens import count_tokens
+
+# History tokens kept per model (HISTORY_TOKEN_BUDGET overrides them all)
+HISTORY_TOKEN_BUDGETS = {
+    "gpt-4o-mini": 4000,
+    "gpt-4o": 4000,
+    "gpt-4-turbo": 4000,
+    "gpt-3.5-turbo": 2000
+}
+DEFAULT_HISTORY_TOKENS = 2000
+
+# Tokens OpenAI adds around each chat message
+MESSAGE_OVERHEAD_TOKENS = 4
+
+SUMMARY_PREFIX = "Summary of the earlier conversation:\n"
+
+SUMMARY_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", "You maintain a running summary of a conversation between a user and an assistant."),
+    ("human",
+     "Current summary:\n{summary}\n\n"
+     "Older messages to fold into it:\n{messages}\n\n"
+     "Write the updated summary in at most {max_words} words. Keep facts, decisions, "
+     "names, code identifiers and open questions; drop pleasantries.")
+])
+
+Summarizer = Callable[[str, List[BaseMessage]], str]
+
+logger = logging.getLogger(__name__)
+
+
+def history_budget(model: str) -> int:
+    """Return the history token budget for a model."""
+    override = os.getenv("HISTORY_TOKEN_BUDGET")
+    if override:
+        return int(override)
+    return HISTORY_TOKEN_BUDGETS.get(model, DEFAULT_HISTORY_TOKENS)
+
+
+def llm_summarizer(llm, max_words: int = 150) -> Summarizer:
+    """
+    Build a summarizer that folds dropped messages into the running summary with an LLM.
+
+    Args:
+        llm: Chat model, ideally non-streaming with a low temperature
+        max_words: Length limit given to the model
+
+    Returns:
+        Function of (previous summary, dropped messages) returning the new summary
+    """
+    chain = SUMMARY_PROMPT | llm | StrOutputParser()
+
+    def summarize(summary: str, messages: List[BaseMessage]) -> str:
+        return chain.invoke({
+            "summary": summary or "(none yet)",
+            "messages": get_buffer_string(messages),
+            "max_words": max_words
+        }).strip()
+
+    return summarize
+
+
+class HistoryTrimmer:
+    """Keeps chat history within a token budget, per session."""
+
+    def __init__(
+        self,
+        model: str = "gpt-4o-mini",
+        max_tokens: Optional[int] = None,
+        low_water: float = 0.75,
+        summarize: Optional[Summarizer] = None,
+        count: Optional[Callable[[str], int]] = None,
+        cache_size: int = 4096,
+        max_sessions: int = 1024
+    ):
+        """
+        Initialize the trimmer.
+
+        Args:
+            model: Model whose tokenizer and budget to use
+            max_tokens: History token budget (default: history_budget(model))
+            low_water: Share of the budget kept after trimming
+            summarize: Optional function of (previous summary, dropped messages) returning a new summary
+            count: Token counter for text (default: the model's tokenizer)
+            cache_size: Per-message token counts kept
+            max_sessions: Sessions whose cut point and summary are remembered
+        """
+        self.model = model
+        self.max_tokens = max_tokens or history_budget(model)
+        self.low_water = low_water
+        self.summarize = summarize
+        self.count = count or (lambda text: count_tokens(text, model))
+        self.cache_size = cache_size
+        self.max_sessions = max_sessions
+
+        self._lock = threading.Lock()
+        self._counts: "OrderedDict[Tuple[str, str], int]" = OrderedDict()
+        self._sessions: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+        self.turns = 0
+        self.tokens_before = 0
+        self.tokens_after = 0
+        self.summaries = 0
+        self.counted = 0
+        self.count_hits = 0
+
+    @staticmethod
+    def _key(message: BaseMessage) -> Tuple[str, str]:
+        """Identify a message by its type and content."""
+        return message.type, str(message.content)
+
+    def message_tokens(self, message: BaseMessage) -> int:
+        """Count a message's prompt tokens, tokenizing each distinct message only once."""
+        key = self._key(message)
+        with self._lock:
+            if key in self._counts:
+                self.count_hits += 1
+                self._counts.move_to_end(key)
+                return self._counts[key]
+
+        tokens = self.count(key[1]) + MESSAGE_OVERHEAD_TOKENS
+        with self._lock:
+            self.counted += 1
+            self._counts[key] = tokens
+            while len(self._counts) > self.cache_size:
+                self._counts.popitem(last=False)
+        return tokens
+
+    def _resume(self, messages: List[BaseMessage], cut: Optional[Tuple]) -> int:
+        """
+        Find where the kept turns start.
+
+        The cut is stored as the index of the first kept message plus the keys
+        of the last dropped and first kept messages. History is only appended
+        to, so the cut is at the same index unless older messages scrolled out
+        of the loaded window, which moves it towards the front; the keys only
+        confirm the position, so repeated exchanges later on can't move it.
+        """
+        if cut is None:
+            return 0
+        index, last_dropped, first_kept = cut
+        for i in range(min(index, len(messages) - 1), 0, -1):
+            if self._key(messages[i]) == first_kept and self._key(messages[i - 1]) == last_dropped:
+                return i
+        # The cut scrolled out of the loaded history window, or the history was cleared
+        return 0
+
+    def trim(self, messages: List[BaseMessage], session_id: str = "default") -> List[BaseMessage]:
+        """
+        Trim a session's history to the token budget.
+
+        Args:
+            messages: The full history, oldest first
+            session_id: Session whose cut point and summary to continue from
+
+        Returns:
+            The kept messages, preceded by a summary system message when turns were
+            dropped and a summarizer is set
+        """
+        counts = [self.message_tokens(message) for message in messages]
+
+        with self._lock:
+            state = self._sessions.pop(session_id, {"cut": None, "summary": ""})
+        start = self._resume(messages, state["cut"])
+        kept = sum(counts[start:])
+
+        if kept > self.max_tokens:
+            target = self.max_tokens * self.low_water
+            end = start
+            # Drop whole turns from the front, but always keep the latest message
+            while end < len(messages) - 1 and (kept > target or messages[end].type != "human"):
+                kept -= counts[end]
+                end += 1
+
+            dropped = messages[start:end]
+            if dropped:
+                if self.summarize:
+                    try:
+                        state["summary"] = self.summarize(state["summary"], dropped)
+                        with self._lock:
+                            self.summaries += 1
+                    except Exception as e:
+                        # A failed summary shouldn't fail the turn; the dropped turns are just lost
+                        logger.warning("History summary failed (%s); trimming without it", e)
+                state["cut"] = (end, self._key(messages[end - 1]), self._key(messages[end]))
+                start = end
+
+        trimmed = list(messages[start:])
+        summary_tokens = 0
+        if state["summary"]:
+            summary = SystemMessage(SUMMARY_PREFIX + state["summary"])
+            summary_tokens = self.message_tokens(summary)
+            trimmed.insert(0, summary)
+
+        with self._lock:
+            self._sessions[session_id] = state
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+            self.turns += 1
+            self.tokens_before += sum(counts)
+            self.tokens_after += sum(counts[start:]) + summary_tokens
+
+        return trimmed
+
+    def as_runnable(self, history_key: str = "history") -> RunnableLambda:
+        """
+        Wrap the trimmer as a chain stage placed before the prompt.
+
+        Args:
+            history_key: Input key holding the history (history_messages_key)
+
+        Returns:
+            A runnable passing its input dict through with the history trimmed,
+            for the session_id in the run's configurable settings
+        """
+        def trim_inputs(inputs: Dict[str, Any], config: RunnableConfig) -> Dict[str, Any]:
+            session_id = (config.get("configurable") or {}).get("session_id", "default")
+            return {**inputs, history_key: self.trim(inputs.get(history_key) or [], session_id)}
+
+        return RunnableLambda(trim_inputs, name="trim_history")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get trimming statistics.
+
+        Returns:
+            Dictionary containing turns, history tokens before and after trimming,
+            tokens saved and the reduction, summaries written and token count cache use
+        """
+        with self._lock:
+            saved = self.tokens_before - self.tokens_after
+            return {
+                "turns": self.turns,
+                "max_tokens": self.max_tokens,
+                "tokens_before": self.tokens_before,
+                "tokens_after": self.tokens_after,
+                "tokens_saved": saved,
+                "reduction": round(saved / self.tokens_before, 3) if self.tokens_before else 0.0,
+                "summaries": self.summaries,
+                "counted": self.counted,
+                "count_hits": self.count_hits
+            }
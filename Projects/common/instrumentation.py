@@ -0,0 +1,420 @@
+"""
+Per-chain LLM call instrumentation.
+
+Attach an InstrumentationHandler to a chain (see `instrument`) to record,
+for every LLM call made by that chain:
+- queue time: from the chain starting to the LLM request going out
+  (prompt formatting, upstream steps, waiting for a worker thread)
+- time to first token (streaming calls only)
+- total LLM latency
+- prompt and completion tokens
+- errors
+
+Values go into in-process histograms that can be exported as Prometheus
+text or JSONL. Code calling the OpenAI SDK directly can use
+`LLMMetrics.record` instead of the callback handler. Retries are only
+counted for such clients, which retry themselves (e.g. the YouTube
+summarizer's LLMClient); LangChain chains report no "retries" counter.
+"""
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from uuid import UUID
+import bisect
+import json
+import threading
+import time
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+
+
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+TOKEN_BUCKETS = (16, 64, 256, 1024, 4096, 16384)
+
+HISTOGRAMS = {
+    "queue_seconds": LATENCY_BUCKETS,
+    "ttft_seconds": LATENCY_BUCKETS,
+    "latency_seconds": LATENCY_BUCKETS,
+    "prompt_tokens": TOKEN_BUCKETS,
+    "completion_tokens": TOKEN_BUCKETS
+}
+COUNTERS = ("calls", "retries", "errors")
+
+
+class Histogram:
+    """Cumulative-bucket histogram in the style of a Prometheus histogram."""
+
+    def __init__(self, buckets: Sequence[float]):
+        """
+        Initialize the histogram.
+
+        Args:
+            buckets: Sorted upper bounds; an implicit +Inf bucket is added
+        """
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.min = None
+        self.max = None
+
+    def observe(self, value: float):
+        """Record one value."""
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def quantile(self, q: float) -> float:
+        """
+        Estimate a quantile by interpolating inside the bucket that holds it.
+
+        Args:
+            q: Quantile between 0 and 1
+
+        Returns:
+            The estimate, clamped to the observed min and max (0.0 if empty)
+        """
+        if not self.count:
+            return 0.0
+
+        target = q * self.count
+        seen = 0
+        for i, bucket_count in enumerate(self.counts):
+            if bucket_count and seen + bucket_count >= target:
+                lower = self.buckets[i - 1] if i > 0 else self.min
+                upper = self.buckets[i] if i < len(self.buckets) else self.max
+                estimate = lower + (upper - lower) * (target - seen) / bucket_count
+                return min(max(estimate, self.min), self.max)
+            seen += bucket_count
+
+        return self.max
+
+    def to_dict(self) -> Dict[str, float]:
+        """Summarize the histogram with count, sum, mean, extremes and quantiles."""
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 4),
+            "mean": round(self.sum / self.count, 4) if self.count else 0.0,
+            "min": round(self.min, 4) if self.min is not None else 0.0,
+            "max": round(self.max, 4) if self.max is not None else 0.0,
+            "p50": round(self.quantile(0.5), 4),
+            "p95": round(self.quantile(0.95), 4),
+            "p99": round(self.quantile(0.99), 4)
+        }
+
+
+class LLMMetrics:
+    """Thread-safe registry of per-chain LLM histograms and counters."""
+
+    def __init__(self):
+        """Initialize an empty registry."""
+        self._lock = threading.Lock()
+        self._histograms: Dict[Tuple[str, str], Histogram] = {}
+        self._counters: Dict[Tuple[str, str], int] = {}
+
+    def observe(self, chain: str, metric: str, value: float):
+        """
+        Record a value in one of the HISTOGRAMS for a chain.
+
+        Args:
+            chain: Chain name
+            metric: Histogram name from HISTOGRAMS
+            value: Observed value
+        """
+        with self._lock:
+            histogram = self._histograms.get((chain, metric))
+            if histogram is None:
+                histogram = self._histograms[(chain, metric)] = Histogram(HISTOGRAMS[metric])
+            histogram.observe(value)
+
+    def increment(self, chain: str, counter: str, amount: int = 1):
+        """
+        Increase one of the COUNTERS for a chain.
+
+        Args:
+            chain: Chain name
+            counter: Counter name from COUNTERS
+            amount: Amount to add
+        """
+        with self._lock:
+            self._counters[(chain, counter)] = self._counters.get((chain, counter), 0) + amount
+
+    def record(
+        self,
+        chain: str,
+        latency: float,
+        ttft: Optional[float] = None,
+        queue: Optional[float] = None,
+        prompt_tokens: Optional[int] = None,
+        completion_tokens: Optional[int] = None,
+        retries: Optional[int] = None,
+        error: bool = False
+    ):
+        """
+        Record a finished LLM call, e.g. one made with the OpenAI SDK directly.
+
+        Args:
+            chain: Chain name
+            latency: Seconds from request to the final token
+            ttft: Seconds to the first token, for streaming calls
+            queue: Seconds spent before the request was sent
+            prompt_tokens: Prompt tokens reported by the API
+            completion_tokens: Completion tokens reported by the API
+            retries: Number of retried attempts, for clients that retry themselves
+                (None leaves the chain without a retries counter)
+            error: Whether the call failed
+        """
+        self.increment(chain, "calls")
+        if retries is not None:
+            self.increment(chain, "retries", retries)
+        if error:
+            self.increment(chain, "errors")
+            return
+
+        self.observe(chain, "latency_seconds", latency)
+        for metric, value in (
+            ("ttft_seconds", ttft),
+            ("queue_seconds", queue),
+            ("prompt_tokens", prompt_tokens),
+            ("completion_tokens", completion_tokens)
+        ):
+            if value is not None:
+                self.observe(chain, metric, value)
+
+    def chains(self) -> List[str]:
+        """Return the names of all chains with recorded data."""
+        with self._lock:
+            names = {chain for chain, _ in self._histograms} | {chain for chain, _ in self._counters}
+        return sorted(names)
+
+    def get_stats(self) -> Dict[str, Dict[str, any]]:
+        """
+        Get a summary per chain.
+
+        Returns:
+            Mapping of chain name to counters and histogram summaries
+        """
+        with self._lock:
+            stats: Dict[str, Dict[str, any]] = {}
+            for (chain, counter), value in self._counters.items():
+                stats.setdefault(chain, {})[counter] = value
+            for (chain, metric), histogram in self._histograms.items():
+                stats.setdefault(chain, {})[metric] = histogram.to_dict()
+
+        for chain_stats in stats.values():
+            # "retries" is left out for chains that don't retry themselves
+            chain_stats.setdefault("calls", 0)
+            chain_stats.setdefault("errors", 0)
+        return dict(sorted(stats.items()))
+
+    def to_prometheus(self, prefix: str = "llm") -> str:
+        """
+        Export all metrics in the Prometheus text exposition format.
+
+        Args:
+            prefix: Metric name prefix
+
+        Returns:
+            The exposition text
+        """
+        lines = []
+        with self._lock:
+            for counter in COUNTERS:
+                samples = [(chain, value) for (chain, name), value in self._counters.items() if name == counter]
+                if not samples:
+                    continue
+                lines.append(f"# TYPE {prefix}_{counter}_total counter")
+                for chain, value in sorted(samples):
+                    lines.append(f'{prefix}_{counter}_total{{chain="{chain}"}} {value}')
+
+            for metric in HISTOGRAMS:
+                samples = [(chain, h) for (chain, name), h in self._histograms.items() if name == metric]
+                if not samples:
+                    continue
+                lines.append(f"# TYPE {prefix}_{metric} histogram")
+                for chain, histogram in sorted(samples, key=lambda sample: sample[0]):
+                    cumulative = 0
+                    for bound, bucket_count in zip(histogram.buckets + ("+Inf",), histogram.counts):
+                        cumulative += bucket_count
+                        lines.append(f'{prefix}_{metric}_bucket{{chain="{chain}",le="{bound}"}} {cumulative}')
+                    lines.append(f'{prefix}_{metric}_sum{{chain="{chain}"}} {histogram.sum}')
+                    lines.append(f'{prefix}_{metric}_count{{chain="{chain}"}} {histogram.count}')
+
+        return "\n".join(lines) + "\n"
+
+    def to_jsonl(self) -> str:
+        """
+        Export one JSON line per chain with a timestamp, counters and histogram summaries.
+
+        Returns:
+            The JSONL text
+        """
+        now = time.time()
+        return "".join(
+            json.dumps({"timestamp": now, "chain": chain, **stats}) + "\n"
+            for chain, stats in self.get_stats().items()
+        )
+
+    def export_jsonl(self, path: str):
+        """Append the current snapshot to a JSONL file."""
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(self.to_jsonl())
+
+    def reset(self):
+        """Forget all recorded metrics."""
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+
+
+class InstrumentationHandler(BaseCallbackHandler):
+    """Callback handler recording the LLM calls made inside one named chain."""
+
+    # Handlers are cheap and thread-safe, so async runs call them inline on the
+    # event loop instead of on a thread pool, which would skew the timings
+    run_inline = True
+
+    def __init__(self, chain_name: str, metrics: Optional[LLMMetrics] = None):
+        """
+        Initialize the handler.
+
+        Args:
+            chain_name: Name the calls are recorded under
+            metrics: Registry to record into (default: the process-wide registry)
+        """
+        self.chain_name = chain_name
+        self.metrics = metrics or get_metrics()
+
+        self._lock = threading.Lock()
+        # run id -> start time of the outermost run this handler saw for it
+        self._root_start: Dict[UUID, float] = {}
+        # LLM run id -> [start time, queue time, first token time, streamed tokens]
+        self._llm_runs: Dict[UUID, list] = {}
+
+    def _start_run(self, run_id: UUID, parent_run_id: Optional[UUID]) -> float:
+        """Remember when the root of a run started and return that time."""
+        now = time.perf_counter()
+        with self._lock:
+            start = self._root_start.get(parent_run_id, now) if parent_run_id else now
+            self._root_start[run_id] = start
+        return start
+
+    def on_chain_start(
+        self,
+        serialized: Dict[str, Any],
+        inputs: Dict[str, Any],
+        *,
+        run_id: UUID,
+        parent_run_id: Optional[UUID] = None,
+        **kwargs: Any
+    ):
+        self._start_run(run_id, parent_run_id)
+
+    def on_chain_end(self, outputs: Any, *, run_id: UUID, **kwargs: Any):
+        with self._lock:
+            self._root_start.pop(run_id, None)
+
+    def on_chain_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any):
+        with self._lock:
+            self._root_start.pop(run_id, None)
+
+    def _start_llm(self, run_id: UUID, parent_run_id: Optional[UUID]):
+        root_start = self._start_run(run_id, parent_run_id)
+        now = time.perf_counter()
+        with self._lock:
+            self._llm_runs[run_id] = [now, now - root_start, None, 0]
+
+    def on_chat_model_start(
+        self,
+        serialized: Dict[str, Any],
+        messages: List[List[Any]],
+        *,
+        run_id: UUID,
+        parent_run_id: Optional[UUID] = None,
+        **kwargs: Any
+    ):
+        self._start_llm(run_id, parent_run_id)
+
+    def on_llm_start(
+        self,
+        serialized: Dict[str, Any],
+        prompts: List[str],
+        *,
+        run_id: UUID,
+        parent_run_id: Optional[UUID] = None,
+        **kwargs: Any
+    ):
+        self._start_llm(run_id, parent_run_id)
+
+    def on_llm_new_token(self, token: str, *, run_id: UUID, **kwargs: Any):
+        with self._lock:
+            run = self._llm_runs.get(run_id)
+            if run is not None:
+                if run[2] is None:
+                    run[2] = time.perf_counter()
+                run[3] += 1
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any):
+        with self._lock:
+            self._llm_runs.pop(run_id, None)
+            self._root_start.pop(run_id, None)
+        self.metrics.record(self.chain_name, latency=0.0, error=True)
+
+    def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs: Any):
+        now = time.perf_counter()
+        with self._lock:
+            run = self._llm_runs.pop(run_id, None)
+            self._root_start.pop(run_id, None)
+        if run is None:
+            return
+
+        start, queue, first_token, streamed_tokens = run
+        prompt_tokens, completion_tokens = self._token_usage(response)
+        if completion_tokens is None and streamed_tokens:
+            completion_tokens = streamed_tokens
+
+        self.metrics.record(
+            self.chain_name,
+            latency=now - start,
+            ttft=first_token - start if first_token is not None else None,
+            queue=queue,
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens
+        )
+
+    @staticmethod
+    def _token_usage(response: LLMResult) -> Tuple[Optional[int], Optional[int]]:
+        """Read prompt and completion tokens from message usage metadata or llm_output."""
+        for generations in response.generations:
+            for generation in generations:
+                usage = getattr(getattr(generation, "message", None), "usage_metadata", None)
+                if usage:
+                    return usage.get("input_tokens"), usage.get("output_tokens")
+
+        usage = (response.llm_output or {}).get("token_usage") or {}
+        return usage.get("prompt_tokens"), usage.get("completion_tokens")
+
+
+_metrics = LLMMetrics()
+
+
+def get_metrics() -> LLMMetrics:
+    """Return the process-wide metrics registry."""
+    return _metrics
+
+
+def instrument(runnable, chain_name: str, metrics: Optional[LLMMetrics] = None):
+    """
+    Attach an InstrumentationHandler to a runnable.
+
+    Args:
+        runnable: Chain to instrument
+        chain_name: Name the chain's LLM calls are recorded under
+        metrics: Registry to record into (default: the process-wide registry)
+
+    Returns:
+        The runnable bound to the handler
+    """
+    return runnable.with_config(callbacks=[InstrumentationHandler(chain_name, metrics)], run_name=chain_name)
@@ -0,0 +1,484 @@
+"""
+Exact-match prompt/response cache shared by the single-shot generators.
+
+Clicking Generate twice, or going back to an earlier tone, re-sends a
+prompt that has already been answered. LLMCache stores answers in SQLite,
+keyed by a hash of the normalized prompt plus the model settings:
+- prompts are normalized (line endings, trailing whitespace, JSON key
+  order) so cosmetic differences still hit
+- settings that don't change the output (streaming flags) are ignored
+- entries expire after a TTL, and the least recently used are evicted
+  past max_entries or max_bytes
+- calls sampled at a temperature above 0 are bypassed unless the cache
+  (or a view of it from with_sampling()) allows them, since a user
+  asking again may want a different draft
+
+LLMCache implements LangChain's BaseCache, so enable_llm_cache() makes
+every ChatModel.invoke in the process use it. LangChain does not consult
+the cache when streaming; cached_streaming(llm) wraps a chat model so
+streamed chains hit and fill the same entries. Non-LangChain clients can
+use lookup_text/update_text.
+"""
+
+from functools import lru_cache
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import zlib
+
+from langchain_core.caches import BaseCache
+from langchain_core.globals import get_llm_cache, set_llm_cache
+from langchain_core.load import dumps
+from langchain_core.messages import (
+    AIMessage,
+    AIMessageChunk,
+    BaseMessage,
+    HumanMessage,
+    convert_to_messages,
+    message_to_dict,
+    messages_from_dict
+)
+from langchain_core.outputs import ChatGeneration, Generation
+from langchain_core.prompt_values import PromptValue
+from langchain_core.runnables import RunnableConfig, RunnableLambda
+
+LLM_CACHE_DB = os.getenv("LLM_CACHE_DB", "llm_cache.db")
+LLM_CACHE_TTL = float(os.getenv("LLM_CACHE_TTL", str(7 * 24 * 3600)))
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "10000"))
+LLM_CACHE_MAX_BYTES = int(os.getenv("LLM_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+LLM_CACHE_SAMPLED = os.getenv("LLM_CACHE_SAMPLED", "0") == "1"
+
+# Model settings that change how a response is delivered, not what it says
+IGNORED_SETTINGS = ("streaming", "stream_usage")
+
+# Fallbacks for models that aren't serializable, described as e.g. "[('model', 'x'), ('temperature', 0.0)]"
+_TEMPERATURE = re.compile(r"['\"]temperature['\"]\s*[:,]\s*([0-9.]+)")
+_MODEL = re.compile(r"['\"]model(?:_name)?['\"]\s*[:,]\s*['\"]([^'\"]+)['\"]")
+
+
+def normalize_text(text: str) -> str:
+    """Normalize line endings and trailing whitespace."""
+    lines = text.replace("\r\n", "\n").replace("\r", "\n").split("\n")
+    return "\n".join(line.rstrip() for line in lines).strip()
+
+
+def _normalize_value(value: Any) -> Any:
+    """Normalize every string inside a JSON value."""
+    if isinstance(value, str):
+        return normalize_text(value)
+    if isinstance(value, list):
+        return [_normalize_value(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _normalize_value(item) for key, item in value.items()}
+    return value
+
+
+def normalize_prompt(prompt: str) -> str:
+    """
+    Normalize a prompt for hashing.
+
+    Args:
+        prompt: Plain text, or a JSON serialization of chat messages (as LangChain passes them)
+
+    Returns:
+        The prompt with normalized whitespace and, for JSON, sorted keys
+    """
+    try:
+        data = json.loads(prompt)
+    except ValueError:
+        return normalize_text(prompt)
+    return json.dumps(_normalize_value(data), sort_keys=True, ensure_ascii=False)
+
+
+def parse_llm_string(llm_string: str) -> Tuple[str, Optional[float], str]:
+    """
+    Extract the model, temperature and output-relevant settings from a LangChain llm_string.
+
+    Args:
+        llm_string: Model description passed to BaseCache.lookup
+
+    Returns:
+        (model, temperature or None if unset, settings string with delivery-only settings removed)
+    """
+    head, separator, tail = llm_string.partition("---")
+    try:
+        data = json.loads(head)
+    except ValueError:
+        model = _MODEL.search(llm_string)
+        temperature = _TEMPERATURE.search(llm_string)
+        return model.group(1) if model else "", float(temperature.group(1)) if temperature else None, llm_string
+
+    settings = data.get("kwargs", {}) if isinstance(data, dict) else {}
+    for name in IGNORED_SETTINGS:
+        settings.pop(name, None)
+    model = settings.get("model_name") or settings.get("model") or ""
+    temperature = settings.get("temperature")
+    return str(model), float(temperature) if temperature is not None else None, json.dumps(data, sort_keys=True) + separator + tail
+
+
+def _encode_generations(generations: Sequence[Generation]) -> List[Dict[str, Any]]:
+    """Serialize generations as plain JSON."""
+    return [
+        {"text": g.text, "message": message_to_dict(g.message)} if isinstance(g, ChatGeneration) else {"text": g.text}
+        for g in generations
+    ]
+
+
+def _decode_generations(records: List[Dict[str, Any]]) -> List[Generation]:
+    """Rebuild generations from plain JSON."""
+    return [
+        ChatGeneration(message=messages_from_dict([r["message"]])[0]) if "message" in r else Generation(text=r["text"])
+        for r in records
+    ]
+
+
+class LLMCache(BaseCache):
+    """SQLite-backed exact-match LLM response cache with TTL and size limits."""
+
+    def __init__(
+        self,
+        path: str = LLM_CACHE_DB,
+        ttl: float = LLM_CACHE_TTL,
+        max_entries: int = LLM_CACHE_MAX_ENTRIES,
+        max_bytes: int = LLM_CACHE_MAX_BYTES,
+        allow_sampled: bool = LLM_CACHE_SAMPLED
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            path: SQLite database file (":memory:" for a throwaway cache)
+            ttl: Seconds an entry stays valid
+            max_entries: Entries kept before the least recently used are evicted
+            max_bytes: Compressed size kept before the least recently used are evicted
+            allow_sampled: Also cache calls with a temperature above 0 (or unset)
+        """
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.allow_sampled = allow_sampled
+        self._sampled_view: Optional["SampledCacheView"] = None
+
+        self.hits = 0
+        self.misses = 0
+        self.bypassed = 0
+        self.expired = 0
+        self.evictions = 0
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                cache_key TEXT PRIMARY KEY,
+                model TEXT NOT NULL,
+                data BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                expires_at REAL NOT NULL,
+                last_used REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_last_used ON responses (last_used)")
+        self._conn.commit()
+
+    # ------------------------------------------------------------------
+    # Keys
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def make_key(kind: str, prompt: str, model: str, settings: str) -> str:
+        """Hash a normalized prompt with its model settings."""
+        payload = json.dumps([kind, model, settings, normalize_prompt(prompt)], ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _cacheable(self, temperature: Optional[float], allow_sampled: Optional[bool]) -> bool:
+        """Whether a call at this temperature may be cached (unset counts as sampled)."""
+        allowed = self.allow_sampled if allow_sampled is None else allow_sampled
+        return allowed or (temperature is not None and temperature <= 0)
+
+    def _bypass(self):
+        """Count a lookup skipped because the call is sampled."""
+        with self._lock:
+            self.bypassed += 1
+
+    # ------------------------------------------------------------------
+    # Storage
+    # ------------------------------------------------------------------
+
+    def _get(self, key: str) -> Optional[Any]:
+        """Load an unexpired entry, updating its last use."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data, expires_at FROM responses WHERE cache_key = ?", (key,)
+            ).fetchone()
+            if row is not None and row[1] <= now:
+                self._conn.execute("DELETE FROM responses WHERE cache_key = ?", (key,))
+                self._conn.commit()
+                self.expired += 1
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+
+            self._conn.execute("UPDATE responses SET last_used = ? WHERE cache_key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+
+        return json.loads(zlib.decompress(row[0]))
+
+    def _put(self, key: str, model: str, value: Any):
+        """Compress and store an entry, then evict down to the limits."""
+        data = zlib.compress(json.dumps(value).encode("utf-8"), 6)
+        now = time.time()
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (cache_key, model, data, size, expires_at, last_used) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, model, data, len(data), now + self.ttl, now)
+            )
+            self._evict(now)
+            self._conn.commit()
+
+    def _evict(self, now: float):
+        """Drop expired entries, then least recently used ones beyond the limits (lock held)."""
+        self.expired += self._conn.execute("DELETE FROM responses WHERE expires_at <= ?", (now,)).rowcount
+
+        count, total = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+        if count <= self.max_entries and total <= self.max_bytes:
+            return
+
+        rows = self._conn.execute("SELECT cache_key, size FROM responses ORDER BY last_used").fetchall()
+        for key, size in rows:
+            if count <= self.max_entries and total <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM responses WHERE cache_key = ?", (key,))
+            count -= 1
+            total -= size
+            self.evictions += 1
+
+    # ------------------------------------------------------------------
+    # LangChain BaseCache interface
+    # ------------------------------------------------------------------
+
+    def lookup(self, prompt: str, llm_string: str, allow_sampled: Optional[bool] = None) -> Optional[List[Generation]]:
+        """
+        Look up a LangChain call.
+
+        Args:
+            prompt: Prompt, or serialized chat messages
+            llm_string: Model description
+            allow_sampled: Override the cache's allow_sampled setting
+
+        Returns:
+            The cached generations, or None
+        """
+        model, temperature, settings = parse_llm_string(llm_string)
+        if not self._cacheable(temperature, allow_sampled):
+            self._bypass()
+            return None
+        records = self._get(self.make_key("langchain", prompt, model, settings))
+        return _decode_generations(records) if records is not None else None
+
+    def update(self, prompt: str, llm_string: str, return_val: Sequence[Generation], allow_sampled: Optional[bool] = None):
+        """
+        Store a LangChain call's generations.
+
+        Args:
+            prompt: Prompt, or serialized chat messages
+            llm_string: Model description
+            return_val: Generations to cache
+            allow_sampled: Override the cache's allow_sampled setting
+        """
+        model, temperature, settings = parse_llm_string(llm_string)
+        if not self._cacheable(temperature, allow_sampled):
+            return
+        self._put(self.make_key("langchain", prompt, model, settings), model, _encode_generations(return_val))
+
+    def clear(self, **kwargs: Any):
+        """Drop all entries."""
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+
+    # ------------------------------------------------------------------
+    # Plain text interface
+    # ------------------------------------------------------------------
+
+    def lookup_text(
+        self,
+        prompt: str,
+        model: str,
+        temperature: Optional[float],
+        settings: str = "",
+        allow_sampled: Optional[bool] = None
+    ) -> Optional[str]:
+        """
+        Look up a completion made without LangChain.
+
+        Args:
+            prompt: Prompt text, or a JSON serialization of the messages
+            model: Model name
+            temperature: Sampling temperature (None if unset)
+            settings: Other output-relevant settings, e.g. "max_tokens=400"
+            allow_sampled: Override the cache's allow_sampled setting
+
+        Returns:
+            The cached completion text, or None
+        """
+        if not self._cacheable(temperature, allow_sampled):
+            self._bypass()
+            return None
+        return self._get(self.make_key("text", prompt, model, f"{temperature}|{settings}"))
+
+    def update_text(
+        self,
+        prompt: str,
+        model: str,
+        temperature: Optional[float],
+        text: str,
+        settings: str = "",
+        allow_sampled: Optional[bool] = None
+    ):
+        """Store a completion made without LangChain; arguments as for lookup_text."""
+        if not self._cacheable(temperature, allow_sampled):
+            return
+        self._put(self.make_key("text", prompt, model, f"{temperature}|{settings}"), model, text)
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------
+
+    def with_sampling(self) -> "SampledCacheView":
+        """
+        Get a view of this cache that also caches calls above temperature 0.
+
+        The same view is returned each time, so models configured with it can be pooled.
+        """
+        if self._sampled_view is None:
+            self._sampled_view = SampledCacheView(self)
+        return self._sampled_view
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dictionary containing hits, misses, hit ratio, bypassed (sampled) calls,
+            entries, compressed bytes, expired and evicted entries
+        """
+        with self._lock:
+            count, total = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0,
+                "bypassed": self.bypassed,
+                "entries": count,
+                "bytes": total,
+                "expired": self.expired,
+                "evictions": self.evictions
+            }
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+
+class SampledCacheView(BaseCache):
+    """An LLMCache that also caches sampled calls, for users who opted in; shares storage and stats."""
+
+    def __init__(self, cache: LLMCache):
+        self.cache = cache
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[List[Generation]]:
+        return self.cache.lookup(prompt, llm_string, allow_sampled=True)
+
+    def update(self, prompt: str, llm_string: str, return_val: Sequence[Generation]):
+        self.cache.update(prompt, llm_string, return_val, allow_sampled=True)
+
+    def clear(self, **kwargs: Any):
+        self.cache.clear()
+
+
+def _to_messages(value: Any) -> List[BaseMessage]:
+    """Convert a chat model input to messages."""
+    if isinstance(value, PromptValue):
+        return value.to_messages()
+    if isinstance(value, str):
+        return [HumanMessage(value)]
+    return convert_to_messages(value)
+
+
+def cached_streaming(llm) -> RunnableLambda:
+    """
+    Wrap a chat model so streamed calls use the LLM cache too.
+
+    The model's own cache setting applies: a BaseCache instance, False to
+    disable, or None for the global cache from enable_llm_cache. Entries are
+    shared with the model's invoke calls.
+
+    Args:
+        llm: LangChain chat model
+
+    Returns:
+        A runnable streaming AIMessageChunks; a cache hit is returned as a single chunk
+    """
+    def stream(value: Any, config: RunnableConfig) -> Iterator[AIMessageChunk]:
+        cache = llm.cache if isinstance(llm.cache, BaseCache) else get_llm_cache()
+        if cache is None or llm.cache is False:
+            yield from llm.stream(value, config)
+            return
+
+        # Same prompt and llm_string as LangChain's own cache lookups
+        prompt = dumps([m.model_copy(update={"id": None}) for m in _to_messages(value)])
+        llm_string = llm._get_llm_string()
+        cached = cache.lookup(prompt, llm_string)
+        if cached:
+            yield AIMessageChunk(content=cached[0].text)
+            return
+
+        message = None
+        for chunk in llm.stream(value, config):
+            message = chunk if message is None else message + chunk
+            yield chunk
+        if message is not None and message.content:
+            response = AIMessage(content=message.content, usage_metadata=message.usage_metadata)
+            cache.update(prompt, llm_string, [ChatGeneration(message=response)])
+
+    return RunnableLambda(stream, name="cached_streaming")
+
+
+@lru_cache(maxsize=4)
+def get_shared_llm_cache(path: Optional[str] = None) -> LLMCache:
+    """Open an LLM cache once per process per database file."""
+    return LLMCache(path or LLM_CACHE_DB)
+
+
+def enable_llm_cache(path: Optional[str] = None) -> Optional[LLMCache]:
+    """
+    Install the shared LLM cache as LangChain's global cache.
+
+    Set LLM_CACHE=0 to disable it.
+
+    Args:
+        path: SQLite database file (default: LLM_CACHE_DB)
+
+    Returns:
+        The installed cache, or None when disabled
+    """
+    if os.getenv("LLM_CACHE", "1") == "0":
+        return None
+    cache = get_shared_llm_cache(path)
+    if get_llm_cache() is not cache:
+        set_llm_cache(cache)
+    return cache
@@ -0,0 +1,299 @@
+"""
+Shared, pooled OpenAI clients for the LangChain projects.
+
+Streamlit re-runs every app script on each interaction, so building a new
+ChatOpenAI per run also builds a new HTTP client and pays for fresh TLS
+handshakes. This module keeps one client per (model, temperature, api key)
+for the whole process and routes them all through shared keep-alive
+connection pools. Async connections are bound to the event loop that
+opened them, so the async client keeps a separate pool per running loop.
+"""
+
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+import asyncio
+import hashlib
+import os
+import threading
+
+import httpx
+from langchain_openai import ChatOpenAI
+from openai import AsyncOpenAI, OpenAI
+
+
+MAX_CONNECTIONS = int(os.getenv("LLM_POOL_MAX_CONNECTIONS", "100"))
+MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("LLM_POOL_MAX_KEEPALIVE", "20"))
+KEEPALIVE_EXPIRY = float(os.getenv("LLM_POOL_KEEPALIVE_EXPIRY", "30"))
+MAX_MODELS = int(os.getenv("LLM_POOL_MAX_MODELS", "32"))
+
+
+def _hash_key(api_key: Optional[str]) -> str:
+    """Hash an API key so it is not used verbatim as a registry key."""
+    return hashlib.sha256((api_key or "").encode("utf-8")).hexdigest()[:16]
+
+
+class LoopLocalAsyncClient(httpx.AsyncClient):
+    """
+    httpx.AsyncClient that sends each request through a client owned by the running event loop.
+
+    An AsyncClient's connections and locks belong to the loop that first used
+    them, so sharing one across loops (successive asyncio.run calls, or the
+    YouTube summarizer's per-API-key loop threads) fails. This client can be
+    handed to ChatOpenAI and AsyncOpenAI once and used from any loop.
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._loop_client_kwargs = kwargs
+        self._loop_clients: Dict[asyncio.AbstractEventLoop, httpx.AsyncClient] = {}
+        self._loop_clients_lock = threading.Lock()
+
+    def for_running_loop(self) -> httpx.AsyncClient:
+        """Get the running loop's client, creating it on first use and dropping those of closed loops."""
+        loop = asyncio.get_running_loop()
+        with self._loop_clients_lock:
+            for closed in [other for other in self._loop_clients if other.is_closed()]:
+                del self._loop_clients[closed]
+            client = self._loop_clients.get(loop)
+            if client is None:
+                client = self._loop_clients[loop] = httpx.AsyncClient(**self._loop_client_kwargs)
+            return client
+
+    def loop_clients(self) -> List[httpx.AsyncClient]:
+        """Get the clients of all loops that used this client."""
+        with self._loop_clients_lock:
+            return list(self._loop_clients.values())
+
+    async def send(self, request: httpx.Request, **kwargs) -> httpx.Response:
+        return await self.for_running_loop().send(request, **kwargs)
+
+    async def aclose(self):
+        """Close the running loop's client; other loops' clients close with their loops."""
+        loop = asyncio.get_running_loop()
+        with self._loop_clients_lock:
+            client = self._loop_clients.pop(loop, None)
+        if client is not None:
+            await client.aclose()
+        await super().aclose()
+
+
+class ChatModelPool:
+    """Process-wide registry of chat models sharing keep-alive HTTP connections."""
+
+    def __init__(
+        self,
+        max_connections: int = MAX_CONNECTIONS,
+        max_keepalive_connections: int = MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry: float = KEEPALIVE_EXPIRY,
+        max_models: int = MAX_MODELS
+    ):
+        """
+        Initialize the pool.
+
+        Args:
+            max_connections: Maximum concurrent HTTP connections per client
+            max_keepalive_connections: Idle connections kept open for reuse
+            keepalive_expiry: Seconds an idle connection stays open
+            max_models: Registered models kept before the least recently used is dropped
+        """
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry
+        )
+        self.max_models = max_models
+
+        self._lock = threading.Lock()
+        self._models: "OrderedDict[Tuple, ChatOpenAI]" = OrderedDict()
+        self._openai_clients: "OrderedDict[Tuple, OpenAI]" = OrderedDict()
+        self._http_client = None
+        self._async_http_client = None
+
+        self.requests = 0
+        self.hits = 0
+        self.created = 0
+        self.evicted = 0
+
+    @property
+    def http_client(self) -> httpx.Client:
+        """Shared synchronous HTTP client with keep-alive connections."""
+        if self._http_client is None:
+            self._http_client = httpx.Client(limits=self.limits, timeout=httpx.Timeout(60.0, connect=10.0))
+        return self._http_client
+
+    @property
+    def async_http_client(self) -> LoopLocalAsyncClient:
+        """Shared asynchronous HTTP client with keep-alive connections per event loop."""
+        if self._async_http_client is None:
+            self._async_http_client = LoopLocalAsyncClient(limits=self.limits, timeout=httpx.Timeout(60.0, connect=10.0))
+        return self._async_http_client
+
+    def _lookup(self, registry: OrderedDict, key: Tuple, factory):
+        """Return a registered client or build one, evicting the least recently used."""
+        with self._lock:
+            self.requests += 1
+
+            if key in registry:
+                self.hits += 1
+                registry.move_to_end(key)
+                return registry[key]
+
+            client = factory()
+            registry[key] = client
+            self.created += 1
+
+            while len(registry) > self.max_models:
+                registry.popitem(last=False)
+                self.evicted += 1
+
+            return client
+
+    def get_chat_model(
+        self,
+        model: str = "gpt-4o-mini",
+        temperature: float = 0.7,
+        api_key: Optional[str] = None,
+        **kwargs
+    ) -> ChatOpenAI:
+        """
+        Get a shared ChatOpenAI instance.
+
+        Args:
+            model: Model name
+            temperature: Sampling temperature
+            api_key: OpenAI API key (falls back to OPENAI_API_KEY)
+            **kwargs: Extra ChatOpenAI options such as streaming, max_retries or base_url
+
+        Returns:
+            A ChatOpenAI reused across calls with the same settings
+        """
+        api_key = api_key or os.getenv("OPENAI_API_KEY")
+        key = (model, float(temperature), _hash_key(api_key), tuple(sorted(kwargs.items())))
+
+        return self._lookup(self._models, key, lambda: ChatOpenAI(
+            model=model,
+            temperature=temperature,
+            api_key=api_key,
+            http_client=self.http_client,
+            http_async_client=self.async_http_client,
+            **kwargs
+        ))
+
+    def get_openai_client(self, api_key: Optional[str] = None, **kwargs) -> OpenAI:
+        """
+        Get a shared OpenAI SDK client for code that calls the API directly.
+
+        Args:
+            api_key: OpenAI API key (falls back to OPENAI_API_KEY)
+            **kwargs: Extra OpenAI client options such as base_url or max_retries
+
+        Returns:
+            An OpenAI client reused across calls with the same settings
+        """
+        api_key = api_key or os.getenv("OPENAI_API_KEY")
+        key = (_hash_key(api_key), tuple(sorted(kwargs.items())))
+
+        return self._lookup(self._openai_clients, key, lambda: OpenAI(
+            api_key=api_key,
+            http_client=self.http_client,
+            **kwargs
+        ))
+
+    def get_async_openai_client(self, api_key: Optional[str] = None, **kwargs) -> AsyncOpenAI:
+        """
+        Get an AsyncOpenAI client on the shared asynchronous connection pool.
+
+        Args:
+            api_key: OpenAI API key (falls back to OPENAI_API_KEY)
+            **kwargs: Extra AsyncOpenAI client options such as base_url or max_retries
+
+        Returns:
+            An AsyncOpenAI client reused across calls with the same settings
+        """
+        api_key = api_key or os.getenv("OPENAI_API_KEY")
+        key = ("async", _hash_key(api_key), tuple(sorted(kwargs.items())))
+
+        return self._lookup(self._openai_clients, key, lambda: AsyncOpenAI(
+            api_key=api_key,
+            http_client=self.async_http_client,
+            **kwargs
+        ))
+
+    @staticmethod
+    def _connection_counts(client) -> Dict[str, int]:
+        """Count open and idle connections in an httpx client's pool."""
+        pool = getattr(getattr(client, "_transport", None), "_pool", None)
+        connections = list(getattr(pool, "connections", []) or [])
+        idle = sum(1 for connection in connections if connection.is_idle())
+        return {"open": len(connections), "idle": idle}
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get reuse and connection statistics.
+
+        Returns:
+            Dictionary containing lookup counts, reuse rate, registered clients,
+            pool limits and open/idle connection counts
+        """
+        clients = [self._http_client]
+        if self._async_http_client is not None:
+            clients += self._async_http_client.loop_clients()
+
+        connections = {"open": 0, "idle": 0}
+        for client in clients:
+            if client is not None:
+                for name, count in self._connection_counts(client).items():
+                    connections[name] += count
+
+        return {
+            "requests": self.requests,
+            "hits": self.hits,
+            "created": self.created,
+            "evicted": self.evicted,
+            "reuse_rate": round(self.hits / self.requests, 3) if self.requests else 0.0,
+            "models": len(self._models),
+            "openai_clients": len(self._openai_clients),
+            "max_connections": self.limits.max_connections,
+            "max_keepalive_connections": self.limits.max_keepalive_connections,
+            "open_connections": connections["open"],
+            "idle_connections": connections["idle"]
+        }
+
+    def close(self):
+        """Close the shared HTTP clients and forget registered models."""
+        with self._lock:
+            self._models.clear()
+            self._openai_clients.clear()
+            if self._http_client is not None:
+                self._http_client.close()
+                self._http_client = None
+            # Async clients are closed with their event loops; just drop the reference
+            self._async_http_client = None
+
+
+_pool = ChatModelPool()
+
+
+def get_pool() -> ChatModelPool:
+    """Return the process-wide chat model pool."""
+    return _pool
+
+
+def get_chat_model(
+    model: str = "gpt-4o-mini",
+    temperature: float = 0.7,
+    api_key: Optional[str] = None,
+    **kwargs
+) -> ChatOpenAI:
+    """Get a shared ChatOpenAI instance from the process-wide pool."""
+    return _pool.get_chat_model(model=model, temperature=temperature, api_key=api_key, **kwargs)
+
+
+def get_openai_client(api_key: Optional[str] = None, **kwargs) -> OpenAI:
+    """Get a shared OpenAI SDK client from the process-wide pool."""
+    return _pool.get_openai_client(api_key=api_key, **kwargs)
+
+
+def get_async_openai_client(api_key: Optional[str] = None, **kwargs) -> AsyncOpenAI:
+    """Get a shared AsyncOpenAI SDK client from the process-wide pool."""
+    return _pool.get_async_openai_client(api_key=api_key, **kwargs)
@@ -0,0 +1,337 @@
+"""
+Semantic response cache for chat questions.
+
+Many questions are near-duplicates of earlier ones ("write a Python
+function to reverse a string" / "python function to reverse a string").
+SemanticCache embeds each question locally (see common/embeddings.py),
+searches earlier questions by cosine similarity in a NumPy matrix and,
+above a threshold, returns the earlier answer instead of calling the
+model. replay streams a cached answer back so the UI behaves as for a
+live response.
+
+In a conversation the answer also depends on what came before, so the
+previous user message can be passed as context; it is embedded with the
+question, so follow-ups only match follow-ups to similar questions.
+Entries are namespaced (e.g. by model and temperature) and evicted least
+recently used first, by count and by total answer size.
+
+Similarity is not enough for every question. The hashing fallback
+embedder drops punctuation and short tokens, so "print(i)" and
+"print(i*i)" embed identically, and even a semantic model scores two
+snippets that differ by one expression as near-duplicates. So with the
+hashing embedder, and for any question containing code, only questions
+that match exactly (ignoring case and whitespace) are served.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional
+import math
+import os
+import re
+import threading
+import time
+
+import numpy as np
+
+from common.embeddings import HashingEmbedder, get_embedder
+
+SEMANTIC_CACHE_THRESHOLD = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.9"))
+SEMANTIC_CACHE_MAX_ENTRIES = int(os.getenv("SEMANTIC_CACHE_MAX_ENTRIES", "1024"))
+SEMANTIC_CACHE_MAX_BYTES = int(os.getenv("SEMANTIC_CACHE_MAX_BYTES", str(16 * 1024 * 1024)))
+
+CHARS_PER_TOKEN = 4
+
+_TOKEN = re.compile(r"\s*\S+\s*")
+
+# Backticks, assignments, brackets, statement punctuation or calls like f(x)
+_CODE = re.compile(r"`|[=;{}\[\]<>]|\w\([^)]*\)|[-+*/%]\s*\d|\d\s*[-+*/%]")
+_SPACE = re.compile(r"\s+")
+
+
+def contains_code(text: str) -> bool:
+    """Whether a question contains code, where near-duplicates can need different answers."""
+    return bool(_CODE.search(text))
+
+
+def normalize_question(text: str) -> str:
+    """Lowercase and collapse whitespace, for exact matching."""
+    return _SPACE.sub(" ", text).strip().lower()
+
+
+@dataclass
+class CacheHit:
+    """A cached answer matching a question."""
+
+    question: str
+    answer: str
+    similarity: float
+    tokens: int
+    seconds: float
+
+
+class SemanticCache:
+    """Similarity-matched, size-bounded cache of answers to questions."""
+
+    def __init__(
+        self,
+        embedder: Optional[Any] = None,
+        threshold: float = SEMANTIC_CACHE_THRESHOLD,
+        max_entries: int = SEMANTIC_CACHE_MAX_ENTRIES,
+        max_bytes: int = SEMANTIC_CACHE_MAX_BYTES,
+        exact_match: Optional[bool] = None
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            embedder: Object with embed(texts) returning L2-normalized rows (default: get_embedder())
+            threshold: Minimum cosine similarity for a hit
+            max_entries: Entries kept before the least recently used are evicted
+            max_bytes: Total answer size kept before the least recently used are evicted
+            exact_match: Only serve exact repeats (default: with the hashing embedder);
+                questions containing code always need an exact repeat
+        """
+        self.embedder = embedder or get_embedder()
+        if exact_match is None:
+            exact_match = getattr(self.embedder, "name", None) == HashingEmbedder.name
+        self.exact_match = exact_match
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+        self._lock = threading.Lock()
+        # One row per slot; freed slots are reused, so evictions don't move vectors
+        self._vectors: Optional[np.ndarray] = None
+        self._slot_namespaces = np.zeros(0, dtype=np.int64)
+        self._namespace_ids: Dict[str, int] = {}
+        self._entries: List[Optional[Dict[str, Any]]] = []
+        # (namespace, normalized text) -> slot, for exact matches
+        self._exact: Dict[tuple, int] = {}
+        self._count = 0
+        self._free: List[int] = []
+        self._bytes = 0
+        self._clock = 0
+
+        self.lookups = 0
+        self.hits = 0
+        self.evictions = 0
+        self.saved_tokens = 0
+        self.saved_seconds = 0.0
+        self.hit_seconds = 0.0
+        self.miss_seconds = 0.0
+        self.misses_timed = 0
+
+    @staticmethod
+    def _text(question: str, context: str) -> str:
+        """Text embedded for a question in its conversation context."""
+        return f"{context.strip()}\n{question.strip()}" if context and context.strip() else question.strip()
+
+    def _embed(self, question: str, context: str) -> np.ndarray:
+        """Embed one question as a float32 row vector."""
+        return np.asarray(self.embedder.embed([self._text(question, context)]), dtype=np.float32)[0]
+
+    def _touch(self, slot: int):
+        """Mark a slot as most recently used."""
+        self._clock += 1
+        self._entries[slot]["used"] = self._clock
+
+    def lookup(self, question: str, context: str = "", namespace: str = "") -> Optional[CacheHit]:
+        """
+        Find a cached answer to a similar question.
+
+        Args:
+            question: The user's question
+            context: Preceding conversation the answer depends on, e.g. the previous question
+            namespace: Partition that must match, e.g. model and temperature
+
+        Returns:
+            The best match at or above the threshold, or None
+        """
+        start = time.perf_counter()
+        if self.exact_match or contains_code(question):
+            with self._lock:
+                self.lookups += 1
+                slot = self._exact.get((namespace, normalize_question(self._text(question, context))))
+                return self._hit(slot, 1.0, start) if slot is not None else None
+
+        vector = self._embed(question, context)
+
+        with self._lock:
+            self.lookups += 1
+            if not self._count or namespace not in self._namespace_ids:
+                return None
+
+            used = len(self._entries)
+            scores = self._vectors[:used] @ vector
+            scores[self._slot_namespaces[:used] != self._namespace_ids[namespace]] = -np.inf
+
+            slot = int(np.argmax(scores))
+            similarity = float(scores[slot])
+            if similarity < self.threshold:
+                return None
+            return self._hit(slot, similarity, start)
+
+    def _hit(self, slot: int, similarity: float, start: float) -> CacheHit:
+        """Record a hit on a slot and build its CacheHit; the caller holds the lock."""
+        entry = self._entries[slot]
+        self._touch(slot)
+        self.hits += 1
+        self.saved_tokens += entry["tokens"]
+        self.saved_seconds += entry["seconds"]
+        self.hit_seconds += time.perf_counter() - start
+
+        return CacheHit(
+            question=entry["question"],
+            answer=entry["answer"],
+            similarity=round(similarity, 4),
+            tokens=entry["tokens"],
+            seconds=entry["seconds"]
+        )
+
+    def put(
+        self,
+        question: str,
+        answer: str,
+        context: str = "",
+        namespace: str = "",
+        tokens: Optional[int] = None,
+        seconds: float = 0.0
+    ):
+        """
+        Cache an answer.
+
+        Args:
+            question: The user's question
+            answer: The model's full answer
+            context: Preceding conversation, as passed to lookup
+            namespace: Partition, as passed to lookup
+            tokens: Tokens a hit saves (default: estimated from the question and answer)
+            seconds: How long the answer took to generate
+        """
+        if not answer.strip():
+            return
+        vector = self._embed(question, context)
+        size = len(answer.encode("utf-8"))
+        if tokens is None:
+            tokens = math.ceil((len(self._text(question, context)) + len(answer)) / CHARS_PER_TOKEN)
+
+        with self._lock:
+            self.miss_seconds += seconds
+            self.misses_timed += 1
+
+            if self._vectors is None:
+                self._vectors = np.zeros((64, len(vector)), dtype=np.float32)
+                self._slot_namespaces = np.full(64, -1, dtype=np.int64)
+
+            if self._free:
+                slot = self._free.pop()
+            else:
+                slot = len(self._entries)
+                self._entries.append(None)
+                if slot >= len(self._vectors):
+                    grown = np.zeros((len(self._vectors) * 2, self._vectors.shape[1]), dtype=np.float32)
+                    grown[:len(self._vectors)] = self._vectors
+                    self._vectors = grown
+                    self._slot_namespaces = np.concatenate([
+                        self._slot_namespaces, np.full(len(self._slot_namespaces), -1, dtype=np.int64)
+                    ])
+
+            self._vectors[slot] = vector
+            self._slot_namespaces[slot] = self._namespace_ids.setdefault(namespace, len(self._namespace_ids))
+            exact_key = (namespace, normalize_question(self._text(question, context)))
+            self._exact[exact_key] = slot
+            self._entries[slot] = {
+                "question": question,
+                "answer": answer,
+                "namespace": namespace,
+                "exact_key": exact_key,
+                "tokens": tokens,
+                "seconds": seconds,
+                "size": size
+            }
+            self._bytes += size
+            self._count += 1
+            self._touch(slot)
+            if self._count > self.max_entries or self._bytes > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        """Drop least recently used entries until within max_entries and max_bytes; the caller holds the lock."""
+        live = sorted((entry["used"], slot) for slot, entry in enumerate(self._entries) if entry is not None)
+        for _, slot in live:
+            if self._count <= self.max_entries and self._bytes <= self.max_bytes:
+                break
+            entry = self._entries[slot]
+            if self._exact.get(entry["exact_key"]) == slot:
+                del self._exact[entry["exact_key"]]
+            self._bytes -= entry["size"]
+            self._entries[slot] = None
+            self._slot_namespaces[slot] = -1
+            self._free.append(slot)
+            self._count -= 1
+            self.evictions += 1
+
+    @staticmethod
+    def replay(answer: str, tokens_per_second: float = 400.0) -> Iterator[str]:
+        """
+        Stream a cached answer word by word, like a live response.
+
+        Args:
+            answer: Text to stream
+            tokens_per_second: Simulated rate (0 for all at once)
+
+        Yields:
+            Word-sized chunks
+        """
+        for token in _TOKEN.findall(answer) or [answer]:
+            if tokens_per_second > 0:
+                time.sleep(1.0 / tokens_per_second)
+            yield token
+
+    def clear(self):
+        """Drop all entries."""
+        with self._lock:
+            self._vectors = None
+            self._slot_namespaces = np.zeros(0, dtype=np.int64)
+            self._namespace_ids = {}
+            self._entries = []
+            self._exact = {}
+            self._free = []
+            self._count = 0
+            self._bytes = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dictionary containing lookups, hits, hit rate, entries, bytes, evictions,
+            tokens and generation seconds saved, and average hit lookup and miss
+            generation latency
+        """
+        with self._lock:
+            return {
+                "lookups": self.lookups,
+                "hits": self.hits,
+                "hit_rate": round(self.hits / self.lookups, 3) if self.lookups else 0.0,
+                "entries": self._count,
+                "bytes": self._bytes,
+                "evictions": self.evictions,
+                "saved_tokens": self.saved_tokens,
+                "saved_seconds": round(self.saved_seconds, 3),
+                "avg_hit_ms": round(self.hit_seconds / self.hits * 1000, 2) if self.hits else 0.0,
+                "avg_miss_seconds": round(self.miss_seconds / self.misses_timed, 3) if self.misses_timed else 0.0
+            }
+
+
+_cache: Optional[SemanticCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_semantic_cache() -> SemanticCache:
+    """Return the process-wide semantic cache, created on first use."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = SemanticCache()
+        return _cache
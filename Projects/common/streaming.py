@@ -0,0 +1,202 @@
+"""
+Incremental rendering of streamed LLM output in Streamlit.
+
+The usual loop, `text += token; placeholder.markdown(text)`, rebuilds the
+whole string and re-sends the whole answer to the browser for every token,
+which is quadratic in the answer length and lags on long code answers.
+StreamRenderer instead:
+- collects chunks in a list and joins only what it is about to render
+- renders at most once per frame_interval seconds, or once min_chars new
+  characters have arrived
+- renders each closed code block (and the text before it) once, in its
+  own element, so later frames only re-send the open tail of the answer
+"""
+
+from typing import Any, Callable, Dict, Iterable, List
+import os
+import re
+import time
+
+STREAM_FRAME_INTERVAL = float(os.getenv("STREAM_FRAME_INTERVAL", "0.05"))
+
+# A fenced code block delimiter: ``` or ~~~ at the start of a line
+_FENCE = re.compile(r"^ {0,3}(?:```|~~~)", re.MULTILINE)
+
+
+def closed_blocks_end(text: str) -> int:
+    """
+    Find where the last closed fenced code block in text ends.
+
+    Args:
+        text: Markdown that starts outside a code block
+
+    Returns:
+        Offset just after the newline ending the last complete closing fence, or 0
+    """
+    end = 0
+    fences = list(_FENCE.finditer(text))
+    for closing in fences[1::2]:
+        newline = text.find("\n", closing.end())
+        if newline < 0:
+            break
+        end = newline + 1
+    return end
+
+
+class StreamRenderer:
+    """Throttled, incremental markdown rendering of a token stream."""
+
+    def __init__(
+        self,
+        target: Any,
+        frame_interval: float = STREAM_FRAME_INTERVAL,
+        min_chars: int = 0,
+        cursor: str = "▌",
+        template: str = "{text}",
+        split_code_blocks: bool = True,
+        clock: Callable[[], float] = time.perf_counter
+    ):
+        """
+        Initialize the renderer.
+
+        Args:
+            target: Streamlit container (e.g. st.container() or st.empty().container());
+                its empty() creates the elements rendered into
+            frame_interval: Minimum seconds between renders (0 to render on every chunk)
+            min_chars: Also render as soon as this many characters are pending (0 to disable)
+            cursor: Appended to the open tail while streaming
+            template: Format string wrapping the open tail, with a {text} field
+            split_code_blocks: Render closed code blocks once in their own elements
+            clock: Time source, replaceable for simulated streams
+        """
+        self.target = target
+        self.frame_interval = frame_interval
+        self.min_chars = min_chars
+        self.cursor = cursor
+        self.template = template
+        self.split_code_blocks = split_code_blocks
+        self.clock = clock
+
+        self._parts: List[str] = []
+        self._tail: List[str] = []
+        self._element = None
+        self._pending = 0
+        self._last_render = clock()
+
+        self.chunks = 0
+        self.chars = 0
+        self.renders = 0
+        self.rendered_chars = 0
+        self.finalized = 0
+
+    @property
+    def text(self) -> str:
+        """Everything received so far."""
+        return "".join(self._parts) + "".join(self._tail)
+
+    def _render(self, element, markdown: str):
+        """Send one markdown update."""
+        element.markdown(markdown)
+        self.renders += 1
+        self.rendered_chars += len(markdown)
+
+    def _current(self):
+        """The element holding the open tail, created on first use."""
+        if self._element is None:
+            self._element = self.target.empty()
+        return self._element
+
+    def _finalize_blocks(self, tail: str) -> str:
+        """Render closed code blocks in the tail once and return what remains open."""
+        end = closed_blocks_end(tail)
+        if not end:
+            return tail
+
+        done, tail = tail[:end], tail[end:]
+        self._render(self._current(), done)
+        self._parts.append(done)
+        self._tail = [tail] if tail else []
+        self._element = None
+        self.finalized += 1
+        return tail
+
+    def write(self, chunk: str) -> bool:
+        """
+        Add a chunk, rendering if a frame is due.
+
+        Args:
+            chunk: Next piece of the stream
+
+        Returns:
+            Whether the UI was updated
+        """
+        if not chunk:
+            return False
+        self._tail.append(chunk)
+        self.chunks += 1
+        self.chars += len(chunk)
+        self._pending += len(chunk)
+
+        now = self.clock()
+        due = now - self._last_render >= self.frame_interval
+        if not due and not (self.min_chars and self._pending >= self.min_chars):
+            return False
+
+        tail = "".join(self._tail)
+        self._tail = [tail]
+        if self.split_code_blocks:
+            tail = self._finalize_blocks(tail)
+        if tail:
+            self._render(self._current(), self.template.format(text=tail + self.cursor))
+        self._pending = 0
+        self._last_render = now
+        return True
+
+    def finish(self) -> str:
+        """
+        Render the final tail without the cursor.
+
+        Returns:
+            The full streamed text
+        """
+        tail = "".join(self._tail)
+        if self.split_code_blocks:
+            tail = self._finalize_blocks(tail)
+        if tail or not self._parts:
+            self._render(self._current(), self.template.format(text=tail))
+        self._pending = 0
+        return self.text
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get rendering statistics.
+
+        Returns:
+            Dictionary containing chunks and characters received, renders,
+            characters rendered and finalized code block groups
+        """
+        return {
+            "chunks": self.chunks,
+            "chars": self.chars,
+            "renders": self.renders,
+            "rendered_chars": self.rendered_chars,
+            "finalized": self.finalized
+        }
+
+
+def render_stream(chunks: Iterable[str], target: Any, **kwargs) -> str:
+    """
+    Stream chunks into a Streamlit container.
+
+    Args:
+        chunks: Iterable of text chunks, e.g. chain.stream(...)
+        target: Container to render into (see StreamRenderer)
+        **kwargs: StreamRenderer options
+
+    Returns:
+        The full streamed text
+    """
+    renderer = StreamRenderer(target, **kwargs)
+    for chunk in chunks:
+        renderer.write(chunk)
+    return renderer.finish()
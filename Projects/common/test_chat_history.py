@@ -0,0 +1,95 @@
+"""
+Tests for the persistent chat history store.
+Note: Stores use temporary SQLite files; no API calls are made.
+"""
+
+from langchain_core.messages import AIMessage, HumanMessage
+from common.chat_history import ChatHistoryStore
+
+
+def turn(i):
+    """Build one user/assistant exchange."""
+    return [HumanMessage(f"question {i}"), AIMessage(f"answer {i}")]
+
+
+class TestChatHistoryStore:
+    """Test cases for ChatHistoryStore."""
+
+    def test_sessions_are_isolated(self, tmp_path):
+        """Test that each session ID has its own history."""
+        store = ChatHistoryStore(str(tmp_path / "chat.db"), flush_interval=0)
+
+        store.get_history("alice").add_messages(turn(1))
+        store.get_history("bob").add_messages(turn(2))
+
+        assert [m.content for m in store.get_history("alice").messages] == ["question 1", "answer 1"]
+        assert [m.content for m in store.get_history("bob").messages] == ["question 2", "answer 2"]
+        store.close()
+
+    def test_history_survives_restart(self, tmp_path):
+        """Test that a new store on the same file reads earlier messages, with their types."""
+        path = str(tmp_path / "chat.db")
+        store = ChatHistoryStore(path, flush_interval=60)
+        store.add_messages("session", turn(1))
+        store.close()
+
+        reopened = ChatHistoryStore(path, flush_interval=0)
+        messages = reopened.get_messages("session")
+
+        assert [m.type for m in messages] == ["human", "ai"]
+        assert messages[1].content == "answer 1"
+        reopened.close()
+
+    def test_writes_are_batched(self, tmp_path):
+        """Test that messages are buffered until flush_size is reached."""
+        store = ChatHistoryStore(str(tmp_path / "chat.db"), flush_interval=60, flush_size=4)
+
+        store.add_messages("session", turn(1))
+        assert store.get_stats()["pending"] == 2
+        assert store.get_stats()["written"] == 0
+
+        store.add_messages("session", turn(2))
+        stats = store.get_stats()
+        assert stats["pending"] == 0
+        assert stats["written"] == 4
+        assert stats["flushes"] == 1
+        store.close()
+
+    def test_loads_only_recent_messages(self, tmp_path):
+        """Test that a session is loaded from disk as its last max_messages rows."""
+        path = str(tmp_path / "chat.db")
+        store = ChatHistoryStore(path, flush_interval=0, max_messages=4)
+        for i in range(10):
+            store.add_messages("session", turn(i))
+
+        assert [m.content for m in store.get_messages("session")] == ["question 8", "answer 8", "question 9", "answer 9"]
+        store.close()
+
+        reopened = ChatHistoryStore(path, flush_interval=0, max_messages=4)
+        assert reopened.get_messages("session")[0].content == "question 8"
+        reopened.close()
+
+    def test_least_recently_used_session_is_reloaded(self, tmp_path):
+        """Test that sessions beyond max_sessions leave memory but not the database."""
+        store = ChatHistoryStore(str(tmp_path / "chat.db"), flush_interval=60, max_sessions=2)
+        for name in ("a", "b", "c"):
+            store.add_messages(name, turn(name))
+
+        assert store.get_stats()["cached_sessions"] == 2
+        assert store.get_messages("a")[0].content == "question a"
+        assert store.get_stats()["misses"] == 4
+        store.close()
+
+    def test_clear_drops_pending_and_stored(self, tmp_path):
+        """Test that clearing a session removes written and unwritten messages."""
+        store = ChatHistoryStore(str(tmp_path / "chat.db"), flush_interval=60, flush_size=2)
+        history = store.get_history("session")
+        history.add_messages(turn(1))
+        history.add_messages([HumanMessage("unsent")])
+
+        history.clear()
+        store.flush()
+
+        assert history.messages == []
+        assert store.get_stats()["stored_sessions"] == 0
+        store.close()
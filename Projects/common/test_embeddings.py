@@ -0,0 +1,86 @@
+"""
+Tests for local embeddings and vector indexes.
+Note: Only the hashing embedder is used, so no model is downloaded.
+"""
+
+import numpy as np
+import pytest
+from common.embeddings import HashingEmbedder, get_embedder
+from common.vector_index import FlatIndex, IVFIndex, build_index
+
+
+def random_unit_vectors(count, dim=32, seed=0):
+    """Build random L2-normalized vectors."""
+    vectors = np.random.default_rng(seed).normal(size=(count, dim)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+class TestHashingEmbedder:
+    """Test cases for HashingEmbedder."""
+
+    def test_similar_texts_score_higher(self):
+        """Test that shared vocabulary gives higher cosine similarity."""
+        embedder = HashingEmbedder()
+        query, related, unrelated = embedder.embed([
+            "how are transformer models trained",
+            "training transformers needs a lot of data",
+            "the recipe needs two cups of flour"
+        ])
+
+        assert query @ related > query @ unrelated
+        assert np.linalg.norm(query) == pytest.approx(1.0, abs=1e-5)
+
+    def test_deterministic_and_empty(self):
+        """Test stable vectors across instances and zero vectors for empty text."""
+        first = HashingEmbedder(dim=64).embed(["attention heads"])
+        second = HashingEmbedder(dim=64).embed(["attention heads"])
+
+        assert np.array_equal(first, second)
+        assert not HashingEmbedder(dim=64).embed([""]).any()
+
+    def test_falls_back_to_hashing(self):
+        """Test that an unavailable model falls back to the hashing embedder."""
+        assert isinstance(get_embedder("hashing"), HashingEmbedder)
+        assert isinstance(get_embedder("/no/such/model"), HashingEmbedder)
+
+
+class TestVectorIndex:
+    """Test cases for FlatIndex and IVFIndex."""
+
+    def test_flat_index_is_exact_and_padded(self):
+        """Test exact nearest neighbours and padding when k exceeds the size."""
+        vectors = random_unit_vectors(3)
+        index = FlatIndex(32)
+        index.add(vectors)
+
+        scores, ids = index.search(vectors[1], k=5)
+
+        assert ids[0, 0] == 1
+        assert scores[0, 0] == pytest.approx(1.0, abs=1e-5)
+        assert list(ids[0, 3:]) == [-1, -1]
+
+    def test_ivf_recall_against_flat(self):
+        """Test that IVF finds most of the exact top results while scoring fewer vectors."""
+        # Clustered data, like embeddings of passages on a few topics
+        centers = random_unit_vectors(40, seed=2)
+        vectors = centers[np.arange(2000) % 40] + 0.3 * random_unit_vectors(2000)
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+        queries = vectors[:50] + 0.1 * random_unit_vectors(50, seed=1)
+        queries /= np.linalg.norm(queries, axis=1, keepdims=True)
+
+        flat = FlatIndex(32)
+        flat.add(vectors)
+        ivf = IVFIndex(32, nlist=32, nprobe=8)
+        ivf.add(vectors)
+
+        _, exact = flat.search(queries, k=5)
+        _, approximate = ivf.search(queries, k=5)
+        recall = np.mean([len(set(a) & set(e)) / 5 for a, e in zip(approximate, exact)])
+
+        assert recall > 0.8
+        assert len(np.unique(ivf.assignments)) > 1
+
+    def test_build_index_picks_by_size(self):
+        """Test that small collections get a flat index and large ones IVF."""
+        assert isinstance(build_index(random_unit_vectors(10)), FlatIndex)
+        assert isinstance(build_index(random_unit_vectors(300), ivf_threshold=256), IVFIndex)
@@ -0,0 +1,45 @@
+"""
+Tests for the fake chat model used by tests and benchmarks.
+"""
+
+import asyncio
+import time
+
+import pytest
+from common.fake_llm import FakeChatModel, split_tokens
+
+
+class TestFakeChatModel:
+    """Test cases for FakeChatModel."""
+
+    def test_streams_response_tokens(self):
+        """Test that streamed chunks add up to the response."""
+        llm = FakeChatModel(response="Hello there, world!")
+
+        chunks = [chunk.content for chunk in llm.stream("Hi") if chunk.content]
+
+        assert chunks == split_tokens("Hello there, world!")
+        assert "".join(chunks) == "Hello there, world!"
+        assert llm.invoke("Hi").content == "Hello there, world!"
+
+    def test_reports_token_usage(self):
+        """Test that responses carry usage metadata like ChatOpenAI."""
+        usage = FakeChatModel(response="one two three").invoke("x" * 40).usage_metadata
+
+        assert usage["output_tokens"] == 3
+        assert usage["input_tokens"] == 11
+
+    def test_async_calls_overlap(self):
+        """Test that concurrent async calls wait for their latency in parallel."""
+        llm = FakeChatModel(latency=0.2)
+
+        async def run():
+            start = time.perf_counter()
+            await asyncio.gather(*(llm.ainvoke("Hi") for _ in range(10)))
+            return time.perf_counter() - start
+
+        assert asyncio.run(run()) < 0.6
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
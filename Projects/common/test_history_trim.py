@@ -0,0 +1,137 @@
+"""
+Tests for token-budgeted history trimming.
+Note: Tokens are counted as words and summaries come from stubs, so no API calls are made.
+"""
+
+from langchain_core.messages import AIMessage, HumanMessage
+from common.fake_llm import FakeChatModel
+from common.history_trim import HistoryTrimmer, llm_summarizer
+
+
+def words(text):
+    """Count one token per word."""
+    return len(text.split())
+
+
+def conversation(turns, size=10):
+    """Build turns of a question and an answer, each size words long."""
+    messages = []
+    for i in range(turns):
+        messages += [HumanMessage(" ".join([f"q{i}"] * size)), AIMessage(" ".join([f"a{i}"] * size))]
+    return messages
+
+
+class TestHistoryTrimmer:
+    """Test cases for HistoryTrimmer."""
+
+    def test_short_history_is_untouched(self):
+        """Test that history within budget passes through unchanged."""
+        trimmer = HistoryTrimmer(max_tokens=100, count=words)
+        messages = conversation(3)
+
+        assert trimmer.trim(messages) == messages
+        assert trimmer.get_stats()["tokens_saved"] == 0
+
+    def test_trims_whole_turns_to_low_water(self):
+        """Test that the oldest turns are dropped until the history fits the low water mark."""
+        trimmer = HistoryTrimmer(max_tokens=100, low_water=0.5, count=words)
+        messages = conversation(6)  # 12 messages of 14 tokens
+
+        trimmed = trimmer.trim(messages)
+
+        assert trimmed[0].type == "human"
+        assert trimmed == messages[-2:]
+        stats = trimmer.get_stats()
+        assert stats["tokens_before"] == 168
+        assert stats["tokens_after"] == 28
+        assert stats["reduction"] > 0.8
+
+    def test_cut_is_stable_between_trims(self):
+        """Test that the next turn keeps the same start until the budget is exceeded again."""
+        trimmer = HistoryTrimmer(max_tokens=100, low_water=0.5, count=words)
+        messages = conversation(6)
+        first = trimmer.trim(messages, "s")
+
+        longer = messages + conversation(7)[-2:]
+        assert trimmer.trim(longer, "s") == first + longer[-2:]
+
+    def test_repeated_exchanges_do_not_move_the_cut(self):
+        """Test that every message is either summarized or kept when the same turn repeats."""
+        summarized = []
+
+        def summarize(summary, dropped):
+            summarized.extend(dropped)
+            return summary + "+"
+
+        trimmer = HistoryTrimmer(max_tokens=40, low_water=0.75, count=words, summarize=summarize)
+        messages = conversation(1) + [HumanMessage("thanks"), AIMessage("You're welcome!")] * 8
+
+        for end in range(2, len(messages) + 1, 2):
+            kept = [m for m in trimmer.trim(messages[:end], "s") if m.type != "system"]
+            assert summarized + kept == messages[:end]
+
+    def test_cut_follows_a_scrolled_window(self):
+        """Test that the cut is found again when older messages leave the loaded window."""
+        trimmer = HistoryTrimmer(max_tokens=100, low_water=0.5, count=words)
+        messages = conversation(6)
+        first = trimmer.trim(messages, "s")
+
+        window = (messages + conversation(7)[-2:])[4:]
+        assert trimmer.trim(window, "s") == first + window[-2:]
+
+    def test_token_counts_are_cached(self):
+        """Test that each distinct message is tokenized once across turns."""
+        calls = []
+        trimmer = HistoryTrimmer(max_tokens=1000, count=lambda text: calls.append(text) or words(text))
+        messages = conversation(5)
+
+        trimmer.trim(messages[:8])
+        trimmer.trim(messages)
+
+        assert len(calls) == 10
+        assert trimmer.get_stats()["count_hits"] == 8
+
+    def test_dropped_turns_are_summarized(self):
+        """Test that dropped turns are folded into a running summary sent first."""
+        seen = []
+
+        def summarize(summary, dropped):
+            seen.append(len(dropped))
+            return f"{summary}+{len(dropped)}"
+
+        trimmer = HistoryTrimmer(max_tokens=60, low_water=0.5, count=words, summarize=summarize)
+        trimmed = trimmer.trim(conversation(4), "s")
+
+        assert trimmed[0].type == "system"
+        assert trimmed[0].content.endswith("+6")
+        assert trimmer.trim(conversation(4), "s")[0].content.endswith("+6")
+        assert seen == [6]
+
+    def test_failed_summary_still_trims(self):
+        """Test that a summarizer error drops the turns without failing the call."""
+        def summarize(summary, dropped):
+            raise RuntimeError("rate limited")
+
+        trimmer = HistoryTrimmer(max_tokens=60, low_water=0.5, count=words, summarize=summarize)
+
+        assert trimmer.trim(conversation(4)) == conversation(4)[-2:]
+
+    def test_llm_summarizer(self):
+        """Test the LLM summarizer with a fake model."""
+        summarize = llm_summarizer(FakeChatModel(response="  The user asked about sorting.  "))
+
+        assert summarize("", conversation(1)) == "The user asked about sorting."
+
+    def test_runnable_uses_session_id(self):
+        """Test the chain stage trims the history key per configured session."""
+        trimmer = HistoryTrimmer(max_tokens=60, low_water=0.5, count=words)
+        stage = trimmer.as_runnable()
+
+        out = stage.invoke(
+            {"input": "next", "history": conversation(4)},
+            config={"configurable": {"session_id": "abc"}}
+        )
+
+        assert out["input"] == "next"
+        assert len(out["history"]) == 2
+        assert "abc" in trimmer._sessions
@@ -0,0 +1,114 @@
+"""
+Tests for per-chain LLM instrumentation.
+Note: Chains run against the fake chat model, so no API calls are made.
+"""
+
+import asyncio
+import json
+import time
+
+import pytest
+from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.runnables import RunnableLambda, RunnableParallel
+from common.fake_llm import FakeChatModel
+from common.instrumentation import Histogram, LLMMetrics, instrument
+
+
+class TestHistogram:
+    """Test cases for Histogram."""
+
+    def test_quantiles_interpolate_within_buckets(self):
+        """Test that quantiles fall inside the bucket holding them."""
+        histogram = Histogram((1, 2, 4))
+        for value in (0.5, 1.5, 1.5, 3.0):
+            histogram.observe(value)
+
+        assert histogram.counts == [1, 2, 1, 0]
+        assert 1 <= histogram.quantile(0.5) <= 2
+        assert histogram.quantile(1.0) == 3.0
+        assert Histogram((1,)).quantile(0.5) == 0.0
+
+
+class TestInstrumentationHandler:
+    """Test cases for InstrumentationHandler."""
+
+    def test_records_queue_ttft_latency_and_tokens(self):
+        """Test that a streamed call records every metric under the chain name."""
+        metrics = LLMMetrics()
+        llm = FakeChatModel(response="one two three", latency=0.05)
+        slow_step = RunnableLambda(lambda x: (time.sleep(0.1), x)[1])
+        chain = instrument(slow_step | ChatPromptTemplate.from_template("{topic}") | llm, "topic_chain", metrics)
+
+        "".join(chunk.content for chunk in chain.stream({"topic": "caching"}))
+
+        stats = metrics.get_stats()["topic_chain"]
+        assert stats["calls"] == 1
+        assert stats["queue_seconds"]["min"] >= 0.1
+        assert 0.05 <= stats["ttft_seconds"]["min"] <= stats["latency_seconds"]["min"]
+        assert stats["completion_tokens"]["sum"] == 3
+
+    def test_chains_are_recorded_separately(self):
+        """Test that parallel chains sharing one model are attributed correctly."""
+        metrics = LLMMetrics()
+        llm = FakeChatModel()
+        turn = RunnableParallel(
+            feedback=instrument(ChatPromptTemplate.from_template("rate {x}") | llm, "evaluation_chain", metrics),
+            question=instrument(ChatPromptTemplate.from_template("ask {x}") | llm, "question_chain", metrics)
+        )
+
+        turn.invoke({"x": 1})
+        asyncio.run(turn.ainvoke({"x": 2}))
+
+        assert metrics.chains() == ["evaluation_chain", "question_chain"]
+        assert all(stats["calls"] == 2 for stats in metrics.get_stats().values())
+
+    def test_errors_are_counted(self):
+        """Test that failing LLM calls increase the error counter."""
+        class FailingModel(FakeChatModel):
+            def _stream(self, *args, **kwargs):
+                raise RuntimeError("rate limited")
+
+        metrics = LLMMetrics()
+        chain = instrument(ChatPromptTemplate.from_template("{x}") | FailingModel(), "failing_chain", metrics)
+
+        with pytest.raises(RuntimeError):
+            chain.invoke({"x": 1})
+
+        stats = metrics.get_stats()["failing_chain"]
+        assert stats["errors"] == 1
+        assert "latency_seconds" not in stats
+
+    def test_retries_only_reported_by_retrying_clients(self):
+        """Test that chains get no retries counter while recorded retries are kept."""
+        metrics = LLMMetrics()
+        chain = instrument(ChatPromptTemplate.from_template("{x}") | FakeChatModel(), "question_chain", metrics)
+        chain.invoke({"x": 1})
+        metrics.record("youtube_summary", latency=0.2, retries=0)
+        metrics.record("youtube_summary", latency=0.4, retries=2)
+
+        stats = metrics.get_stats()
+        assert "retries" not in stats["question_chain"]
+        assert stats["youtube_summary"]["retries"] == 2
+        assert 'llm_retries_total{chain="question_chain"}' not in metrics.to_prometheus()
+
+
+class TestExport:
+    """Test cases for Prometheus and JSONL export."""
+
+    def test_prometheus_and_jsonl(self):
+        """Test both export formats."""
+        metrics = LLMMetrics()
+        metrics.record("youtube_summary", latency=0.3, prompt_tokens=900, completion_tokens=120)
+
+        text = metrics.to_prometheus()
+        assert 'llm_calls_total{chain="youtube_summary"} 1' in text
+        assert 'llm_latency_seconds_bucket{chain="youtube_summary",le="0.5"} 1' in text
+        assert 'llm_latency_seconds_bucket{chain="youtube_summary",le="+Inf"} 1' in text
+
+        line = json.loads(metrics.to_jsonl())
+        assert line["chain"] == "youtube_summary"
+        assert line["prompt_tokens"]["sum"] == 900
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,148 @@
+"""
+Tests for the exact-match LLM response cache.
+Note: Responses come from the deterministic fake chat model, so no API calls are made.
+"""
+
+import time
+
+import pytest
+from langchain_core.output_parsers import StrOutputParser
+from langchain_core.prompts import ChatPromptTemplate
+from common.fake_llm import FakeChatModel
+from common.llm_cache import LLMCache, cached_streaming, normalize_prompt, parse_llm_string
+
+
+class CountingModel(FakeChatModel):
+    """Fake chat model with a temperature, counting the requests it answers."""
+
+    temperature: float = 0.0
+    requests: int = 0
+
+    @property
+    def _identifying_params(self):
+        return {"model": "fake", "temperature": self.temperature}
+
+    # invoke() also goes through _stream
+    def _stream(self, *args, **kwargs):
+        self.requests += 1
+        return super()._stream(*args, **kwargs)
+
+
+PROMPT = ChatPromptTemplate.from_messages([("human", "Write an email about {topic}")])
+
+
+class TestKeys:
+    """Test cases for prompt and model normalization."""
+
+    def test_whitespace_does_not_change_the_key(self):
+        """Test that line endings and trailing whitespace are normalized."""
+        assert normalize_prompt("Hello  \r\nworld \n") == normalize_prompt("Hello\nworld")
+        assert normalize_prompt('{"b": "x ", "a": 1}') == normalize_prompt('{"a": 1, "b": "x"}')
+
+    def test_streaming_flags_are_ignored(self):
+        """Test that delivery-only settings don't split entries, but temperature is read."""
+        base = '{"kwargs": {"model_name": "gpt-4o-mini", "temperature": 0.0%s}}---[(\'stop\', None)]'
+        streamed = parse_llm_string(base % ', "streaming": true, "stream_usage": true')
+
+        assert streamed == parse_llm_string(base % "")
+        assert streamed[:2] == ("gpt-4o-mini", 0.0)
+
+    def test_unset_temperature_is_sampled(self):
+        """Test that a model without an explicit temperature is not cached by default."""
+        cache = LLMCache(":memory:")
+
+        assert cache.lookup_text("hi", "gpt-4o-mini", None) is None
+        cache.update_text("hi", "gpt-4o-mini", None, "hello")
+        assert cache.get_stats()["entries"] == 0
+        assert cache.get_stats()["bypassed"] == 1
+
+
+class TestLLMCache:
+    """Test cases for LLMCache with LangChain models."""
+
+    def test_invoke_hits_after_first_call(self):
+        """Test that a repeated prompt at temperature 0 is answered from the cache."""
+        cache = LLMCache(":memory:")
+        llm = CountingModel(response="Dear Alex,", cache=cache)
+        chain = PROMPT | llm | StrOutputParser()
+
+        assert chain.invoke({"topic": "the report"}) == "Dear Alex,"
+        assert chain.invoke({"topic": "the report  "}) == "Dear Alex,"
+        assert llm.requests == 1
+        assert cache.get_stats()["hit_ratio"] == 0.5
+
+    def test_different_settings_miss(self):
+        """Test that another temperature or prompt is a separate entry."""
+        cache = LLMCache(":memory:", allow_sampled=True)
+        cold = CountingModel(response="a", cache=cache)
+        warm = CountingModel(response="b", temperature=0.7, cache=cache)
+
+        assert (PROMPT | cold | StrOutputParser()).invoke({"topic": "x"}) == "a"
+        assert (PROMPT | warm | StrOutputParser()).invoke({"topic": "x"}) == "b"
+        assert (PROMPT | cold | StrOutputParser()).invoke({"topic": "y"}) == "a"
+        assert cache.get_stats()["hits"] == 0
+
+    def test_sampled_calls_need_opt_in(self):
+        """Test that calls above temperature 0 are bypassed unless the sampling view is used."""
+        cache = LLMCache(":memory:")
+        plain = CountingModel(temperature=0.7, cache=cache)
+        opted_in = CountingModel(temperature=0.7, cache=cache.with_sampling())
+
+        for _ in range(2):
+            plain.invoke("hi")
+            opted_in.invoke("hi")
+
+        assert plain.requests == 2
+        assert opted_in.requests == 1
+        assert cache.with_sampling() is cache.with_sampling()
+        assert cache.get_stats()["bypassed"] == 2
+
+    def test_streaming_shares_entries_with_invoke(self):
+        """Test that cached_streaming fills and reads the same entries as invoke."""
+        cache = LLMCache(":memory:")
+        llm = CountingModel(response="Dear Alex, thanks.", cache=cache)
+        streamed = PROMPT | cached_streaming(llm) | StrOutputParser()
+
+        assert "".join(streamed.stream({"topic": "x"})) == "Dear Alex, thanks."
+        assert (PROMPT | llm | StrOutputParser()).invoke({"topic": "x"}) == "Dear Alex, thanks."
+        assert list(streamed.stream({"topic": "x"})) == ["Dear Alex, thanks."]
+        assert llm.requests == 1
+
+    def test_entries_expire(self):
+        """Test that entries older than the TTL are dropped."""
+        cache = LLMCache(":memory:", ttl=0.05)
+        cache.update_text("hi", "m", 0.0, "hello")
+        assert cache.lookup_text("hi", "m", 0.0) == "hello"
+
+        time.sleep(0.1)
+
+        assert cache.lookup_text("hi", "m", 0.0) is None
+        assert cache.get_stats()["expired"] == 1
+
+    def test_evicts_least_recently_used(self):
+        """Test eviction by entry count, keeping recently hit entries."""
+        cache = LLMCache(":memory:", max_entries=2)
+        cache.update_text("a", "m", 0.0, "1")
+        time.sleep(0.01)
+        cache.update_text("b", "m", 0.0, "2")
+        time.sleep(0.01)
+        assert cache.lookup_text("a", "m", 0.0) == "1"
+        time.sleep(0.01)
+        cache.update_text("c", "m", 0.0, "3")
+
+        assert cache.lookup_text("b", "m", 0.0) is None
+        assert cache.lookup_text("a", "m", 0.0) == "1"
+        assert cache.get_stats()["evictions"] == 1
+
+    def test_persists_across_instances(self, tmp_path):
+        """Test that entries survive reopening the database."""
+        path = str(tmp_path / "llm_cache.db")
+        first = LLMCache(path)
+        first.update_text("hi", "m", 0.0, "hello")
+        first.close()
+
+        assert LLMCache(path).lookup_text("hi", "m", 0.0) == "hello"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
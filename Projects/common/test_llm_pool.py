@@ -0,0 +1,127 @@
+"""
+Tests for the shared chat model pool.
+Note: Clients are only constructed, or talk to a local HTTP server, so no API calls are made.
+"""
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import asyncio
+import threading
+
+import pytest
+from common.llm_pool import ChatModelPool
+
+
+class OkHandler(BaseHTTPRequestHandler):
+    """Answers every GET with a small JSON body over a keep-alive connection."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        body = b'{"ok": true}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def local_url():
+    """Serve OkHandler on a free local port for the duration of a test."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), OkHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/"
+    server.shutdown()
+    server.server_close()
+
+
+class TestChatModelPool:
+    """Test cases for ChatModelPool."""
+
+    def test_same_settings_reuse_the_model(self):
+        """Test that identical settings return the same ChatOpenAI instance."""
+        pool = ChatModelPool()
+
+        first = pool.get_chat_model("gpt-4o-mini", 0.2, api_key="sk-test", streaming=True)
+        second = pool.get_chat_model("gpt-4o-mini", 0.2, api_key="sk-test", streaming=True)
+
+        assert first is second
+        assert pool.get_stats()["reuse_rate"] == 0.5
+
+    def test_settings_are_part_of_the_key(self):
+        """Test that model, temperature, api key and options each get their own client."""
+        pool = ChatModelPool()
+
+        base = pool.get_chat_model("gpt-4o-mini", 0.2, api_key="sk-a")
+
+        assert pool.get_chat_model("gpt-4o-mini", 0.3, api_key="sk-a") is not base
+        assert pool.get_chat_model("gpt-4o-mini", 0.2, api_key="sk-b") is not base
+        assert pool.get_chat_model("gpt-3.5-turbo", 0.2, api_key="sk-a") is not base
+        assert pool.get_chat_model("gpt-4o-mini", 0.2, api_key="sk-a", max_retries=5) is not base
+        assert pool.get_stats()["created"] == 5
+
+    def test_models_share_http_connection_pool(self):
+        """Test that every model routes through the same keep-alive HTTP clients."""
+        pool = ChatModelPool(max_connections=7, max_keepalive_connections=3)
+
+        first = pool.get_chat_model("gpt-4o-mini", 0.2, api_key="sk-a")
+        second = pool.get_chat_model("gpt-4o-mini", 0.9, api_key="sk-b")
+        sdk_client = pool.get_openai_client(api_key="sk-a")
+
+        assert first.http_client is second.http_client is pool.http_client
+        assert sdk_client._client is pool.http_client
+        assert pool.get_stats()["max_connections"] == 7
+        assert pool.get_stats()["open_connections"] == 0
+        pool.close()
+
+    def test_least_recently_used_model_is_evicted(self):
+        """Test that the registry is bounded."""
+        pool = ChatModelPool(max_models=2)
+
+        first = pool.get_chat_model("gpt-4o-mini", 0.1, api_key="sk-a")
+        pool.get_chat_model("gpt-4o-mini", 0.2, api_key="sk-a")
+        pool.get_chat_model("gpt-4o-mini", 0.1, api_key="sk-a")
+        pool.get_chat_model("gpt-4o-mini", 0.3, api_key="sk-a")
+
+        assert pool.get_chat_model("gpt-4o-mini", 0.1, api_key="sk-a") is first
+        assert pool.get_stats()["evicted"] == 1
+        assert pool.get_stats()["models"] == 2
+
+    def test_async_client_works_from_several_event_loops(self, local_url):
+        """Test that the shared async client can be used from successive and concurrent event loops."""
+        pool = ChatModelPool()
+        client = pool.async_http_client
+
+        async def fetch():
+            responses = await asyncio.gather(*(client.get(local_url) for _ in range(3)))
+            return [response.json() for response in responses]
+
+        # Successive asyncio.run calls, as in Streamlit reruns
+        assert asyncio.run(fetch()) == [{"ok": True}] * 3
+        assert asyncio.run(fetch()) == [{"ok": True}] * 3
+
+        # Concurrent loop threads, as with one LLMClient per API key
+        results, errors = [], []
+
+        def worker():
+            try:
+                results.append(asyncio.run(fetch()))
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=10)
+
+        assert not errors
+        assert results == [[{"ok": True}] * 3] * 2
+        assert pool.get_async_openai_client(api_key="sk-test")._client is client
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
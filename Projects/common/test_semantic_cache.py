@@ -0,0 +1,124 @@
+"""
+Tests for the semantic response cache.
+Note: Questions are embedded with the local hashing embedder, so no models or APIs are needed.
+"""
+
+import pytest
+from common.embeddings import HashingEmbedder
+from common.semantic_cache import SemanticCache, contains_code
+
+
+def make_cache(**kwargs):
+    """Build a cache with the deterministic hashing embedder."""
+    return SemanticCache(embedder=HashingEmbedder(), **kwargs)
+
+
+class TestSemanticCache:
+    """Test cases for SemanticCache."""
+
+    def test_near_duplicate_hits(self):
+        """Test that a near-duplicate question returns the cached answer when similarity matching is on."""
+        cache = make_cache(threshold=0.85, exact_match=False)
+        cache.put("write a python function to reverse a string", "def reverse(s): return s[::-1]", seconds=2.0)
+
+        hit = cache.lookup("python function to reverse a string")
+
+        assert hit is not None
+        assert hit.answer == "def reverse(s): return s[::-1]"
+        assert hit.similarity >= 0.85
+        stats = cache.get_stats()
+        assert stats["hit_rate"] == 1.0
+        assert stats["saved_tokens"] == hit.tokens > 0
+        assert stats["saved_seconds"] == 2.0
+
+    def test_unrelated_question_misses(self):
+        """Test that a different question is not served from the cache."""
+        cache = make_cache()
+        cache.put("write a python function to reverse a string", "def reverse(s): return s[::-1]")
+
+        assert cache.lookup("explain how async/await works in JavaScript") is None
+        assert cache.get_stats()["hits"] == 0
+
+    def test_namespace_and_context_must_match(self):
+        """Test that answers are not shared across namespaces or conversation contexts."""
+        cache = make_cache()
+        cache.put("make it faster", "Use a generator.", context="read a large csv file in python", namespace="gpt-4o-mini|0.2")
+
+        assert cache.lookup("make it faster", context="read a large csv file in python", namespace="gpt-4o-mini|0.7") is None
+        assert cache.lookup("make it faster", context="sort a list of dicts by key", namespace="gpt-4o-mini|0.2") is None
+        assert cache.lookup("make it faster", context="read a large csv file in python", namespace="gpt-4o-mini|0.2")
+
+    def test_least_recently_used_is_evicted(self):
+        """Test eviction by entry count, keeping recently hit entries."""
+        cache = make_cache(max_entries=2)
+        cache.put("reverse a string in python", "a")
+        cache.put("parse json in javascript", "b")
+        assert cache.lookup("reverse a string in python")
+        cache.put("connect to postgres from go", "c")
+
+        assert cache.lookup("parse json in javascript") is None
+        assert cache.lookup("reverse a string in python").answer == "a"
+        assert cache.get_stats()["evictions"] == 1
+        assert cache.get_stats()["entries"] == 2
+
+    def test_evicts_by_size(self):
+        """Test eviction when answers exceed max_bytes."""
+        cache = make_cache(max_bytes=150)
+        cache.put("first question about python lists", "x" * 100)
+        cache.put("second question about rust traits", "y" * 100)
+
+        assert cache.get_stats()["bytes"] == 100
+        assert cache.lookup("second question about rust traits").answer == "y" * 100
+
+    def test_many_entries_grow_the_matrix(self):
+        """Test that slots beyond the initial capacity are searchable."""
+        cache = make_cache()
+        for i in range(100):
+            cache.put(f"question number {i} about topic{i} and subject{i}", f"answer {i}")
+
+        assert cache.lookup("question number 99 about topic99 and subject99").answer == "answer 99"
+
+    def test_replay_streams_the_answer(self):
+        """Test that a replayed answer reassembles exactly."""
+        answer = "Here is code:\n\n```python\nprint('hi')\n```\n"
+
+        assert "".join(SemanticCache.replay(answer, tokens_per_second=0)) == answer
+
+    def test_hashing_embedder_only_serves_exact_repeats(self):
+        """Test that the hashing fallback ignores case and whitespace but nothing else."""
+        cache = make_cache()
+        cache.put("Write a python function to reverse a string", "def reverse(s): return s[::-1]")
+
+        assert cache.exact_match
+        assert cache.lookup("write a  python function to reverse a string ")
+        assert cache.lookup("python function to reverse a string") is None
+
+    def test_code_questions_need_exact_repeats(self):
+        """Test that questions differing only in their code never share an answer."""
+        cache = make_cache(exact_match=False)
+        cache.put("Explain this code: for i in range(10): print(i)", "Prints 0 to 9.")
+        cache.put("Why does this code fail? x = 1/0", "Division by zero.")
+
+        assert cache.lookup("Explain this code: for i in range(10): print(i*i)") is None
+        assert cache.lookup('Why does this code fail? x = int("a")') is None
+        assert cache.lookup("why does this code fail? x = 1/0").answer == "Division by zero."
+
+    def test_detects_code(self):
+        """Test the code heuristic on code and on plain questions."""
+        assert contains_code("what does `zip` do")
+        assert contains_code("x = 1/0")
+        assert contains_code("for i in range(10): print(i)")
+        assert not contains_code("How do I reverse a string in Python?")
+        assert not contains_code("What is a closure (in simple terms)?")
+
+    def test_empty_answers_are_not_cached(self):
+        """Test that failed or empty generations are skipped."""
+        cache = make_cache()
+        cache.put("anything", "   ")
+
+        assert cache.get_stats()["entries"] == 0
+        assert cache.lookup("anything") is None
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,114 @@
+"""
+Tests for incremental stream rendering.
+Note: Streamlit containers are replaced by recording stand-ins and time by a manual clock.
+"""
+
+from common.streaming import StreamRenderer, closed_blocks_end, render_stream
+
+
+class Element:
+    """Recording stand-in for a Streamlit element."""
+
+    def __init__(self, log):
+        self.log = log
+        self.index = len(log)
+        log.append([])
+
+    def markdown(self, body):
+        self.log[self.index].append(body)
+
+
+class Container:
+    """Recording stand-in for st.container(); log holds each element's updates."""
+
+    def __init__(self):
+        self.log = []
+
+    def empty(self):
+        return Element(self.log)
+
+
+class Clock:
+    """Manually advanced clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestClosedBlocks:
+    """Test cases for closed_blocks_end."""
+
+    def test_finds_end_of_closed_block(self):
+        """Test the offset after a complete closing fence line."""
+        text = "Intro\n```python\nx = 1\n```\nMore"
+        assert text[:closed_blocks_end(text)] == "Intro\n```python\nx = 1\n```\n"
+
+    def test_open_or_unterminated_blocks(self):
+        """Test that open blocks and closing fences without a newline are not closed yet."""
+        assert closed_blocks_end("```python\nx = 1\n") == 0
+        assert closed_blocks_end("```python\nx = 1\n```") == 0
+        assert closed_blocks_end("no code at all\n") == 0
+
+
+class TestStreamRenderer:
+    """Test cases for StreamRenderer."""
+
+    def test_throttles_to_frame_interval(self):
+        """Test that chunks arriving within one frame are rendered together."""
+        clock = Clock()
+        container = Container()
+        renderer = StreamRenderer(container, frame_interval=0.1, split_code_blocks=False, clock=clock)
+
+        for i in range(10):
+            clock.now += 0.025
+            renderer.write(f"w{i} ")
+        text = renderer.finish()
+
+        assert text == "".join(f"w{i} " for i in range(10))
+        assert renderer.get_stats()["renders"] == 3
+        assert container.log[0][-1] == text
+        assert container.log[0][0].endswith("▌")
+
+    def test_min_chars_triggers_render(self):
+        """Test that enough pending characters render before the frame is due."""
+        clock = Clock()
+        renderer = StreamRenderer(Container(), frame_interval=10, min_chars=8, clock=clock)
+
+        assert not renderer.write("abc")
+        assert renderer.write("defgh")
+
+    def test_closed_code_blocks_render_once(self):
+        """Test that a closed block moves to its own element and later frames only send the tail."""
+        container = Container()
+        renderer = StreamRenderer(container, frame_interval=0, clock=Clock())
+        chunks = ["Here:\n", "```python\n", "x = 1\n", "```\n", "That ", "sets x."]
+
+        for chunk in chunks:
+            renderer.write(chunk)
+        renderer.finish()
+
+        block, tail = container.log
+        assert block[-1] == "Here:\n```python\nx = 1\n```\n"
+        assert tail == ["That ▌", "That sets x.▌", "That sets x."]
+        assert renderer.get_stats()["finalized"] == 1
+
+    def test_template_wraps_tail(self):
+        """Test that the template is applied while streaming and when finished."""
+        container = Container()
+        text = render_stream(
+            ["Dear ", "Alex,"], container,
+            frame_interval=0, split_code_blocks=False, template="Draft:\n```\n{text}\n```"
+        )
+
+        assert text == "Dear Alex,"
+        assert container.log[0] == ["Draft:\n```\nDear ▌\n```", "Draft:\n```\nDear Alex,▌\n```", "Draft:\n```\nDear Alex,\n```"]
+
+    def test_empty_stream_renders_once(self):
+        """Test that an empty stream still clears the cursor."""
+        container = Container()
+
+        assert render_stream([], container) == ""
+        assert container.log == [[""]]
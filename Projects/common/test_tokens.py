@@ -0,0 +1,33 @@
+"""
+Tests for token counting.
+Note: Counts fall back to the character estimate when tiktoken's encodings can't be loaded.
+"""
+
+import pytest
+from common import tokens
+from common.tokens import count_tokens, get_tokenizer
+
+
+class TestCountTokens:
+    """Test cases for count_tokens."""
+
+    def test_counts_grow_with_the_text(self):
+        """Test that counts are positive and roughly proportional to length."""
+        short = count_tokens("hello world")
+
+        assert 0 < short < 10
+        assert 50 * short < count_tokens("hello world " * 100)
+
+    def test_falls_back_without_tokenizer(self, monkeypatch):
+        """Test the four-characters-per-token estimate."""
+        monkeypatch.setattr(tokens, "get_tokenizer", lambda model: None)
+
+        assert count_tokens("x" * 401) == 101
+
+    def test_tokenizer_is_loaded_once(self):
+        """Test that tokenizers are cached per model."""
+        assert get_tokenizer("gpt-4o-mini") is get_tokenizer("gpt-4o-mini")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,57 @@
+"""
+Token counting with the model's tokenizer.
+
+Tokenizers are loaded once per model. Without tiktoken, or when its
+encoding files can't be downloaded, counts fall back to about one token
+per four characters, which is close enough for budgeting.
+"""
+
+from functools import lru_cache
+import math
+
+CHARS_PER_TOKEN = 4
+
+
+@lru_cache(maxsize=8)
+def get_tokenizer(model: str):
+    """
+    Load the tokenizer for a model once.
+
+    Args:
+        model: Model name
+
+    Returns:
+        A tiktoken Encoding, or None if tiktoken or its encoding files are unavailable
+    """
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        try:
+            return tiktoken.get_encoding("o200k_base")
+        except Exception:
+            return None
+    except Exception:
+        # Encoding files are downloaded on first use; offline this fails
+        return None
+
+
+def count_tokens(text: str, model: str = "gpt-4o-mini") -> int:
+    """
+    Count the tokens in text.
+
+    Args:
+        text: Text to count
+        model: Model whose tokenizer to use
+
+    Returns:
+        Exact count with tiktoken, otherwise about one token per four characters
+    """
+    tokenizer = get_tokenizer(model)
+    if tokenizer is None:
+        return math.ceil(len(text) / CHARS_PER_TOKEN)
+    return len(tokenizer.encode(text, disallowed_special=()))
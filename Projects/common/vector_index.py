@@ -0,0 +1,181 @@
+"""
+In-memory vector indexes with a FAISS-like add/search interface.
+
+Vectors are expected to be L2-normalized, so inner product is cosine
+similarity:
+- FlatIndex scores every vector exactly; best below a few thousand vectors
+- IVFIndex clusters vectors with spherical k-means and only scores the
+  clusters nearest to each query (nprobe), trading a little recall for
+  sub-linear search on large collections
+
+search returns (scores, ids) arrays of shape (queries, k), padded with
+-inf scores and -1 ids when fewer than k vectors are found.
+"""
+
+from typing import Optional, Tuple
+import math
+
+import numpy as np
+
+
+def _top_k(scores: np.ndarray, ids: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Pick the k best scores from one query's candidates, padded to k."""
+    out_scores = np.full(k, -np.inf, dtype=np.float32)
+    out_ids = np.full(k, -1, dtype=np.int64)
+    if len(scores) == 0:
+        return out_scores, out_ids
+
+    count = min(k, len(scores))
+    best = np.argpartition(-scores, count - 1)[:count]
+    best = best[np.argsort(-scores[best], kind="stable")]
+    out_scores[:count] = scores[best]
+    out_ids[:count] = ids[best]
+    return out_scores, out_ids
+
+
+class FlatIndex:
+    """Exact inner-product search over all vectors."""
+
+    def __init__(self, dim: int):
+        """
+        Initialize an empty index.
+
+        Args:
+            dim: Vector size
+        """
+        self.dim = dim
+        self.vectors = np.zeros((0, dim), dtype=np.float32)
+
+    def __len__(self) -> int:
+        return len(self.vectors)
+
+    def add(self, vectors: np.ndarray):
+        """Add vectors; their ids continue from the current size."""
+        self.vectors = np.vstack([self.vectors, np.asarray(vectors, dtype=np.float32).reshape(-1, self.dim)])
+
+    def search(self, queries: np.ndarray, k: int = 5) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Find the k most similar vectors to each query.
+
+        Args:
+            queries: Array of shape (queries, dim)
+            k: Results per query
+
+        Returns:
+            (scores, ids), each of shape (queries, k)
+        """
+        queries = np.asarray(queries, dtype=np.float32).reshape(-1, self.dim)
+        similarities = queries @ self.vectors.T
+        ids = np.arange(len(self.vectors))
+        results = [_top_k(row, ids, k) for row in similarities]
+        return np.array([r[0] for r in results]).reshape(-1, k), np.array([r[1] for r in results]).reshape(-1, k)
+
+
+class IVFIndex:
+    """Inverted-file index: vectors are searched only in the clusters nearest the query."""
+
+    def __init__(self, dim: int, nlist: int = 64, nprobe: int = 8, iterations: int = 10, seed: int = 0):
+        """
+        Initialize an untrained index.
+
+        Args:
+            dim: Vector size
+            nlist: Number of clusters
+            nprobe: Clusters searched per query
+            iterations: k-means iterations when training
+            seed: Random seed for the initial centroids
+        """
+        self.dim = dim
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.iterations = iterations
+        self.seed = seed
+        self.centroids: Optional[np.ndarray] = None
+        self.vectors = np.zeros((0, dim), dtype=np.float32)
+        self.assignments = np.zeros(0, dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self.vectors)
+
+    @property
+    def is_trained(self) -> bool:
+        """Whether centroids have been learned."""
+        return self.centroids is not None
+
+    def train(self, vectors: np.ndarray):
+        """
+        Learn cluster centroids with spherical k-means.
+
+        Args:
+            vectors: Training vectors, typically the vectors to be added
+        """
+        vectors = np.asarray(vectors, dtype=np.float32).reshape(-1, self.dim)
+        nlist = max(1, min(self.nlist, len(vectors)))
+        rng = np.random.default_rng(self.seed)
+        centroids = vectors[rng.choice(len(vectors), nlist, replace=False)].copy()
+
+        for _ in range(self.iterations):
+            assignments = np.argmax(vectors @ centroids.T, axis=1)
+            for cluster in range(nlist):
+                members = vectors[assignments == cluster]
+                if len(members):
+                    centroid = members.sum(axis=0)
+                    norm = np.linalg.norm(centroid)
+                    centroids[cluster] = centroid / norm if norm else centroid
+
+        self.centroids = centroids
+
+    def add(self, vectors: np.ndarray):
+        """Add vectors to their nearest clusters; trains first if needed."""
+        vectors = np.asarray(vectors, dtype=np.float32).reshape(-1, self.dim)
+        if not self.is_trained:
+            self.train(vectors)
+        self.vectors = np.vstack([self.vectors, vectors])
+        self.assignments = np.concatenate([self.assignments, np.argmax(vectors @ self.centroids.T, axis=1)])
+
+    def search(self, queries: np.ndarray, k: int = 5) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Find the k most similar vectors to each query within its nprobe nearest clusters.
+
+        Args:
+            queries: Array of shape (queries, dim)
+            k: Results per query
+
+        Returns:
+            (scores, ids), each of shape (queries, k)
+        """
+        queries = np.asarray(queries, dtype=np.float32).reshape(-1, self.dim)
+        if not self.is_trained:
+            return FlatIndex(self.dim).search(queries, k)
+
+        nprobe = min(self.nprobe, len(self.centroids))
+        nearest = np.argsort(-(queries @ self.centroids.T), axis=1)[:, :nprobe]
+
+        all_scores, all_ids = [], []
+        for query, clusters in zip(queries, nearest):
+            ids = np.flatnonzero(np.isin(self.assignments, clusters))
+            scores, found = _top_k(self.vectors[ids] @ query, ids, k)
+            all_scores.append(scores)
+            all_ids.append(found)
+        return np.array(all_scores).reshape(-1, k), np.array(all_ids).reshape(-1, k)
+
+
+def build_index(vectors: np.ndarray, ivf_threshold: int = 4096, nprobe: int = 8):
+    """
+    Build the right index for a collection's size.
+
+    Args:
+        vectors: L2-normalized vectors, shape (count, dim)
+        ivf_threshold: Collections at least this large get an IVFIndex
+        nprobe: Clusters searched per query in an IVFIndex
+
+    Returns:
+        A FlatIndex, or an IVFIndex with about 4 * sqrt(count) clusters
+    """
+    vectors = np.asarray(vectors, dtype=np.float32)
+    if len(vectors) < ivf_threshold:
+        index = FlatIndex(vectors.shape[1])
+    else:
+        index = IVFIndex(vectors.shape[1], nlist=int(4 * math.sqrt(len(vectors))), nprobe=nprobe)
+    index.add(vectors)
+    return index